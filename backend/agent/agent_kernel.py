@@ -15,13 +15,17 @@ from .vps_gateway import VPSGateway, VPSConfig
 from .personality import PersonalityManager
 from .memory import ConversationMemory, TaskRecord
 from .model_router import ModelRouter
-from typing import Any, Dict, Optional, List, Callable
+from typing import Any, Dict, Optional, List, Callable, Set
 import json
 import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
 
+from backend.monitoring.tracing import span as trace_span
+from .context_budget import ContextBlock, TokenCounter, select_blocks
+from .kernel_resources import get_kernel_resources
+
 logger = logging.getLogger(__name__)
 
 # ── DER Loop constants (spec: agent_loop_requirements.md Gap 11) ───────────
@@ -156,6 +160,9 @@ class AgentKernel:
         # provider is `iris_local`, inference goes through the manager's
         # `InProcessOpenAIAdapter` with zero network hops.
         self._inprocess_local_mgr: Any = None
+        self._token_counter: Optional[TokenCounter] = None
+        self._last_context_allocation: Optional[Dict[str, Any]] = None
+        self._last_retrieval: Optional[Dict[str, Any]] = None
 
         # Ollama native API endpoint (used when provider == "local").
         self._ollama_endpoint: str = "http://localhost:11434"
@@ -212,14 +219,11 @@ class AgentKernel:
     def _initialize_components(self):
         """Initialize all core components with error handling."""
         try:
-            # Initialize Model Router with UNINITIALIZED mode (lazy loading)
-            logger.info(
-                "[AgentKernel] Initializing Model Router in UNINITIALIZED mode (lazy loading)...")
-            from .model_router import InferenceMode
-            self._model_router = ModelRouter(
-                self.config_path, inference_mode=InferenceMode.UNINITIALIZED)
+            # Shared Model Router (UNINITIALIZED until a mode is chosen) — one
+            # per process, so lazily loaded models are not duplicated per session
+            self._model_router = get_kernel_resources().model_router(self.config_path)
             logger.info(
-                "[AgentKernel] Model Router initialized - models will NOT be loaded automatically")
+                "[AgentKernel] Model Router attached - models will NOT be loaded automatically")
             logger.info(
                 "[AgentKernel] Models will be loaded only when user selects Local Model inference mode")
 
@@ -308,8 +312,7 @@ class AgentKernel:
         self._der_tokens_used: int = 0
 
         try:
-            from backend.memory.mycelium.kyudo import TaskClassifier as _TC
-            self._task_classifier = _TC()
+            self._task_classifier = get_kernel_resources().task_classifier()
             logger.info("[AgentKernel] TaskClassifier initialized (DER)")
         except Exception as _tc_err:
             logger.warning(f"[AgentKernel] TaskClassifier unavailable: {_tc_err}")
@@ -331,8 +334,7 @@ class AgentKernel:
             logger.warning(f"[AgentKernel] TrailingDirector unavailable: {_td_err}")
 
         try:
-            from backend.agent.mode_detector import ModeDetector as _MD
-            self._mode_detector = _MD()
+            self._mode_detector = get_kernel_resources().mode_detector()
             logger.info("[AgentKernel] ModeDetector initialized (DER)")
         except Exception as _md_err:
             logger.warning(f"[AgentKernel] ModeDetector unavailable: {_md_err}")
@@ -539,6 +541,9 @@ class AgentKernel:
                 - load_balancing_strategy: str - "round_robin" or "least_loaded"
                 - protocol: str - "rest" or "websocket"
                 - offload_tools: bool - Offload tool execution to VPS
+                - hedge_requests: bool - Hedge slow requests on a second endpoint
+                - circuit_failure_threshold: int - Failures before an endpoint's circuit opens
+                - circuit_cooldown: float - Seconds before a half-open probe
         """
         try:
             logger.info(f"[AgentKernel] Configuring VPS Gateway: {vps_config}")
@@ -556,9 +561,17 @@ class AgentKernel:
                 load_balancing_strategy=vps_config.get(
                     "load_balancing_strategy", "round_robin"),
                 protocol=vps_config.get("protocol", "rest"),
-                offload_tools=vps_config.get("offload_tools", False)
+                offload_tools=vps_config.get("offload_tools", False),
+                hedge_requests=vps_config.get("hedge_requests", False),
+                circuit_failure_threshold=vps_config.get(
+                    "circuit_failure_threshold", 3),
+                circuit_cooldown=vps_config.get("circuit_cooldown", 10.0)
             )
 
+            # A replaced gateway's loop thread and pooled clients go with it
+            if self._vps_gateway is not None:
+                self._vps_gateway.close()
+
             # Only create VPSGateway when user has explicitly enabled it.
             # This prevents health-check loops on every reconnect when VPS is disabled.
             if self._vps_config.enabled and self._model_router:
@@ -644,11 +657,8 @@ class AgentKernel:
 
     def _get_api_client(self) -> Any:
         """Return an OpenAI-compatible client for the remote API provider."""
-        from openai import OpenAI as _OpenAI
-        return _OpenAI(
-            api_key=self._api_key or "placeholder",
-            base_url=self._api_base_url,
-        )
+        return get_kernel_resources().openai_client(
+            self._api_base_url, self._api_key or "placeholder")
 
     # Providers that speak the OpenAI-compatible chat completions API.
     # When the user picks any of these, inference routes through _get_lmstudio_client()
@@ -690,6 +700,7 @@ class AgentKernel:
         # Invalidate any cached HTTP client so the next call picks up the
         # new adapter (or falls back to HTTP if mgr was cleared).
         self._lmstudio_client = None
+        self._token_counter = None      # new model, new tokenizer
         if mgr is None:
             logger.info("[AgentKernel] In-process local binding cleared")
         else:
@@ -707,9 +718,10 @@ class AgentKernel:
            openai client surface but routes straight to the in-process
            ``Llama`` instance. No HTTP, no subprocess, no port 8082.
 
-        2. **Real openai HTTP client** — all other cases. Created once and
-           cached so every inference call reuses the same httpx connection
-           pool (saves ~5–20 ms per call on localhost).
+        2. **Real openai HTTP client** — all other cases. Shared through
+           KernelResources so every call, and every session on the same
+           endpoint, reuses one httpx connection pool (saves ~5–20 ms per
+           call on localhost, and the cold connect on a new session).
 
         Invalidated by ``configure_lmstudio()`` / ``configure_inprocess_local()``
         when the binding changes.
@@ -723,16 +735,10 @@ class AgentKernel:
             # Manager was bound but model isn't loaded → fall through to
             # HTTP path (which will 404 cleanly instead of silently hanging).
 
-        # Path 2: cached real OpenAI HTTP client.
+        # Path 2: real OpenAI HTTP client, shared by every session on this endpoint.
         if self._lmstudio_client is None:
-            from openai import OpenAI as _OpenAI
-            self._lmstudio_client = _OpenAI(
-                base_url=f"{self._lmstudio_endpoint}/v1",
-                api_key="lm-studio",
-            )
-            logger.debug(
-                f"[AgentKernel] Created LM Studio client → {self._lmstudio_endpoint}/v1"
-            )
+            self._lmstudio_client = get_kernel_resources().openai_client(
+                f"{self._lmstudio_endpoint}/v1", "lm-studio")
         return self._lmstudio_client
 
     def prewarm_lmstudio(self) -> None:
@@ -1119,17 +1125,43 @@ class AgentKernel:
             pass  # never block the response
 
     # ── Token estimation ─────────────────────────────────────────────────────
-    # Rough but fast: 1 token ≈ 4 chars. Real tokenizer adds <5% accuracy gain
-    # but costs 10-50ms per call — not worth it for windowing decisions.
+    # Rough but fast: 1 token ≈ 4 chars. Used for telemetry when the backend
+    # reports no usage; prompt budgeting counts with context_budget.TokenCounter.
     _CHARS_PER_TOKEN: int = 4
 
-    # Context budget for direct responses. Keeps the most recent history
-    # within the model's 32k window, leaving ~8k for system prompt + response.
-    # With episodic injection headroom this sits at ~20k chat tokens max.
+    # Context budget for direct responses: a cap on prompt tokens, further
+    # limited by the model's real window minus the generation reserve — a
+    # quarter of the window, at most _RESERVED_GENERATION_TOKENS (so a 2k
+    # "eco" window keeps 1.5k for the prompt).  32k is assumed when the window
+    # is unknown (LM Studio / remote APIs).
     _DIRECT_CTX_BUDGET: int = 20_000   # tokens
+    _DEFAULT_CONTEXT_WINDOW: int = 32_768
+    _RESERVED_GENERATION_TOKENS: int = 4_096
+
+    # Per-source retrieval deadlines (seconds) for direct-response context
+    _RETRIEVAL_DEADLINES: Dict[str, float] = {"episodic": 0.75, "chunks": 0.75}
+
+    def _context_token_counter(self) -> TokenCounter:
+        """Token counter for prompt budgeting — exact with an in-process model loaded."""
+        counter = getattr(self, "_token_counter", None)
+        if counter is None:
+            mgr = getattr(self, "_inprocess_local_mgr", None)
+            exact = mgr is not None and mgr.is_loaded()
+            counter = TokenCounter(mgr.count_tokens if exact else None)
+            self._token_counter = counter
+        return counter
+
+    def _context_window(self) -> int:
+        mgr = getattr(self, "_inprocess_local_mgr", None)
+        if mgr is not None:
+            window = mgr.context_window()
+            if window:
+                return window
+        return self._DEFAULT_CONTEXT_WINDOW
 
-    def _count_tokens(self, messages: List[Dict]) -> int:
-        return sum(len(m.get("content") or "") for m in messages) // self._CHARS_PER_TOKEN
+    def _generation_reserve(self, window: int) -> int:
+        """Tokens kept free for the reply: window // 4, capped."""
+        return min(self._RESERVED_GENERATION_TOKENS, window // 4)
 
     def _assemble_direct_context(self, text: str, context: List[Dict]) -> List[Dict]:
         """
@@ -1142,10 +1174,11 @@ class AgentKernel:
           Layer 3 — Working memory / history   → token-aware full context, NOT
                                                   a hard-capped roll window
 
-        The result is unlimited effective memory: the agent sees all context
-        that fits in the budget. When history exceeds the budget, the oldest
-        messages are trimmed — but episodic summaries from Mycelium still carry
-        the gist of older sessions forward (Layer 2).
+        Every layer is a candidate ContextBlock with a token cost and a
+        relevance value (retrieval/resonance score, chunk score, turn
+        recency); context_budget.select_blocks() keeps the highest value per
+        token that fits the model's window minus the generation reserve.  The
+        allocation is kept in self._last_context_allocation for debugging.
 
         Design rules (from spec):
           • Never drop the current user turn
@@ -1154,19 +1187,51 @@ class AgentKernel:
             doesn't break the alternating pattern
         """
         system_prompt = self._build_system_prompt()
+        counter = self._context_token_counter()
+        system_msg = [{"role": "system", "content": system_prompt}]
+        current_msg = [{"role": "user", "content": text}]
+        blocks: List[ContextBlock] = [
+            ContextBlock("system", system_msg, counter.count_messages(system_msg), required=True),
+            ContextBlock("current", current_msg, counter.count_messages(current_msg), required=True),
+        ]
+
+        # ── Layers 2 + 3a: episodic and chunk retrieval, concurrently ─────
+        # One shared query embedding; a source that misses its deadline is
+        # left out instead of delaying the first token.
+        episodic_store = getattr(self._memory_interface, "episodic", None)
+        retrieved = None
+        if episodic_store is not None:
+            from backend.memory.retrieval import get_retrieval_orchestrator
+            sources = {
+                "episodic": lambda vec: episodic_store.assemble_episodic_context(
+                    text, with_score=True, query_embedding=vec),
+            }
+            if hasattr(episodic_store, "retrieve_context_chunks"):
+                sources["chunks"] = lambda vec: episodic_store.retrieve_context_chunks(
+                    query=text,
+                    session_id=getattr(self, "session_id", None),
+                    limit=6,
+                    min_similarity=0.25,
+                    with_scores=True,
+                    query_embedding=vec,
+                )
+            retrieved = get_retrieval_orchestrator().gather(
+                sources, query=text, deadlines=self._RETRIEVAL_DEADLINES)
+            self._last_retrieval = retrieved.to_dict()
 
         # ── Layer 2: episodic injection ───────────────────────────────────
-        episodic_prefix: List[Dict] = []
         try:
-            if self._memory_interface is not None and hasattr(self._memory_interface, "episodic"):
-                ep_ctx = self._memory_interface.episodic.assemble_episodic_context(text)
-                if ep_ctx and ep_ctx.strip():
-                    # Inject as a pseudo-exchange so the message pattern stays
-                    # [system, user, assistant, user, assistant, …, user]
-                    episodic_prefix = [
-                        {"role": "user",      "content": f"<memory>\n{ep_ctx.strip()}\n</memory>"},
-                        {"role": "assistant", "content": "Understood — I have that context."},
-                    ]
+            ep = retrieved.value("episodic") if retrieved is not None else None
+            ep_ctx, ep_score = ep if isinstance(ep, tuple) else (ep, 0.5)
+            if ep_ctx and ep_ctx.strip():
+                # Inject as a pseudo-exchange so the message pattern stays
+                # [system, user, assistant, user, assistant, …, user]
+                episodic_prefix = [
+                    {"role": "user",      "content": f"<memory>\n{ep_ctx.strip()}\n</memory>"},
+                    {"role": "assistant", "content": "Understood — I have that context."},
+                ]
+                blocks.append(ContextBlock("episodic", episodic_prefix,
+                                           counter.count_messages(episodic_prefix), ep_score))
         except Exception:
             pass  # episodic failure never blocks the response
 
@@ -1175,78 +1240,70 @@ class AgentKernel:
         # conversation fragments stored by fragment_and_store().  Falls back to
         # the plain rolling window when no chunks exist yet (first turn, fresh DB).
         #
-        # Recency anchor: always keep the last _RECENCY_TURNS raw turns so the
-        # model can follow short-term conversational flow regardless of relevance.
+        # Recency anchor: the last _RECENCY_TURNS raw turns carry full value so
+        # the model can follow short-term conversational flow.
         _RECENCY_TURNS = 4
 
-        sys_tokens     = len(system_prompt) // self._CHARS_PER_TOKEN
-        ep_tokens      = self._count_tokens(episodic_prefix)
-        current_tokens = len(text) // self._CHARS_PER_TOKEN
-
-        # ── 3a: semantic chunk retrieval from DB ──────────────────────────
-        chunk_prefix: List[Dict] = []
-        try:
-            if (
-                self._memory_interface is not None
-                and hasattr(self._memory_interface, "episodic")
-                and hasattr(self._memory_interface.episodic, "retrieve_context_chunks")
-            ):
-                _chunks = self._memory_interface.episodic.retrieve_context_chunks(
-                    query=text,
-                    session_id=getattr(self, "session_id", None),
-                    limit=6,
-                    min_similarity=0.25,
-                )
-                if _chunks:
-                    chunk_text = "\n---\n".join(_chunks)
-                    # Inject as a pseudo-exchange so role alternation stays valid
-                    chunk_prefix = [
-                        {"role": "user",      "content": f"<context_memory>\n{chunk_text}\n</context_memory>"},
-                        {"role": "assistant", "content": "Understood — I have those context fragments."},
-                    ]
-        except Exception:
-            pass  # chunk retrieval failure never blocks the response
+        # ── 3a: semantic chunks retrieved from DB ─────────────────────────
+        _chunks = retrieved.value("chunks") if retrieved is not None else None
+        chunks: List[tuple] = [c if isinstance(c, tuple) else (c, 0.5)
+                               for c in (_chunks if isinstance(_chunks, list) else [])]
 
-        chunk_tokens = self._count_tokens(chunk_prefix)
-        budget_for_history = (
-            self._DIRECT_CTX_BUDGET - sys_tokens - ep_tokens - chunk_tokens - current_tokens
-        )
+        if chunks:
+            # The pseudo-exchange framing is paid once, with the first chunk chosen
+            frame = [
+                {"role": "user",      "content": "<context_memory>\n\n</context_memory>"},
+                {"role": "assistant", "content": "Understood — I have those context fragments."},
+            ]
+            blocks.append(ContextBlock("chunk_frame", frame, counter.count_messages(frame)))
+            for i, (chunk, score) in enumerate(chunks):
+                blocks.append(ContextBlock(f"chunk:{i}", [{"role": "user", "content": chunk}],
+                                           counter.count(chunk + "\n---\n"), score,
+                                           frame="chunk_frame"))
 
-        # ── 3b: recency anchor — last N raw turns ─────────────────────────
+        # ── 3b: history — newest turn first, each older turn only after the newer one ─
         history = list(context)
         # Remove current user turn from tail if already appended
         if history and history[-1].get("role") == "user" and history[-1].get("content") == text:
             history = history[:-1]
-
-        if chunk_prefix:
-            # DB has relevant chunks: only keep a small recency window
-            recent = history[-_RECENCY_TURNS:] if len(history) > _RECENCY_TURNS else list(history)
-            recent_tokens = self._count_tokens(recent)
-            while recent and recent_tokens > max(budget_for_history, 0):
-                removed_item = recent.pop(0)
-                recent_tokens -= len(removed_item.get("content") or "") // self._CHARS_PER_TOKEN
-            while recent and recent[0].get("role") != "user":
-                recent.pop(0)
-            history_block = recent
-        else:
-            # No chunks yet (first message / empty DB): full rolling window fallback
-            history_tokens = self._count_tokens(history)
-            while history and history_tokens > max(budget_for_history, 0):
-                removed_item = history.pop(0)
-                history_tokens -= len(removed_item.get("content") or "") // self._CHARS_PER_TOKEN
-            while history and history[0].get("role") != "user":
-                history.pop(0)
-            history_block = history
+        if chunks:
+            # DB has relevant chunks: they stand in for older history
+            history = history[-_RECENCY_TURNS:]
+        for age, msg in enumerate(reversed(history)):
+            blocks.append(ContextBlock(
+                f"history:{age}", [msg], counter.count_messages([msg]),
+                1.0 if age < _RECENCY_TURNS else _RECENCY_TURNS / (age + 1.0),
+                after=f"history:{age - 1}" if age else None,
+            ))
+
+        window = self._context_window()
+        allocation = select_blocks(
+            blocks, window, self._generation_reserve(window),
+            budget=self._DIRECT_CTX_BUDGET, exact_tokens=counter.exact,
+        )
+        self._last_context_allocation = allocation.to_dict()
+        logger.debug(
+            "[AgentKernel] context budget: %d/%d tokens, dropped %s",
+            allocation.used, allocation.budget, [b.name for b in allocation.dropped],
+        )
 
         # ── Assemble final message list ───────────────────────────────────
-        messages: List[Dict] = [{"role": "system", "content": system_prompt}]
-        messages.extend(episodic_prefix)   # Layer 2: episodic summaries
-        messages.extend(chunk_prefix)      # Layer 3a: semantic DB chunks
-        messages.extend(history_block)     # Layer 3b: recency anchor
-
-        # Ensure the list ends on the current user turn
-        if not messages or messages[-1].get("content") != text or messages[-1].get("role") != "user":
-            messages.append({"role": "user", "content": text})
+        messages: List[Dict] = list(system_msg)
+        episodic_block = allocation.get("episodic")
+        if episodic_block is not None:
+            messages.extend(episodic_block.messages)                  # Layer 2: episodic summaries
+        chosen_chunks = [b.messages[0]["content"] for b in allocation.chosen_with_prefix("chunk:")]
+        if chosen_chunks:                                             # Layer 3a: semantic DB chunks
+            chunk_text = "\n---\n".join(chosen_chunks)
+            messages.extend([
+                {"role": "user",      "content": f"<context_memory>\n{chunk_text}\n</context_memory>"},
+                {"role": "assistant", "content": "Understood — I have those context fragments."},
+            ])
+        history_block = [b.messages[0] for b in reversed(allocation.chosen_with_prefix("history:"))]
+        while history_block and history_block[0].get("role") != "user":
+            history_block.pop(0)
+        messages.extend(history_block)                                # Layer 3b: recency anchor
+        messages.extend(current_msg)
 
         # ── MCM Protocol: MITO tag injection + DCP prune ─────────────────
         if self._mcm_orch is not None:
@@ -1267,7 +1324,8 @@ class AgentKernel:
           Layer 2: Episodic store       → memory block prefix
           Layer 3: Full history         → token-aware (not a hard roll window)
         """
-        messages = self._assemble_direct_context(text, context)
+        with trace_span("context.assemble"):
+            messages = self._assemble_direct_context(text, context)
 
         try:
             # LM Studio (OpenAI-compatible)
@@ -1282,31 +1340,35 @@ class AgentKernel:
                     # Streaming implementation
                     import time as _perf_t
                     _t0 = _perf_t.perf_counter()
-                    resp = client.chat.completions.create(
-                        model=sel,
-                        messages=messages,
-                        max_tokens=-1,
-                        temperature=0.6,
-                        stream=True,
-                        extra_body={"chat_template_kwargs": {
-                            "enable_thinking": use_thinking}},
-                    )
-                    full_reply = ""
-                    in_think = False
-                    for chunk in resp:
-                        if chunk.choices[0].delta.content:
-                            delta = chunk.choices[0].delta.content
-                            full_reply += delta
-
-                            # Stream-safe thinking tag stripping (simplified)
-                            if "<think>" in delta:
-                                in_think = True
-                            if "</think>" in delta:
-                                in_think = False
-                                continue
+                    with trace_span("llm.stream", model=sel) as _llm_span:
+                        resp = client.chat.completions.create(
+                            model=sel,
+                            messages=messages,
+                            max_tokens=-1,
+                            temperature=0.6,
+                            stream=True,
+                            extra_body={"chat_template_kwargs": {
+                                "enable_thinking": use_thinking}},
+                        )
+                        full_reply = ""
+                        in_think = False
+                        for chunk in resp:
+                            if chunk.choices[0].delta.content:
+                                delta = chunk.choices[0].delta.content
+                                if not full_reply:
+                                    _llm_span.set(first_token_ms=round(
+                                        (_perf_t.perf_counter() - _t0) * 1000, 1))
+                                full_reply += delta
+
+                                # Stream-safe thinking tag stripping (simplified)
+                                if "<think>" in delta:
+                                    in_think = True
+                                if "</think>" in delta:
+                                    in_think = False
+                                    continue
 
-                            if not in_think:
-                                chunk_callback(delta)
+                                if not in_think:
+                                    chunk_callback(delta)
 
                     thinking, clean = self._parse_thinking(full_reply)
                     self._pending_thinking = thinking
@@ -2528,26 +2590,17 @@ Respond with a JSON object:
                 try:
                     logger.info(
                         "[AgentKernel] Using VPS Gateway for planning inference...")
-                    try:
-                        plan_response = asyncio.run(
-                            self._vps_gateway.infer(
-                                model=self._model_router.get_reasoning_model_id() or "lfm2-8b",
-                                prompt=planning_prompt,
-                                context={
-                                    "conversation_history": context} if context else {},
-                                params={"max_tokens": 512, "temperature": 0.2},
-                                session_id=self.session_id
-                            )
-                        )
-                        logger.info(
-                            "[AgentKernel] VPS Gateway inference complete")
-                    except RuntimeError as e:
-                        if "already running" in str(e):
-                            logger.warning(
-                                "[AgentKernel] Event loop conflict — falling back to local model")
-                            plan_response = None
-                        else:
-                            raise
+                    # Runs on the gateway's own loop, which owns its pooled clients
+                    plan_response = self._vps_gateway.infer_sync(
+                        model=self._model_router.get_reasoning_model_id() or "lfm2-8b",
+                        prompt=planning_prompt,
+                        context={
+                            "conversation_history": context} if context else {},
+                        params={"max_tokens": 512, "temperature": 0.2},
+                        session_id=self.session_id
+                    )
+                    logger.info(
+                        "[AgentKernel] VPS Gateway inference complete")
                 except TimeoutError:
                     logger.error(
                         "[AgentKernel] VPS Gateway inference timed out")
@@ -3351,25 +3404,15 @@ Provide the execution result."""
                 try:
                     logger.info(
                         "[AgentKernel] Using VPS Gateway for execution inference...")
-                    try:
-                        result_text = asyncio.run(
-                            self._vps_gateway.infer(
-                                model=self._model_router.get_execution_model_id() or "lfm2.5-1.2b-instruct",
-                                prompt=execution_prompt,
-                                context={},
-                                params={"max_tokens": 512, "temperature": 0.3},
-                                session_id=self.session_id
-                            )
-                        )
-                        logger.info(
-                            "[AgentKernel] VPS Gateway execution inference complete")
-                    except RuntimeError as e:
-                        if "already running" in str(e):
-                            logger.warning(
-                                "[AgentKernel] Event loop conflict — falling back to local model")
-                            result_text = None
-                        else:
-                            raise
+                    result_text = self._vps_gateway.infer_sync(
+                        model=self._model_router.get_execution_model_id() or "lfm2.5-1.2b-instruct",
+                        prompt=execution_prompt,
+                        context={},
+                        params={"max_tokens": 512, "temperature": 0.3},
+                        session_id=self.session_id
+                    )
+                    logger.info(
+                        "[AgentKernel] VPS Gateway execution inference complete")
                 except TimeoutError:
                     logger.error(
                         "[AgentKernel] VPS Gateway execution timed out")
@@ -3748,6 +3791,8 @@ If any tools failed, address those issues in your response.
             - single_model_mode: bool - if in fallback mode
             - error: str - initialization error if any
             - vps_gateway: dict - VPS Gateway status (enabled, available endpoints, health)
+            - context_budget: dict - last prompt allocation from context_budget
+            - context_retrieval: dict - per-source latency of the last retrieval
         """
         status = {
             "ready": False,
@@ -3756,7 +3801,11 @@ If any tools failed, address those issues in your response.
             "tool_bridge_available": False,
             "model_status": {},
             "single_model_mode": self._single_model_mode,
-            "error": self._initialization_error
+            "error": self._initialization_error,
+            # Last direct-response prompt allocation (blocks chosen/dropped)
+            "context_budget": getattr(self, "_last_context_allocation", None),
+            # Last retrieval: per-source status and latency
+            "context_retrieval": getattr(self, "_last_retrieval", None),
         }
 
         # Check model router status
@@ -4002,6 +4051,76 @@ If any tools failed, address those issues in your response.
 
 # Singleton instance management
 _agent_kernel_instances: Dict[str, AgentKernel] = {}
+# session_id → time.monotonic() of the last get_agent_kernel() for it
+_agent_kernel_last_used: Dict[str, float] = {}
+
+# Kernels are per-session state over shared services (kernel_resources), and
+# conversation history is persisted by ConversationMemory, so an evicted
+# session is rebuilt cheaply on its next message.
+AGENT_KERNEL_IDLE_TTL_S: float = 1800.0
+MAX_AGENT_KERNELS: int = 64
+
+# Sessions whose kernel is never evicted.  "default" is the startup kernel
+# main.py keeps as app.state.agent_kernel (tool bridge, main loop, launcher
+# mode); evicting it would leave the app and get_agent_kernel() holding two
+# diverging kernels for one session.
+_pinned_agent_kernels: Set[str] = {"default"}
+
+
+def pin_agent_kernel(session_id: str) -> None:
+    """Exempt a session's kernel from idle/LRU eviction (e.g. one the app holds)."""
+    _pinned_agent_kernels.add(session_id)
+
+
+def _model_config_of(kernel: AgentKernel) -> Optional[Dict[str, Any]]:
+    """The provider/model settings a new session should inherit, or None."""
+    if kernel._model_provider in (None, "uninitialized"):
+        return None
+    return {
+        "reasoning_model": kernel._selected_reasoning_model,
+        "tool_execution_model": kernel._selected_tool_execution_model,
+        "model_provider": kernel._model_provider,
+        "lmstudio_endpoint": kernel._lmstudio_endpoint,
+        "ollama_endpoint": kernel._ollama_endpoint,
+        "api_key": kernel._api_key,
+        "api_base_url": kernel._api_base_url,
+        "inprocess_local_mgr": kernel._inprocess_local_mgr,
+    }
+
+
+def _apply_model_config(kernel: AgentKernel, config: Dict[str, Any]) -> None:
+    kernel.set_model_selection(
+        reasoning_model=config["reasoning_model"],
+        tool_execution_model=config["tool_execution_model"],
+        model_provider=config["model_provider"],
+    )
+    kernel._lmstudio_endpoint = config["lmstudio_endpoint"]
+    kernel._ollama_endpoint = config["ollama_endpoint"]
+    kernel._api_key = config["api_key"]
+    kernel._api_base_url = config["api_base_url"]
+    # Without the in-process binding an inherited "iris_local" provider
+    # would fall through to the HTTP path and 404
+    kernel._inprocess_local_mgr = config["inprocess_local_mgr"]
+
+
+def _evict_idle_agent_kernels(keep: str) -> None:
+    """Drop kernels idle past AGENT_KERNEL_IDLE_TTL_S, then the least recently
+    used beyond MAX_AGENT_KERNELS.  ``keep`` (the caller's session) and pinned
+    sessions stay."""
+    now = time.monotonic()
+    by_age = sorted((t, sid) for sid, t in _agent_kernel_last_used.items()
+                    if sid != keep and sid not in _pinned_agent_kernels)
+    # Leave room for the caller's kernel if it is about to be created
+    excess = len(_agent_kernel_instances) + (keep not in _agent_kernel_instances) - MAX_AGENT_KERNELS
+    for last_used, sid in by_age:
+        if now - last_used > AGENT_KERNEL_IDLE_TTL_S or excess > 0:
+            kernel = _agent_kernel_instances.get(sid)
+            config = _model_config_of(kernel) if kernel is not None else None
+            if config is not None:
+                get_kernel_resources().model_config = config
+            cleanup_agent_kernel(sid)
+            excess -= 1
+            logger.info(f"[AgentKernel] Evicted idle kernel for session {sid}")
 
 
 def get_agent_kernel(session_id: str = "default") -> AgentKernel:
@@ -4009,6 +4128,9 @@ def get_agent_kernel(session_id: str = "default") -> AgentKernel:
     Get or create an AgentKernel instance for a session.
     Auto-wires the memory interface (Pillar 4) when a new kernel is created.
 
+    Kernels share the process-wide services in kernel_resources; idle
+    kernels are evicted (see AGENT_KERNEL_IDLE_TTL_S / MAX_AGENT_KERNELS).
+
     Args:
         session_id: Session identifier
 
@@ -4017,6 +4139,9 @@ def get_agent_kernel(session_id: str = "default") -> AgentKernel:
     """
     global _agent_kernel_instances
 
+    _evict_idle_agent_kernels(keep=session_id)
+    _agent_kernel_last_used[session_id] = time.monotonic()
+
     if session_id not in _agent_kernel_instances:
         kernel = AgentKernel(session_id=session_id)
 
@@ -4032,6 +4157,10 @@ def get_agent_kernel(session_id: str = "default") -> AgentKernel:
             logger.warning(
                 f"[AgentKernel] Memory interface not available for session {session_id}: {e}")
 
+        resources = get_kernel_resources()
+        if kernel._tool_bridge is None:
+            kernel._tool_bridge = resources.tool_bridge()
+
         # Inherit model configuration from any already-configured kernel.
         #
         # Context: the user configures a model once (in session_iris / the main UI
@@ -4041,24 +4170,23 @@ def get_agent_kernel(session_id: str = "default") -> AgentKernel:
         # returns None from _respond_direct, crashing the voice pipeline.
         #
         # We look for the first peer kernel whose provider is not the default
-        # "uninitialized" sentinel and copy its full model configuration.
+        # "uninitialized" sentinel and copy its full model configuration; if every
+        # configured kernel has been evicted, the last one's settings are used.
         if kernel._model_provider == "uninitialized":
+            source, config = "last evicted session", resources.model_config
             for peer_id, peer_kernel in _agent_kernel_instances.items():
-                if peer_kernel._model_provider not in (None, "uninitialized"):
-                    kernel.set_model_selection(
-                        reasoning_model=peer_kernel._selected_reasoning_model,
-                        tool_execution_model=peer_kernel._selected_tool_execution_model,
-                        model_provider=peer_kernel._model_provider,
-                    )
-                    # Also copy the LM Studio endpoint in case it was customised.
-                    kernel._lmstudio_endpoint = peer_kernel._lmstudio_endpoint
-                    logger.info(
-                        f"[AgentKernel] Session '{session_id}' inherited model config "
-                        f"from '{peer_id}' "
-                        f"(provider={peer_kernel._model_provider!r}, "
-                        f"model={peer_kernel._selected_reasoning_model!r})"
-                    )
+                peer_config = _model_config_of(peer_kernel)
+                if peer_config is not None:
+                    source, config = f"'{peer_id}'", peer_config
                     break
+            if config is not None:
+                _apply_model_config(kernel, config)
+                logger.info(
+                    f"[AgentKernel] Session '{session_id}' inherited model config "
+                    f"from {source} "
+                    f"(provider={config['model_provider']!r}, "
+                    f"model={config['reasoning_model']!r})"
+                )
 
         _agent_kernel_instances[session_id] = kernel
 
@@ -4077,6 +4205,7 @@ def cleanup_agent_kernel(session_id: str) -> None:
     """
     global _agent_kernel_instances
     kernel = _agent_kernel_instances.pop(session_id, None)
+    _agent_kernel_last_used.pop(session_id, None)
     if kernel is not None:
         try:
             # Shut down VPS Gateway if it was active
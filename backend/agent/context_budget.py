@@ -0,0 +1,193 @@
+"""
+Context budget — value-density selection of prompt blocks.
+
+AgentKernel._assemble_direct_context used to concatenate the system prompt,
+the episodic memory block, retrieved context chunks and the chat history in
+a fixed order and trim the history with a chars/4 estimate.  Whatever came
+first kept its place even when it was barely relevant, and the estimate was
+wrong enough for code or non-English text to overflow small windows.
+
+Here every candidate is a ContextBlock with a token cost (from the loaded
+model's tokenizer when there is one) and a value in [0, 1] taken from what
+retrieval already knows: cosine/resonance scores for memories, the combined
+similarity+recency score for chunks, recency for history turns.
+select_blocks() fills the budget greedily by value per token — the
+knapsack density ordering, which misses the optimum by at most one block's
+value when blocks are small next to the window:
+
+  - required blocks (system prompt, current user turn) are always taken
+  - a block with ``after`` is only eligible once that block is chosen, so
+    history stays a contiguous run back from the newest turn
+  - a block with ``frame`` shares an overhead block (e.g. the wrapper around
+    retrieved chunks): the frame's tokens are charged to the first block
+    that needs it, and the frame is left out when none is chosen
+  - the budget is the model's context window minus the tokens reserved for
+    generation (AgentKernel reserves a quarter of the window, capped)
+
+The resulting BudgetAllocation lists what was chosen and dropped, with
+costs and values, for debugging (AgentKernel.get_status()["context_budget"]).
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Chat-template framing per message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokenizer-free estimate: ~4 UTF-8 bytes per token.
+
+    Counting bytes rather than characters keeps non-ASCII text (about one
+    token per CJK character) from being underestimated fourfold.
+    """
+    if not text:
+        return 0
+    return (len(text.encode("utf-8", "ignore")) + 3) // 4
+
+
+class TokenCounter:
+    """Token counts for prompt text, exact when given the model's tokenizer.
+
+    ``tokenize`` maps text to a token count (e.g. a wrapper around
+    llama_cpp.Llama.tokenize).  Counts are cached by content hash because the
+    same history messages are counted again on every turn.
+    """
+
+    def __init__(self, tokenize: Optional[Callable[[str], int]] = None, cache_size: int = 2048):
+        self._tokenize = tokenize
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._cache_size = cache_size
+
+    @property
+    def exact(self) -> bool:
+        return self._tokenize is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._tokenize is None:
+            return estimate_tokens(text)
+        key = hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        try:
+            n = int(self._tokenize(text))
+        except Exception as e:
+            logger.debug(f"[ContextBudget] tokenizer failed, estimating: {e}")
+            return estimate_tokens(text)
+        self._cache[key] = n
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return n
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.count(m.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+@dataclass
+class ContextBlock:
+    """One candidate piece of the prompt."""
+
+    name: str
+    messages: List[Dict[str, Any]]
+    tokens: int
+    value: float = 0.0
+    required: bool = False
+    after: Optional[str] = None     # only selectable once this block is chosen
+    frame: Optional[str] = None     # overhead block charged with the first user of it
+
+    @property
+    def density(self) -> float:
+        return self.value / max(1, self.tokens)
+
+
+@dataclass
+class BudgetAllocation:
+    """Outcome of select_blocks(): chosen blocks in input order, and the rest."""
+
+    window: int
+    reserved: int
+    budget: int
+    exact_tokens: bool
+    chosen: List[ContextBlock] = field(default_factory=list)
+    dropped: List[ContextBlock] = field(default_factory=list)
+
+    @property
+    def used(self) -> int:
+        return sum(b.tokens for b in self.chosen)
+
+    def get(self, name: str) -> Optional[ContextBlock]:
+        for block in self.chosen:
+            if block.name == name:
+                return block
+        return None
+
+    def chosen_with_prefix(self, prefix: str) -> List[ContextBlock]:
+        return [b for b in self.chosen if b.name.startswith(prefix)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def row(b: ContextBlock) -> Dict[str, Any]:
+            return {"name": b.name, "tokens": b.tokens, "value": round(b.value, 3),
+                    "required": b.required}
+        return {
+            "window": self.window,
+            "reserved": self.reserved,
+            "budget": self.budget,
+            "used": self.used,
+            "value": round(sum(b.value for b in self.chosen), 3),
+            "exact_tokens": self.exact_tokens,
+            "chosen": [row(b) for b in self.chosen],
+            "dropped": [row(b) for b in self.dropped],
+        }
+
+
+def select_blocks(blocks: List[ContextBlock], window: int, reserved: int,
+                  budget: Optional[int] = None, exact_tokens: bool = False) -> BudgetAllocation:
+    """Choose blocks by value density under ``budget`` (default window − reserved)."""
+    if budget is None:
+        budget = window - reserved
+    budget = max(0, min(budget, window - reserved))
+    chosen = {b.name for b in blocks if b.required}
+    remaining = budget - sum(b.tokens for b in blocks if b.required)
+    if remaining < 0:
+        logger.warning(f"[ContextBudget] required blocks exceed the budget by {-remaining} tokens")
+
+    by_name = {b.name: b for b in blocks}
+    frames = {b.frame for b in blocks if b.frame}
+
+    def cost(b: ContextBlock) -> int:
+        if b.frame and b.frame not in chosen and b.frame in by_name:
+            return b.tokens + by_name[b.frame].tokens
+        return b.tokens
+
+    rejected = set()
+    while True:
+        eligible = [b for b in blocks
+                    if b.name not in chosen and b.name not in rejected
+                    and b.name not in frames
+                    and (b.after is None or b.after in chosen)]
+        if not eligible:
+            break
+        best = max(eligible, key=lambda b: b.value / max(1, cost(b)))
+        best_cost = cost(best)
+        if best_cost <= remaining:
+            chosen.add(best.name)
+            if best.frame in by_name:
+                chosen.add(best.frame)
+            remaining -= best_cost
+        else:
+            rejected.add(best.name)
+
+    allocation = BudgetAllocation(window=window, reserved=reserved, budget=budget,
+                                  exact_tokens=exact_tokens)
+    for block in blocks:
+        (allocation.chosen if block.name in chosen else allocation.dropped).append(block)
+    return allocation
@@ -0,0 +1,109 @@
+"""
+KernelResources — process-wide services shared by every session's AgentKernel.
+
+get_agent_kernel() keeps one AgentKernel per session.  Each used to build
+its own ModelRouter (and with it its own copy of any lazily loaded local
+models), its own DER classifier and mode detector, and its own OpenAI HTTP
+client, so memory grew with every session and the first message of a new
+session paid for a fresh client and a cold connection pool.
+
+A kernel is now per-session state only — conversation history, provider and
+model selection, personality and mode flags — on top of this pool:
+
+  - one ModelRouter per agent config path (models load once per process)
+  - one stateless TaskClassifier and ModeDetector
+  - one OpenAI client per (base_url, api_key), so sessions on the same
+    endpoint share a warm httpx connection pool
+  - the AgentToolBridge singleton, once something has created it
+  - the model configuration of the last evicted kernel, so a session
+    created after every configured kernel went idle still inherits it
+
+Components that hold the kernel itself or a session id (Reviewer,
+TrailingDirector, MCMOrchestrator, ConversationMemory) stay per session.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class KernelResources:
+    """Lazily created heavy services shared across AgentKernel instances."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._model_routers: Dict[str, Any] = {}
+        self._openai_clients: Dict[Tuple[str, str], Any] = {}
+        self._task_classifier: Any = None
+        self._mode_detector: Any = None
+        # Model configuration carried over from the last evicted kernel
+        self.model_config: Optional[Dict[str, Any]] = None
+
+    def model_router(self, config_path: str) -> Any:
+        """The ModelRouter for ``config_path``, created UNINITIALIZED on first use."""
+        with self._lock:
+            router = self._model_routers.get(config_path)
+            if router is None:
+                from .model_router import InferenceMode, ModelRouter
+                router = ModelRouter(config_path, inference_mode=InferenceMode.UNINITIALIZED)
+                self._model_routers[config_path] = router
+            return router
+
+    def task_classifier(self) -> Any:
+        with self._lock:
+            if self._task_classifier is None:
+                from backend.memory.mycelium.kyudo import TaskClassifier
+                self._task_classifier = TaskClassifier()
+            return self._task_classifier
+
+    def mode_detector(self) -> Any:
+        with self._lock:
+            if self._mode_detector is None:
+                from .mode_detector import ModeDetector
+                self._mode_detector = ModeDetector()
+            return self._mode_detector
+
+    def openai_client(self, base_url: str, api_key: str) -> Any:
+        """A shared OpenAI-compatible client for this endpoint and key."""
+        key = (base_url, api_key)
+        with self._lock:
+            client = self._openai_clients.get(key)
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(base_url=base_url, api_key=api_key)
+                self._openai_clients[key] = client
+                logger.debug(f"[KernelResources] Created OpenAI client → {base_url}")
+            return client
+
+    def tool_bridge(self) -> Any:
+        """The AgentToolBridge singleton if it exists yet (never creates it)."""
+        try:
+            from . import tool_bridge
+        except Exception:
+            return None
+        return tool_bridge._agent_tool_bridge
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "model_routers": len(self._model_routers),
+            "loaded_models": sum(len(getattr(r, "models", {}) or {})
+                                 for r in self._model_routers.values()),
+            "openai_clients": len(self._openai_clients),
+            "has_model_config": self.model_config is not None,
+        }
+
+
+_resources: Optional[KernelResources] = None
+_resources_lock = threading.Lock()
+
+
+def get_kernel_resources() -> KernelResources:
+    """The process-wide KernelResources instance."""
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = KernelResources()
+    return _resources
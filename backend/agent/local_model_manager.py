@@ -17,7 +17,10 @@ Two load paths coexist, selected by the IRIS_INPROCESS_LLAMA env var
   path is verified end-to-end; scheduled for deletion after V1–V3 pass.
 
 Neither path auto-loads at startup — both only activate when the user
-picks a model from the ModelsScreen.
+picks a model from the ModelsScreen.  With ``IRIS_MODEL_PRELOAD=1`` the
+in-process path preloads the likeliest model as a warm *standby* in the
+background (see model_residency.py); load_model() then swaps it in under
+the inference lock instead of loading from disk.
 """
 import asyncio
 import atexit
@@ -32,6 +35,7 @@ import struct
 import subprocess
 import sys
 import threading
+import time
 from multiprocessing import cpu_count
 from pathlib import Path
 from types import SimpleNamespace
@@ -39,6 +43,10 @@ from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional
 
 import httpx
 
+from backend.agent.model_inventory import ModelInventory, estimate_footprint
+from backend.agent.model_residency import ModelResidency, ResidentModel
+from backend.monitoring.tracing import span as trace_span
+
 # ── Hardware detection (import-guarded, matches audio/model_manager.py pattern) ──
 try:
     import psutil
@@ -169,6 +177,13 @@ PROFILES: Dict[str, Dict[str, Any]] = {
 # Split GGUF filename pattern: model-00001-of-00003.gguf
 _SPLIT_SUFFIX_PART = "-of-"
 
+# general.file_type (llama_ftype) → quantization name
+_GGUF_FILE_TYPES: Dict[int, str] = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1",
+    10: "Q2_K", 11: "Q3_K_S", 12: "Q3_K_M", 13: "Q3_K_L", 14: "Q4_K_S",
+    15: "Q4_K_M", 16: "Q5_K_S", 17: "Q5_K_M", 18: "Q6_K", 32: "BF16",
+}
+
 # ── GGML type string → llama_cpp integer constant ─────────────────────────
 # Kept module-scope so _load_inprocess and _build_server_cmd share one source
 # of truth. Values mirror llama_cpp.GGML_TYPE_* (verified against
@@ -197,7 +212,7 @@ class LocalModelManager:
     Port 8082, OpenAI-compatible API.
 
     Loading contract:
-      - NEVER auto-loads at startup
+      - NEVER auto-loads at startup (IRIS_MODEL_PRELOAD=1 only prepares a standby)
       - Only spawns subprocess when user calls load_model()
       - Registers atexit + SIGTERM cleanup to kill subprocess on backend exit
     """
@@ -218,6 +233,7 @@ class LocalModelManager:
         MODELS_DIR = _iris_fallback
 
     SETTINGS_FILE = _iris_fallback / ".iris_model_settings.json"
+    INDEX_FILE = _iris_fallback / ".iris_model_index.json"
 
     def __init__(self) -> None:
         # Always ensure the IRIS fallback dir exists for downloads
@@ -236,9 +252,14 @@ class LocalModelManager:
         self._lock = threading.Lock()
         # [10.6] Async lock — prevents concurrent load_model() calls racing
         self._load_lock: Optional[asyncio.Lock] = None
-        # Metadata cache: key = "path::mtime" -> parsed GGUF metadata dict
-        # Persists across calls — only re-parsed when file changes (mtime check)
-        self._metadata_cache: Dict[str, Dict[str, Any]] = {}
+        # Persistent GGUF header index (see model_inventory.py) — created on
+        # first scan; headers are only re-parsed when a file changes
+        self._inventory: Optional[ModelInventory] = None
+        # Warm standby model + load/swap timings (see model_residency.py)
+        self._residency = ModelResidency(self._construct_llama, self._standby_fits,
+                                         self._residency_key)
+        # Model picked in the UI but not loaded yet — the likeliest next load
+        self._selected_model: Optional[Dict[str, Any]] = None
         # Hardware info cache — invalidated on model load/unload (VRAM changes)
         self._hw_cache: Optional[Dict[str, Any]] = None
         self._hw_cache_time: float = 0.0
@@ -285,12 +306,16 @@ class LocalModelManager:
         the subprocess path while the in-process implementation is verified."""
         return os.environ.get("IRIS_INPROCESS_LLAMA", "1") != "0"
 
-    def _build_llama_ctor_kwargs(self, model_path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_llama_ctor_kwargs(self, model_path: str, params: Dict[str, Any],
+                                 warn: bool = True) -> Dict[str, Any]:
         """Map a PROFILES dict into ``Llama(**kwargs)`` form.
 
         Handles the fork split:
           * Stock llama-cpp-python → ``type_k`` / ``type_v`` = GGML int
           * RotorQuant fork       → ``cache_type_k`` / ``cache_type_v`` = string
+
+        ``warn=False`` skips the missing-fork warning, for callers that only
+        compare kwargs (the residency key) rather than build a model.
         """
         ctor: Dict[str, Any] = {
             "model_path": str(model_path),
@@ -316,7 +341,7 @@ class LocalModelManager:
                     ctor["cache_type_k"] = k_name
                 if v_name:
                     ctor["cache_type_v"] = v_name
-            else:
+            elif warn:
                 logger.warning(
                     f"[LocalModelManager] Profile requested RotorQuant KV "
                     f"'{k_name}/{v_name}' but llama-cpp-turboquant fork not "
@@ -385,11 +410,12 @@ class LocalModelManager:
     ) -> bool:
         """Construct a `llama_cpp.Llama` on a thread executor (no subprocess).
 
-        Returns True when the instance is ready for inference. Emits
+        Returns True when the instance is built, warmed up with a one-token
+        generation and ready for inference. Emits
         synthetic progress events via progress_cb (Llama itself gives none).
         """
         try:
-            from llama_cpp import Llama
+            from llama_cpp import Llama  # noqa: F401 — availability probe
         except ImportError as exc:
             logger.error(f"[LocalModelManager] llama-cpp-python not importable: {exc}")
             if progress_cb:
@@ -402,28 +428,13 @@ class LocalModelManager:
                     pass
             return False
 
-        # Re-detect in case the env changed since __init__ (e.g. fork was just
-        # installed). Cheap — one inspect.signature call.
-        try:
-            self._rotorquant_available = (
-                "cache_type_k" in inspect.signature(Llama.__init__).parameters
-            )
-        except Exception:
-            pass
-
-        ctor = self._build_llama_ctor_kwargs(model_path, params)
-        logger.info(
-            f"[LocalModelManager] Loading in-process: "
-            f"model={Path(model_path).name} n_ctx={ctor.get('n_ctx')} "
-            f"n_gpu_layers={ctor.get('n_gpu_layers')} "
-            f"flash_attn={ctor.get('flash_attn')} "
-            f"rotorquant={self._rotorquant_available}"
-        )
-
         await self._start_progress_heartbeat(progress_cb)
         loop = asyncio.get_running_loop()
         try:
-            llm = await loop.run_in_executor(None, lambda: Llama(**ctor))
+            # Construct + one-token warm-up, so the first real request is not
+            # the one that pays for CUDA kernel and KV cache initialisation
+            model = await loop.run_in_executor(
+                None, lambda: self._residency.load(model_path, params))
         except Exception as exc:
             logger.exception(f"[LocalModelManager] In-process Llama construction failed: {exc}")
             if progress_cb:
@@ -439,12 +450,13 @@ class LocalModelManager:
         finally:
             self._stop_progress_heartbeat()
 
-        self._llm = llm
+        self._llm = model.llm
         self._current_model_path = model_path
         self._current_params = params
         logger.info(
             f"[LocalModelManager] In-process Llama ready "
-            f"(model={Path(model_path).name}, ctx={ctor.get('n_ctx')})"
+            f"(model={Path(model_path).name}, ctx={params.get('n_ctx', 8192)}, "
+            f"load {model.load_s:.1f}s, warm-up {model.warmup_s:.2f}s)"
         )
         if progress_cb:
             try:
@@ -453,6 +465,183 @@ class LocalModelManager:
                 pass
         return True
 
+    # ─────────────────────────────────────────────────────────────────────────
+    # Model residency — warm standby, predictive preload, atomic swap
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _construct_llama(self, model_path: str, params: Dict[str, Any]) -> Any:
+        """Build a `llama_cpp.Llama` on the calling thread (executor or preload thread)."""
+        from llama_cpp import Llama
+
+        # Re-detect in case the env changed since __init__ (e.g. fork was just
+        # installed). Cheap — one inspect.signature call.
+        try:
+            self._rotorquant_available = (
+                "cache_type_k" in inspect.signature(Llama.__init__).parameters
+            )
+        except Exception:
+            pass
+
+        ctor = self._build_llama_ctor_kwargs(model_path, params)
+        logger.info(
+            f"[LocalModelManager] Loading in-process: "
+            f"model={Path(model_path).name} n_ctx={ctor.get('n_ctx')} "
+            f"n_gpu_layers={ctor.get('n_gpu_layers')} "
+            f"flash_attn={ctor.get('flash_attn')} "
+            f"rotorquant={self._rotorquant_available}"
+        )
+        return Llama(**ctor)
+
+    def _residency_key(self, model_path: str, params: Dict[str, Any]) -> str:
+        # Two loads are interchangeable when they would build the same Llama
+        return json.dumps(self._build_llama_ctor_kwargs(model_path, params, warn=False),
+                          sort_keys=True)
+
+    def _footprint(self, model_path: str, params: Dict[str, Any]) -> Dict[str, float]:
+        record = self._inventory.get(model_path) if self._inventory is not None else None
+        size_bytes = record["size_bytes"] if record else Path(model_path).stat().st_size
+        return estimate_footprint(record["meta"] if record else {}, size_bytes, params)
+
+    def _standby_fits(self, model_path: str, params: Dict[str, Any]) -> bool:
+        """
+        Whether a second model fits beside the active one.
+
+        Unlike the pre-flight check this fails closed — a standby is only an
+        optimisation and must never push the active model out of VRAM.  VRAM
+        is budgeted from the total minus the active model's estimate, since
+        torch does not see llama.cpp allocations.
+        """
+        try:
+            need = self._footprint(model_path, params)
+            active = {"vram_gb": 0.0}
+            if self._llm is not None and self._current_model_path:
+                active = self._footprint(self._current_model_path, self._current_params)
+            hw = self.get_hardware_info()
+            if hw.get("cuda_available") and need["vram_gb"] > 0:
+                vram_budget = hw.get("vram_total_gb", 0.0) * 0.92 - active["vram_gb"]
+                if need["vram_gb"] > vram_budget:
+                    return False
+                ram_needed = need["ram_gb"]
+            else:
+                ram_needed = need["weights_gb"] + need["kv_cache_gb"]
+            if not PSUTIL_AVAILABLE:
+                return False
+            ram_free = psutil.virtual_memory().available / (1024 ** 3)
+            return ram_needed <= ram_free * 0.85
+        except Exception as e:
+            logger.debug(f"[LocalModelManager] Standby budget check failed: {e}")
+            return False
+
+    async def _swap_in(self, model: ResidentModel, profile: str) -> None:
+        """Make a warm standby the active model.
+
+        The switch happens under `_inference_lock`: a generation already
+        running finishes on the old model, the next one starts on the new.
+        The displaced model stays resident as the standby if it still fits.
+        """
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        # Acquired off the event loop — a long generation may hold it
+        await loop.run_in_executor(None, self._inference_lock.acquire)
+        try:
+            previous = (self._current_model_path, self._current_params, self._llm)
+            self._llm = model.llm
+            with self._lock:
+                self._current_model_path = model.path
+                self._current_params = model.params
+            self._current_profile = profile
+        finally:
+            self._inference_lock.release()
+        swap_s = time.perf_counter() - t0
+        self._residency.record_swap(swap_s)
+        logger.info(f"[LocalModelManager] Swapped in warm standby {Path(model.path).name} "
+                    f"in {swap_s * 1000:.1f} ms")
+
+        prev_path, prev_params, prev_llm = previous
+        kept = prev_llm is not None and prev_path and self._residency.offer(
+            prev_path, prev_params, prev_llm)
+        del previous, prev_llm
+        if not kept:
+            gc.collect()
+        self._invalidate_hw_cache()
+
+    def select_model(self, model_path: str, profile: str = "balanced",
+                     custom_params: Dict[str, Any] = None) -> bool:
+        """
+        Record the model highlighted in the UI picker and start preloading it.
+        Returns True if a background preload was started.
+        """
+        self._selected_model = {"path": model_path, "profile": profile,
+                                "custom_params": custom_params or {}}
+        if model_path == self._current_model_path:
+            return False
+        return self.preload_model(model_path, profile, custom_params)
+
+    def preload_model(self, model_path: str, profile: str = "balanced",
+                      custom_params: Dict[str, Any] = None) -> bool:
+        """Load a model as the warm standby in the background, if the budget allows."""
+        if not self._inprocess_enabled() or not Path(model_path).exists():
+            return False
+        params = self.get_profile_params(
+            self._resolve_profile_for_environment(profile), custom_params or {})
+        return self._residency.preload(model_path, params)
+
+    def _launcher_default_model(self) -> Optional[str]:
+        """IRIS_DEFAULT_MODEL, else `default_model` in the launcher's data/iris_config.json."""
+        path = os.environ.get("IRIS_DEFAULT_MODEL")
+        if not path:
+            try:
+                cfg = json.loads((IRISVOICE_ROOT / "data" / "iris_config.json").read_text(encoding="utf-8"))
+                path = cfg.get("default_model")
+            except (OSError, ValueError):
+                return None
+        if path and not Path(path).is_absolute():
+            path = str(self.MODELS_DIR / path)
+        return path or None
+
+    def predict_next_model(self) -> Optional[Dict[str, Any]]:
+        """
+        The model most likely to be loaded next, other than the active one:
+        the UI picker selection, then the launcher default, then the most
+        recently loaded model.  Returns {path, profile, custom_params} or None.
+        """
+        settings = self.load_model_settings()
+        candidates: List[Dict[str, Any]] = []
+        if self._selected_model:
+            candidates.append(self._selected_model)
+        default = self._launcher_default_model()
+        if default:
+            saved = settings.get(Path(default).name, {})
+            candidates.append({"path": default,
+                               "profile": saved.get("last_profile", "balanced"),
+                               "custom_params": {}})
+        recent = sorted(
+            (s for s in settings.values() if isinstance(s, dict) and s.get("last_path")),
+            key=lambda s: s.get("last_loaded_at", 0), reverse=True)
+        for saved in recent:
+            candidates.append({
+                "path": saved["last_path"],
+                "profile": saved.get("last_profile", "balanced"),
+                "custom_params": {"n_ctx": saved.get("last_ctx", 8192),
+                                  "n_gpu_layers": saved.get("last_gpu_layers", -1)},
+            })
+        for candidate in candidates:
+            if candidate["path"] != self._current_model_path and Path(candidate["path"]).exists():
+                return candidate
+        return None
+
+    def preload_predicted(self) -> bool:
+        """Preload predict_next_model() when IRIS_MODEL_PRELOAD=1 (off by default)."""
+        if os.environ.get("IRIS_MODEL_PRELOAD", "0") != "1":
+            return False
+        if self._residency.occupied:
+            return False        # never evict a standby for a guess
+        candidate = self.predict_next_model()
+        if candidate is None:
+            return False
+        return self.preload_model(candidate["path"], candidate["profile"],
+                                  candidate["custom_params"])
+
     def create_chat_completion(self, **kwargs) -> Dict[str, Any]:
         """Synchronous wrapper around `Llama.create_chat_completion`.
 
@@ -471,8 +660,11 @@ class LocalModelManager:
         if kwargs.get("stream"):
             # Collapse to the streaming generator; caller decides what to do.
             return self.create_chat_completion_stream(**kwargs)  # type: ignore[return-value]
+        waiting = trace_span("inference.lock_wait")
         with self._inference_lock:
-            return self._llm.create_chat_completion(**_sanitise_completion_kwargs(kwargs))
+            waiting.end()
+            with trace_span("inference.generate"):
+                return self._llm.create_chat_completion(**_sanitise_completion_kwargs(kwargs))
 
     def create_chat_completion_stream(self, **kwargs) -> Iterator[Dict[str, Any]]:
         """Token-by-token generator. Holds `_inference_lock` for the whole run.
@@ -485,9 +677,17 @@ class LocalModelManager:
             raise RuntimeError("LocalModelManager: no in-process model loaded")
         kwargs = _sanitise_completion_kwargs(kwargs)
         kwargs["stream"] = True
+        # Spans are ended explicitly: a generator must not leave a contextvar
+        # set across its yields.
+        waiting = trace_span("inference.lock_wait")
         with self._inference_lock:
-            for chunk in self._llm.create_chat_completion(**kwargs):
-                yield chunk
+            waiting.end()
+            generating = trace_span("inference.generate", stream=True)
+            try:
+                for chunk in self._llm.create_chat_completion(**kwargs):
+                    yield chunk
+            finally:
+                generating.end()
 
     def get_inprocess_client(self) -> Optional["InProcessOpenAIAdapter"]:
         """Return an OpenAI-client shim bound to this manager, or None if no
@@ -504,6 +704,24 @@ class LocalModelManager:
             return None
         return InProcessOpenAIAdapter(self)
 
+    def count_tokens(self, text: str) -> Optional[int]:
+        """Prompt tokens for ``text`` per the loaded model's tokenizer, or None if none is loaded."""
+        llm = self._llm
+        if llm is None:
+            return None
+        return len(llm.tokenize(text.encode("utf-8", "ignore"), add_bos=False, special=True))
+
+    def context_window(self) -> Optional[int]:
+        """n_ctx of the loaded in-process model, or None if none is loaded."""
+        llm = self._llm
+        if llm is None:
+            return None
+        try:
+            return int(llm.n_ctx())
+        except Exception:
+            n_ctx = self._current_params.get("n_ctx")
+            return int(n_ctx) if n_ctx else None
+
     # ─────────────────────────────────────────────────────────────────────────
     # Hardware info
     # ─────────────────────────────────────────────────────────────────────────
@@ -575,25 +793,34 @@ class LocalModelManager:
     # Model scanning
     # ─────────────────────────────────────────────────────────────────────────
 
+    def get_model_inventory(self) -> ModelInventory:
+        """The persistent GGUF index for MODELS_DIR, watching the directory once created."""
+        if self._inventory is None:
+            with self._lock:
+                if self._inventory is None:
+                    inventory = ModelInventory(
+                        self.MODELS_DIR, self.INDEX_FILE, self.parse_gguf_metadata, PROFILES)
+                    inventory.watch()
+                    self._inventory = inventory
+        return self._inventory
+
     def scan_models(self) -> List[Dict[str, Any]]:
         """
-        Walk MODELS_DIR for *.gguf files.
+        List the *.gguf files under MODELS_DIR from the model inventory.
         Groups split-shard files (model-00001-of-NNNNN.gguf) under one entry.
         Returns list of model dicts with metadata.
+
+        Header metadata comes from the persisted index; the directory is only
+        re-walked when the watcher saw a change (or the index went stale).
         """
         settings = self.load_model_settings()
         seen_bases: Dict[str, Dict[str, Any]] = {}  # base_name -> entry
 
-        for gguf_path in sorted(self.MODELS_DIR.rglob("*.gguf")):
+        for record in self.get_model_inventory().entries():
+            gguf_path = Path(record["path"])
             filename = gguf_path.name
             stem = gguf_path.stem  # without .gguf
 
-            # Stat the file once — used for both size and cache key
-            try:
-                st = gguf_path.stat()
-            except OSError:
-                continue
-
             # Detect split shards (e.g., model-00001-of-00003)
             is_shard = False
             shard_idx = 0
@@ -616,22 +843,10 @@ class LocalModelManager:
                 seen_bases[base_stem]["shard_count"] = seen_bases[base_stem].get("shard_count", 1) + 1
                 continue
 
-            # Metadata cache: key = "path::mtime" — avoids re-parsing unchanged files.
-            # First call is slow (reads GGUF headers). Subsequent calls are instant.
-            cache_key = f"{gguf_path}::{st.st_mtime}"
-            if cache_key in self._metadata_cache:
-                meta = self._metadata_cache[cache_key]
-            else:
-                try:
-                    meta = self.parse_gguf_metadata(gguf_path)
-                except Exception as e:
-                    logger.debug(f"[LocalModelManager] Could not parse GGUF header for {filename}: {e}")
-                    meta = {}
-                self._metadata_cache[cache_key] = meta
-
-            size_gb = round(st.st_size / (1024 ** 3), 2)
+            meta = record["meta"]
+            size_gb = round(record["size_bytes"] / (1024 ** 3), 2)
             quant = meta.get("quantization") or self._quant_from_filename(stem)
-            vram_est = self.estimate_vram_gb(meta) if meta.get("params_b") else 0.0
+            vram_est = self.estimate_vram_gb({**meta, "quantization": quant}) if meta.get("params_b") else 0.0
 
             model_settings = settings.get(filename, {})
 
@@ -643,8 +858,11 @@ class LocalModelManager:
                 "architecture": meta.get("architecture", "unknown"),
                 "params_b": meta.get("params_b", 0),
                 "native_ctx": meta.get("context_length", 0),
+                "n_layers": meta.get("n_layers", 0),
                 "quantization": quant,
                 "vram_estimate_gb": round(vram_est, 1),
+                "footprint": record["footprint"],
+                "last_tps": record.get("last_tps"),
                 "loaded": self._current_model_path == str(gguf_path),
                 "pinned": model_settings.get("pinned", False),
                 "last_profile": model_settings.get("last_profile", "balanced"),
@@ -662,41 +880,63 @@ class LocalModelManager:
     def parse_gguf_metadata(self, path: Path) -> Dict[str, Any]:
         """
         Read GGUF binary header to extract architecture, parameter count,
-        context length, and quantization type.
+        context length, quantization type and attention shape (layers, KV
+        heads, head dim — enough to size the KV cache).
 
         GGUF format:
           magic (4 bytes) + version (uint32) + tensor_count (uint64) +
           metadata_kv_count (uint64) + kv pairs
+        Only the header is read; large arrays (tokenizer vocab) are skipped
+        with seeks.
         """
         meta: Dict[str, Any] = {}
         GGUF_MAGIC = b"GGUF"
+        ARRAY_TYPE = 9
         STRING_TYPE = 8
-        UINT32_TYPE = 4
-        UINT64_TYPE = 7
+        # GGUF value type → struct format (spec: ggml/docs/gguf.md)
+        scalar_fmt = {
+            0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i",
+            6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d",
+        }
 
         def read_str(f: io.RawIOBase) -> str:
             length = struct.unpack("<Q", f.read(8))[0]
             return f.read(length).decode("utf-8", errors="replace")
 
-        def read_value(f: io.RawIOBase, vtype: int) -> Any:
-            if vtype == 4:    return struct.unpack("<I", f.read(4))[0]   # uint32
-            elif vtype == 5:  return struct.unpack("<i", f.read(4))[0]   # int32
-            elif vtype == 6:  return struct.unpack("<f", f.read(4))[0]   # float32
-            elif vtype == 7:  return struct.unpack("<Q", f.read(8))[0]   # uint64
-            elif vtype == 8:  return read_str(f)                          # string
-            elif vtype == 10: return struct.unpack("<q", f.read(8))[0]   # int64
-            elif vtype == 11: return struct.unpack("<d", f.read(8))[0]   # float64
-            elif vtype == 1:  return struct.unpack("<?", f.read(1))[0]   # bool
-            elif vtype == 2:  return struct.unpack("<B", f.read(1))[0]   # uint8
-            elif vtype == 3:  return struct.unpack("<H", f.read(2))[0]   # uint16
-            elif vtype == 9:
-                # array: elem_type (uint32) + count (uint64) + elements
+        def skip_value(f: io.RawIOBase, vtype: int) -> None:
+            if vtype in scalar_fmt:
+                f.seek(struct.calcsize(scalar_fmt[vtype]), 1)
+            elif vtype == STRING_TYPE:
+                f.seek(struct.unpack("<Q", f.read(8))[0], 1)
+            elif vtype == ARRAY_TYPE:
                 elem_type = struct.unpack("<I", f.read(4))[0]
                 count = struct.unpack("<Q", f.read(8))[0]
-                return [read_value(f, elem_type) for _ in range(min(count, 16))]
+                skip_array(f, elem_type, count)
             else:
                 raise ValueError(f"Unknown GGUF value type: {vtype}")
 
+        def skip_array(f: io.RawIOBase, elem_type: int, count: int) -> None:
+            if elem_type in scalar_fmt:
+                f.seek(count * struct.calcsize(scalar_fmt[elem_type]), 1)
+            else:
+                for _ in range(count):
+                    skip_value(f, elem_type)
+
+        def read_value(f: io.RawIOBase, vtype: int) -> Any:
+            if vtype in scalar_fmt:
+                fmt = scalar_fmt[vtype]
+                return struct.unpack(fmt, f.read(struct.calcsize(fmt)))[0]
+            if vtype == STRING_TYPE:
+                return read_str(f)
+            if vtype == ARRAY_TYPE:
+                # array: elem_type (uint32) + count (uint64) + elements; keep the first 16
+                elem_type = struct.unpack("<I", f.read(4))[0]
+                count = struct.unpack("<Q", f.read(8))[0]
+                head = [read_value(f, elem_type) for _ in range(min(count, 16))]
+                skip_array(f, elem_type, max(0, count - 16))
+                return head
+            raise ValueError(f"Unknown GGUF value type: {vtype}")
+
         with open(path, "rb") as f:
             magic = f.read(4)
             if magic != GGUF_MAGIC:
@@ -707,27 +947,48 @@ class LocalModelManager:
             _tensor_count = struct.unpack("<Q", f.read(8))[0]
             kv_count = struct.unpack("<Q", f.read(8))[0]
 
-            arch = "unknown"
-            for _ in range(min(kv_count, 256)):
+            fields: Dict[str, Any] = {}
+            for _ in range(min(kv_count, 512)):
                 try:
                     key = read_str(f)
                     vtype = struct.unpack("<I", f.read(4))[0]
-                    val = read_value(f, vtype)
+                    if key.startswith("tokenizer.") and vtype == ARRAY_TYPE:
+                        skip_value(f, vtype)     # vocab / merges — never needed
+                        continue
+                    fields[key] = read_value(f, vtype)
                 except Exception:
                     break
 
-                if key == "general.architecture" and isinstance(val, str):
-                    arch = val
-                    meta["architecture"] = val
-                elif key == "general.parameter_count" and isinstance(val, int):
-                    meta["params_b"] = round(val / 1e9, 1)
-                elif key == "general.quantization_version":
-                    pass  # not the quant name, skip
-                elif key.endswith(".context_length") and isinstance(val, int):
-                    meta["context_length"] = val
-                elif key == "general.name" and isinstance(val, str):
-                    meta["model_name"] = val
-
+        arch = fields.get("general.architecture")
+        if isinstance(arch, str):
+            meta["architecture"] = arch
+        if isinstance(fields.get("general.name"), str):
+            meta["model_name"] = fields["general.name"]
+        if isinstance(fields.get("general.parameter_count"), int):
+            meta["params_b"] = round(fields["general.parameter_count"] / 1e9, 1)
+        quant = _GGUF_FILE_TYPES.get(fields.get("general.file_type"))
+        if quant:
+            meta["quantization"] = quant
+
+        def arch_int(suffix: str) -> Optional[int]:
+            value = fields.get(f"{arch}.{suffix}")
+            if isinstance(value, list):       # per-layer values (e.g. head_count_kv)
+                value = max(value) if value else None
+            return int(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+        for suffix, name in (
+            ("context_length", "context_length"),
+            ("block_count", "n_layers"),
+            ("embedding_length", "n_embd"),
+            ("attention.head_count", "n_heads"),
+            ("attention.head_count_kv", "n_kv_heads"),
+            ("attention.key_length", "head_dim"),
+        ):
+            value = arch_int(suffix) if arch else None
+            if value:
+                meta[name] = value
+        if "head_dim" not in meta and meta.get("n_embd") and meta.get("n_heads"):
+            meta["head_dim"] = meta["n_embd"] // meta["n_heads"]
         return meta
 
     def _quant_from_filename(self, stem: str) -> str:
@@ -856,14 +1117,17 @@ class LocalModelManager:
             if not path.exists():
                 return f"Model file not found: {model_path}"
 
-            file_gb = path.stat().st_size / (1024 ** 3)
+            size_bytes = path.stat().st_size
+            file_gb = size_bytes / (1024 ** 3)
 
             hw = self.get_hardware_info()
             n_gpu = params.get("n_gpu_layers", -1)
-            n_ctx = params.get("n_ctx", 8192)
 
-            # Estimate KV cache RAM: ~2 bytes * n_ctx * n_layers (rough: ctx/1000 GB)
-            kv_cache_gb = (n_ctx / 1000.0) * 0.1
+            # KV cache size from the indexed attention shape (layers × KV heads ×
+            # head dim × n_ctx × cache type); rough ctx/1000 × 0.1 GB if unknown
+            record = self._inventory.get(model_path) if self._inventory is not None else None
+            kv_cache_gb = estimate_footprint(
+                record["meta"] if record else {}, size_bytes, params)["kv_cache_gb"]
 
             if n_gpu != 0 and hw.get("cuda_available"):
                 # GPU load: model fits in VRAM + KV cache overhead
@@ -951,9 +1215,12 @@ class LocalModelManager:
         """
         Record a TPS measurement. If the last 3 are all below the threshold,
         emit a gradient warning to the coordinate graph (fire-and-forget).
-        Threshold: 8 tok/s GPU, 2 tok/s CPU.
+        Threshold: 8 tok/s GPU, 2 tok/s CPU.  The measurement is also kept
+        in the model inventory as the loaded model's last_tps.
         """
         threshold = 8.0 if gpu_active else 2.0
+        if self._inventory is not None and self._current_model_path:
+            self._inventory.record_tps(self._current_model_path, tps)
         self._tps_window.append(tps)
         if len(self._tps_window) > 3:
             self._tps_window.pop(0)
@@ -1020,14 +1287,33 @@ class LocalModelManager:
 
         async with lock:
             self._stop_watchdog()  # cancel any existing watchdog
-            await self.unload_model()
-            self._invalidate_hw_cache()  # VRAM state will change during load
 
             # Resolve requested profile; may fall back if the fork isn't
             # installed and the profile demands it.
             profile = self._resolve_profile_for_environment(profile)
             params = self.get_profile_params(profile, custom_params or {})
 
+            # ── Warm standby (preloaded or kept from the last swap) ─────
+            if self._inprocess_enabled() and self._process is None:
+                loop = asyncio.get_running_loop()
+                standby = await loop.run_in_executor(
+                    None, lambda: self._residency.take(model_path, params))
+                if standby is not None:
+                    await self._swap_in(standby, profile)
+                    self._record_loaded(model_path, profile, params)
+                    if progress_cb:
+                        try:
+                            await progress_cb({"phase": "ready", "pct": 100, "msg": "Model ready"})
+                        except Exception:
+                            pass
+                    return True
+
+            await self.unload_model()
+            # A cancelled preload may still be building; its memory must be
+            # released before the pre-flight check and the cold load
+            await asyncio.get_running_loop().run_in_executor(None, self._residency.settle)
+            self._invalidate_hw_cache()  # VRAM state will change during load
+
             # [10.5] Pre-flight resource check — fail fast before spawning
             preflight_error = self._preflight_resource_check(model_path, params)
             if preflight_error:
@@ -1045,13 +1331,9 @@ class LocalModelManager:
                 self._current_profile = profile
                 ok = await self._load_inprocess(model_path, params, progress_cb=progress_cb)
                 if ok:
-                    filename = Path(model_path).name
-                    self.save_model_settings(filename, {
-                        "last_profile": profile,
-                        "last_ctx": params.get("n_ctx", 8192),
-                        "last_gpu_layers": params.get("n_gpu_layers", -1),
-                    })
+                    self._record_loaded(model_path, profile, params)
                     self._invalidate_hw_cache()
+                    self.preload_predicted()
                 return ok
 
             # ── Legacy subprocess path (IRIS_INPROCESS_LLAMA=0) ──────────
@@ -1159,12 +1441,7 @@ class LocalModelManager:
                     poll_interval = min(poll_interval * 2, 8.0)
 
             if ready:
-                filename = Path(model_path).name
-                self.save_model_settings(filename, {
-                    "last_profile": profile,
-                    "last_ctx": params.get("n_ctx", 8192),
-                    "last_gpu_layers": params.get("n_gpu_layers", -1),
-                })
+                self._record_loaded(model_path, profile, params)
                 self._invalidate_hw_cache()  # refresh VRAM after model occupies GPU
                 # [10.7] Start watchdog — detects subprocess death after load
                 self._watchdog_task = asyncio.ensure_future(
@@ -1176,6 +1453,18 @@ class LocalModelManager:
                 await self.unload_model()
             return ready
 
+    def _record_loaded(self, model_path: str, profile: str, params: Dict[str, Any]) -> None:
+        """Persist what was loaded and when — feeds predict_next_model()."""
+        if self._selected_model and self._selected_model["path"] == model_path:
+            self._selected_model = None
+        self.save_model_settings(Path(model_path).name, {
+            "last_profile": profile,
+            "last_ctx": params.get("n_ctx", 8192),
+            "last_gpu_layers": params.get("n_gpu_layers", -1),
+            "last_path": str(model_path),
+            "last_loaded_at": time.time(),
+        })
+
     def _resolve_profile_for_environment(self, profile: str) -> str:
         """If the requested profile demands a fork we don't have, fall back
         to a safe default and log a warning. No-op for profiles that don't
@@ -1199,6 +1488,8 @@ class LocalModelManager:
         # [10.7] Cancel watchdog before stopping subprocess
         self._stop_watchdog()
         self._stop_progress_heartbeat()
+        # The standby's memory is needed by whatever loads next
+        self._residency.discard()
 
         # ── In-process path: drop the Llama instance and let GC free VRAM ──
         if self._llm is not None:
@@ -1268,6 +1559,7 @@ class LocalModelManager:
             "pid": None if inprocess else (self._process.pid if loaded and self._process else None),
             "inprocess": inprocess,
             "rotorquant": self._rotorquant_available,
+            "residency": self._residency.get_stats(),
         }
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -1536,6 +1828,8 @@ class LocalModelManager:
                     local_dir=str(dest_dir or self.MODELS_DIR),
                 ),
             )
+            if self._inventory is not None:
+                self._inventory.mark_dirty()
             yield {
                 "status": "complete",
                 "progress_pct": 100,
@@ -1591,6 +1885,7 @@ class LocalModelManager:
     def _sync_cleanup(self) -> None:
         # In-process instance — best-effort drop. Python's GC will free the
         # CUDA context when the interpreter exits even if we skip this.
+        self._residency.discard()
         if self._llm is not None:
             try:
                 self._llm = None
@@ -0,0 +1,314 @@
+"""
+ModelInventory — persistent index of the GGUF files under MODELS_DIR.
+
+LocalModelManager.scan_models() used to walk the models directory and parse
+the GGUF header of every file on each backend start (its cache lived only in
+memory).  On slow disks with multi-GB files that made opening ModelsScreen
+take seconds.  The inventory keeps, per file:
+
+  signature   (size, mtime_ns, inode) — a header is re-parsed only when this changes
+  meta        parsed header fields (architecture, context length, layers, KV heads, quant)
+  footprint   estimated weights / KV cache / VRAM / RAM in GB for every load profile
+  last_tps    last measured generation speed, recorded by LocalModelManager.record_tps
+
+and persists it as JSON next to the per-model settings file, so a restart
+reads one small file instead of every header.  Speed samples arrive after
+every generation, so they are written at most once per TPS_SAVE_DELAY_SEC
+(and on stop() / interpreter exit) rather than rewriting the index each time.
+
+Rescans are incremental (stat every file, parse only new or changed ones) and
+happen only when the index is dirty: a watchdog observer on the models
+directory marks it dirty on any *.gguf change; without watchdog the index is
+treated as stale after REFRESH_INTERVAL_SEC.  entries() otherwise returns the
+in-memory snapshot without touching the disk.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Bytes per KV element for each cache type (block-quantised types include the scale)
+KV_BYTES_PER_ELEMENT: Dict[str, float] = {
+    "f32": 4.0, "f16": 2.0, "bf16": 2.0,
+    "q8_0": 34 / 32, "q5_1": 24 / 32, "q5_0": 22 / 32,
+    "q4_1": 20 / 32, "q4_0": 18 / 32,
+    # RotorQuant 3-bit planar/iso quantisation
+    "planar3": 0.375, "iso3": 0.375, "planarquant": 0.375, "isoquant": 0.375,
+}
+
+_GB = 1024 ** 3
+
+
+def estimate_footprint(meta: Dict[str, Any], size_bytes: int, params: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Memory needed to load a model with one profile's params, in GB.
+
+    KV cache = layers × n_ctx × KV heads × head dim × (bytes_k + bytes_v).
+    When the header lacks the attention shape, falls back to the rough
+    n_ctx/1000 × 0.1 GB rule used by the pre-load resource check.
+    """
+    n_ctx = int(params.get("n_ctx", 8192))
+    weights_gb = size_bytes / _GB
+    layers = meta.get("n_layers") or 0
+    kv_heads = meta.get("n_kv_heads") or meta.get("n_heads") or 0
+    head_dim = meta.get("head_dim") or 0
+    if layers and kv_heads and head_dim:
+        per_token = layers * kv_heads * head_dim * (
+            KV_BYTES_PER_ELEMENT.get(str(params.get("cache_type_k", "f16")).lower(), 2.0)
+            + KV_BYTES_PER_ELEMENT.get(str(params.get("cache_type_v", "f16")).lower(), 2.0))
+        kv_gb = n_ctx * per_token / _GB
+    else:
+        kv_gb = (n_ctx / 1000.0) * 0.1
+
+    if params.get("n_gpu_layers", -1) != 0:
+        vram_gb = weights_gb * 1.05 + (kv_gb if params.get("offload_kv_cache", True) else 0.0)
+        ram_gb = 0.0 if params.get("offload_kv_cache", True) else kv_gb
+    else:
+        vram_gb = 0.0
+        ram_gb = weights_gb + kv_gb
+    return {
+        "weights_gb": round(weights_gb, 2),
+        "kv_cache_gb": round(kv_gb, 2),
+        "vram_gb": round(vram_gb, 2),
+        "ram_gb": round(ram_gb, 2),
+    }
+
+
+def _signature(st: os.stat_result) -> List[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+class ModelInventory:
+    """Incrementally maintained, persisted index of GGUF header metadata."""
+
+    REFRESH_INTERVAL_SEC = float(os.environ.get("IRIS_MODEL_INDEX_REFRESH_SEC", "300"))
+    TPS_SAVE_DELAY_SEC = 30.0   # unsaved speed samples are written at most this often
+
+    def __init__(
+        self,
+        models_dir: Path,
+        index_path: Path,
+        parse: Callable[[Path], Dict[str, Any]],
+        profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.models_dir = Path(models_dir)
+        self.index_path = Path(index_path)
+        self._parse = parse
+        self._profiles = profiles or {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+        self._dirty = True
+        self._refreshed_at = 0.0
+        self._observer = None
+        self._save_timer: Optional[threading.Timer] = None
+        self._exit_hook = False
+        self.parses = 0
+        self.saves = 0
+        self._load()
+
+    # ── queries ─────────────────────────────────────────────────────────────
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All indexed files, sorted by path.  Rescans first only if dirty or stale."""
+        if self._dirty or (
+            self._observer is None
+            and time.monotonic() - self._refreshed_at > self.REFRESH_INTERVAL_SEC
+        ):
+            self.refresh()
+        return self._snapshot
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(str(path))
+
+    # ── maintenance ─────────────────────────────────────────────────────────
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def refresh(self) -> Dict[str, int]:
+        """Stat every *.gguf; parse new or changed files; drop deleted ones."""
+        with self._lock:
+            self._dirty = False
+            counts = {"parsed": 0, "unchanged": 0, "removed": 0}
+            seen = set()
+            if self.models_dir.exists():
+                for path in self.models_dir.rglob("*.gguf"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    key = str(path)
+                    seen.add(key)
+                    entry = self._entries.get(key)
+                    if entry is not None and entry["signature"] == _signature(st):
+                        counts["unchanged"] += 1
+                        continue
+                    self._entries[key] = self._index_file(path, st, entry)
+                    counts["parsed"] += 1
+            for key in [k for k in self._entries if k not in seen]:
+                del self._entries[key]
+                counts["removed"] += 1
+            self._refreshed_at = time.monotonic()
+            self._publish()
+            if counts["parsed"] or counts["removed"]:
+                self._save()
+                logger.info(
+                    f"[ModelInventory] Indexed {len(self._entries)} GGUF files "
+                    f"({counts['parsed']} parsed, {counts['removed']} removed)")
+            return counts
+
+    def record_tps(self, path: str, tps: float) -> None:
+        """Store the last measured generation speed for a model file."""
+        with self._lock:
+            entry = self._entries.get(str(path))
+            if entry is None:
+                return
+            entry["last_tps"] = round(float(tps), 2)
+            entry["tps_measured_at"] = time.time()
+            self._publish()
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.TPS_SAVE_DELAY_SEC, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                if not self._exit_hook:
+                    self._exit_hook = True
+                    atexit.register(self.flush)
+
+    def flush(self) -> None:
+        """Write unsaved speed samples now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save()
+
+    def _index_file(self, path: Path, st: os.stat_result,
+                    previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        self.parses += 1
+        try:
+            meta = self._parse(path)
+        except Exception as e:
+            logger.debug(f"[ModelInventory] Could not parse GGUF header for {path.name}: {e}")
+            meta = {}
+        entry = {
+            "path": str(path),
+            "signature": _signature(st),
+            "size_bytes": st.st_size,
+            "meta": meta,
+            "footprint": self._footprints(meta, st.st_size),
+            "last_tps": None,
+            "tps_measured_at": None,
+        }
+        if previous is not None and previous.get("size_bytes") == st.st_size:
+            # Touched but (most likely) the same weights — keep the measurement
+            entry["last_tps"] = previous.get("last_tps")
+            entry["tps_measured_at"] = previous.get("tps_measured_at")
+        return entry
+
+    def _footprints(self, meta: Dict[str, Any], size_bytes: int) -> Dict[str, Dict[str, float]]:
+        return {name: estimate_footprint(meta, size_bytes, params)
+                for name, params in self._profiles.items()}
+
+    def _publish(self) -> None:
+        # Readers get an immutable-by-convention list; swapped atomically
+        self._snapshot = [self._entries[k] for k in sorted(self._entries)]
+
+    # ── persistence ─────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"[ModelInventory] Ignoring unreadable index {self.index_path}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        for entry in data.get("models", []):
+            if "path" in entry and "signature" in entry:
+                # Profiles may have changed since the index was written
+                entry["footprint"] = self._footprints(entry.get("meta", {}), entry.get("size_bytes", 0))
+                self._entries[entry["path"]] = entry
+        self._publish()
+
+    def _save(self) -> None:
+        # Caller holds _lock; a full save also covers any pending speed samples
+        timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.saves += 1
+        data = {"version": INDEX_VERSION, "models_dir": str(self.models_dir),
+                "models": self._snapshot}
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning(f"[ModelInventory] Could not save model index: {e}")
+
+    # ── directory watching ──────────────────────────────────────────────────
+
+    def watch(self) -> bool:
+        """Mark the index dirty on *.gguf changes under models_dir.  False if watchdog is unavailable."""
+        if self._observer is not None:
+            return True
+        if not self.models_dir.exists():
+            return False
+        try:
+            from watchdog.observers import Observer  # type: ignore
+            from watchdog.events import FileSystemEventHandler  # type: ignore
+        except ImportError:
+            logger.debug("[ModelInventory] watchdog not installed — polling every "
+                         f"{self.REFRESH_INTERVAL_SEC:.0f}s instead")
+            return False
+
+        inventory = self
+
+        class _Handler(FileSystemEventHandler):  # type: ignore[misc]
+            def on_any_event(self, event) -> None:  # type: ignore[override]
+                if event.event_type not in ("created", "deleted", "modified", "moved"):
+                    return      # opened/closed: a model being loaded, not changed
+                paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+                if event.is_directory or any(str(p).endswith(".gguf") for p in paths):
+                    inventory.mark_dirty()
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.models_dir), recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            logger.debug(f"[ModelInventory] Could not watch {self.models_dir}: {e}")
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        self.flush()
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            try:
+                observer.stop()
+                observer.join(timeout=2.0)
+            except Exception as e:
+                logger.debug(f"[ModelInventory] stop error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "models": len(self._entries),
+            "parses": self.parses,
+            "saves": self.saves,
+            "watching": self._observer is not None,
+            "dirty": self._dirty,
+            "index_path": str(self.index_path),
+        }
@@ -0,0 +1,269 @@
+"""
+ModelResidency — predictive preload and warm swap for the in-process Llama.
+
+Switching models through LocalModelManager.load_model() used to unload the
+active Llama and then pay the whole GGUF mmap, tensor upload and context
+creation on the user's critical path; even the first request after a load
+was slow because CUDA kernels and the KV cache were only touched then.
+The residency manager keeps at most one *standby* model beside the active
+one:
+
+  preload(path, params)  builds a Llama on a background thread and runs a
+                         one-token warm-up generation; refused when the
+                         standby would not fit the RAM/VRAM budget
+  take(path, params)     hands the standby to load_model() if it matches
+                         (waits for an in-flight preload of the same model)
+  offer(path, params, llm)
+                         keeps a model displaced by a swap as the new
+                         standby when it still fits, so switching back is
+                         also instant
+
+LocalModelManager swaps a taken standby in under its inference lock, so
+requests already generating finish on the old model and the next one runs
+on the new model.  What to preload (last used model, UI picker selection,
+launcher default) is decided by the manager; this module only holds the
+slot, the timings and the metrics.
+
+A cancelled preload cannot interrupt Llama construction, so its thread runs
+on until the model is built and then drops it.  Until then it still holds
+memory the budget check does not see: a new preload waits for it before
+building, and load() / settle() wait for it before a foreground load, so two
+constructions never overlap.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_LOAD_SECONDS = _metrics.summary(
+    "iris_llm_load_seconds", "Time to construct a llama_cpp.Llama", ["mode"])
+_WARMUP_SECONDS = _metrics.summary(
+    "iris_llm_warmup_seconds", "Time of the one-token warm-up generation after a load")
+_SWAP_SECONDS = _metrics.summary(
+    "iris_llm_swap_seconds", "Time to install a warm standby, including the wait for in-flight inference")
+_STANDBY_LOOKUPS = _metrics.counter(
+    "iris_llm_standby_total", "Model loads checked against the warm standby", ["result"])
+
+WARMUP_PROMPT = "Hello"
+
+
+def residency_key(model_path: str, params: Dict[str, Any]) -> str:
+    """Identity of a loaded Llama: same file and same load params."""
+    return json.dumps([str(model_path), params], sort_keys=True, default=str)
+
+
+def warm_up(llm: Any) -> float:
+    """Generate one token so the first real request runs at steady-state speed.  Returns seconds."""
+    t0 = time.perf_counter()
+    try:
+        llm.create_completion(prompt=WARMUP_PROMPT, max_tokens=1, temperature=0.0)
+    except Exception as e:
+        logger.debug(f"[ModelResidency] Warm-up generation failed: {e}")
+    elapsed = time.perf_counter() - t0
+    _WARMUP_SECONDS.observe(elapsed)
+    return elapsed
+
+
+@dataclass
+class ResidentModel:
+    """A constructed, warmed-up Llama and how long it took."""
+
+    path: str
+    params: Dict[str, Any]
+    llm: Any
+    load_s: float = 0.0
+    warmup_s: float = 0.0
+    key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.key = residency_key(self.path, self.params)
+
+
+class _Preload:
+    def __init__(self, key: str, path: str) -> None:
+        self.key = key
+        self.path = path
+        self.done = threading.Event()
+        self.cancelled = False
+
+
+class ModelResidency:
+    """One warm standby Llama beside the active one, with load/swap timings."""
+
+    def __init__(
+        self,
+        build: Callable[[str, Dict[str, Any]], Any],
+        fits: Callable[[str, Dict[str, Any]], bool],
+        key: Callable[[str, Dict[str, Any]], str] = residency_key,
+    ):
+        self._build = build
+        self._fits = fits
+        self._key = key
+        self._lock = threading.Lock()
+        self._standby: Optional[ResidentModel] = None
+        self._preload: Optional[_Preload] = None
+        # Cancelled preloads whose threads are still building
+        self._abandoned: List[_Preload] = []
+        self.hits = 0
+        self.misses = 0
+        self.last_load: Optional[Dict[str, Any]] = None
+        self.last_swap_s: Optional[float] = None
+
+    # ── loading ─────────────────────────────────────────────────────────────
+
+    def load(self, path: str, params: Dict[str, Any], mode: str = "foreground") -> ResidentModel:
+        """Construct and warm up a Llama on the calling thread, recording the timings."""
+        if mode == "foreground":
+            self.settle()
+        t0 = time.perf_counter()
+        llm = self._build(path, params)
+        load_s = time.perf_counter() - t0
+        _LOAD_SECONDS.labels(mode).observe(load_s)
+        warmup_s = warm_up(llm)
+        model = ResidentModel(path, params, llm, load_s, warmup_s)
+        self.last_load = {"model": Path(path).name, "mode": mode,
+                          "load_s": round(load_s, 3), "warmup_s": round(warmup_s, 3)}
+        logger.info(f"[ModelResidency] {mode} load of {Path(path).name}: "
+                    f"{load_s:.2f}s + {warmup_s:.2f}s warm-up")
+        return model
+
+    def preload(self, path: str, params: Dict[str, Any]) -> bool:
+        """Build a standby for (path, params) in the background.
+
+        False when that model is already standing by or loading, or when it
+        does not fit the memory budget.  Any other standby is dropped first
+        so its memory is free for the new one.
+        """
+        key = self._key(path, params)
+        with self._lock:
+            if self._standby is not None and self._standby.key == key:
+                return False
+            if self._preload is not None and self._preload.key == key:
+                return False
+            self._cancel_locked()
+        if not self._fits(path, params):
+            logger.info(f"[ModelResidency] No memory budget for a standby {Path(path).name}")
+            return False
+        job = _Preload(key, path)
+        with self._lock:
+            if self._preload is not None:       # raced with another preload
+                return False
+            self._preload = job
+            prior = list(self._abandoned)
+        threading.Thread(target=self._run_preload, args=(job, params, prior),
+                         name="iris-llm-preload", daemon=True).start()
+        return True
+
+    def _run_preload(self, job: _Preload, params: Dict[str, Any], prior: List[_Preload]) -> None:
+        model = None
+        for earlier in prior:
+            earlier.done.wait()
+        try:
+            if not job.cancelled:
+                model = self.load(job.path, params, mode="standby")
+        except Exception as e:
+            logger.warning(f"[ModelResidency] Preload of {Path(job.path).name} failed: {e}")
+        with self._lock:
+            if self._preload is job:
+                self._preload = None
+            if model is not None and not job.cancelled:
+                model.key = job.key
+                self._standby = model
+                model = None
+        # Cancelled while loading — release it before anyone waiting builds
+        del model
+        with self._lock:
+            if job in self._abandoned:
+                self._abandoned.remove(job)
+        job.done.set()
+
+    # ── handing over ────────────────────────────────────────────────────────
+
+    def take(self, path: str, params: Dict[str, Any],
+             timeout: Optional[float] = None) -> Optional[ResidentModel]:
+        """The standby for (path, params), or None.  Waits for a matching in-flight preload."""
+        key = self._key(path, params)
+        with self._lock:
+            job = self._preload if self._preload is not None and self._preload.key == key else None
+        if job is not None:
+            job.done.wait(timeout)
+        with self._lock:
+            model = self._standby
+            if model is None or model.key != key:
+                self.misses += 1
+                _STANDBY_LOOKUPS.labels("miss").inc()
+                return None
+            self._standby = None
+        self.hits += 1
+        _STANDBY_LOOKUPS.labels("hit").inc()
+        return model
+
+    def offer(self, path: str, params: Dict[str, Any], llm: Any) -> bool:
+        """Keep a model displaced by a swap as the standby if the budget still allows."""
+        with self._lock:
+            if self._standby is not None or self._preload is not None:
+                return False
+        if not self._fits(path, params):
+            return False
+        model = ResidentModel(path, params, llm)
+        model.key = self._key(path, params)
+        with self._lock:
+            if self._standby is not None or self._preload is not None:
+                return False
+            self._standby = model
+        return True
+
+    def record_swap(self, seconds: float) -> None:
+        self.last_swap_s = round(seconds, 4)
+        _SWAP_SECONDS.observe(seconds)
+
+    def discard(self) -> None:
+        """Drop the standby and abandon any preload in flight."""
+        with self._lock:
+            self._cancel_locked()
+
+    def settle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no cancelled preload is still building.  False on timeout."""
+        with self._lock:
+            pending = list(self._abandoned)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not job.done.wait(remaining):
+                return False
+        return True
+
+    def _cancel_locked(self) -> None:
+        if self._preload is not None:
+            self._preload.cancelled = True
+            self._abandoned.append(self._preload)
+            self._preload = None
+        self._standby = None
+
+    # ── introspection ───────────────────────────────────────────────────────
+
+    @property
+    def occupied(self) -> bool:
+        """A standby is resident or being preloaded."""
+        return self._standby is not None or self._preload is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        standby, job = self._standby, self._preload
+        return {
+            "standby": Path(standby.path).name if standby is not None else None,
+            "preloading": Path(job.path).name if job is not None else None,
+            "abandoned_preloads": len(self._abandoned),
+            "hits": self.hits,
+            "misses": self.misses,
+            "last_load": self.last_load,
+            "last_swap_s": self.last_swap_s,
+        }
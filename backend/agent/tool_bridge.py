@@ -19,11 +19,20 @@ import asyncio
 import logging
 import os
 import subprocess
+import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import span as trace_span
+
 logger = logging.getLogger(__name__)
 
+_TOOL_SECONDS = get_metrics_registry().summary(
+    "iris_tool_seconds", "Agent tool execution latency", ["tool"])
+_TOOL_ERRORS = get_metrics_registry().counter(
+    "iris_tool_errors_total", "Agent tool executions that returned an error", ["tool"])
+
 
 class AgentToolBridge:
     """
@@ -658,10 +667,24 @@ class AgentToolBridge:
         """
         Execute any tool by name with routing to appropriate server.
 
-        Integrates with AgentKernel context for tool results.
+        Integrates with AgentKernel context for tool results.  Latency and
+        errors are recorded per tool in the iris_tool_* metrics.
 
         Requirements: 8.3, 8.4, 8.5, 8.6
         """
+        started = time.perf_counter()
+        with trace_span("tool.call", tool=tool_name) as span:
+            result = await self._route_tool(tool_name, params, session_id)
+            failed = isinstance(result, dict) and bool(result.get("error"))
+            if failed:
+                span.set(error=str(result["error"])[:200])
+        _TOOL_SECONDS.labels(tool=tool_name).observe(time.perf_counter() - started)
+        if failed:
+            _TOOL_ERRORS.labels(tool=tool_name).inc()
+        return result
+
+    async def _route_tool(self, tool_name: str, params: Dict, session_id: str) -> Dict:
+        """Route a tool call to its server; errors are returned as {"error": ...}."""
         # Map tool names to their execution methods
         vision_tools = ["vision_detect_element", "vision_analyze_screen",
                         "vision_validate_action", "vision_get_context"]
@@ -16,6 +16,11 @@ Final fallback  : pyttsx3 (Windows SAPI5 — zero download, instant)
 Setup           : pip install f5-tts
                   Place TOMV2.wav at IRISVOICE/data/TOMV2.wav
 
+Phrase cache    : synthesize_phrase() renders one sentence-sized chunk via
+                  the RAM + disk PhraseAudioCache (agent/tts_cache.py), keyed
+                  by engine, voice, speaking rate and text; the gateway's
+                  SpeechScheduler (agent/tts_scheduler.py) plays through it.
+
 Lock discipline
   self._lock guards model initialisation only.  It is released before
   inference so synthesis never blocks the consumer's audio-queue timeout.
@@ -27,14 +32,28 @@ import re
 import sys
 import tempfile
 import threading
+import time
 import wave
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Generator
+from typing import Optional, Dict, Any, List, Generator, Tuple
 
 import numpy as np
 
+from backend.agent.tts_cache import PhraseAudioCache, get_phrase_cache
+from backend.audio.resampling import StreamingResampler, resample
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import span as trace_span
+
 logger = logging.getLogger(__name__)
 
+_metrics = get_metrics_registry()
+_TTS_FIRST_AUDIO_SECONDS = _metrics.summary(
+    "iris_tts_first_audio_seconds", "Time from synthesis request to the first audio chunk")
+_TTS_SYNTH_SECONDS = _metrics.summary(
+    "iris_tts_synthesis_seconds", "Time spent synthesizing one utterance")
+_TTS_REAL_TIME_FACTOR = _metrics.summary(
+    "iris_tts_real_time_factor", "Synthesis time divided by audio duration")
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -69,23 +88,10 @@ F5TTS_MODEL = "F5TTS_v1_Base"
 def _resample(audio: np.ndarray, orig_sr: int) -> np.ndarray:
     """Resample *audio* (float32) from *orig_sr* to OUTPUT_SAMPLE_RATE.
 
-    Uses scipy.signal.resample for quality; falls back to numpy interp.
+    Uses the cached polyphase filter from backend.audio.resampling.
     No-op when orig_sr == OUTPUT_SAMPLE_RATE.
     """
-    if orig_sr == OUTPUT_SAMPLE_RATE:
-        return audio.astype(np.float32)
-    try:
-        from scipy.signal import resample as _sp_resample
-        n_out = int(len(audio) * OUTPUT_SAMPLE_RATE / orig_sr)
-        return _sp_resample(audio, n_out).astype(np.float32)
-    except Exception as exc:
-        logger.warning(f"[TTSManager] scipy resample failed ({exc}); using numpy interp fallback")
-        n_out = int(len(audio) * OUTPUT_SAMPLE_RATE / orig_sr)
-        return np.interp(
-            np.linspace(0, len(audio) - 1, n_out),
-            np.arange(len(audio)),
-            audio
-        ).astype(np.float32)
+    return resample(audio, orig_sr, OUTPUT_SAMPLE_RATE)
 
 
 # ---------------------------------------------------------------------------
@@ -185,6 +191,7 @@ class TTSManager:
         # Engine instances (lazy-loaded)
         self._f5tts       = None    # F5TTS instance
         self._piper       = None    # PiperVoice instance
+        self._f5tts_installed: Optional[bool] = None
         self._lock        = threading.Lock()   # guards init only, NOT inference
 
         TTSManager._initialized = True
@@ -314,7 +321,9 @@ class TTSManager:
             f"{'Piper/pyttsx3 (Built-in selected — F5-TTS skipped)' if force_builtin else 'F5-TTS (primary) → Piper (fallback) → pyttsx3 (last resort)'}"
         )
 
-    def synthesize_stream(self, text: str) -> Generator[np.ndarray, None, None]:
+    def synthesize_stream(
+        self, text: str, used: Optional[Dict[str, str]] = None
+    ) -> Generator[np.ndarray, None, None]:
         """Stream synthesis — yields float32 arrays at OUTPUT_SAMPLE_RATE Hz.
 
         Text is normalised before synthesis (strips markdown / expands symbols).
@@ -324,7 +333,49 @@ class TTSManager:
         pyttsx3:     one full chunk as last resort.
 
         Lock discipline: self._lock held only during model load, not inference.
+
+        Time-to-first-audio, synthesis time and real-time factor are recorded
+        in the iris_tts_* metrics.  Only time spent producing chunks counts —
+        not the time the caller spends playing them.
+
+        If *used* is given, used["engine"] is set to the engine that produced
+        the audio ("f5tts", "piper" or "pyttsx3").
         """
+        started = time.perf_counter()
+        busy = 0.0
+        audio_s = 0.0
+        produced = 0
+        # Not entered: a generator must not leave a contextvar set across yields
+        span = trace_span("tts.synthesize", chars=len(text))
+        chunks = self._synthesize_chunks(text, used)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                now = time.perf_counter()
+                if not produced:
+                    _TTS_FIRST_AUDIO_SECONDS.observe(now - started)
+                    span.set(first_audio_ms=round((now - started) * 1000, 1))
+                produced += 1
+                busy += now - t0
+                audio_s += len(chunk) / OUTPUT_SAMPLE_RATE
+                yield chunk
+        finally:
+            chunks.close()
+            span.set(audio_s=round(audio_s, 2))
+            span.end()
+        if audio_s:
+            _TTS_SYNTH_SECONDS.observe(busy)
+            _TTS_REAL_TIME_FACTOR.observe(busy / audio_s)
+
+    def _synthesize_chunks(
+        self, text: str, used: Optional[Dict[str, str]] = None
+    ) -> Generator[np.ndarray, None, None]:
+        """Engine selection and fallback chain behind synthesize_stream()."""
+        used = {} if used is None else used
         if not self.config.get("tts_enabled", True):
             return
         if not text.strip():
@@ -347,6 +398,7 @@ class TTSManager:
             if loaded and f5tts is not None:
                 try:
                     for chunk in self._stream_f5tts(f5tts, normalized):
+                        used["engine"] = "f5tts"
                         yield chunk
                     return
                 except Exception as exc:
@@ -368,6 +420,7 @@ class TTSManager:
         if piper_loaded and piper is not None:
             try:
                 for chunk in self._stream_piper(piper, normalized):
+                    used["engine"] = "piper"
                     yield chunk
                 return
             except Exception as exc:
@@ -379,10 +432,77 @@ class TTSManager:
         try:
             result = self._synthesize_pyttsx(normalized)
             if result is not None:
+                used["engine"] = "pyttsx3"
                 yield result
         except Exception as exc:
             logger.error(f"[TTSManager] pyttsx3 stream error: {exc}")
 
+    # ------------------------------------------------------------------
+    # Phrase-level synthesis (cached)
+    # ------------------------------------------------------------------
+
+    def voice_identity(self) -> Tuple[str, str]:
+        """(engine, voice) the next synthesis is expected to use.
+
+        Part of the phrase cache key: audio rendered by a fallback engine or
+        from a different reference clip never answers for the primary voice.
+        """
+        if self.config.get("tts_voice") != "Built-in" and self._f5tts_expected():
+            try:
+                st = REFERENCE_AUDIO.stat()
+                ref = f"{REFERENCE_AUDIO.name}:{st.st_size}:{int(st.st_mtime)}"
+            except OSError:
+                ref = REFERENCE_AUDIO.name
+            return "f5tts", f"{F5TTS_MODEL}:{ref}"
+        if PIPER_MODEL_ONNX.exists():
+            return "piper", PIPER_MODEL_ONNX.stem
+        return "pyttsx3", "sapi5"
+
+    def _f5tts_expected(self) -> bool:
+        if self._f5tts is not None:
+            return True
+        if self._f5tts_installed is None:
+            import importlib.util
+            try:
+                self._f5tts_installed = importlib.util.find_spec("f5_tts") is not None
+            except Exception:
+                self._f5tts_installed = False
+        return self._f5tts_installed and REFERENCE_AUDIO.exists()
+
+    def synthesize_phrase(
+        self, text: str, cache: Optional[PhraseAudioCache] = None
+    ) -> Optional[np.ndarray]:
+        """Synthesize one sentence-sized chunk, served from the phrase cache when possible.
+
+        Returns float32 audio at OUTPUT_SAMPLE_RATE Hz, or None.  Concurrent
+        requests for the same phrase share one synthesis.  Audio is only
+        cached when the expected engine (voice_identity) produced it.
+        """
+        if not self.config.get("tts_enabled", True):
+            return None
+        if not text or not text.strip():
+            return None
+        cache = cache or get_phrase_cache()
+        if not cache.cacheable(text):
+            return self.synthesize(text)
+
+        engine, voice = self.voice_identity()
+        key = cache.key(
+            engine, voice, text,
+            speaking_rate=float(self.config.get("speaking_rate", 1.0)),
+            sample_rate=OUTPUT_SAMPLE_RATE,
+        )
+
+        def _render():
+            used: Dict[str, str] = {}
+            chunks = list(self.synthesize_stream(text, used=used))
+            if not chunks:
+                return None, False
+            return np.concatenate(chunks), used.get("engine") == engine
+
+        audio, _cached = cache.get_or_create(key, _render)
+        return audio
+
     # ------------------------------------------------------------------
     # Text normalization
     # ------------------------------------------------------------------
@@ -516,12 +636,19 @@ class TTSManager:
         piper.synthesize() yields AudioChunk objects per sentence.
         Each chunk has audio_int16_array (numpy int16) and sample_rate.
         RTF ~0.04x on CPU; first chunk typically in <100 ms.
+
+        One StreamingResampler spans the whole utterance, so each sentence is
+        converted as it arrives without filter ringing at the joins.  The
+        final filter tail (<1 ms of sentence-end silence) is not flushed:
+        play_audio() peak-normalises every chunk and would turn it into a click.
         """
+        resampler: Optional[StreamingResampler] = None
         for chunk in piper.synthesize(text):
             arr = chunk.audio_int16_array  # numpy int16
             piper_rate = chunk.sample_rate
-            audio = arr.astype(np.float32) / 32768.0
-            audio = _resample(audio, piper_rate)
+            if resampler is None or resampler.src_rate != piper_rate:
+                resampler = StreamingResampler(piper_rate, OUTPUT_SAMPLE_RATE)
+            audio = resampler.process(arr.astype(np.float32) / 32768.0)
             if len(audio) > 0:
                 yield audio
 
@@ -0,0 +1,268 @@
+"""
+Content-addressed cache of synthesised phrase audio.
+
+Acknowledgements, greetings, error notices and the "Full response in the
+chat window." tail recur constantly and F5-TTS spends ~1 s of CPU on each.
+PhraseAudioCache keys float32 audio by a hash of (engine, voice, speaking
+rate, sample rate, text) and keeps it in two tiers:
+
+  RAM   LRU bounded by RAM_BUDGET_MB
+  disk  one .npy per phrase under IRIS_TTS_CACHE_DIR, LRU by mtime, bounded
+        by DISK_BUDGET_MB — survives restarts
+
+get_or_create() is single-flight: a phrase that is already being
+synthesised (e.g. speculatively while the LLM is still generating) is
+waited for, not synthesised twice.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_CACHE_LOOKUPS = _metrics.counter(
+    "iris_tts_phrase_cache_total", "Phrase audio cache lookups", ["result"])
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "voice" / "tts_cache"
+
+
+class _InFlight:
+    __slots__ = ("done", "audio", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.audio: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+
+
+class PhraseAudioCache:
+    """Two-tier (RAM + disk) phrase audio cache keyed by content hash."""
+
+    RAM_BUDGET_MB = float(os.environ.get("IRIS_TTS_CACHE_RAM_MB", "32"))
+    DISK_BUDGET_MB = float(os.environ.get("IRIS_TTS_CACHE_DISK_MB", "256"))
+    MAX_PHRASE_CHARS = 200      # longer text is not worth keeping
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ram_budget_mb: Optional[float] = None,
+        disk_budget_mb: Optional[float] = None,
+    ):
+        env_dir = os.environ.get("IRIS_TTS_CACHE_DIR")
+        self.cache_dir = Path(cache_dir or env_dir or _DEFAULT_DIR)
+        self.ram_budget = int((self.RAM_BUDGET_MB if ram_budget_mb is None else ram_budget_mb) * 2 ** 20)
+        self.disk_budget = int((self.DISK_BUDGET_MB if disk_budget_mb is None else disk_budget_mb) * 2 ** 20)
+        self._ram: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._ram_bytes = 0
+        self._disk_bytes: Optional[int] = None     # scanned lazily
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = {"ram": 0, "disk": 0}
+        self.misses = 0
+
+    @staticmethod
+    def key(engine: str, voice: str, text: str, **params) -> str:
+        """Content address for one phrase rendering."""
+        blob = json.dumps(
+            {"engine": engine, "voice": voice, "text": " ".join(text.split()), **params},
+            sort_keys=True, ensure_ascii=False,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self.MAX_PHRASE_CHARS
+
+    # ── lookup ────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            audio = self._ram.get(key)
+            if audio is not None:
+                self._ram.move_to_end(key)
+                self.hits["ram"] += 1
+                _CACHE_LOOKUPS.labels(result="ram").inc()
+                return audio
+        audio = self._load(key)
+        if audio is not None:
+            with self._lock:
+                self._remember(key, audio)
+                self.hits["disk"] += 1
+            _CACHE_LOOKUPS.labels(result="disk").inc()
+        return audio
+
+    def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Tuple[Optional[np.ndarray], bool]],
+        persist: bool = True,
+    ) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Cached audio for key, or the result of factory() — once per key.
+
+        factory returns (audio, store); store=False keeps a fallback-engine
+        rendering out of the cache.  Returns (audio, was_cached).
+        """
+        audio = self.get(key)
+        if audio is not None:
+            return audio, True
+        with self._lock:
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = _InFlight()
+                self.misses += 1
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.audio is not None:
+                _CACHE_LOOKUPS.labels(result="shared").inc()
+            return flight.audio, flight.audio is not None
+
+        _CACHE_LOOKUPS.labels(result="miss").inc()
+        try:
+            audio, store = factory()
+            if audio is not None and len(audio) and store:
+                self.put(key, audio, persist=persist)
+            flight.audio = audio
+            return audio, False
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    # ── storage ───────────────────────────────────────────────────────────
+
+    def put(self, key: str, audio: np.ndarray, persist: bool = True) -> None:
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        audio.flags.writeable = False     # shared between callers
+        with self._lock:
+            self._remember(key, audio)
+        if persist and self.disk_budget > 0:
+            self._store(key, audio)
+
+    def _remember(self, key: str, audio: np.ndarray) -> None:
+        if audio.nbytes > self.ram_budget:
+            return
+        old = self._ram.pop(key, None)
+        if old is not None:
+            self._ram_bytes -= old.nbytes
+        self._ram[key] = audio
+        self._ram_bytes += audio.nbytes
+        while self._ram_bytes > self.ram_budget:
+            _, evicted = self._ram.popitem(last=False)
+            self._ram_bytes -= evicted.nbytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        try:
+            audio = np.load(path, allow_pickle=False)
+            os.utime(path)      # disk LRU by mtime
+        except (OSError, ValueError):
+            return None
+        audio.flags.writeable = False
+        return audio
+
+    def _store(self, key: str, audio: np.ndarray) -> None:
+        path = self._path(key)
+        tmp = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.save(f, audio, allow_pickle=False)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.debug(f"[PhraseAudioCache] Could not persist {key[:12]}: {exc}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk()
+            else:
+                self._disk_bytes += path.stat().st_size
+            if self._disk_bytes > self.disk_budget:
+                self._prune_disk()
+
+    def _scan_disk(self) -> int:
+        try:
+            return sum(p.stat().st_size for p in self.cache_dir.glob("*.npy"))
+        except OSError:
+            return 0
+
+    def _prune_disk(self) -> None:
+        """Delete least recently used files down to 90 % of the budget."""
+        try:
+            files = sorted(
+                ((p.stat().st_mtime, p.stat().st_size, p) for p in self.cache_dir.glob("*.npy")),
+                key=lambda item: item[0],
+            )
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_budget * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._ram.clear()
+            self._ram_bytes = 0
+            if disk:
+                for path in self.cache_dir.glob("*.npy"):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "ram_entries": len(self._ram),
+                "ram_mb": round(self._ram_bytes / 2 ** 20, 2),
+                "disk_mb": None if self._disk_bytes is None else round(self._disk_bytes / 2 ** 20, 2),
+                "hits": dict(self.hits),
+                "misses": self.misses,
+                "in_flight": len(self._inflight),
+            }
+
+
+_cache: Optional[PhraseAudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_phrase_cache() -> PhraseAudioCache:
+    """Process-wide PhraseAudioCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PhraseAudioCache()
+    return _cache
@@ -0,0 +1,278 @@
+"""
+Sentence-lookahead TTS scheduling.
+
+SpeechScheduler turns text — a whole reply, or sentences/tokens as they
+stream in — into audio chunks for playback.  A worker thread synthesises
+sentence-sized chunks in order and keeps up to `lookahead` of them ready
+ahead of the player, so chunk N+1 is rendered while chunk N plays and
+playback never waits on synthesis once it has started.  Chunks are
+rendered through TTSManager.synthesize_phrase(), so repeated phrases come
+straight from the phrase audio cache.
+
+PhrasePrefetcher is the speculative half: fed the LLM token stream, it
+synthesises the first sentences into the phrase cache while the reply is
+still being generated.  When the final spoken text is scheduled its
+opening chunks are cache hits (or join the synthesis already in flight).
+
+Time-to-first-audio — scheduler start to the first chunk ready to play —
+is recorded in iris_tts_time_to_first_audio_seconds.
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import bind_context
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_TIME_TO_FIRST_AUDIO = _metrics.summary(
+    "iris_tts_time_to_first_audio_seconds",
+    "Time from a speech request to its first audio chunk being ready to play")
+
+# Sentence boundary: terminal punctuation followed by whitespace, or newlines
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+Synthesize = Callable[[str], Optional[np.ndarray]]
+
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter for streamed text.
+
+    A sentence is emitted once the whitespace after its final punctuation
+    has arrived ("3." might still become "3.5"); over-long sentences are
+    cut further with tts._split_into_chunks.
+    """
+
+    def __init__(self, max_chars: int = 200):
+        self.max_chars = max_chars
+        self._buf = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buf += text
+        parts = _SENTENCE_BOUNDARY.split(self._buf)
+        self._buf = parts.pop()
+        return self._chunks(parts)
+
+    def flush(self) -> List[str]:
+        rest, self._buf = self._buf, ""
+        return self._chunks([rest])
+
+    def _chunks(self, sentences: List[str]) -> List[str]:
+        from backend.agent.tts import _split_into_chunks
+        out: List[str] = []
+        for sentence in sentences:
+            if sentence.strip():
+                out.extend(_split_into_chunks(sentence, self.max_chars))
+        return out
+
+
+class SpeechScheduler:
+    """Synthesises chunks up to `lookahead` ahead of playback."""
+
+    LOOKAHEAD = int(os.environ.get("IRIS_TTS_LOOKAHEAD", "2"))
+
+    def __init__(self, synthesize: Synthesize, lookahead: Optional[int] = None, max_chars: int = 200):
+        self.lookahead = max(1, self.LOOKAHEAD if lookahead is None else lookahead)
+        self._synthesize = synthesize
+        self._segmenter = SentenceSegmenter(max_chars)
+        self._text_q: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._audio_q: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=self.lookahead)
+        self._cancel = threading.Event()
+        self._closed = False
+        self._ended = False
+        self.started_at = time.perf_counter()
+        self.first_text_at: Optional[float] = None
+        self.first_audio_at: Optional[float] = None
+        self.chunks_queued = 0
+        self.chunks_played = 0
+        self.synth_seconds = 0.0
+        self._worker = threading.Thread(
+            target=bind_context(self._run), daemon=True, name="tts-lookahead")
+        self._worker.start()
+
+    # ── producer side ─────────────────────────────────────────────────────
+
+    def feed(self, text: str) -> None:
+        """Add streamed text; complete sentences are queued for synthesis."""
+        if self._closed:
+            raise RuntimeError("SpeechScheduler is closed")
+        for chunk in self._segmenter.feed(text):
+            self._enqueue(chunk)
+
+    def close(self) -> None:
+        """No more text: synthesise the remainder and end the stream."""
+        if self._closed:
+            return
+        for chunk in self._segmenter.flush():
+            self._enqueue(chunk)
+        self._closed = True
+        self._text_q.put(None)
+
+    def _enqueue(self, chunk: str) -> None:
+        if self.first_text_at is None:
+            self.first_text_at = time.perf_counter()
+        self.chunks_queued += 1
+        self._text_q.put(chunk)
+
+    # ── consumer side ─────────────────────────────────────────────────────
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Next audio chunk in text order, or None once the stream has ended.
+
+        Raises queue.Empty if nothing arrives within timeout.
+        """
+        if self._ended:
+            return None
+        chunk = self._audio_q.get(timeout=timeout)
+        if chunk is None:
+            self._ended = True
+            return None
+        if self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+            _TIME_TO_FIRST_AUDIO.observe(self.first_audio_at - self.started_at)
+        self.chunks_played += 1
+        return chunk
+
+    def __iter__(self):
+        while True:
+            chunk = self.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    def cancel(self) -> None:
+        """Stop synthesising; pending text and audio are dropped."""
+        self._cancel.set()
+        self._closed = True
+        self._text_q.put(None)
+        while True:
+            try:
+                self._audio_q.get_nowait()
+            except queue.Empty:
+                break
+
+    @property
+    def time_to_first_audio(self) -> Optional[float]:
+        if self.first_audio_at is None:
+            return None
+        return self.first_audio_at - self.started_at
+
+    def get_stats(self) -> dict:
+        ttfa = self.time_to_first_audio
+        return {
+            "lookahead": self.lookahead,
+            "chunks_queued": self.chunks_queued,
+            "chunks_played": self.chunks_played,
+            "synth_s": round(self.synth_seconds, 3),
+            "time_to_first_audio_ms": None if ttfa is None else round(ttfa * 1000, 1),
+        }
+
+    # ── worker ────────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        try:
+            while not self._cancel.is_set():
+                text = self._text_q.get()
+                if text is None or self._cancel.is_set():
+                    break
+                t0 = time.perf_counter()
+                try:
+                    audio = self._synthesize(text)
+                except Exception as exc:
+                    logger.warning(f"[SpeechScheduler] Synthesis failed for {text[:40]!r}: {exc}")
+                    audio = None
+                self.synth_seconds += time.perf_counter() - t0
+                if audio is not None and len(audio) > 0:
+                    self._put(audio)
+        finally:
+            self._put(None)
+
+    def _put(self, item: Optional[np.ndarray]) -> None:
+        # Blocks while `lookahead` chunks are waiting — that is the lookahead bound
+        while not self._cancel.is_set():
+            try:
+                self._audio_q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        if item is None:
+            try:
+                self._audio_q.put_nowait(None)
+            except queue.Full:
+                pass
+
+
+class PhrasePrefetcher:
+    """
+    Speculatively synthesises the first sentences of a streaming reply.
+
+    Results land in the phrase cache via `synthesize`; nothing is returned.
+    `prepare` maps a raw sentence to the text that will eventually be
+    spoken (markdown stripped etc.) so the cache keys line up.
+    """
+
+    def __init__(
+        self,
+        synthesize: Synthesize,
+        prepare: Optional[Callable[[str], str]] = None,
+        max_phrases: int = 2,
+        max_chars: int = 200,
+    ):
+        self._synthesize = synthesize
+        self._prepare = prepare
+        self.max_phrases = max_phrases
+        self._max_chars = max_chars
+        self._segmenter = SentenceSegmenter(max_chars)
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.submitted: List[str] = []
+
+    def feed(self, text: str) -> None:
+        if len(self.submitted) >= self.max_phrases:
+            return
+        for sentence in self._segmenter.feed(text):
+            prepared = self._prepare(sentence) if self._prepare else sentence
+            chunks = SentenceSegmenter(self._max_chars)
+            for chunk in chunks.feed(prepared) + chunks.flush():
+                if len(self.submitted) >= self.max_phrases:
+                    return
+                self._submit(chunk)
+
+    def close(self) -> None:
+        """Stop after the phrases already submitted."""
+        self.max_phrases = len(self.submitted)
+        if self._worker is not None:
+            self._queue.put(None)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _submit(self, chunk: str) -> None:
+        self.submitted.append(chunk)
+        self._queue.put(chunk)
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=bind_context(self._run), daemon=True, name="tts-prefetch")
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            text = self._queue.get()
+            if text is None:
+                return
+            try:
+                self._synthesize(text)
+            except Exception as exc:
+                logger.debug(f"[PhrasePrefetcher] Prefetch failed for {text[:40]!r}: {exc}")
@@ -14,12 +14,21 @@ Key Features:
 - Request/response serialization and deserialization
 - Authentication header injection
 - Timeout handling with configurable duration
+- Per-endpoint keep-alive clients, EWMA latency/error scoring, circuit
+  breakers and optional hedged requests (see vps_routing.py)
+- Streaming inference (SSE or NDJSON) as OpenAI-style chat chunks, resumed
+  on another endpoint when the serving one fails mid-stream
 """
 
 import asyncio
+import inspect
+import json
 import logging
+import threading
+import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any
 from enum import Enum
 
 import httpx
@@ -27,6 +36,7 @@ from pydantic import BaseModel, Field
 
 from backend.core.logging_config import get_component_logger
 from .model_router import ModelRouter
+from .vps_routing import CircuitOpenError, EndpointRouter
 
 logger = get_component_logger("vps_gateway")
 
@@ -41,13 +51,7 @@ class LoadBalancingStrategy(str, Enum):
     """Load balancing strategy for multiple VPS endpoints."""
     ROUND_ROBIN = "round_robin"
     LEAST_LOADED = "least_loaded"
-
-
-class LoadBalancingStrategy(str, Enum):
-    """Load balancing strategy for multiple VPS endpoints."""
-    ROUND_ROBIN = "round_robin"
-    LEAST_LOADED = "least_loaded"
-
+    EWMA = "ewma"
 
 
 class VPSConfig(BaseModel):
@@ -61,9 +65,17 @@ class VPSConfig(BaseModel):
         health_check_interval: Health check interval in seconds (default 60)
         fallback_to_local: Fall back to local execution when VPS unavailable (default True)
         load_balancing: Enable load balancing across multiple endpoints (default False)
-        load_balancing_strategy: Strategy for load balancing - "round_robin" or "least_loaded" (default "round_robin")
+        load_balancing_strategy: Strategy for load balancing - "round_robin", "least_loaded"
+            or "ewma" (lowest EWMA latency × queue depth, penalised by error rate) (default "round_robin")
         protocol: Communication protocol - "rest" or "websocket" (default "rest")
         offload_tools: Offload tool execution to VPS in addition to model inference (default False)
+        hedge_requests: Send a second copy to another endpoint when the first has not answered
+            within its p95 latency; the slower copy is cancelled (default False)
+        hedge_min_delay_ms: Lower bound on the hedge delay in milliseconds (default 50)
+        circuit_failure_threshold: Consecutive failures that open an endpoint's circuit (default 3)
+        circuit_cooldown: Seconds an open circuit waits before a half-open probe (default 10)
+        max_keepalive_connections: Pooled keep-alive connections per endpoint (default 8)
+        keepalive_expiry: Seconds an idle pooled connection is kept (default 60)
     """
     enabled: bool = False
     endpoints: List[str] = Field(default_factory=list)
@@ -75,6 +87,12 @@ class VPSConfig(BaseModel):
     load_balancing_strategy: LoadBalancingStrategy = LoadBalancingStrategy.ROUND_ROBIN
     protocol: VPSProtocol = VPSProtocol.REST
     offload_tools: bool = False
+    hedge_requests: bool = False
+    hedge_min_delay_ms: int = 50
+    circuit_failure_threshold: int = 3
+    circuit_cooldown: float = 10.0
+    max_keepalive_connections: int = 8
+    keepalive_expiry: float = 60.0
 
 
 class VPSHealthStatus(BaseModel):
@@ -138,6 +156,61 @@ class VPSInferenceResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+# Errors after which a stream is resumed on another endpoint
+_STREAM_ERRORS = (httpx.HTTPError, OSError, ValueError, CircuitOpenError)
+
+
+async def _iter_stream_events(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Decode a streaming /api/v1/infer/stream body: SSE ``data:`` events or NDJSON lines.
+
+    Lines are pulled from the socket only as the consumer asks for the next
+    event, so a slow consumer throttles the remote through TCP flow control
+    instead of buffering the completion in memory.
+    """
+    sse = response.headers.get("content-type", "").startswith("text/event-stream")
+    data: List[str] = []
+    async for line in response.aiter_lines():
+        if not sse:
+            if line.strip():
+                yield json.loads(line)
+            continue
+        if line.startswith("data:"):
+            data.append(line[5:].lstrip())
+        elif not line and data:
+            payload, data = "\n".join(data), []
+            if payload == "[DONE]":
+                return
+            yield json.loads(payload)
+    if sse and data and data != ["[DONE]"]:
+        yield json.loads("\n".join(data))
+
+
+def _event_text(event: Dict[str, Any]) -> str:
+    """Token text of one stream event: {"text": ...}, {"delta": ...} or an OpenAI chat chunk."""
+    if "text" in event or "delta" in event:
+        text = event.get("text", event.get("delta"))
+        return text if isinstance(text, str) else ""
+    choices = event.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+def _chat_chunk(model: str, content: Optional[str], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+    """One chunk in the shape LocalModelManager.create_chat_completion_stream yields."""
+    delta = {"content": content} if content is not None else {}
+    return {
+        "object": "chat.completion.chunk",
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+async def _deliver(on_token: Optional[Callable[[str], Any]], token: str) -> None:
+    if on_token is not None:
+        result = on_token(token)
+        if inspect.isawaitable(result):
+            await result
+
+
 class VPSGateway:
     """Gateway for routing model inference to remote VPS or local execution.
     
@@ -178,10 +251,16 @@ class VPSGateway:
         """
         self._config = config
         self._model_router = model_router
-        self._http_client: Optional[httpx.AsyncClient] = None
+        self._router: Optional[EndpointRouter] = None
         self._health_status: Dict[str, VPSHealthStatus] = {}
         self._health_check_task: Optional[asyncio.Task] = None
         self._endpoint_index = 0  # For round-robin load balancing
+        # The loop initialize() ran on owns the router's clients and the
+        # health-check task; infer_sync() starts a dedicated thread loop when
+        # nothing else has initialized the gateway
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
         
         logger.info(
             "VPS Gateway initialized",
@@ -201,10 +280,23 @@ class VPSGateway:
             logger.info("VPS Gateway disabled, skipping initialization")
             return
         
-        # Initialize HTTP client
-        self._http_client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self._config.timeout),
-            follow_redirects=True
+        self._loop = asyncio.get_running_loop()
+        
+        # Long-lived keep-alive client, EWMA stats and circuit breaker per endpoint
+        headers = {}
+        if self._config.auth_token:
+            headers["Authorization"] = f"Bearer {self._config.auth_token}"
+        self._router = EndpointRouter(
+            self._config.endpoints,
+            timeout=self._config.timeout,
+            headers=headers,
+            max_keepalive_connections=self._config.max_keepalive_connections,
+            keepalive_expiry=self._config.keepalive_expiry,
+            failure_threshold=self._config.circuit_failure_threshold,
+            cooldown=self._config.circuit_cooldown,
+            hedge=self._config.hedge_requests,
+            hedge_min_delay=self._config.hedge_min_delay_ms / 1000.0,
+            on_result=self._record_result,
         )
         
         # Initialize health status for all endpoints
@@ -227,8 +319,18 @@ class VPSGateway:
     async def shutdown(self) -> None:
         """Shutdown the VPS Gateway.
         
-        Cancels health check task and closes HTTP client.
+        Cancels health check task and closes the pooled HTTP clients on the
+        loop that owns them, then stops the gateway's own loop thread if
+        infer_sync() started one.
         """
+        loop = self._loop
+        if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._shutdown(), loop))
+        else:
+            await self._shutdown()
+        self._stop_loop_thread()
+    
+    async def _shutdown(self) -> None:
         logger.info("Shutting down VPS Gateway")
         
         # Cancel health check task
@@ -238,13 +340,90 @@ class VPSGateway:
                 await self._health_check_task
             except asyncio.CancelledError:
                 pass
+            self._health_check_task = None
         
-        # Close HTTP client
-        if self._http_client:
-            await self._http_client.aclose()
+        # Close pooled HTTP clients
+        if self._router:
+            await self._router.aclose()
+            self._router = None
         
         logger.info("VPS Gateway shutdown complete")
     
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop that owns the gateway, started and initialized on first use."""
+        with self._loop_lock:
+            if self._loop is not None and self._loop.is_running():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="vps-gateway-loop", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self.initialize(), loop).result()
+            except BaseException:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=5.0)
+                raise
+            self._loop, self._loop_thread = loop, thread
+            return loop
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """shutdown() for synchronous callers, when infer_sync() started the gateway's loop."""
+        loop, thread = self._loop, self._loop_thread
+        if loop is None or thread is None or thread is threading.current_thread():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.warning("VPS Gateway shutdown failed", error=str(e))
+        self._stop_loop_thread()
+    
+    def _stop_loop_thread(self) -> None:
+        thread, loop = self._loop_thread, self._loop
+        if thread is None or loop is None:
+            return
+        self._loop_thread = None
+        self._loop = None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+            if not thread.is_alive():
+                loop.close()
+    
+    def infer_sync(
+        self,
+        model: str,
+        prompt: str,
+        context: Dict[str, Any],
+        params: Dict[str, Any],
+        session_id: str = "default",
+        timeout: Optional[float] = None
+    ) -> str:
+        """Blocking infer() for synchronous callers.
+        
+        Every call runs on the one loop that owns the keep-alive clients,
+        circuit breakers and health-check task. A fresh asyncio.run() loop
+        per call would leave those clients bound to a closed loop, failing
+        every other request with "Event loop is closed".
+        
+        Raises:
+            RuntimeError: If called from the gateway's own loop (await infer() there)
+            TimeoutError: If ``timeout`` elapses first
+        """
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("infer_sync() called on the VPS Gateway's own event loop; await infer()")
+        future = asyncio.run_coroutine_threadsafe(
+            self.infer(model, prompt, context, params, session_id), loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+    
     async def infer(
         self,
         model: str,
@@ -279,22 +458,19 @@ class VPSGateway:
                         endpoint=endpoint,
                         session_id=session_id
                     )
-                    return await self.infer_remote(endpoint, model, prompt, context, params, session_id)
+                    return await self.infer_remote(
+                        endpoint, model, prompt, context, params, session_id,
+                        backups=self._backup_endpoints(endpoint)
+                    )
                 except Exception as e:
+                    # Endpoint health and circuit state were already updated
+                    # per attempt by _record_result
                     logger.error(
                         "VPS inference failed, falling back to local",
                         error=str(e),
                         endpoint=endpoint,
                         model=model
                     )
-                    # Mark endpoint as unavailable (only if not already updated by infer_remote)
-                    if endpoint in self._health_status:
-                        # Only update if the endpoint is still marked as available
-                        # (infer_remote already updated it on timeout/error)
-                        if self._health_status[endpoint].available:
-                            self._health_status[endpoint].available = False
-                            self._health_status[endpoint].consecutive_failures += 1
-                            self._health_status[endpoint].error_message = str(e)
                     
                     # Fall through to local execution if fallback enabled
                     if not self._config.fallback_to_local:
@@ -317,7 +493,8 @@ class VPSGateway:
         prompt: str,
         context: Dict[str, Any],
         params: Dict[str, Any],
-        session_id: str = "default"
+        session_id: str = "default",
+        backups: Optional[List[str]] = None
     ) -> str:
         """Execute inference on remote VPS.
         
@@ -328,6 +505,7 @@ class VPSGateway:
             context: Context dictionary
             params: Model parameters
             session_id: Session identifier
+            backups: Other endpoints, best first, to fail over to or hedge on
         
         Returns:
             Generated text from the model
@@ -335,17 +513,113 @@ class VPSGateway:
         Raises:
             httpx.TimeoutException: If request times out
             httpx.HTTPError: If HTTP request fails
+            CircuitOpenError: If the endpoint's circuit breaker is open
             ValueError: If response is invalid
         """
-        if not self._http_client:
+        if not self._router:
             raise RuntimeError("VPS Gateway not initialized")
         
-        # Increment active requests counter
-        if endpoint in self._health_status:
-            self._health_status[endpoint].active_requests += 1
+        if self._config.protocol != VPSProtocol.REST:
+            # WebSocket implementation would go here
+            # For now, raise NotImplementedError
+            raise NotImplementedError("WebSocket protocol not yet implemented")
         
+        # Create inference request
+        request = VPSInferenceRequest(
+            model=model,
+            prompt=prompt,
+            context=context,
+            parameters=params,
+            session_id=session_id
+        )
+        
+        start_time = time.perf_counter()
         try:
-            # Create inference request
+            served_by, response = await self._router.request(
+                "POST", "/api/v1/infer", [endpoint, *(backups or [])],
+                json=request.model_dump()
+            )
+            response.raise_for_status()
+            
+            # Parse response
+            inference_response = VPSInferenceResponse(**response.json())
+        
+        except httpx.TimeoutException:
+            logger.error(
+                "VPS inference timeout - falling back to local execution",
+                endpoint=endpoint,
+                model=model,
+                timeout=self._config.timeout,
+                session_id=session_id,
+                consecutive_failures=self._health_status[endpoint].consecutive_failures if endpoint in self._health_status else 0
+            )
+            raise
+        
+        except httpx.HTTPError as e:
+            logger.error(
+                "VPS HTTP error - falling back to local execution",
+                endpoint=endpoint,
+                model=model,
+                error=str(e),
+                status_code=getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None,
+                session_id=session_id,
+                consecutive_failures=self._health_status[endpoint].consecutive_failures if endpoint in self._health_status else 0
+            )
+            raise
+        
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "VPS inference successful",
+            endpoint=served_by,
+            model=model,
+            latency_ms=latency_ms,
+            session_id=session_id
+        )
+        
+        return inference_response.text
+    
+    async def infer_stream(
+        self,
+        model: str,
+        prompt: str,
+        context: Dict[str, Any],
+        params: Dict[str, Any],
+        session_id: str = "default",
+        on_token: Optional[Callable[[str], Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream inference from the VPS as OpenAI-style chat chunks.
+        
+        Yields the same chunk dicts as LocalModelManager.create_chat_completion_stream
+        (``chunk["choices"][0]["delta"]["content"]``), ending with a chunk whose
+        finish_reason is "stop".  `on_token` is called with each token's text; if it
+        returns an awaitable the stream waits for it, so a slow consumer (e.g. TTS)
+        applies backpressure instead of tokens piling up.
+        
+        If the serving endpoint fails mid-stream the request is resumed on the next
+        endpoint with ``resume_from`` set to the text already delivered.  Servers that
+        report an ``offset`` per event and restart from the beginning are de-duplicated,
+        so no token is delivered twice.  Without a usable endpoint (or if every endpoint
+        fails before the first token) the local model answers in a single chunk when
+        fallback_to_local is on.
+        
+        Args:
+            model: Model identifier
+            prompt: Input prompt
+            context: Context dictionary
+            params: Model parameters
+            session_id: Session identifier
+            on_token: Optional callback receiving each token's text
+        
+        Raises:
+            httpx.HTTPError: If every endpoint failed and fallback is not possible
+        """
+        endpoint = None
+        if self._config.enabled and self.is_vps_available():
+            endpoint = await self._select_endpoint()
+        
+        delivered = ""
+        last_error: Optional[BaseException] = None
+        if endpoint and self._router:
             request = VPSInferenceRequest(
                 model=model,
                 prompt=prompt,
@@ -353,94 +627,118 @@ class VPSGateway:
                 parameters=params,
                 session_id=session_id
             )
-            
-            # Prepare headers with authentication
-            headers = {}
-            if self._config.auth_token:
-                headers["Authorization"] = f"Bearer {self._config.auth_token}"
-            headers["Content-Type"] = "application/json"
-            
-            # Send request based on protocol
-            if self._config.protocol == VPSProtocol.REST:
-                start_time = datetime.now()
-                
-                try:
-                    response = await self._http_client.post(
-                        f"{endpoint}/api/v1/infer",
-                        json=request.dict(),
-                        headers=headers
-                    )
-                    response.raise_for_status()
-                    
-                    # Parse response
-                    response_data = response.json()
-                    inference_response = VPSInferenceResponse(**response_data)
-                    
-                    # Update health status
-                    latency_ms = (datetime.now() - start_time).total_seconds() * 1000
-                    if endpoint in self._health_status:
-                        self._health_status[endpoint].available = True
-                        self._health_status[endpoint].last_success = datetime.now()
-                        self._health_status[endpoint].consecutive_failures = 0
-                        self._health_status[endpoint].latency_ms = latency_ms
-                        self._health_status[endpoint].error_message = None
-                    
-                    logger.info(
-                        "VPS inference successful",
-                        endpoint=endpoint,
-                        model=model,
-                        latency_ms=latency_ms,
-                        session_id=session_id
-                    )
-                    
-                    return inference_response.text
-                
-                except httpx.TimeoutException as e:
-                    # Update health status on timeout
-                    if endpoint in self._health_status:
-                        self._health_status[endpoint].available = False
-                        self._health_status[endpoint].consecutive_failures += 1
-                        self._health_status[endpoint].error_message = f"Timeout after {self._config.timeout}s"
-                    
-                    logger.error(
-                        "VPS inference timeout - falling back to local execution",
-                        endpoint=endpoint,
-                        model=model,
-                        timeout=self._config.timeout,
-                        session_id=session_id,
-                        consecutive_failures=self._health_status[endpoint].consecutive_failures if endpoint in self._health_status else 0
-                    )
-                    raise
-                
-                except httpx.HTTPError as e:
-                    # Update health status on HTTP error
-                    if endpoint in self._health_status:
-                        self._health_status[endpoint].available = False
-                        self._health_status[endpoint].consecutive_failures += 1
-                        self._health_status[endpoint].error_message = str(e)
-                    
-                    logger.error(
-                        "VPS HTTP error - falling back to local execution",
-                        endpoint=endpoint,
-                        model=model,
-                        error=str(e),
-                        status_code=getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None,
-                        session_id=session_id,
-                        consecutive_failures=self._health_status[endpoint].consecutive_failures if endpoint in self._health_status else 0
-                    )
-                    raise
-            
-            else:  # WebSocket protocol
-                # WebSocket implementation would go here
-                # For now, raise NotImplementedError
-                raise NotImplementedError("WebSocket protocol not yet implemented")
-        
-        finally:
-            # Decrement active requests counter
-            if endpoint in self._health_status:
-                self._health_status[endpoint].active_requests = max(
-                    0, self._health_status[endpoint].active_requests - 1
+            for attempt in [endpoint, *self._backup_endpoints(endpoint)][:2]:
+                failed: Optional[BaseException] = None
+                async with aclosing(self._stream_endpoint(attempt, request, delivered)) as tokens:
+                    while True:
+                        # Only errors from the endpoint trigger a resume — errors
+                        # raised by on_token or the consumer propagate unchanged
+                        try:
+                            token = await tokens.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        except _STREAM_ERRORS as e:
+                            failed = e
+                            break
+                        delivered += token
+                        await _deliver(on_token, token)
+                        yield _chat_chunk(model, token)
+                if failed is None:
+                    yield _chat_chunk(model, None, "stop")
+                    return
+                last_error = failed
+                logger.warning(
+                    "VPS stream failed" + (" mid-stream, resuming" if delivered else ""),
+                    endpoint=attempt,
+                    delivered_chars=len(delivered),
+                    error=str(failed) or type(failed).__name__,
+                    session_id=session_id
                 )
+        
+        if delivered or (last_error is not None and not self._config.fallback_to_local):
+            # Part of the answer is already out — a local restart would repeat it
+            raise last_error
+        
+        logger.debug("Using local inference for stream", model=model, session_id=session_id)
+        text = await self.infer_local(model, prompt, context, params)
+        await _deliver(on_token, text)
+        yield _chat_chunk(model, text)
+        yield _chat_chunk(model, None, "stop")
+    
+    async def _stream_endpoint(
+        self,
+        endpoint: str,
+        request: VPSInferenceRequest,
+        delivered: str
+    ) -> AsyncIterator[str]:
+        """Token texts from one endpoint's stream, skipping anything already delivered."""
+        body = request.model_dump()
+        body["stream"] = True
+        if delivered:
+            body["resume_from"] = delivered
+        position = len(delivered)
+        start = time.perf_counter()
+        first = True
+        async with self._router.stream(
+            endpoint, "POST", "/api/v1/infer/stream", json=body,
+            headers={"Accept": "text/event-stream"}
+        ) as response:
+            async for event in _iter_stream_events(response):
+                if event.get("error"):
+                    raise httpx.RemoteProtocolError(str(event["error"]))
+                text = _event_text(event)
+                offset = event.get("offset")
+                if isinstance(offset, int):
+                    # Server restarted from `offset`: drop what the user already has
+                    skip = max(0, position - offset)
+                    position = max(position, offset + len(text))
+                    text = text[skip:]
+                else:
+                    position += len(text)
+                if not text:
+                    continue
+                if first:
+                    first = False
+                    ttft = time.perf_counter() - start
+                    self._router.observe_ttft(endpoint, ttft)
+                    logger.debug("VPS stream first token", endpoint=endpoint,
+                                 ttft_ms=round(ttft * 1000, 1))
+                yield text
+    
+    def _backup_endpoints(self, primary: str) -> List[str]:
+        """Other usable endpoints, best EWMA score first."""
+        candidates = [endpoint for endpoint in self._usable() if endpoint != primary]
+        return self._router.rank(candidates) if self._router else []
+    
+    def _usable(self) -> List[str]:
+        """Endpoints that passed their health check and whose circuit admits traffic."""
+        return [
+            endpoint for endpoint, status in self._health_status.items()
+            if status.available and (self._router is None or self._router.available(endpoint))
+        ]
+    
+    def _record_result(
+        self,
+        endpoint: str,
+        ok: bool,
+        latency: Optional[float],
+        error: Optional[str]
+    ) -> None:
+        """Per-attempt callback from the router — keeps VPSHealthStatus current."""
+        status = self._health_status.get(endpoint)
+        if status is None:
+            return
+        if ok:
+            status.available = True
+            status.last_success = datetime.now()
+            status.consecutive_failures = 0
+            status.latency_ms = self._router.snapshot(endpoint)["ewma_latency_ms"] if self._router else None
+            status.error_message = None
+        else:
+            # Not marked unavailable here: the endpoint leaves rotation when
+            # its circuit opens (see _usable), not on a single failure
+            status.consecutive_failures += 1
+            status.error_message = error
     
     async def infer_local(
         self,
@@ -512,21 +810,16 @@ class VPSGateway:
         Returns:
             True if endpoint is healthy, False otherwise
         """
-        if not self._http_client:
+        if not self._router or endpoint not in self._router.endpoints:
             return False
         
         try:
-            # Prepare headers with authentication
-            headers = {}
-            if self._config.auth_token:
-                headers["Authorization"] = f"Bearer {self._config.auth_token}"
-            
             start_time = datetime.now()
             
-            # Send health check request
-            response = await self._http_client.get(
-                f"{endpoint}/api/v1/health",
-                headers=headers,
+            # Send health check request over the endpoint's pooled client
+            # (auth header is set on the client)
+            response = await self._router.client(endpoint).get(
+                "/api/v1/health",
                 timeout=5.0  # Short timeout for health checks
             )
             response.raise_for_status()
@@ -599,17 +892,18 @@ class VPSGateway:
     async def _select_endpoint(self) -> Optional[str]:
         """Select an available VPS endpoint based on configured strategy.
         
-        Supports two strategies:
+        Supports three strategies:
         - round_robin: Cycle through available endpoints in order
         - least_loaded: Select endpoint with lowest latency or fewest active requests
+        - ewma: Select endpoint with the lowest EWMA latency × (in-flight + 1),
+          inflated by its EWMA error rate
+        
+        Endpoints whose circuit breaker is open are skipped by every strategy.
         
         Returns:
             Selected endpoint URL, or None if no endpoints available
         """
-        available_endpoints = [
-            endpoint for endpoint, status in self._health_status.items()
-            if status.available
-        ]
+        available_endpoints = self._usable()
         
         if not available_endpoints:
             logger.warning("No available VPS endpoints")
@@ -643,7 +937,7 @@ class VPSGateway:
             def calculate_load(endpoint: str) -> float:
                 status = self._health_status[endpoint]
                 # Base load from active requests
-                load = float(status.active_requests)
+                load = float(self._active_requests(endpoint))
                 # Add latency component (convert ms to seconds for weighting)
                 if status.latency_ms is not None:
                     load += status.latency_ms / 1000.0
@@ -660,11 +954,20 @@ class VPSGateway:
                 "Selected endpoint using least-loaded",
                 endpoint=selected_endpoint,
                 load=selected_load,
-                active_requests=self._health_status[selected_endpoint].active_requests,
+                active_requests=self._active_requests(selected_endpoint),
                 latency_ms=self._health_status[selected_endpoint].latency_ms
             )
             return selected_endpoint
         
+        elif self._config.load_balancing_strategy == LoadBalancingStrategy.EWMA:
+            selected_endpoint = self._router.rank(available_endpoints)[0]
+            logger.debug(
+                "Selected endpoint using EWMA",
+                endpoint=selected_endpoint,
+                **self._router.snapshot(selected_endpoint)
+            )
+            return selected_endpoint
+        
         else:
             # Unknown strategy - fall back to first available
             logger.warning(
@@ -679,7 +982,12 @@ class VPSGateway:
         Returns:
             True if at least one endpoint is available, False otherwise
         """
-        return any(status.available for status in self._health_status.values())
+        return bool(self._usable())
+    
+    def _active_requests(self, endpoint: str) -> int:
+        if self._router and endpoint in self._router.stats:
+            return self._router.stats[endpoint].in_flight
+        return self._health_status[endpoint].active_requests if endpoint in self._health_status else 0
     
     def get_status(self) -> Dict[str, Any]:
         """Get current VPS Gateway status.
@@ -693,7 +1001,8 @@ class VPSGateway:
             "load_balancing": self._config.load_balancing,
             "load_balancing_strategy": self._config.load_balancing_strategy if self._config.load_balancing else None,
             "endpoints": len(self._config.endpoints),
-            "available_endpoints": sum(1 for s in self._health_status.values() if s.available),
+            "available_endpoints": len(self._usable()),
+            "hedge_requests": self._config.hedge_requests,
             "health_status": {
                 endpoint: {
                     "available": status.available,
@@ -701,8 +1010,9 @@ class VPSGateway:
                     "last_success": status.last_success.isoformat() if status.last_success else None,
                     "consecutive_failures": status.consecutive_failures,
                     "latency_ms": status.latency_ms,
-                    "active_requests": status.active_requests,
-                    "error_message": status.error_message
+                    "active_requests": self._active_requests(endpoint),
+                    "error_message": status.error_message,
+                    "routing": self._router.snapshot(endpoint) if self._router else None
                 }
                 for endpoint, status in self._health_status.items()
             }
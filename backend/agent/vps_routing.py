@@ -0,0 +1,391 @@
+"""
+VPS request routing — pooled clients, EWMA scoring, circuit breakers, hedging.
+
+VPSGateway used to send every remote inference through one shared client
+and pick endpoints by round-robin or a load figure built from the last
+health-check latency.  A single slow or failing endpoint then set the tail
+latency until the next health check (60 s) noticed it.  EndpointRouter
+keeps, per endpoint:
+
+  client    a long-lived httpx.AsyncClient with keep-alive, so requests
+            reuse warm TCP/TLS connections
+  stats     EWMA of request latency and of the error rate, plus a window
+            of recent latencies for the p95
+  breaker   closed → open after `failure_threshold` consecutive failures;
+            after the cooldown one half-open probe request is let through,
+            which closes the breaker or re-opens it with a doubled cooldown
+
+request() sends to the first endpoint of a caller-ordered list.  With
+hedging on, if no answer has arrived after that endpoint's p95 latency a
+second copy goes to the next endpoint; the first success wins and the
+other request is cancelled.  A request that fails outright fails over to
+the next endpoint straight away.  At most two endpoints are tried.
+
+stream() opens one streaming response on one endpoint under the same
+breaker and in-flight accounting; failover for streams (resuming after
+the text already delivered) is up to the caller, see
+VPSGateway.infer_stream().  Streams report time to first token with
+observe_ttft() instead of a latency sample, since their total duration
+depends on the completion length.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from backend.core.logging_config import get_component_logger
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = get_component_logger("vps_gateway")
+
+_metrics = get_metrics_registry()
+_REQUEST_SECONDS = _metrics.summary(
+    "iris_vps_request_seconds", "Latency of successful VPS requests", ["endpoint"])
+_REQUEST_ERRORS = _metrics.counter(
+    "iris_vps_request_errors_total", "Failed VPS requests", ["endpoint"])
+_HEDGES = _metrics.counter(
+    "iris_vps_hedged_requests_total", "Hedged VPS requests by which copy answered first", ["winner"])
+_TTFT_SECONDS = _metrics.summary(
+    "iris_vps_ttft_seconds", "Time from sending a streaming VPS request to its first token", ["endpoint"])
+_BREAKER_OPENED = _metrics.counter(
+    "iris_vps_circuit_open_total", "Times a VPS endpoint's circuit breaker opened", ["endpoint"])
+
+
+class CircuitOpenError(RuntimeError):
+    """The endpoint's circuit breaker is open (or its half-open probe is in flight)."""
+
+
+class NoEndpointAvailable(RuntimeError):
+    """No endpoint could take the request."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe and exponential cooldown."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 10.0,
+        max_cooldown: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() >= self._open_until:
+            return self.HALF_OPEN
+        return self._state
+
+    def available(self) -> bool:
+        """Would acquire() succeed right now?  Does not take the probe slot."""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probe_in_flight)
+
+    def acquire(self) -> bool:
+        """Admit a request; in half-open state only the single probe is admitted."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """A request finished without a verdict (cancelled) — free the probe slot."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._cooldown = self.base_cooldown
+        self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure.  Returns True if this opened the breaker."""
+        if self._state == self.HALF_OPEN:
+            # Probe failed — back off harder
+            self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+            self._trip()
+            return True
+        self._failures += 1
+        if self._state == self.CLOSED and self._failures >= self.failure_threshold:
+            self._trip()
+            return True
+        return False
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._open_until = self._clock() + self._cooldown
+        self._probe_in_flight = False
+
+
+class EndpointStats:
+    """EWMA latency / error rate and a window of recent latencies for one endpoint."""
+
+    WINDOW = 200
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None     # seconds
+        self.ewma_ttft: Optional[float] = None        # seconds, streaming requests
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=self.WINDOW)
+
+    def observe(self, latency: float) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.ewma_latency = latency if self.ewma_latency is None else (
+            self.alpha * latency + (1 - self.alpha) * self.ewma_latency)
+        self.error_rate *= 1 - self.alpha
+
+    def observe_ttft(self, ttft: float) -> None:
+        self.ewma_ttft = ttft if self.ewma_ttft is None else (
+            self.alpha * ttft + (1 - self.alpha) * self.ewma_ttft)
+
+    def observe_error(self) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class EndpointRouter:
+    """Per-endpoint pooled clients, EWMA ranking, circuit breakers and hedged requests."""
+
+    # Hedging waits for this many latency samples before trusting the p95
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        *,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+        max_keepalive_connections: int = 8,
+        keepalive_expiry: float = 60.0,
+        alpha: float = 0.3,
+        failure_threshold: int = 3,
+        cooldown: float = 10.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        on_result: Optional[Callable[[str, bool, Optional[float], Optional[str]], None]] = None,
+    ):
+        self.endpoints = list(endpoints)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self._on_result = on_result
+        limits = httpx.Limits(max_keepalive_connections=max_keepalive_connections,
+                              keepalive_expiry=keepalive_expiry)
+        self._clients: Dict[str, httpx.AsyncClient] = {
+            ep: httpx.AsyncClient(base_url=ep, timeout=httpx.Timeout(timeout), limits=limits,
+                                  headers=headers or {}, follow_redirects=True)
+            for ep in self.endpoints
+        }
+        self.stats: Dict[str, EndpointStats] = {ep: EndpointStats(alpha) for ep in self.endpoints}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            ep: CircuitBreaker(failure_threshold, cooldown) for ep in self.endpoints}
+
+    # ── selection ───────────────────────────────────────────────────────────
+
+    def client(self, endpoint: str) -> httpx.AsyncClient:
+        return self._clients[endpoint]
+
+    def available(self, endpoint: str) -> bool:
+        return endpoint in self.breakers and self.breakers[endpoint].available()
+
+    def score(self, endpoint: str) -> float:
+        """Expected wait: EWMA latency × (queued + 1), inflated by the error rate."""
+        stats = self.stats[endpoint]
+        # Unmeasured endpoints score 0 so each one gets tried once
+        latency = stats.ewma_latency or stats.ewma_ttft or 0.0
+        return latency * (stats.in_flight + 1) / max(0.05, 1.0 - stats.error_rate)
+
+    def rank(self, endpoints: List[str]) -> List[str]:
+        """Endpoints whose breaker admits traffic, best score first."""
+        return sorted((ep for ep in endpoints if self.available(ep)), key=self.score)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait on `endpoint` before hedging; None until enough samples exist."""
+        stats = self.stats[endpoint]
+        if len(stats.latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.hedge_min_delay, stats.quantile(self.hedge_quantile) or 0.0)
+
+    # ── requests ────────────────────────────────────────────────────────────
+
+    async def request(self, method: str, path: str, endpoints: List[str],
+                      **kwargs: Any) -> Tuple[str, httpx.Response]:
+        """
+        Send to endpoints[0], hedging or failing over to endpoints[1].
+
+        Returns (endpoint, response) from the first success.  Raises the last
+        error when every attempt failed, or NoEndpointAvailable.
+        """
+        order = [ep for ep in endpoints if ep in self._clients][:2]
+        if not order:
+            raise NoEndpointAvailable("no VPS endpoint configured for this request")
+        backups = order[1:]
+        pending: Dict[asyncio.Task, str] = {
+            asyncio.ensure_future(self._attempt(order[0], method, path, kwargs)): "primary"}
+        delay = self.hedge_delay(order[0]) if self.hedge and backups else None
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=delay,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary slower than its p95 — hedge on the next endpoint
+                    delay, hedged = None, True
+                    logger.debug("Hedging VPS request", endpoint=backups[0], path=path)
+                    pending[asyncio.ensure_future(
+                        self._attempt(backups.pop(0), method, path, kwargs))] = "hedge"
+                    continue
+                for task in done:
+                    role = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if hedged:
+                            _HEDGES.labels(role).inc()
+                        return task.result()
+                    last_error = error
+                if not pending and backups:
+                    # Failed outright — fail over without waiting for a hedge delay
+                    delay = None
+                    pending[asyncio.ensure_future(
+                        self._attempt(backups.pop(0), method, path, kwargs))] = "failover"
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        raise last_error if last_error is not None else NoEndpointAvailable(path)
+
+    async def _attempt(self, endpoint: str, method: str, path: str,
+                       kwargs: Dict[str, Any]) -> Tuple[str, httpx.Response]:
+        breaker, stats = self.breakers[endpoint], self.stats[endpoint]
+        if not breaker.acquire():
+            raise CircuitOpenError(f"circuit open for {endpoint}")
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await self._clients[endpoint].request(method, path, **kwargs)
+            if response.status_code >= 500 or response.status_code == 429:
+                response.raise_for_status()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            stats.observe_error()
+            _REQUEST_ERRORS.labels(endpoint).inc()
+            if breaker.record_failure():
+                _BREAKER_OPENED.labels(endpoint).inc()
+                logger.warning("VPS endpoint circuit opened", endpoint=endpoint, error=str(e))
+            self._report(endpoint, False, None, str(e) or type(e).__name__)
+            raise
+        finally:
+            stats.in_flight -= 1
+        latency = time.perf_counter() - start
+        stats.observe(latency)
+        breaker.record_success()
+        _REQUEST_SECONDS.labels(endpoint).observe(latency)
+        self._report(endpoint, True, latency, None)
+        return endpoint, response
+
+    @asynccontextmanager
+    async def stream(self, endpoint: str, method: str, path: str,
+                     **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        A streaming response from one endpoint.  Errors while opening or
+        reading it count against the endpoint's breaker; closing it early
+        (the consumer stopped reading) does not.
+        """
+        breaker, stats = self.breakers[endpoint], self.stats[endpoint]
+        if not breaker.acquire():
+            raise CircuitOpenError(f"circuit open for {endpoint}")
+        stats.in_flight += 1
+        try:
+            async with self._clients[endpoint].stream(method, path, **kwargs) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                yield response
+        except (httpx.HTTPError, OSError, ValueError) as e:
+            status = getattr(getattr(e, "response", None), "status_code", 500)
+            if status >= 500 or status == 429:
+                stats.observe_error()
+                _REQUEST_ERRORS.labels(endpoint).inc()
+                if breaker.record_failure():
+                    _BREAKER_OPENED.labels(endpoint).inc()
+                    logger.warning("VPS endpoint circuit opened", endpoint=endpoint, error=str(e))
+                self._report(endpoint, False, None, str(e) or type(e).__name__)
+            else:
+                breaker.release()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            self._report(endpoint, True, None, None)
+        finally:
+            stats.in_flight -= 1
+
+    def observe_ttft(self, endpoint: str, ttft: float) -> None:
+        self.stats[endpoint].observe_ttft(ttft)
+        _TTFT_SECONDS.labels(endpoint).observe(ttft)
+
+    def _report(self, endpoint: str, ok: bool, latency: Optional[float], error: Optional[str]) -> None:
+        if self._on_result is not None:
+            try:
+                self._on_result(endpoint, ok, latency, error)
+            except Exception as e:
+                logger.debug("VPS result callback failed", error=str(e))
+
+    # ── lifecycle / introspection ───────────────────────────────────────────
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(c.aclose() for c in self._clients.values()), return_exceptions=True)
+
+    def snapshot(self, endpoint: str) -> Dict[str, Any]:
+        stats = self.stats[endpoint]
+        p95 = stats.quantile(0.95)
+        return {
+            "ewma_latency_ms": round(stats.ewma_latency * 1000, 1) if stats.ewma_latency is not None else None,
+            "ewma_ttft_ms": round(stats.ewma_ttft * 1000, 1) if stats.ewma_ttft is not None else None,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(stats.error_rate, 3),
+            "in_flight": stats.in_flight,
+            "requests": stats.requests,
+            "errors": stats.errors,
+            "circuit": self.breakers[endpoint].state,
+        }
@@ -0,0 +1,23 @@
+"""Prometheus-style metrics endpoint.
+
+GET /metrics renders the process-wide MetricsRegistry in the text exposition
+format.  Quantiles are computed from the sketches only when this is scraped;
+the backend binds to 127.0.0.1, so the endpoint is local-only.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.monitoring.metrics import get_metrics_registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Return every registered counter, gauge and summary as Prometheus text."""
+    return PlainTextResponse(
+        get_metrics_registry().render_prometheus(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -2,56 +2,84 @@
 
 Returns one JSON aggregating: online state, git status & recent log, pending
 writes, and any other state currently scattered across /api/* endpoints.
+
+The snapshot is maintained by StatusService: git state is gathered with
+asyncio subprocesses (never blocking the event loop) and refreshed only when
+the working tree or .git metadata changes, as reported by dev/file_watcher.
+
+system_status messages carry a sequence number.  A full snapshot
+({"delta": false, "seq": n, ...fields}) is sent to each client when it
+connects (request_state) or asks for one (request_status); after that only
+field-level deltas are broadcast ({"delta": true, "seq": n, "base_seq": n-1,
+...changed fields}, removed keys as null).  A client merges a delta only if
+base_seq matches the seq it holds, and requests a full snapshot otherwise.
 """
 import asyncio
-import json
 import logging
 import os
-import subprocess
 import time
 from fastapi import APIRouter
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
+
+from backend.performance.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
 
-async def get_git_status() -> dict[str, Any]:
-    """Fetch current git status and recent log for the project."""
-    try:
-        # Get the project root
-        project_root = os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        )
+# Path fragments whose changes never affect `git status` / `git log` output
+# (ignored or generated trees, and gitignored files the backend itself writes
+# at runtime).  Checked against '/'-normalised paths.
+_IGNORED_FRAGMENTS = (
+    "/node_modules/", "/__pycache__/", "/.next/", "/.pytest_cache/",
+    "/.mypy_cache/", "/src-tauri/target/", "/backend/logs/", "/.git/objects/",
+    "/.git/logs/", "/backend/voice/tts_cache/", "/data/stt_fixtures/",
+    "/models/gguf/.iris_model_index.json",
+)
 
-        # Get git status
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+_SNAPSHOT_FLIGHT = SingleFlight("build_snapshot")
+
+
+async def _run_git(*args: str, timeout: float = 5.0) -> str:
+    """Run a git command without blocking the event loop; return stdout."""
+    # --no-optional-locks: `git status` must not rewrite .git/index, or the
+    # refresh would trigger the file watcher that scheduled it.
+    proc = await asyncio.create_subprocess_exec(
+        "git", "--no-optional-locks", *args,
+        cwd=_PROJECT_ROOT,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return stdout.decode("utf-8", errors="replace")
 
-        status_lines = result.stdout.strip().split("\n") if result.stdout else []
 
-        # Get recent log (last 5 commits)
-        log_result = subprocess.run(
-            ["git", "log", "--oneline", "-5"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=5
+async def get_git_status() -> dict[str, Any]:
+    """Fetch current git status and recent log for the project."""
+    try:
+        # Both commands run concurrently as asyncio subprocesses
+        status_out, log_out = await asyncio.gather(
+            _run_git("status", "--porcelain"),
+            _run_git("log", "--oneline", "-5"),
         )
 
-        log_entries = log_result.stdout.strip().split("\n") if log_result.stdout else []
+        status_lines = status_out.strip().split("\n") if status_out.strip() else []
+        log_entries = log_out.strip().split("\n") if log_out.strip() else []
 
         return {
             "status": status_lines,
             "log": log_entries,
             "dirty": len([l for l in status_lines if l.strip()]) > 0
         }
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         logger.warning("[git_status] git commands timed out")
         return {"error": "timeout", "status": [], "log": [], "dirty": False}
     except FileNotFoundError:
@@ -63,7 +91,14 @@ async def get_git_status() -> dict[str, Any]:
 
 
 async def build_snapshot() -> dict[str, Any]:
-    """Build a unified status snapshot aggregating all polled endpoints."""
+    """Build a unified status snapshot aggregating all polled endpoints.
+
+    Concurrent callers share one build (and one pair of git subprocesses).
+    """
+    return await _SNAPSHOT_FLIGHT.do((), _build_snapshot)
+
+
+async def _build_snapshot() -> dict[str, Any]:
     snap: dict[str, Any] = {"ts": time.time()}
 
     # online — if backend is responding, it's online
@@ -88,11 +123,156 @@ async def build_snapshot() -> dict[str, Any]:
     return snap
 
 
+def diff_snapshot(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    Field-level delta between two snapshots.
+
+    Nested dicts are diffed recursively; removed keys map to None.  The
+    volatile "ts" key is ignored so an unchanged snapshot yields {}.
+    """
+    delta: dict[str, Any] = {}
+    for key, value in new.items():
+        if key == "ts":
+            continue
+        prev = old.get(key)
+        if isinstance(value, dict) and isinstance(prev, dict):
+            sub = diff_snapshot(prev, value)
+            if sub:
+                delta[key] = sub
+        elif prev != value or key not in old:
+            delta[key] = value
+    for key in old:
+        if key != "ts" and key not in new:
+            delta[key] = None
+    return delta
+
+
+class StatusService:
+    """
+    Event-driven owner of the system status snapshot.
+
+    run() refreshes git state once, then again only after the file watcher
+    reports a relevant change (debounced), and broadcasts sequence-numbered
+    deltas through the supplied callback.  full_message() is what a client
+    gets on connect or on request.  If watchdog is unavailable it falls back
+    to a slow FALLBACK_POLL_S refresh.
+    """
+
+    REFRESH_DEBOUNCE_S = 0.5   # coalesce bursts of file events into one refresh
+    FALLBACK_POLL_S = 30.0     # refresh interval when no file watcher is available
+
+    def __init__(self, root: str = _PROJECT_ROOT):
+        self._root = root
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watcher = None
+        self.refresh_count = 0
+        # Sequence number of the current snapshot; bumped on every change
+        self.seq = 0
+
+    def snapshot(self) -> Optional[dict[str, Any]]:
+        """Latest full snapshot (None until the first refresh)."""
+        return self._snapshot
+
+    def _is_relevant(self, path: str) -> bool:
+        norm = path.replace("\\", "/")
+        return not any(frag in norm for frag in _IGNORED_FRAGMENTS)
+
+    def _on_file_event(self, event) -> None:
+        # Called on the watchdog thread — hop to the loop, never block here.
+        if self._loop is not None and self._changed is not None and self._is_relevant(event.path):
+            self._loop.call_soon_threadsafe(self._changed.set)
+
+    def _start_watcher(self) -> bool:
+        from backend.dev.file_watcher import FileWatcher
+        # Own instance — the module singleton belongs to CLI dev sessions.
+        self._watcher = FileWatcher()
+        return self._watcher.start(self._root, self._on_file_event)
+
+    def _stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    async def refresh(self) -> dict[str, Any]:
+        """Rebuild the snapshot and return the delta against the previous one."""
+        new = await build_snapshot()
+        old = self._snapshot
+        self._snapshot = new
+        self.refresh_count += 1
+        changes = new if old is None else diff_snapshot(old, new)
+        if changes:
+            self.seq += 1
+        return changes
+
+    async def full_message(self) -> dict[str, Any]:
+        """A full system_status message at the current seq (for one client)."""
+        snap = self._snapshot
+        if snap is None:
+            snap = await build_snapshot()
+        return {"type": "system_status",
+                "payload": {**snap, "delta": False, "seq": self.seq}}
+
+    def _delta_message(self, changes: dict[str, Any]) -> dict[str, Any]:
+        return {"type": "system_status",
+                "payload": {**changes, "ts": self._snapshot["ts"], "delta": True,
+                            "seq": self.seq, "base_seq": self.seq - 1}}
+
+    async def run(self, broadcast: Callable[[dict], Awaitable[Any]]) -> None:
+        """Refresh on change and broadcast system_status deltas until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        watching = await self._loop.run_in_executor(None, self._start_watcher)
+        if not watching:
+            logger.info(
+                f"[StatusService] file watcher unavailable — polling every {self.FALLBACK_POLL_S:.0f}s")
+        try:
+            first = True
+            while True:
+                try:
+                    changes = await self.refresh()
+                    if first:
+                        # Clients connected before the first refresh hold nothing yet
+                        await broadcast(await self.full_message())
+                    elif changes:
+                        await broadcast(self._delta_message(changes))
+                    first = False
+
+                    if watching:
+                        await self._changed.wait()
+                        await asyncio.sleep(self.REFRESH_DEBOUNCE_S)
+                    else:
+                        await asyncio.sleep(self.FALLBACK_POLL_S)
+                    self._changed.clear()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"[StatusService] error: {e}")
+                    await asyncio.sleep(self.FALLBACK_POLL_S)
+        finally:
+            await self._loop.run_in_executor(None, self._stop_watcher)
+
+
+_status_service: Optional[StatusService] = None
+
+
+def get_status_service() -> StatusService:
+    """Get or create the singleton StatusService."""
+    global _status_service
+    if _status_service is None:
+        _status_service = StatusService()
+    return _status_service
+
+
 @router.get("/api/status/snapshot")
 async def status_snapshot():
     """
     Return unified status snapshot.
 
+    Served from the StatusService cache when it is running; built on demand
+    otherwise.
+
     Response schema:
     {
       "ts": float,
@@ -106,4 +286,7 @@ async def status_snapshot():
       "pending_writes": int
     }
     """
+    cached = get_status_service().snapshot()
+    if cached is not None:
+        return cached
     return await build_snapshot()
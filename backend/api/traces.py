@@ -0,0 +1,42 @@
+"""Turn traces — recent span waterfalls and Chrome trace export.
+
+GET /api/traces                      summaries of recent turns (newest first)
+GET /api/traces/export/chrome        Chrome trace-event JSON (all or ?trace_id=)
+GET /api/traces/{trace_id}           waterfall for one turn
+
+Everything is served from the in-process ring buffer; nothing leaves the
+machine.
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from backend.monitoring.tracing import get_tracer
+
+router = APIRouter()
+
+
+@router.get("/api/traces")
+async def list_traces(limit: int = 50, session_id: Optional[str] = None):
+    """Summaries of the most recent traces."""
+    return {"traces": get_tracer().recent(limit=limit, session_id=session_id)}
+
+
+@router.get("/api/traces/export/chrome")
+async def export_chrome(trace_id: Optional[List[str]] = Query(None)):
+    """Download traces in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+    return JSONResponse(
+        get_tracer().export_chrome(trace_id),
+        headers={"Content-Disposition": 'attachment; filename="iris-trace.json"'},
+    )
+
+
+@router.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Span waterfall for one trace."""
+    tracer = get_tracer()
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="trace not found")
+    return tracer.waterfall(trace)
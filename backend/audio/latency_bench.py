@@ -0,0 +1,499 @@
+"""
+End-to-end voice latency harness — what the user actually waits for.
+
+A fixture (recorded WAV or a deterministic synthetic utterance) is fed in
+device-sized blocks, on the wall clock, into AudioPipeline._input_callback —
+the same entry point PortAudio calls — so it goes through the real input
+resampler, ring buffer, VoiceCommandHandler VAD and streaming STT.  The
+transcript then drives a token-streaming LLM and the gateway's TTS path
+(PhrasePrefetcher while tokens arrive, SpeechScheduler once the reply is
+complete).  No audio device is opened; the activation beep is discarded.
+
+STT, LLM and TTS are pluggable.  The Fake* backends have configurable
+latencies (with seeded jitter, so runs are reproducible); real models can be
+passed in instead — any faster-whisper-like model for STT, any
+prompt → token-iterator callable for the LLM, any text → float32 audio
+callable for TTS.
+
+Every turn is timed from the end of speech in the fixture:
+
+  endpoint      recording stopped (VAD end-of-speech, streaming pass drained)
+  transcript    final transcript delivered to the result callback
+  first_token   first LLM token
+  llm_done      reply complete
+  first_audio   first audio chunk ready to play
+
+bench() runs fixtures repeatedly and returns a JSON-serialisable report with
+min/mean/p50/p90/p99/max per milestone and per stage.  See
+scripts/bench_voice_latency.py for the command-line front end.
+"""
+
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .pipeline import AudioPipeline
+from .speech_detection import FRAME_LENGTH, as_frames, frame_features
+from .stt_pool import STTModelPool
+from .voice_command import VoiceCommandHandler, VoiceState
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+MILESTONES = ("endpoint", "transcript", "first_token", "llm_done", "first_audio")
+# stage name → (from milestone, to milestone); None is the end of speech
+STAGES = {
+    "vad_endpoint":    (None, "endpoint"),
+    "stt_finalize":    ("endpoint", "transcript"),
+    "llm_first_token": ("transcript", "first_token"),
+    "llm_rest":        ("first_token", "llm_done"),
+    "tts_first_audio": ("llm_done", "first_audio"),
+}
+
+LLM = Callable[[str], Iterable[str]]
+TTS = Callable[[str], np.ndarray]
+
+
+# ── fixtures ────────────────────────────────────────────────────────────────
+
+@dataclass
+class Fixture:
+    name: str
+    audio: np.ndarray           # float32 mono at sample_rate
+    sample_rate: int
+    speech_end_s: float         # end of the last word
+    transcript: str = ""        # what the fake STT "hears"
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+
+def synthetic_utterance(
+    text: str = "what is the weather like today",
+    sample_rate: int = SAMPLE_RATE,
+    word_sec: float = 0.28,
+    gap_sec: float = 0.06,
+    lead_sec: float = 0.3,
+    tail_sec: float = 1.2,
+    seed: int = 0,
+) -> Fixture:
+    """
+    Deterministic speech-like fixture: one voiced burst (harmonic tone with a
+    Hann envelope, pitch varying per word) per word of text, over a faint
+    noise floor, with silence before and after.
+    """
+    rng = np.random.default_rng(seed)
+    words = text.split()
+    n_word, n_gap = int(word_sec * sample_rate), int(gap_sec * sample_rate)
+    t = np.arange(n_word) / sample_rate
+    parts = [np.zeros(int(lead_sec * sample_rate))]
+    for i, _ in enumerate(words):
+        f0 = 120.0 + 15.0 * (i % 5)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+        parts.append(0.12 * np.hanning(n_word) * voiced)
+        parts.append(np.zeros(n_gap))
+    speech_end = sum(len(p) for p in parts) - n_gap
+    parts.append(np.zeros(int(tail_sec * sample_rate)))
+    audio = np.concatenate(parts)
+    audio += rng.normal(0.0, 5e-4, len(audio))
+    return Fixture(f"synthetic-{len(words)}w", audio.astype(np.float32), sample_rate,
+                   speech_end / sample_rate, text)
+
+
+def load_wav_fixture(path: Path, transcript: str = "", tail_sec: float = 1.2) -> Fixture:
+    """
+    Load a PCM WAV at its native rate (the pipeline resamples it, as it does
+    a capture device).  End of speech is the last frame above the VAD energy
+    threshold; tail_sec of silence is appended so the VAD can end the take.
+    """
+    path = Path(path)
+    with wave.open(str(path), "rb") as wf:
+        width, channels, rate = wf.getsampwidth(), wf.getnchannels(), wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    audio = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+    if width == 1:
+        audio = (audio - 128) / 128
+    else:
+        audio /= float(2 ** (8 * width - 1))
+    audio = audio.reshape(-1, channels).mean(axis=1)
+
+    frame = max(1, FRAME_LENGTH * rate // SAMPLE_RATE)
+    rms = frame_features(as_frames(audio, frame))[0]
+    loud = np.nonzero(rms >= VoiceCommandHandler.VAD_ENERGY_THRESHOLD)[0]
+    speech_end = (int(loud[-1]) + 1) * frame if len(loud) else len(audio)
+    audio = np.concatenate((audio, np.zeros(int(tail_sec * rate), dtype=np.float32)))
+    return Fixture(path.stem, audio, rate, speech_end / rate, transcript)
+
+
+# ── fake backends ───────────────────────────────────────────────────────────
+
+class _Latency:
+    """Seeded jitter: each delay is base × (1 ± jitter)."""
+
+    def __init__(self, jitter: float, seed: int):
+        self.jitter = jitter
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def sleep(self, base: float) -> None:
+        if base <= 0:
+            return
+        with self._lock:
+            scale = 1.0 + self.jitter * (2.0 * self._rng.random() - 1.0)
+        time.sleep(base * scale)
+
+
+class FakeSTT(_Latency):
+    """
+    faster-whisper stand-in.  A pass costs latency_s + per_audio_s per second
+    of audio, spent lazily while the segments are consumed (as in
+    faster-whisper).  Words of `transcript` are revealed at words_per_sec of
+    voiced audio heard, with word timestamps for the streaming transcriber.
+    """
+
+    def __init__(self, latency_s: float = 0.05, per_audio_s: float = 0.02,
+                 words_per_sec: float = 3.0, jitter: float = 0.0, seed: int = 0):
+        super().__init__(jitter, seed)
+        self.latency_s = latency_s
+        self.per_audio_s = per_audio_s
+        self.words_per_sec = words_per_sec
+        self.transcript = ""
+        self.passes = 0
+
+    def transcribe(self, audio: np.ndarray, **kwargs: Any):
+        self.passes += 1
+        audio = np.asarray(audio, dtype=np.float32)
+        duration = len(audio) / SAMPLE_RATE
+        words = self.transcript.split()
+        loud = np.nonzero(frame_features(as_frames(audio))[0]
+                          >= VoiceCommandHandler.VAD_ENERGY_THRESHOLD)[0]
+        if len(loud):
+            first = loud[0] * FRAME_LENGTH / SAMPLE_RATE
+            heard = (loud[-1] + 1 - loud[0]) * FRAME_LENGTH / SAMPLE_RATE
+            words = words[:int(heard * self.words_per_sec + 0.5)]
+        else:
+            first, words = 0.0, []
+        step = 1.0 / self.words_per_sec
+        timed = [SimpleNamespace(start=first + i * step, end=first + (i + 1) * step, word=f" {w}")
+                 for i, w in enumerate(words)]
+
+        def _segments():
+            self.sleep(self.latency_s + self.per_audio_s * duration)
+            if timed:
+                yield SimpleNamespace(text=" ".join(words), words=timed)
+
+        return _segments(), SimpleNamespace(duration=duration, language="en")
+
+
+class FakeLLM(_Latency):
+    """Streams `reply` word by word: first_token_s, then token_s per token."""
+
+    def __init__(self, first_token_s: float = 0.3, token_s: float = 0.02,
+                 reply: str = "Sure. You said: {transcript}. Anything else?",
+                 jitter: float = 0.0, seed: int = 1):
+        super().__init__(jitter, seed)
+        self.first_token_s = first_token_s
+        self.token_s = token_s
+        self.reply = reply
+
+    def __call__(self, prompt: str) -> Iterator[str]:
+        words = self.reply.format(transcript=prompt).split()
+        for i, word in enumerate(words):
+            self.sleep(self.first_token_s if i == 0 else self.token_s)
+            yield word if i == len(words) - 1 else word + " "
+
+
+class FakeTTS(_Latency):
+    """Renders latency_s + per_char_s per character; returns silence of speaking length."""
+
+    def __init__(self, latency_s: float = 0.15, per_char_s: float = 0.004,
+                 sample_rate: int = 24000, chars_per_sec: float = 15.0,
+                 jitter: float = 0.0, seed: int = 2):
+        super().__init__(jitter, seed)
+        self.latency_s = latency_s
+        self.per_char_s = per_char_s
+        self.sample_rate = sample_rate
+        self.chars_per_sec = chars_per_sec
+
+    def __call__(self, text: str) -> np.ndarray:
+        self.sleep(self.latency_s + self.per_char_s * len(text))
+        return np.zeros(max(1, int(len(text) / self.chars_per_sec * self.sample_rate)),
+                        dtype=np.float32)
+
+
+# ── headless audio path ─────────────────────────────────────────────────────
+
+class _HeadlessPipeline(AudioPipeline):
+    """AudioPipeline with input driven by the harness and output discarded."""
+
+    def play_audio(self, audio_data: np.ndarray, sample_rate: int = None):
+        pass
+
+
+class _HeadlessEngine:
+    """The slice of AudioEngine that VoiceCommandHandler uses."""
+
+    def __init__(self, pipeline: AudioPipeline):
+        self.pipeline = pipeline
+
+    def register_frame_listener(self, callback: Callable[[np.ndarray], None]) -> None:
+        self.pipeline.add_frame_listener(callback)
+
+
+class _BenchVoiceHandler(VoiceCommandHandler):
+    """VoiceCommandHandler whose Whisper handle comes from the harness' pool."""
+
+    def __init__(self, audio_engine, whisper):
+        self._bench_whisper = whisper
+        super().__init__(audio_engine)
+
+    def _get_whisper(self):
+        return self._bench_whisper
+
+
+# ── harness ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class _Turn:
+    marks: Dict[str, float] = field(default_factory=dict)
+    transcript: Optional[str] = None
+    partials: int = 0
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class VoiceLatencyHarness:
+    """
+    Drives fixtures through AudioPipeline → VoiceCommandHandler → LLM → TTS.
+
+    stt: a faster-whisper-like model (transcribe(audio, **kw) → segments, info),
+         e.g. a real WhisperModel, served through the harness' own
+         STTModelPool.  Defaults to FakeSTT, which is given each fixture's
+         transcript.
+    speed: feed audio faster than real time (1.0 = as a microphone would).
+    speculative: prefetch the reply's first sentences while the LLM streams,
+         as IRISGateway does with IRIS_TTS_SPECULATIVE.
+    """
+
+    BLOCK_SEC = FRAME_LENGTH / SAMPLE_RATE     # PortAudio block, as AudioPipeline opens it
+
+    def __init__(
+        self,
+        stt: Any = None,
+        llm: Optional[LLM] = None,
+        tts: Optional[TTS] = None,
+        speed: float = 1.0,
+        speculative: bool = True,
+        lookahead: Optional[int] = None,
+        turn_timeout_s: float = 60.0,
+    ):
+        from backend.agent.tts_scheduler import SpeechScheduler
+
+        self.stt = FakeSTT() if stt is None else stt
+        self.llm = llm or FakeLLM()
+        self.tts = tts or FakeTTS()
+        self.speed = speed
+        self.speculative = speculative
+        self.lookahead = SpeechScheduler.LOOKAHEAD if lookahead is None else lookahead
+        self.turn_timeout_s = turn_timeout_s
+
+        model = self.stt
+        self._pool = STTModelPool(idle_unload_sec=0, loader=lambda spec, options: model)
+        whisper = self._pool.model("bench", "cpu", "int8")
+        whisper.prewarm(background=False)
+
+        self.pipeline = _HeadlessPipeline(sample_rate=SAMPLE_RATE, frame_length=FRAME_LENGTH)
+        self.pipeline._is_running = True
+        self.handler = _BenchVoiceHandler(_HeadlessEngine(self.pipeline), whisper)
+        self.handler.set_state_callback(self._on_state)
+        self.handler.set_command_result_callback(self._on_result)
+        self.handler.set_partial_transcript_callback(self._on_partial)
+        self._turn = _Turn()
+        self._cache_dir = Path(tempfile.mkdtemp(prefix="iris-voice-bench-"))
+
+    def close(self) -> None:
+        self.pipeline._is_running = False
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+
+    # ── handler callbacks ──────────────────────────────────────────────────
+
+    def _on_state(self, state: VoiceState, message: str) -> None:
+        if state == VoiceState.PROCESSING:
+            self._turn.marks.setdefault("endpoint", time.perf_counter())
+
+    def _on_result(self, result: Dict[str, Any]) -> None:
+        self._turn.marks.setdefault("transcript", time.perf_counter())
+        self._turn.transcript = result.get("transcript", "")
+        self._turn.done.set()
+
+    def _on_partial(self, partial: Dict[str, Any]) -> None:
+        self._turn.partials += 1
+
+    # ── one turn ───────────────────────────────────────────────────────────
+
+    def run(self, fixture: Fixture) -> Dict[str, Any]:
+        """Play one fixture and time the turn; milestones in ms after end of speech."""
+        turn = self._turn = _Turn()
+        if isinstance(self.stt, FakeSTT):
+            self.stt.transcript = fixture.transcript
+        self.pipeline._configure_input_rate(fixture.sample_rate)
+        if not self.handler.start_recording(auto_stop=True):
+            raise RuntimeError("VoiceCommandHandler did not start recording")
+
+        eos = self._feed(fixture, turn)
+        record: Dict[str, Any] = {"fixture": fixture.name, "text": turn.transcript,
+                                  "partials": turn.partials}
+        if turn.transcript:
+            self._respond(turn)
+        record.update(self._relative(turn.marks, eos))
+        return record
+
+    def _feed(self, fixture: Fixture, turn: _Turn) -> float:
+        """Deliver the fixture block by block until a transcript arrives; return the EOS time."""
+        block = max(1, round(self.BLOCK_SEC * fixture.sample_rate))
+        end_sample = int(fixture.speech_end_s * fixture.sample_rate)
+        silence = np.zeros(block, dtype=np.float32)
+        eos = None
+        started = time.perf_counter()
+        deadline = started + self.turn_timeout_s
+        pos = 0
+        while not turn.done.is_set() and time.perf_counter() < deadline:
+            chunk = fixture.audio[pos:pos + block]
+            if len(chunk) < block:
+                chunk = np.concatenate((chunk, silence[len(chunk):]))
+            delay = started + (pos + block) / fixture.sample_rate / self.speed - time.perf_counter()
+            if delay > 0:
+                # The block "arrives" once it has been spoken
+                turn.done.wait(delay)
+            self.pipeline._input_callback(chunk[:, None], block, None, None)
+            pos += block
+            if eos is None and pos >= end_sample:
+                eos = time.perf_counter()
+        if not turn.done.wait(max(0.0, deadline - time.perf_counter())):
+            self.handler.cancel_recording()
+        return eos if eos is not None else time.perf_counter()
+
+    def _respond(self, turn: _Turn) -> None:
+        """LLM stream with speculative TTS, then the scheduler — as IRISGateway._handle_voice does."""
+        from backend.agent.tts_cache import PhraseAudioCache
+        from backend.agent.tts_scheduler import PhrasePrefetcher, SpeechScheduler
+
+        # A fresh RAM-only cache per turn: nothing is served from earlier runs
+        cache = PhraseAudioCache(cache_dir=self._cache_dir, disk_budget_mb=0)
+
+        def synthesize_phrase(text: str) -> np.ndarray:
+            return cache.get_or_create(
+                PhraseAudioCache.key("bench", "bench", text), lambda: (self.tts(text), True))[0]
+
+        prefetch = (PhrasePrefetcher(synthesize_phrase, max_phrases=self.lookahead)
+                    if self.speculative else None)
+        parts: List[str] = []
+        try:
+            for token in self.llm(turn.transcript):
+                turn.marks.setdefault("first_token", time.perf_counter())
+                parts.append(token)
+                if prefetch is not None:
+                    prefetch.feed(token)
+        finally:
+            if prefetch is not None:
+                prefetch.close()
+        turn.marks["llm_done"] = time.perf_counter()
+
+        reply = "".join(parts).strip()
+        if not reply:
+            return
+        scheduler = SpeechScheduler(synthesize_phrase, lookahead=self.lookahead)
+        try:
+            scheduler.feed(reply)
+            scheduler.close()
+            if scheduler.get(timeout=self.turn_timeout_s) is not None:
+                turn.marks["first_audio"] = time.perf_counter()
+        finally:
+            scheduler.cancel()
+            if prefetch is not None:
+                prefetch.join(self.turn_timeout_s)
+
+    @staticmethod
+    def _relative(marks: Dict[str, float], eos: float) -> Dict[str, Optional[float]]:
+        ms = {name: (round((marks[name] - eos) * 1000, 2) if name in marks else None)
+              for name in MILESTONES}
+        for stage, (start, end) in STAGES.items():
+            a = 0.0 if start is None else ms[start]
+            b = ms[end]
+            ms[stage] = None if a is None or b is None else round(b - a, 2)
+        return ms
+
+    # ── many turns ─────────────────────────────────────────────────────────
+
+    def bench(self, fixtures: List[Fixture], runs: int = 5, warmup: int = 1) -> Dict[str, Any]:
+        """Run every fixture warmup + runs times; return the report."""
+        records: List[Dict[str, Any]] = []
+        for fixture in fixtures:
+            for i in range(warmup + runs):
+                record = self.run(fixture)
+                if i >= warmup:
+                    records.append(record)
+                # Let the handler settle back to idle between takes
+                thread = self.handler._transcription_thread
+                if thread is not None:
+                    thread.join(self.turn_timeout_s)
+        return {
+            "config": self.describe(),
+            "fixtures": [{"name": f.name, "sample_rate": f.sample_rate,
+                          "duration_s": round(f.duration_s, 3),
+                          "speech_end_s": round(f.speech_end_s, 3)} for f in fixtures],
+            "runs": records,
+            "failures": sum(1 for r in records if r["first_audio"] is None),
+            "latency_ms": summarize(records),
+        }
+
+    def describe(self) -> Dict[str, Any]:
+        def _backend(obj: Any) -> Dict[str, Any]:
+            info: Dict[str, Any] = {"backend": type(obj).__name__}
+            for key in ("latency_s", "per_audio_s", "first_token_s", "token_s",
+                        "per_char_s", "jitter"):
+                if hasattr(obj, key):
+                    info[key] = getattr(obj, key)
+            return info
+
+        return {
+            "stt": _backend(self.stt),
+            "llm": _backend(self.llm),
+            "tts": _backend(self.tts),
+            "speed": self.speed,
+            "speculative": self.speculative,
+            "lookahead": self.lookahead,
+            "streaming_stt": self.handler.STREAMING_STT,
+            "vad_backend": self.handler.VAD_BACKEND,
+            "vad_silence_s": self.handler.VAD_SILENCE_SEC,
+        }
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """min/mean/p50/p90/p99/max (ms) of every milestone and stage over the runs."""
+    out: Dict[str, Dict[str, float]] = {}
+    for name in (*MILESTONES, *STAGES):
+        values = np.array([r[name] for r in records if r.get(name) is not None], dtype=np.float64)
+        if not len(values):
+            continue
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        out[name] = {
+            "n": int(len(values)),
+            "min": round(float(values.min()), 2),
+            "mean": round(float(values.mean()), 2),
+            "p50": round(float(p50), 2),
+            "p90": round(float(p90), 2),
+            "p99": round(float(p99), 2),
+            "max": round(float(values.max()), 2),
+        }
+    return out
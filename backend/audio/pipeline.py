@@ -9,6 +9,9 @@ from typing import Optional, Callable, List
 logger = logging.getLogger(__name__)
 import numpy as np
 
+from .resampling import StreamingResampler
+from .ring_buffer import AudioRingBuffer
+
 # sounddevice (PortAudio) is imported lazily inside methods to avoid loading the
 # PortAudio DLL at backend startup. On Windows, PortAudio can take 200-2000 ms
 # to initialize when there are many audio devices, USB audio, or Bluetooth audio.
@@ -25,8 +28,15 @@ class AudioPipeline:
     - Input stream from microphone
     - Output stream to speakers
     - Audio buffering for inference
+
+    Every input block is written once into a shared AudioRingBuffer; the
+    primary callback and all frame listeners receive the same read-only view
+    of it instead of a copy each.  Listeners that keep frames for longer than
+    RING_SECONDS must copy them.
     """
-    
+
+    RING_SECONDS = 10.0
+
     def __init__(
         self,
         input_device: Optional[int] = None,
@@ -55,6 +65,14 @@ class AudioPipeline:
         self._audio_buffer: List[np.ndarray] = []
         self._buffer_lock = threading.Lock()
         
+        # Shared input ring — readers take cursors via self.ring.reader()
+        self.ring = AudioRingBuffer(int(self.RING_SECONDS * sample_rate))
+
+        # Set when the device only opens at its native rate (e.g. 48 kHz WASAPI):
+        # input is resampled to sample_rate and re-cut into frame_length frames.
+        self._input_resampler: Optional[StreamingResampler] = None
+        self._frame_reader = None
+
         # Frame listeners for unified audio access
         self._frame_listeners: List[Callable[[np.ndarray], None]] = []
         self._is_buffering = False
@@ -101,18 +119,26 @@ class AudioPipeline:
 
         # --- Input stream (microphone / Porcupine) ---
         try:
-            self._input_stream = _sd().InputStream(
-                device=self.input_device,
-                channels=self.channels,
-                samplerate=self.sample_rate,
-                callback=self._input_callback,
-                blocksize=self.frame_length
-            )
-            self._input_stream.start()
+            self._input_stream = self._open_input_stream(self.sample_rate)
             input_ok = True
         except Exception as e:
-            logger.error(f"[AudioPipeline] Input stream failed: {e}")
-            self._input_stream = None
+            # Some devices (WASAPI shared mode) refuse anything but their mixer
+            # rate — capture at that rate and resample to self.sample_rate.
+            device_rate = self._device_input_rate()
+            if device_rate and device_rate != self.sample_rate:
+                try:
+                    self._input_stream = self._open_input_stream(device_rate)
+                    input_ok = True
+                    logger.info(
+                        f"[AudioPipeline] Input opened at {device_rate} Hz "
+                        f"({e}); resampling to {self.sample_rate} Hz"
+                    )
+                except Exception as e2:
+                    e = e2
+            if not input_ok:
+                logger.error(f"[AudioPipeline] Input stream failed: {e}")
+                self._input_stream = None
+                self._configure_input_rate(self.sample_rate)
 
         # --- Output stream (TTS / beep playback) ---
         # Output: use _sd().play() per-chunk instead of a persistent OutputStream.
@@ -133,6 +159,35 @@ class AudioPipeline:
         logger.error("[AudioPipeline] Both input and output streams failed — pipeline not running")
         return False
     
+    def _open_input_stream(self, device_rate: int):
+        self._configure_input_rate(device_rate)
+        blocksize = self.frame_length * device_rate // self.sample_rate
+        stream = _sd().InputStream(
+            device=self.input_device,
+            channels=self.channels,
+            samplerate=device_rate,
+            callback=self._input_callback,
+            blocksize=blocksize
+        )
+        stream.start()
+        return stream
+
+    def _device_input_rate(self) -> Optional[int]:
+        try:
+            info = _sd().query_devices(self.input_device, "input")
+            return int(info["default_samplerate"])
+        except Exception:
+            return None
+
+    def _configure_input_rate(self, device_rate: int) -> None:
+        """Capture at device_rate; frames are still delivered at self.sample_rate."""
+        if device_rate == self.sample_rate:
+            self._input_resampler = None
+            self._frame_reader = None
+        else:
+            self._input_resampler = StreamingResampler(device_rate, self.sample_rate)
+            self._frame_reader = self.ring.reader()
+
     def stop(self):
         """Stop audio pipeline"""
         self._is_running = False
@@ -143,25 +198,35 @@ class AudioPipeline:
         """This is called (from a separate thread) for each audio block."""
         if status:
             logger.debug(f"[AudioPipeline] Input status: {status}")
-        if self._is_running:
-            # The input data is a numpy array, take the first channel
-            audio_frame = indata[:, 0].astype(np.float32)
+        if not self._is_running:
+            return
+        # The input data is a numpy array, take the first channel.
+        # PortAudio reuses indata, so this write is the frame's one copy.
+        if self._input_resampler is None:
+            self._dispatch_frame(self.ring.write(indata[:, 0]))
+            return
+        self.ring.write(self._input_resampler.process(indata[:, 0]))
+        reader = self._frame_reader
+        while reader.available >= self.frame_length:
+            self._dispatch_frame(reader.read(self.frame_length))
 
-            # Buffer audio if buffering is enabled
-            with self._buffer_lock:
-                if self._is_buffering:
-                    self._audio_buffer.append(audio_frame)
+    def _dispatch_frame(self, audio_frame: np.ndarray) -> None:
+        """Hand one frame_length frame (a ring view) to the buffer and all listeners."""
+        # Buffer audio if buffering is enabled (the ring view would be overwritten)
+        with self._buffer_lock:
+            if self._is_buffering:
+                self._audio_buffer.append(audio_frame.copy())
 
-            # Primary callback (e.g. AudioEngine._process_audio_frame)
-            if self._on_audio_frame is not None:
-                self._on_audio_frame(audio_frame)
+        # Primary callback (e.g. AudioEngine._process_audio_frame)
+        if self._on_audio_frame is not None:
+            self._on_audio_frame(audio_frame)
 
-            # Notify all registered frame listeners (e.g. VoiceCommandHandler._capture_frame)
-            for listener in self._frame_listeners:
-                try:
-                    listener(audio_frame)
-                except Exception as exc:
-                    logger.error(f"[AudioPipeline] Frame listener error: {exc}")
+        # Notify all registered frame listeners (e.g. VoiceCommandHandler._capture_frame)
+        for listener in self._frame_listeners:
+            try:
+                listener(audio_frame)
+            except Exception as exc:
+                logger.error(f"[AudioPipeline] Frame listener error: {exc}")
     
     def play_audio(self, audio_data: np.ndarray, sample_rate: int = None):
         """Play audio through the system default output device using _sd().play().
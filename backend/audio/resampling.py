@@ -0,0 +1,164 @@
+"""
+Polyphase sample-rate conversion for TTS and microphone audio.
+
+Conversions use rational up/down factors (24 kHz → 48 kHz is 2/1,
+22.05 kHz → 48 kHz is 320/147, 48 kHz → 16 kHz is 1/3).  A Kaiser-windowed
+sinc low-pass is designed once per rate pair, split into `up` polyphase
+branches and cached, so each output sample costs one short dot product
+(~2 × HALF_TAPS_PER_PHASE taps) instead of an FFT over the whole clip.
+
+StreamingResampler carries the filter history between calls: audio can be
+converted chunk by chunk as it is synthesised or captured, with no ringing
+at chunk boundaries, and the concatenated output matches a one-shot
+`resample()` of the whole signal (and scipy's `resample_poly` with the same
+filter) to float32 rounding.  Only NumPy is needed.
+"""
+
+import functools
+import math
+from typing import NamedTuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Filter length per branch and window shape — scipy.signal.resample_poly's defaults
+HALF_TAPS_PER_PHASE = 10
+KAISER_BETA = 5.0
+
+# Small calls gather windows in blocks of _BLOCK outputs; calls with at least
+# _PHASE_LOOP_MIN outputs per branch run one mat-vec per branch instead
+_BLOCK = 8192
+_PHASE_LOOP_MIN = 8
+
+
+class PolyphaseFilter(NamedTuple):
+    up: int
+    down: int
+    delay: int              # filter centre, in upsampled samples
+    taps: int               # taps per branch
+    bank: np.ndarray        # (up, taps) time-reversed branch coefficients, float32
+    prototype: np.ndarray   # full low-pass (gain `up`), float64
+
+
+@functools.lru_cache(maxsize=32)
+def polyphase_filter(src_rate: int, dst_rate: int) -> PolyphaseFilter:
+    """Design (once) the anti-aliasing filter bank for src_rate → dst_rate."""
+    if src_rate <= 0 or dst_rate <= 0:
+        raise ValueError(f"sample rates must be positive, got {src_rate} → {dst_rate}")
+    g = math.gcd(int(src_rate), int(dst_rate))
+    up, down = int(dst_rate) // g, int(src_rate) // g
+    max_rate = max(up, down)
+    half_len = HALF_TAPS_PER_PHASE * max_rate
+    n = np.arange(-half_len, half_len + 1)
+    cutoff = 1.0 / max_rate     # relative to the upsampled Nyquist
+    h = np.sinc(cutoff * n) * np.kaiser(2 * half_len + 1, KAISER_BETA)
+    h *= up / h.sum()           # unity DC gain after zero-stuffing
+
+    taps = -(-len(h) // up)
+    padded = np.zeros(taps * up)
+    padded[:len(h)] = h
+    # bank[p, j] multiplies x[base - taps + 1 + j] for output phase p
+    bank = padded.reshape(taps, up).T[:, ::-1].astype(np.float32)
+    return PolyphaseFilter(up, down, half_len, taps, np.ascontiguousarray(bank), h)
+
+
+def output_length(num_samples: int, src_rate: int, dst_rate: int) -> int:
+    """Samples produced for num_samples of input (rounded up, as resample_poly)."""
+    f = polyphase_filter(src_rate, dst_rate)
+    return -(-num_samples * f.up // f.down)
+
+
+class StreamingResampler:
+    """
+    Incremental polyphase resampler for one mono stream.
+
+    process() returns every output sample whose filter window is already
+    covered by input (the filter look-ahead is HALF_TAPS_PER_PHASE input
+    samples); flush() zero-pads the tail and returns the rest, then the
+    resampler is ready for a new stream.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int):
+        self.src_rate = int(src_rate)
+        self.dst_rate = int(dst_rate)
+        self._filter = polyphase_filter(self.src_rate, self.dst_rate)
+        self.reset()
+
+    @property
+    def passthrough(self) -> bool:
+        return self.src_rate == self.dst_rate
+
+    def reset(self) -> None:
+        taps = self._filter.taps
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._offset = 1 - taps     # absolute input index of _history[0]
+        self._n_in = 0
+        self._n_out = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Feed input samples; return the output samples now computable."""
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if self.passthrough:
+            return chunk.copy()
+        self._history = np.concatenate((self._history, chunk))
+        self._n_in += len(chunk)
+        f = self._filter
+        # Output m needs input up to (m*down + delay) // up
+        ready = max(0, -((f.delay - self._n_in * f.up) // f.down))
+        return self._emit(ready)
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining output for the stream and reset."""
+        if self.passthrough:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+        f = self._filter
+        total = -(-self._n_in * f.up // f.down)
+        if total > self._n_out:
+            last_base = ((total - 1) * f.down + f.delay) // f.up
+            pad = last_base + 1 - (self._offset + len(self._history))
+            if pad > 0:
+                self._history = np.concatenate((self._history, np.zeros(pad, dtype=np.float32)))
+        out = self._emit(total)
+        self.reset()
+        return out
+
+    def _emit(self, end: int) -> np.ndarray:
+        f = self._filter
+        start = self._n_out
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        windows = sliding_window_view(self._history, f.taps)
+        n = end - start
+        out = np.empty(n, dtype=np.float32)
+        if n >= _PHASE_LOOP_MIN * f.up:
+            # Outputs k, k+up, k+2up, ... share a branch and step `down` inputs
+            # apart: one strided mat-vec per branch, no gathered copies.
+            for k in range(f.up):
+                t0 = (start + k) * f.down + f.delay
+                first = t0 // f.up - (f.taps - 1) - self._offset
+                count = len(range(k, n, f.up))
+                out[k::f.up] = windows[first:first + (count - 1) * f.down + 1:f.down] @ f.bank[t0 % f.up]
+        else:
+            for b in range(start, end, _BLOCK):
+                t = np.arange(b, min(b + _BLOCK, end), dtype=np.int64) * f.down + f.delay
+                first = t // f.up - (f.taps - 1) - self._offset
+                out[b - start:b - start + len(t)] = np.einsum(
+                    "ij,ij->i", windows[first], f.bank[t % f.up])
+        self._n_out = end
+        # Drop input no later output can reach
+        keep_from = (end * f.down + f.delay) // f.up - (f.taps - 1) - self._offset
+        if keep_from > 0:
+            self._history = self._history[keep_from:]
+            self._offset += keep_from
+        return out
+
+
+def resample(audio: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Resample a whole mono float signal; returns float32."""
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if src_rate == dst_rate:
+        return audio
+    r = StreamingResampler(src_rate, dst_rate)
+    head = r.process(audio)
+    return np.concatenate((head, r.flush()))
@@ -0,0 +1,157 @@
+"""
+Ring buffers for the audio frame path.
+
+AudioRingBuffer is a preallocated float32 ring with one writer and any number
+of reader cursors.  It is "double-mapped": every sample is stored twice,
+`capacity` apart, so any window of up to `capacity` samples is a single
+contiguous slice — readers always get NumPy views, never copies, even across
+the wrap point.
+
+The writer only publishes its new position after the samples are in place,
+and readers only ever look at `position`, so no lock is needed between the
+writer (the PortAudio callback) and readers (VAD, STT) under the GIL.  A
+reader that falls more than `capacity` behind skips ahead and counts the
+samples it lost.  Views stay valid until the writer laps them, so consumers
+that keep audio longer than the ring span must copy it.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Preallocated single-writer / multi-reader sample ring."""
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._position = 0      # total samples ever written
+
+    @property
+    def position(self) -> int:
+        """Absolute index one past the newest sample."""
+        return self._position
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return max(0, self._position - self.capacity)
+
+    def write(self, samples: np.ndarray) -> np.ndarray:
+        """Append samples and return a read-only view of them inside the ring."""
+        n = len(samples)
+        if n > self.capacity:
+            self._position += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+        cap = self.capacity
+        start = self._position % cap
+        first = min(n, cap - start)
+        buf = self._buf
+        buf[start:start + first] = samples[:first]
+        buf[start + cap:start + cap + first] = samples[:first]
+        rest = n - first
+        if rest:
+            buf[:rest] = samples[first:]
+            buf[cap:cap + rest] = samples[first:]
+        self._position += n
+        return self.view(self._position - n, self._position)
+
+    def view(self, start: int, end: Optional[int] = None) -> np.ndarray:
+        """Read-only view of absolute samples [start, end), clamped to what the ring still holds."""
+        end = self._position if end is None else min(end, self._position)
+        start = max(start, self.oldest)
+        if end <= start:
+            return self._buf[:0]
+        offset = start % self.capacity
+        out = self._buf[offset:offset + (end - start)]
+        out.flags.writeable = False
+        return out
+
+    def reader(self, start: Optional[int] = None) -> "RingReader":
+        """New cursor, by default at the current write position."""
+        return RingReader(self, self._position if start is None else start)
+
+    def reset(self) -> None:
+        """Forget all samples. Only safe when no reader still uses old views."""
+        self._position = 0
+
+
+class RingReader:
+    """Independent read cursor over an AudioRingBuffer."""
+
+    __slots__ = ("_ring", "position", "dropped")
+
+    def __init__(self, ring: AudioRingBuffer, position: int):
+        self._ring = ring
+        self.position = position
+        self.dropped = 0        # samples overwritten before this reader got to them
+
+    @property
+    def available(self) -> int:
+        return self._ring.position - self.position
+
+    def read(self, max_samples: Optional[int] = None, multiple_of: int = 1) -> np.ndarray:
+        """
+        View of the unread samples, advancing the cursor.
+
+        multiple_of limits the read to whole frames (the rest stays unread).
+        """
+        oldest = self._ring.oldest
+        if self.position < oldest:
+            self.dropped += oldest - self.position
+            self.position = oldest
+        n = self.available
+        if max_samples is not None:
+            n = min(n, max_samples)
+        n -= n % multiple_of
+        out = self._ring.view(self.position, self.position + n)
+        self.position += n
+        return out
+
+
+class FrameBuffer:
+    """
+    One recording: frames appended into a preallocated AudioRingBuffer.
+
+    Stands in for the old list of per-frame arrays — append() and len()
+    (number of frames) behave the same — but the audio lives in one block,
+    so samples() returns the utterance as a view instead of concatenating.
+    """
+
+    def __init__(self, capacity: int):
+        self.ring = AudioRingBuffer(capacity)
+        self._frame_ends: List[int] = []
+
+    def append(self, frame: np.ndarray) -> None:
+        self.ring.write(frame)
+        self._frame_ends.append(self.ring.position)
+
+    def __len__(self) -> int:
+        return len(self._frame_ends)
+
+    @property
+    def num_samples(self) -> int:
+        return self.ring.position
+
+    @property
+    def overflowed(self) -> bool:
+        """True once the recording outgrew the ring and its start was lost."""
+        return self.ring.oldest > 0
+
+    def samples(self, start_frame: int = 0, end_frame: Optional[int] = None) -> np.ndarray:
+        """View of frames[start_frame:end_frame] as one contiguous array."""
+        ends = self._frame_ends
+        n = len(ends)
+        start_frame = min(max(start_frame, 0), n)
+        end_frame = n if end_frame is None else min(max(end_frame, start_frame), n)
+        start = ends[start_frame - 1] if start_frame else 0
+        end = ends[end_frame - 1] if end_frame else 0
+        return self.ring.view(start, end)
+
+    def reset(self) -> None:
+        self.ring.reset()
+        self._frame_ends = []
@@ -0,0 +1,257 @@
+"""
+Voice activity detection for the recording path.
+
+Two layers:
+
+  - A frame classifier decides speech / non-speech for a whole block of
+    frames at once (a 2-D array, one row per frame):
+      EnergyVAD   RMS energy plus zero-crossing rate, pure NumPy (default)
+      WebRTCVAD   Google's WebRTC GMM VAD (optional: pip install webrtcvad)
+      SileroVAD   Silero VAD v5 ONNX model on CPU (optional: onnxruntime and
+                  a silero_vad.onnx file, see SileroVAD.model_path())
+    create_vad() picks one by name and falls back to EnergyVAD if the
+    optional dependency or model is missing.
+
+  - SpeechSegmenter turns the per-frame decisions into speech onset and
+    end-of-speech (with hangover) events, again over whole blocks using
+    cumulative sums instead of a per-frame Python loop.
+
+Frames are float32 at 16 kHz, 512 samples (32 ms) by default — the
+AudioPipeline block size.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_LENGTH = 512
+
+
+def as_frames(samples: np.ndarray, frame_length: int = FRAME_LENGTH) -> np.ndarray:
+    """View of the complete frames in samples as a (n_frames, frame_length) array."""
+    n = len(samples) // frame_length
+    return samples[:n * frame_length].reshape(n, frame_length)
+
+
+def frame_features(frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame RMS energy and zero-crossing rate (crossings per sample)."""
+    if not len(frames):
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frames.shape[1])
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+    return rms, zcr
+
+
+class EnergyVAD:
+    """
+    Energy gate with a zero-crossing ceiling.
+
+    A frame is speech when its RMS reaches energy_threshold and its
+    zero-crossing rate stays below max_zcr — broadband hiss and fan noise
+    cross zero on roughly every other sample, voiced speech far less often.
+    """
+
+    name = "energy"
+
+    def __init__(self, energy_threshold: float = 0.008, max_zcr: float = 0.45, **_):
+        self.energy_threshold = energy_threshold
+        self.max_zcr = max_zcr
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        rms, zcr = frame_features(frames)
+        return (rms >= self.energy_threshold) & (zcr <= self.max_zcr)
+
+
+class WebRTCVAD:
+    """WebRTC VAD; each frame is judged on its 30 ms sub-frames (speech if any is)."""
+
+    name = "webrtc"
+
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 2, **_):
+        import webrtcvad
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self.sample_rate = sample_rate
+        self._sub = sample_rate * 30 // 1000
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        pcm = (np.clip(frames, -1.0, 1.0) * 32767).astype(np.int16)
+        subs = max(1, pcm.shape[1] // self._sub)
+        out = np.zeros(len(pcm), dtype=bool)
+        for i, frame in enumerate(pcm):
+            out[i] = any(self._vad.is_speech(frame[k * self._sub:(k + 1) * self._sub].tobytes(),
+                                             self.sample_rate)
+                         for k in range(subs))
+        return out
+
+
+class SileroVAD:
+    """
+    Silero VAD v5 (ONNX, CPU).  Stateful: use one instance per audio stream.
+
+    The ONNX session is shared between instances; only the recurrent state
+    is per stream.
+    """
+
+    name = "silero"
+    _CONTEXT = 64
+    _sessions: Dict[str, object] = {}
+
+    def __init__(self, sample_rate: int = 16000, threshold: float = 0.5,
+                 model_path: Optional[str] = None, **_):
+        if sample_rate != 16000:
+            raise ValueError("SileroVAD here supports 16 kHz only")
+        path = str(model_path or self.model_path())
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Silero VAD model not found at {path}")
+        session = self._sessions.get(path)
+        if session is None:
+            import onnxruntime as ort
+            opts = ort.SessionOptions()
+            opts.inter_op_num_threads = 1
+            opts.intra_op_num_threads = 1
+            session = self._sessions[path] = ort.InferenceSession(
+                path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self._session = session
+        self.threshold = threshold
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._context = np.zeros((1, self._CONTEXT), dtype=np.float32)
+
+    @staticmethod
+    def model_path() -> Path:
+        env = os.environ.get("IRIS_SILERO_VAD_PATH")
+        if env:
+            return Path(env)
+        return Path(__file__).resolve().parent.parent.parent / "models" / "vad" / "silero_vad.onnx"
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(frames), dtype=bool)
+        for i, frame in enumerate(frames):
+            x = np.concatenate((self._context, frame[None, :].astype(np.float32)), axis=1)
+            prob, self._state = self._session.run(
+                None, {"input": x, "state": self._state, "sr": self._sr})
+            self._context = x[:, -self._CONTEXT:]
+            out[i] = float(prob[0][0]) >= self.threshold
+        return out
+
+
+_BACKENDS = {"energy": EnergyVAD, "webrtc": WebRTCVAD, "silero": SileroVAD}
+_warned = set()
+
+
+def create_vad(backend: str = "energy", **options):
+    """
+    Frame classifier by name ("energy", "webrtc", "silero").
+
+    Falls back to EnergyVAD (warning once) when the backend's optional
+    dependency or model file is unavailable.
+    """
+    cls = _BACKENDS.get((backend or "energy").lower())
+    if cls is None:
+        raise ValueError(f"Unknown VAD backend {backend!r}; expected one of {sorted(_BACKENDS)}")
+    try:
+        return cls(**options)
+    except Exception as e:
+        if backend not in _warned:
+            _warned.add(backend)
+            logger.warning(f"[VAD] {backend} VAD unavailable ({e}) — using energy VAD")
+        return EnergyVAD(**options)
+
+
+class SpeechSegmenter:
+    """
+    Onset / end-of-speech state machine over per-frame speech flags.
+
+    Onset: at least min_speech_frames speech frames within the last
+    onset_window frames (default 2x min_speech_frames), so short blips and
+    sparse noise never start an utterance.
+    End: hangover_frames consecutive non-speech frames after onset.
+    Timeouts: no onset within pre_speech_max_frames, or max_frames in total.
+
+    feed() takes any number of flags and returns the state after them;
+    frame indices in events count from the first frame ever fed.
+    """
+
+    WAITING, SPEECH, ENDED, TIMEOUT = "waiting", "speech", "ended", "timeout"
+
+    def __init__(self, min_speech_frames: int, hangover_frames: int,
+                 max_frames: int, pre_speech_max_frames: Optional[int] = None,
+                 onset_window: Optional[int] = None):
+        self.min_speech_frames = max(1, min_speech_frames)
+        self.hangover_frames = max(1, hangover_frames)
+        self.max_frames = max_frames
+        self.pre_speech_max_frames = pre_speech_max_frames or max_frames
+        self.onset_window = max(self.min_speech_frames, onset_window or 2 * self.min_speech_frames)
+        self.state = self.WAITING
+        self.frames_seen = 0
+        self.onset_frame: Optional[int] = None
+        self.end_frame: Optional[int] = None
+        self._history = np.zeros(0, dtype=bool)    # last onset_window-1 flags before onset
+        self._silence_run = 0                       # trailing non-speech frames after onset
+
+    @property
+    def done(self) -> bool:
+        return self.state in (self.ENDED, self.TIMEOUT)
+
+    def feed(self, flags: np.ndarray) -> str:
+        flags = np.asarray(flags, dtype=bool)
+        while len(flags) and not self.done:
+            if self.state == self.WAITING:
+                flags = self._feed_waiting(flags)
+            else:
+                flags = self._feed_speech(flags)
+        return self.state
+
+    def _feed_waiting(self, flags: np.ndarray) -> np.ndarray:
+        base = self.frames_seen
+        window = np.concatenate((self._history, flags))
+        counts = np.cumsum(window, dtype=np.int64)
+        w = self.onset_window
+        in_window = counts.copy()
+        in_window[w:] -= counts[:-w]
+        hits = np.nonzero(in_window[len(self._history):] >= self.min_speech_frames)[0]
+        limit = min(self.pre_speech_max_frames, self.max_frames) - base
+        if len(hits) and hits[0] < limit:
+            i = int(hits[0])
+            self.state = self.SPEECH
+            self.onset_frame = base + i
+            self.frames_seen = base + i + 1
+            self._silence_run = 0
+            return flags[i + 1:]
+        if limit <= len(flags):
+            self.state = self.TIMEOUT
+            self.frames_seen = base + max(limit, 0)
+            return flags[:0]
+        self.frames_seen = base + len(flags)
+        self._history = window[-(w - 1):] if w > 1 else window[:0]
+        return flags[:0]
+
+    def _feed_speech(self, flags: np.ndarray) -> np.ndarray:
+        base = self.frames_seen
+        idx = np.arange(len(flags))
+        # Index of the most recent speech frame at or before each position;
+        # a carried-over silence run counts as speech that far back
+        last_speech = np.maximum.accumulate(np.where(flags, idx, -1 - self._silence_run))
+        run = idx - last_speech
+        ends = np.nonzero(run >= self.hangover_frames)[0]
+        limit = self.max_frames - base
+        if len(ends) and ends[0] < limit:
+            i = int(ends[0])
+            self.state = self.ENDED
+            self.end_frame = base + i + 1 - self.hangover_frames
+            self.frames_seen = base + i + 1
+            return flags[:0]
+        if limit <= len(flags):
+            self.state = self.TIMEOUT
+            self.frames_seen = base + max(limit, 0)
+            return flags[:0]
+        self._silence_run = int(run[-1])
+        self.frames_seen = base + len(flags)
+        return flags[:0]
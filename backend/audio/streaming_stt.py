@@ -0,0 +1,209 @@
+"""
+Streaming STT — incremental transcription while the user is still speaking.
+
+The growing utterance is re-transcribed every STREAM_STEP_SEC over a window
+that starts at the last committed word.  Whisper's output for the tail of a
+window is unstable, so words are only committed by *local agreement*: a word
+becomes final once `agreement` consecutive passes produce the same word at
+the same position (LocalAgreement-n, Macháček et al., 2023).  Everything after
+the committed prefix is reported as tentative text for the UI.
+
+Once committed words cover enough of the window, the audio before the last
+committed word is dropped and the committed text is passed as the decoder
+prompt instead, so each pass stays short.  At end-of-speech finish() only has
+to decode the uncommitted tail — usually well under a second of audio — which
+keeps the post-speech delay small and independent of utterance length.
+If passes keep disagreeing (noise, mumbling) nothing gets committed, so the
+window is also capped at MAX_WINDOW_SEC: past it the tentative words that
+end before the last TRIM_SEC are taken as final and the audio is trimmed
+anyway.
+
+Works with any callable mapping (audio, prompt) to timestamped words;
+whisper_word_transcriber() adapts a faster-whisper WhisperModel (tiny/base on
+CPU are fine).
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Word(NamedTuple):
+    start: float    # seconds from the start of the utterance
+    end: float
+    text: str
+
+
+# (audio float32 @ sample_rate, prompt) -> words with times relative to the audio
+WordTranscriber = Callable[[np.ndarray, str], List[Word]]
+
+_NORMALIZE_RE = re.compile(r"[^\w']+")
+
+
+def _key(text: str) -> str:
+    # Passes often disagree only on casing or punctuation ("so," vs "So")
+    return _NORMALIZE_RE.sub("", text.lower())
+
+
+def _join(words: List[Word]) -> str:
+    return " ".join(w.text.strip() for w in words if w.text.strip())
+
+
+def _common_prefix(a: List[Word], b: List[Word]) -> int:
+    n = 0
+    while n < min(len(a), len(b)) and _key(a[n].text) == _key(b[n].text):
+        n += 1
+    return n
+
+
+@dataclass
+class PartialTranscript:
+    committed: str      # final, will not change
+    tentative: str      # current guess for the rest of the utterance
+    new_words: int      # words committed by this pass
+
+    @property
+    def text(self) -> str:
+        return f"{self.committed} {self.tentative}".strip()
+
+
+def whisper_word_transcriber(model, language: str = "en") -> WordTranscriber:
+    """Adapt a faster-whisper WhisperModel to the WordTranscriber interface."""
+
+    def _transcribe(audio: np.ndarray, prompt: str) -> List[Word]:
+        segments, _ = model.transcribe(
+            audio,
+            language=language,
+            beam_size=1,
+            best_of=1,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=prompt or None,
+            # The caller's VAD already bounds the utterance; filtering inside
+            # a sliding window would shift word timestamps between passes.
+            vad_filter=False,
+        )
+        return [Word(w.start, w.end, w.word) for s in segments for w in (s.words or [])]
+
+    return _transcribe
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcriber for one utterance.  Not thread-safe: feed it from
+    a single thread (VoiceCommandHandler runs it on its STT worker).
+    """
+
+    AGREEMENT = 2               # passes that must agree before a word is committed
+    TRIM_SEC = 4.0              # drop committed audio once the window exceeds this
+    MAX_WINDOW_SEC = 12.0       # trim even without agreement once the window exceeds this
+    MIN_WINDOW_SEC = 0.5        # don't decode windows shorter than this
+    PROMPT_CHARS = 200          # committed text carried over as decoder prompt
+    TIME_TOLERANCE_SEC = 0.1    # timestamp jitter allowed between passes
+
+    def __init__(self, transcribe: WordTranscriber, sample_rate: int = 16000,
+                 agreement: Optional[int] = None, trim_sec: Optional[float] = None,
+                 max_window_sec: Optional[float] = None):
+        self._transcribe = transcribe
+        self.sample_rate = sample_rate
+        self._agreement = max(1, agreement or self.AGREEMENT)
+        self._trim_sec = trim_sec or self.TRIM_SEC
+        self._max_window_sec = max(self._trim_sec, max_window_sec or self.MAX_WINDOW_SEC)
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._offset = 0.0                      # utterance time of self._audio[0]
+        self._committed: List[Word] = []
+        self._history: List[List[Word]] = []    # last agreement-1 uncommitted hypotheses
+        self._tentative: List[Word] = []
+        self.passes = 0
+        self.decoded_sec = 0.0                  # total audio fed through the model
+
+    # ── input ───────────────────────────────────────────────────────────
+
+    def insert_audio(self, audio: np.ndarray) -> None:
+        if len(audio):
+            self._audio = np.concatenate((self._audio, audio.astype(np.float32, copy=False)))
+
+    @property
+    def buffered_sec(self) -> float:
+        return len(self._audio) / self.sample_rate
+
+    @property
+    def committed_text(self) -> str:
+        return _join(self._committed)
+
+    # ── decoding ────────────────────────────────────────────────────────
+
+    def _prompt(self) -> str:
+        return self.committed_text[-self.PROMPT_CHARS:]
+
+    def _decode(self) -> List[Word]:
+        """Transcribe the window and return the words not yet committed (absolute times)."""
+        self.passes += 1
+        self.decoded_sec += self.buffered_sec
+        words = [Word(w.start + self._offset, w.end + self._offset, w.text)
+                 for w in self._transcribe(self._audio, self._prompt())]
+        if not self._committed:
+            return words
+        last_end = self._committed[-1].end
+        words = [w for w in words if w.start > last_end - self.TIME_TOLERANCE_SEC]
+        # The window can re-emit the last committed word(s); drop a repeated n-gram
+        tail = [_key(w.text) for w in self._committed[-5:]]
+        for n in range(min(len(tail), len(words)), 0, -1):
+            if tail[-n:] == [_key(w.text) for w in words[:n]]:
+                return words[n:]
+        return words
+
+    def process(self) -> PartialTranscript:
+        """Decode the current window and commit the words recent passes agree on."""
+        if self.buffered_sec < self.MIN_WINDOW_SEC:
+            return PartialTranscript(self.committed_text, _join(self._tentative), 0)
+
+        hypothesis = self._decode()
+        # Not enough passes yet -> nothing can be agreed on
+        agreed = len(hypothesis) if len(self._history) >= self._agreement - 1 else 0
+        for previous in self._history:
+            agreed = min(agreed, _common_prefix(previous, hypothesis))
+
+        self._committed.extend(hypothesis[:agreed])
+        history = [h[agreed:] for h in self._history] + [hypothesis[agreed:]]
+        self._history = history[len(history) - (self._agreement - 1):]
+        self._tentative = hypothesis[agreed:]
+        self._maybe_trim()
+        return PartialTranscript(self.committed_text, _join(self._tentative), agreed)
+
+    def _maybe_trim(self) -> None:
+        if self.buffered_sec > self._max_window_sec:
+            # No agreement for too long: keep only the last trim_sec, committing
+            # the tentative words that end before it
+            horizon = self._offset + self.buffered_sec - self._trim_sec
+            forced = 0
+            while forced < len(self._tentative) and self._tentative[forced].end <= horizon:
+                forced += 1
+            if forced:
+                self._committed.extend(self._tentative[:forced])
+                self._tentative = self._tentative[forced:]
+                self._history = []
+            cut_at = (self._committed[-1].end if forced else horizon) - self._offset
+        elif self.buffered_sec > self._trim_sec and self._committed:
+            cut_at = self._committed[-1].end - self._offset
+        else:
+            return
+        cut = int(max(0.0, cut_at) * self.sample_rate)
+        if cut <= 0:
+            return
+        self._audio = self._audio[cut:]
+        self._offset += cut / self.sample_rate
+
+    def finish(self) -> str:
+        """Decode whatever is still uncommitted and return the full transcript."""
+        if self.buffered_sec > 0:
+            self._committed.extend(self._decode())
+        self._history = []
+        self._tentative = []
+        self._audio = np.zeros(0, dtype=np.float32)
+        return self.committed_text
@@ -0,0 +1,349 @@
+"""
+STT Model Pool — resident faster-whisper models shared across voice turns.
+
+Loading a WhisperModel costs hundreds of milliseconds to seconds on CPU, so
+models are loaded once and kept warm, keyed by (size, device, compute_type).
+Callers never hold a model directly: model() returns a PooledWhisper handle
+whose transcribe() leases the resident instance for the duration of one call.
+That keeps idle unload and eviction safe (a leased model is never dropped)
+and lets the pool time load and transcription separately.
+
+  - prewarm() loads a model and runs one silent inference in the background
+    (called at startup and whenever a recording starts)
+  - models unused for IDLE_UNLOAD_SEC are unloaded (IRIS_STT_IDLE_UNLOAD_SEC,
+    0 = keep forever)
+  - resident models are kept under MEMORY_BUDGET_MB (IRIS_STT_MEMORY_BUDGET_MB)
+    by evicting the least recently used idle model before a new load
+  - concurrent loads of the same model wait for one load; concurrent
+    transcriptions per model are capped at its num_workers
+
+faster_whisper is imported lazily, on first load.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_STT_MODEL_LOAD_SECONDS = _metrics.summary(
+    "iris_stt_model_load_seconds", "Time to load a faster-whisper model", ["model"])
+_STT_MODEL_TRANSCRIBE_SECONDS = _metrics.summary(
+    "iris_stt_model_transcribe_seconds", "Time inside one pooled transcribe() call", ["model"])
+
+# Approximate parameter counts (millions) used to estimate resident memory
+_MODEL_PARAMS_M = {
+    "tiny": 39, "tiny.en": 39,
+    "base": 74, "base.en": 74,
+    "small": 244, "small.en": 244,
+    "medium": 769, "medium.en": 769,
+    "large-v1": 1550, "large-v2": 1550, "large-v3": 1550, "large": 1550,
+    "distil-large-v3": 756, "large-v3-turbo": 809, "turbo": 809,
+}
+_BYTES_PER_PARAM = {"int8": 1, "int8_float16": 1, "int8_float32": 1, "int8_bfloat16": 1,
+                    "float16": 2, "bfloat16": 2, "float32": 4}
+_RUNTIME_OVERHEAD = 1.25    # activations, CTranslate2 workspace, tokenizer
+
+
+class ModelSpec(NamedTuple):
+    size: str = "tiny"
+    device: str = "cpu"
+    compute_type: str = "int8"
+
+    @property
+    def label(self) -> str:
+        return f"{self.size}/{self.device}/{self.compute_type}"
+
+    def estimated_mb(self) -> float:
+        params = _MODEL_PARAMS_M.get(self.size, 769)   # unknown / local path: assume medium
+        return params * _BYTES_PER_PARAM.get(self.compute_type, 2) * _RUNTIME_OVERHEAD
+
+
+@dataclass
+class _Entry:
+    spec: ModelSpec
+    options: Dict[str, Any]
+    model: Any = None
+    loading: Optional[threading.Event] = None
+    load_error: Optional[BaseException] = None
+    slots: threading.BoundedSemaphore = None
+    leases: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    loads: int = 0
+    load_seconds: float = 0.0
+    last_load_seconds: float = 0.0
+    transcribes: int = 0
+    transcribe_seconds: float = 0.0
+
+
+class STTModelPool:
+    """Keeps faster-whisper models resident, keyed by ModelSpec."""
+
+    IDLE_UNLOAD_SEC = float(os.environ.get("IRIS_STT_IDLE_UNLOAD_SEC", "900"))
+    MEMORY_BUDGET_MB = float(os.environ.get("IRIS_STT_MEMORY_BUDGET_MB", "1024"))
+
+    def __init__(self, idle_unload_sec: Optional[float] = None,
+                 memory_budget_mb: Optional[float] = None, loader=None):
+        self.idle_unload_sec = self.IDLE_UNLOAD_SEC if idle_unload_sec is None else idle_unload_sec
+        self.memory_budget_mb = self.MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self._loader = loader or _load_whisper
+        self._entries: Dict[ModelSpec, _Entry] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    # ── access ──────────────────────────────────────────────────────────
+
+    def model(self, size: str = "tiny", device: str = "cpu", compute_type: str = "int8",
+              **options: Any) -> "PooledWhisper":
+        """Handle for one model; nothing is loaded until it is first used."""
+        return PooledWhisper(self, ModelSpec(size, device, compute_type), options)
+
+    def is_loaded(self, spec: ModelSpec) -> bool:
+        entry = self._entries.get(spec)
+        return entry is not None and entry.model is not None
+
+    def _entry(self, spec: ModelSpec, options: Dict[str, Any]) -> _Entry:
+        """Return the entry with its model loaded, loading it at most once."""
+        with self._lock:
+            entry = self._entries.get(spec)
+            if entry is None:
+                entry = self._entries[spec] = _Entry(
+                    spec, options,
+                    slots=threading.BoundedSemaphore(max(1, int(options.get("num_workers", 1)))))
+            if entry.model is not None:
+                entry.last_used = time.monotonic()
+                return entry
+            waiter = entry.loading
+            if waiter is None:
+                entry.loading = threading.Event()
+                entry.load_error = None
+        if waiter is not None:
+            waiter.wait()
+            if entry.model is None:
+                raise RuntimeError(f"STT model {spec.label} failed to load") from entry.load_error
+            return entry
+        self._load(entry)
+        return entry
+
+    def _load(self, entry: _Entry) -> None:
+        spec = entry.spec
+        self._make_room(spec)
+        logger.info(f"[STTPool] Loading faster-whisper {spec.label} (~{spec.estimated_mb():.0f} MB)...")
+        started = time.perf_counter()
+        try:
+            model = self._loader(spec, entry.options)
+        except BaseException as e:
+            entry.load_error = e
+            with self._lock:
+                entry.loading.set()
+                entry.loading = None
+            raise
+        elapsed = time.perf_counter() - started
+        _STT_MODEL_LOAD_SECONDS.labels(model=spec.label).observe(elapsed)
+        with self._lock:
+            entry.model = model
+            entry.loads += 1
+            entry.load_seconds += elapsed
+            entry.last_load_seconds = elapsed
+            entry.last_used = time.monotonic()
+            entry.loading.set()
+            entry.loading = None
+        logger.info(f"[STTPool] {spec.label} ready in {elapsed * 1000:.0f} ms")
+        self._ensure_reaper()
+
+    @contextmanager
+    def lease(self, spec: ModelSpec, options: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """Borrow the resident model; it cannot be unloaded while leased."""
+        entry = self._entry(spec, options or {})
+        with self._lock:
+            entry.leases += 1
+        try:
+            with entry.slots:
+                model = entry.model
+                if model is None:       # unloaded between _entry() and the lease
+                    model = self._entry(spec, entry.options).model
+                started = time.perf_counter()
+                try:
+                    yield model
+                finally:
+                    elapsed = time.perf_counter() - started
+                    _STT_MODEL_TRANSCRIBE_SECONDS.labels(model=spec.label).observe(elapsed)
+                    entry.transcribes += 1
+                    entry.transcribe_seconds += elapsed
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    # ── warm-up / unload ────────────────────────────────────────────────
+
+    def prewarm(self, size: str = "tiny", device: str = "cpu", compute_type: str = "int8",
+                background: bool = True, **options: Any) -> Optional[threading.Thread]:
+        """
+        Load a model and run one silent inference so the first real
+        transcription pays neither load nor kernel-initialisation cost.
+        No-op if the model is already resident.
+        """
+        spec = ModelSpec(size, device, compute_type)
+        if self.is_loaded(spec):
+            with self._lock:
+                self._entries[spec].last_used = time.monotonic()
+            return None
+
+        def _warm():
+            try:
+                with self.lease(spec, options) as model:
+                    silence = np.zeros(8000, dtype=np.float32)
+                    list(model.transcribe(silence, language="en", beam_size=1)[0])
+                logger.info(f"[STTPool] {spec.label} warm")
+            except Exception as exc:
+                logger.warning(f"[STTPool] Warm-up of {spec.label} failed (non-fatal): {exc}")
+
+        if not background:
+            _warm()
+            return None
+        thread = threading.Thread(target=_warm, daemon=True, name="iris-stt-warmup")
+        thread.start()
+        return thread
+
+    def unload(self, spec: ModelSpec) -> bool:
+        """Drop a resident model unless it is leased. Returns True if unloaded."""
+        with self._lock:
+            entry = self._entries.get(spec)
+            if entry is None or entry.model is None or entry.leases:
+                return False
+            entry.model = None
+        logger.info(f"[STTPool] Unloaded {spec.label}")
+        return True
+
+    def unload_idle(self) -> int:
+        """Unload models unused for idle_unload_sec. Returns how many were unloaded."""
+        if self.idle_unload_sec <= 0:
+            return 0
+        cutoff = time.monotonic() - self.idle_unload_sec
+        with self._lock:
+            idle = [e.spec for e in self._entries.values()
+                    if e.model is not None and not e.leases and e.last_used < cutoff]
+        return sum(self.unload(spec) for spec in idle)
+
+    def _make_room(self, spec: ModelSpec) -> None:
+        """Evict least recently used idle models until spec fits the budget."""
+        needed = spec.estimated_mb()
+        while True:
+            with self._lock:
+                resident = [e for e in self._entries.values() if e.model is not None]
+                used = sum(e.spec.estimated_mb() for e in resident)
+                if used + needed <= self.memory_budget_mb:
+                    return
+                victims = sorted((e for e in resident if not e.leases), key=lambda e: e.last_used)
+            if not victims:
+                logger.warning(
+                    f"[STTPool] Loading {spec.label} exceeds the {self.memory_budget_mb:.0f} MB "
+                    f"budget ({used:.0f} MB resident, all in use)")
+                return
+            self.unload(victims[0].spec)
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_unload_sec <= 0 or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True, name="iris-stt-reaper")
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, min(60.0, self.idle_unload_sec / 4))
+        while not self._closed.wait(interval):
+            self.unload_idle()
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            for entry in self._entries.values():
+                entry.model = None
+
+    # ── reporting ───────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._entries.values())
+        now = time.monotonic()
+        models = {}
+        for e in entries:
+            models[e.spec.label] = {
+                "loaded": e.model is not None,
+                "estimated_mb": round(e.spec.estimated_mb()),
+                "leases": e.leases,
+                "idle_s": round(now - e.last_used, 1),
+                "loads": e.loads,
+                "load_ms_total": round(e.load_seconds * 1000, 1),
+                "last_load_ms": round(e.last_load_seconds * 1000, 1),
+                "transcribes": e.transcribes,
+                "transcribe_ms_total": round(e.transcribe_seconds * 1000, 1),
+                "transcribe_ms_avg": round(e.transcribe_seconds * 1000 / e.transcribes, 1)
+                if e.transcribes else 0.0,
+            }
+        return {
+            "resident_mb": round(sum(e.spec.estimated_mb() for e in entries if e.model is not None)),
+            "memory_budget_mb": self.memory_budget_mb,
+            "idle_unload_sec": self.idle_unload_sec,
+            "models": models,
+        }
+
+
+class PooledWhisper:
+    """
+    Stand-in for a WhisperModel backed by the pool.
+
+    transcribe() has the faster-whisper signature but decodes eagerly (the
+    segments generator is consumed inside the lease) and returns a list.
+    """
+
+    __slots__ = ("_pool", "spec", "_options")
+
+    def __init__(self, pool: STTModelPool, spec: ModelSpec, options: Dict[str, Any]):
+        self._pool = pool
+        self.spec = spec
+        self._options = options
+
+    def transcribe(self, audio: np.ndarray, **kwargs: Any):
+        with self._pool.lease(self.spec, self._options) as model:
+            segments, info = model.transcribe(audio, **kwargs)
+            return list(segments), info
+
+    def prewarm(self, background: bool = True) -> Optional[threading.Thread]:
+        return self._pool.prewarm(*self.spec, background=background, **self._options)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._pool.is_loaded(self.spec)
+
+
+def _load_whisper(spec: ModelSpec, options: Dict[str, Any]):
+    from faster_whisper import WhisperModel
+    return WhisperModel(spec.size, device=spec.device, compute_type=spec.compute_type, **options)
+
+
+_pool: Optional[STTModelPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_stt_pool() -> STTModelPool:
+    """Get or create the process-wide STTModelPool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = STTModelPool()
+    return _pool
@@ -8,24 +8,40 @@ RealtimeSTT.AudioToTextRecorder.__init__ hangs indefinitely on this system
 Flow:
   1. iris_gateway calls start_recording(auto_stop=True)   ← wake word path
      or start_recording(auto_stop=False)                  ← double-click path
-  2. AudioEngine frame listener (_capture_frame) accumulates float32 PCM frames
-  3a. auto_stop=True:  energy-based VAD loop detects end-of-speech silently
+  2. AudioEngine frame listener (_capture_frame) writes float32 PCM frames into
+     a preallocated ring (FrameBuffer); the utterance is read back as a view
+  3a. auto_stop=True:  block-vectorised VAD (speech_detection.py) detects end-of-speech silently
   3b. auto_stop=False: stop_recording() is called by user or gateway
-  4. Accumulated audio is passed to faster-whisper.transcribe()
+     Meanwhile a streaming worker re-transcribes the growing utterance and
+     reports partial transcripts (see streaming_stt.py)
+  4. End-of-speech: the streaming transcriber decodes only the uncommitted
+     tail (short takes fall back to one faster-whisper.transcribe() pass)
   5. _on_command_result callback → iris_gateway._on_voice_result → agent pipeline
 """
 
 import logging
+import os
 import threading
 import time
 import numpy as np
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from enum import Enum
 
 from .engine import AudioEngine
+from .ring_buffer import FrameBuffer
+from .stt_pool import get_stt_pool
+from .streaming_stt import StreamingTranscriber, whisper_word_transcriber
+from .speech_detection import FRAME_LENGTH, SpeechSegmenter, as_frames, create_vad, frame_features
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import bind_context, get_tracer, span as trace_span
 
 logger = logging.getLogger(__name__)
 
+_STT_SECONDS = get_metrics_registry().summary(
+    "iris_stt_seconds", "Speech-to-text latency for one recorded utterance")
+_STT_REAL_TIME_FACTOR = get_metrics_registry().summary(
+    "iris_stt_real_time_factor", "Transcription time divided by audio duration")
+
 
 class VoiceState(str, Enum):
     """Voice command states"""
@@ -41,8 +57,10 @@ class VoiceCommandHandler:
     Records user speech after wake word detection and transcribes with faster-whisper.
 
     Uses WhisperModel('tiny', compute_type='int8') — ~40 MB, loads in ~1s on CPU,
-    transcribes a 3s utterance in < 1s.  Simple energy-based VAD handles
-    auto-stop (wake-word path) without external VAD dependencies.
+    transcribes a 3s utterance in < 1s.  The model stays resident in the shared
+    STTModelPool between turns.  Energy/zero-crossing VAD handles auto-stop
+    (wake-word path) without external VAD dependencies; WebRTC or Silero VAD
+    can be selected with IRIS_VAD_BACKEND.
     """
 
     # VAD tuning — adjustable per environment
@@ -51,11 +69,22 @@ class VoiceCommandHandler:
     VAD_SILENCE_SEC: float = 0.5          # silence after speech → end of utterance
     VAD_MAX_DURATION_SEC: float = 30.0    # hard cap on recording length
     VAD_POLL_INTERVAL_SEC: float = 0.015  # how often VAD loop checks for new frames
+    VAD_BACKEND: str = os.environ.get("IRIS_VAD_BACKEND", "energy")   # energy | webrtc | silero
+
+    # Recording ring size; a manual recording longer than this keeps its last part
+    RECORDING_CAPACITY_SEC: float = 60.0
+
+    # Streaming STT — partial transcripts while the user is still speaking
+    STREAMING_STT: bool = os.environ.get("IRIS_STREAMING_STT", "1") != "0"
+    STREAM_STEP_SEC: float = 0.5          # re-transcribe the growing utterance this often
+    STREAM_JOIN_TIMEOUT_SEC: float = 3.0  # longest wait for an in-flight pass at end-of-speech
+
+    # faster-whisper model size (tiny / base are both fine on CPU)
+    STT_MODEL_SIZE: str = os.environ.get("IRIS_STT_MODEL", "tiny")
 
     def __init__(self, audio_engine: AudioEngine):
         self.audio_engine = audio_engine
-        self._whisper = None            # lazy-loaded WhisperModel
-        self._whisper_lock = threading.Lock()
+        self._whisper = None            # PooledWhisper handle (model lives in the STT pool)
 
         # State
         self.state = VoiceState.IDLE
@@ -63,10 +92,11 @@ class VoiceCommandHandler:
         # audio_buffer length checked by iris_gateway (> 30 frames = has real audio).
         # Sentinel Nones keep the count accurate without storing duplicates.
         self.audio_buffer: List = []
-        self._raw_frames: List[np.ndarray] = []   # actual float32 PCM frames
 
         # Configuration
         self.sample_rate = 16000
+        # Recorded float32 PCM, preallocated and reused across takes
+        self._raw_frames = FrameBuffer(int(self.RECORDING_CAPACITY_SEC * self.sample_rate))
 
         # Session tracking
         self._active_session_id: str = "default"
@@ -87,6 +117,8 @@ class VoiceCommandHandler:
         # Called with smoothed RMS level (0.0–1.0) every ~100 ms during recording.
         # Used by the gateway to broadcast audio_level WS events for orb animation.
         self._on_audio_level: Optional[Callable[[float], None]] = None
+        # Called with {"committed", "tentative", "session_id"} from the streaming worker
+        self._on_partial_transcript: Optional[Callable[[Dict[str, Any]], None]] = None
 
         # Internal
         self._frame_listener_registered = False
@@ -112,6 +144,10 @@ class VoiceCommandHandler:
         """Register callback fired with smoothed RMS (0.0–1.0) every ~100 ms during recording."""
         self._on_audio_level = callback
 
+    def set_partial_transcript_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Register callback fired with partial transcripts while the user speaks."""
+        self._on_partial_transcript = callback
+
     def set_active_session(self, session_id: str) -> None:
         """Set the session_id that owns the current recording."""
         self._active_session_id = session_id
@@ -124,6 +160,7 @@ class VoiceCommandHandler:
             "buffer_size": len(self.audio_buffer),
             "silence_counter": 0,
             "speech_started": self.is_recording,
+            "stt_models": get_stt_pool().get_stats(),
         }
 
     def start_recording(self, auto_stop: bool = False, pre_speech_timeout_sec: float = 0.0) -> bool:
@@ -177,10 +214,19 @@ class VoiceCommandHandler:
             logger.info("[VoiceCommand] Starting recording (faster-whisper)...")
             # Play beep in parallel so recording setup doesn't wait for audio I/O
             threading.Thread(target=self._play_activation_beep, daemon=True, name="iris-beep").start()
+            # Reload the STT model now if it was idle-unloaded — overlaps the
+            # load with the user speaking instead of paying it at end-of-speech
+            self.warm_up()
 
             self.is_recording = True
             self.audio_buffer = []
-            self._raw_frames = []
+            previous = self._transcription_thread
+            if previous is not None and previous.is_alive():
+                # The previous take may still be transcribing from views into
+                # the old ring — give this take its own
+                self._raw_frames = FrameBuffer(int(self.RECORDING_CAPACITY_SEC * self.sample_rate))
+            else:
+                self._raw_frames.reset()
             self._cancel_event.clear()  # clear any stale cancel from the previous take
             self._stop_event.clear()
 
@@ -197,7 +243,7 @@ class VoiceCommandHandler:
 
             # Start transcription thread (handles VAD + whisper in background)
             self._transcription_thread = threading.Thread(
-                target=self._run_transcription,
+                target=self._run_traced_transcription,
                 daemon=True,
                 name="iris-stt",
             )
@@ -261,19 +307,19 @@ class VoiceCommandHandler:
         """
         import psutil
 
-        # RAM guard — require at least 4.0 GB free before attempting model load
+        fallback_model = get_stt_pool().model("tiny", "cpu", "int8")
+        # RAM guard — require at least 4.0 GB free before loading a model
+        # (not needed when the pool already has it resident)
         _avail_gb = psutil.virtual_memory().available / (1024 ** 3)
-        if _avail_gb < 4.0:
+        if _avail_gb < 4.0 and not fallback_model.is_loaded:
             logger.warning(
                 f"[VoiceCommand] Fallback STT: only {_avail_gb:.1f} GB RAM available "
                 "(need >= 4.0 GB) — skipping to speech_recognition fallback"
             )
         else:
-            # Attempt 1: faster_whisper
+            # Attempt 1: faster_whisper (resident tiny model from the STT pool)
             try:
-                from faster_whisper import WhisperModel
-                _fw_model = WhisperModel("tiny", device="cpu", compute_type="int8")
-                segments, _ = _fw_model.transcribe(
+                segments, _ = fallback_model.transcribe(
                     audio_np, language="en", beam_size=1, vad_filter=True
                 )
                 transcript = " ".join(s.text.strip() for s in segments).strip()
@@ -311,23 +357,22 @@ class VoiceCommandHandler:
         return ""
 
     def _get_whisper(self):
-        """Lazy-load and cache the WhisperModel (thread-safe)."""
+        """
+        Handle to the resident WhisperModel in the shared STT pool.
+
+        Always CPU: F5-TTS also runs on CPU so keeping STT on CPU avoids any
+        CUDA context serialisation; tiny/int8 transcribes a 3 s clip in
+        ~80 ms on any modern CPU.  The model itself is loaded on first use
+        (faster_whisper is imported lazily by the pool).
+        """
         if self._whisper is None:
-            with self._whisper_lock:
-                if self._whisper is None:
-                    from faster_whisper import WhisperModel
-                    logger.info("[VoiceCommand] Loading faster-whisper tiny/int8 on CPU...")
-                    # Always use CPU for STT.  F5-TTS also runs on CPU so keeping
-                    # STT on CPU avoids any CUDA context serialisation; tiny/int8
-                    # transcribes a 3 s clip in ~80 ms on any modern CPU.
-                    self._whisper = WhisperModel(
-                        "tiny",
-                        device="cpu",
-                        compute_type="int8",
-                        num_workers=1,          # single-threaded is fine for our latency target
-                        cpu_threads=4,          # cap so we don't starve the F5-TTS thread
-                    )
-                    logger.info("[VoiceCommand] faster-whisper ready")
+            self._whisper = get_stt_pool().model(
+                self.STT_MODEL_SIZE,
+                "cpu",
+                "int8",
+                num_workers=1,          # single-threaded is fine for our latency target
+                cpu_threads=4,          # cap so we don't starve the F5-TTS thread
+            )
         return self._whisper
 
     def warm_up(self) -> None:
@@ -335,24 +380,22 @@ class VoiceCommandHandler:
         Pre-load the Whisper model and run one silent inference in a daemon
         thread so the FIRST real transcription has zero model-load latency.
 
-        Call this once during backend startup (after AudioEngine initialises).
-        Safe to call multiple times — subsequent calls are no-ops.
+        Called at startup and again whenever a recording starts (the model
+        may have been idle-unloaded).  No-op while the model is resident.
         """
-        if self._whisper is not None:
-            return  # already loaded
+        self._get_whisper().prewarm()
 
-        def _do_warm_up():
-            try:
-                model = self._get_whisper()
-                # Run a silent 0.5 s array through the pipeline to trigger
-                # any lazy ONNX/CTranslate2 kernel compilation.
-                silence = np.zeros(int(self.sample_rate * 0.5), dtype=np.float32)
-                list(model.transcribe(silence, language="en", beam_size=1)[0])
-                logger.info("[VoiceCommand] Whisper warm-up complete — first transcription will be instant")
-            except Exception as exc:
-                logger.warning(f"[VoiceCommand] Whisper warm-up failed (non-fatal): {exc}")
+    def _run_traced_transcription(self) -> None:
+        """
+        Transcription thread entry point.
 
-        threading.Thread(target=_do_warm_up, daemon=True, name="iris-stt-warmup").start()
+        The whole turn runs inside a "voice.turn" trace; the result callback
+        hands it on to the gateway (run_coroutine_threadsafe carries the
+        context), so agent, TTS and WS spans join the same trace.
+        """
+        with get_tracer().trace("voice.turn", session_id=self._active_session_id,
+                                auto_stop=self._auto_stop_mode):
+            self._run_transcription()
 
     def _run_transcription(self) -> None:
         """
@@ -362,14 +405,17 @@ class VoiceCommandHandler:
         try:
             logger.info("[VoiceCommand] Waiting for speech...")
 
-            if self._auto_stop_mode:
-                # Energy-based VAD: wait for speech onset, then wait for silence
-                self._vad_wait_for_speech_then_silence()
-            else:
-                # Manual mode: wait until stop_recording() sets the event
-                self._stop_event.wait()
+            stream = self._start_streaming()
+            with trace_span("vad.wait"):
+                if self._auto_stop_mode:
+                    # Energy-based VAD: wait for speech onset, then wait for silence
+                    self._vad_wait_for_speech_then_silence()
+                else:
+                    # Manual mode: wait until stop_recording() sets the event
+                    self._stop_event.wait()
 
             self.is_recording = False
+            streamer, streamed_samples = self._stop_streaming(stream)
 
             # Check for explicit user cancellation BEFORE running Whisper.
             # cancel_recording() sets _cancel_event when the user clicks the orb
@@ -385,25 +431,40 @@ class VoiceCommandHandler:
                 self._on_transcription_complete("")
                 return
 
-            # Concatenate all captured frames into one float32 array
-            audio_np = np.concatenate(self._raw_frames, axis=0).astype(np.float32)
+            # The whole utterance as one contiguous float32 view (no copy)
+            audio_np = self._recorded_audio()
             duration = len(audio_np) / self.sample_rate
             logger.info(f"[VoiceCommand] Transcribing {duration:.1f}s of audio...")
 
             self._set_state(VoiceState.PROCESSING, "Transcribing...")
 
-            whisper = self._get_whisper()
-            segments, _ = whisper.transcribe(
-                audio_np,
-                language="en",
-                beam_size=1,                # 3× faster than default beam_size=5; quality
-                                            # loss is negligible for conversational STT on tiny
-                best_of=1,                  # no random sampling — deterministic, fastest path
-                condition_on_previous_text=False,   # prevents hallucination drift between clips
-                vad_filter=True,            # faster-whisper built-in VAD for clean segments
-                vad_parameters={"min_silence_duration_ms": 300},
-            )
-            transcript = " ".join(s.text.strip() for s in segments).strip()
+            stt_started = time.perf_counter()
+            if streamer is not None:
+                # Most of the utterance is already committed; decode only the tail
+                with trace_span("stt.transcribe", audio_s=round(duration, 2), streaming=True):
+                    tail = self._raw_frames.ring.view(streamed_samples)
+                    if len(tail):
+                        streamer.insert_audio(tail)
+                    transcript = streamer.finish()
+            else:
+                whisper = self._get_whisper()
+                with trace_span("stt.transcribe", audio_s=round(duration, 2)):
+                    segments, _ = whisper.transcribe(
+                        audio_np,
+                        language="en",
+                        beam_size=1,                # 3× faster than default beam_size=5; quality
+                                                    # loss is negligible for conversational STT on tiny
+                        best_of=1,                  # no random sampling — deterministic, fastest path
+                        condition_on_previous_text=False,   # prevents hallucination drift between clips
+                        vad_filter=True,            # faster-whisper built-in VAD for clean segments
+                        vad_parameters={"min_silence_duration_ms": 300},
+                    )
+                    # segments is lazy — decoding happens while it is joined
+                    transcript = " ".join(s.text.strip() for s in segments).strip()
+            stt_elapsed = time.perf_counter() - stt_started
+            _STT_SECONDS.observe(stt_elapsed)
+            if duration > 0:
+                _STT_REAL_TIME_FACTOR.observe(stt_elapsed / duration)
             logger.info(f"[VoiceCommand] Transcript: '{transcript[:100]}'")
 
             self._on_transcription_complete(transcript)
@@ -414,8 +475,7 @@ class VoiceCommandHandler:
             logger.warning(f"[VoiceCommand] Failed to load native audio model: {e}")
             try:
                 if self._raw_frames:
-                    import numpy as np
-                    audio_np = np.concatenate(self._raw_frames, axis=0).astype(np.float32)
+                    audio_np = self._recorded_audio()
                     transcript = self._transcribe_with_fallback(audio_np)
                     if transcript:
                         self._on_transcription_complete(transcript)
@@ -425,89 +485,182 @@ class VoiceCommandHandler:
             self._set_state(VoiceState.ERROR, f"Transcription failed: {e}")
             threading.Timer(2.0, lambda: self._set_state(VoiceState.IDLE, "")).start()
 
+    # -------------------------------------------------------------------------
+    # Internal — streaming STT
+    # -------------------------------------------------------------------------
+
+    def _start_streaming(self):
+        """Start the partial-transcript worker for this take, or return None."""
+        if not self.STREAMING_STT:
+            return None
+        stop = threading.Event()
+        result: Dict[str, Any] = {}
+        worker = threading.Thread(
+            target=bind_context(self._stream_partials, stop, result),
+            daemon=True,
+            name="iris-stt-stream",
+        )
+        worker.start()
+        return worker, stop, result
+
+    def _stop_streaming(self, stream):
+        """
+        Stop the streaming worker and return (streamer, samples_fed).
+
+        samples_fed is an absolute sample index in the take. streamer is None
+        when streaming is off, failed, or never got far enough to decode
+        anything — the caller then transcribes in one pass.
+        At most one in-flight pass is waited for, and no longer than
+        STREAM_JOIN_TIMEOUT_SEC; a worker stuck past that (a model load, a
+        hung decode) is abandoned and the take is decoded in one pass.
+        """
+        if stream is None:
+            return None, 0
+        worker, stop, result = stream
+        stop.set()
+        worker.join(timeout=self.STREAM_JOIN_TIMEOUT_SEC)
+        if worker.is_alive():
+            logger.warning("[VoiceCommand] Streaming STT worker did not stop — falling back to one-pass")
+            return None, 0
+        streamer = result.get("streamer")
+        if streamer is None or result.get("failed") or not streamer.passes:
+            return None, 0
+        if result["fed"] < self._raw_frames.ring.oldest:
+            # The ring lapped audio the streamer never saw; decode what is left
+            return None, 0
+        return streamer, result["fed"]
+
+    def _stream_partials(self, stop: threading.Event, result: Dict[str, Any]) -> None:
+        """Streaming worker: re-transcribe the growing utterance every STREAM_STEP_SEC."""
+        try:
+            streamer = StreamingTranscriber(
+                whisper_word_transcriber(self._get_whisper()), self.sample_rate)
+            result["streamer"], result["fed"] = streamer, 0
+            speech = False
+            last_text = None
+            while not stop.wait(self.STREAM_STEP_SEC):
+                # Absolute indices: a manual take longer than the ring wraps it
+                start, new = self._recorded_since(result["fed"])
+                if start != result["fed"]:
+                    raise RuntimeError("fell behind the recording ring")
+                if not speech:
+                    # Skip leading silence; keep a couple of frames before the onset
+                    loud = np.nonzero(frame_features(as_frames(new))[0] >= self.VAD_ENERGY_THRESHOLD)[0]
+                    if not len(loud):
+                        result["fed"] += max(0, len(new) // FRAME_LENGTH - 2) * FRAME_LENGTH
+                        continue
+                    speech = True
+                    skip = max(0, int(loud[0]) - 2) * FRAME_LENGTH
+                    result["fed"] += skip
+                    new = new[skip:]
+                if not len(new):
+                    continue
+                result["fed"] += len(new)
+                streamer.insert_audio(new)
+                partial = streamer.process()
+                if partial.text == last_text:
+                    continue
+                last_text = partial.text
+                if self._on_partial_transcript:
+                    try:
+                        self._on_partial_transcript({
+                            "committed":  partial.committed,
+                            "tentative":  partial.tentative,
+                            "session_id": self._active_session_id,
+                        })
+                    except Exception:
+                        pass
+        except Exception as e:
+            result["failed"] = True
+            logger.warning(f"[VoiceCommand] Streaming STT failed — falling back to one-pass: {e}")
+
     def _vad_wait_for_speech_then_silence(self) -> None:
         """
-        Simple energy-based VAD for auto_stop mode.
+        VAD wait for auto_stop mode.
 
-        State machine:
-          PRE_SPEECH  → wait for audio above VAD_ENERGY_THRESHOLD
+        State machine (SpeechSegmenter):
+          PRE_SPEECH  → wait for VAD_MIN_SPEECH_SEC of speech
           IN_SPEECH   → wait for sustained silence (VAD_SILENCE_SEC) after speech
           DONE        → return (triggers transcription)
 
+        Each poll classifies every frame that arrived since the last one in a
+        single vectorised pass over a view of the recording ring.
+
         If _pre_speech_timeout_sec > 0, gives up if speech onset doesn't
         arrive within that window — used by conversation-mode relisten passes.
         """
-        frame_sec = 512 / self.sample_rate          # ≈ 0.032 s per frame at 16 kHz
-        silence_needed = int(self.VAD_SILENCE_SEC / frame_sec)
-        speech_needed = int(self.VAD_MIN_SPEECH_SEC / frame_sec)
+        frame_sec = FRAME_LENGTH / self.sample_rate     # ≈ 0.032 s per frame at 16 kHz
         max_frames = int(self.VAD_MAX_DURATION_SEC / frame_sec)
-        pre_speech_max_frames = (
-            int(self._pre_speech_timeout_sec / frame_sec)
-            if self._pre_speech_timeout_sec > 0 else max_frames
+        segmenter = SpeechSegmenter(
+            min_speech_frames=int(self.VAD_MIN_SPEECH_SEC / frame_sec),
+            hangover_frames=int(self.VAD_SILENCE_SEC / frame_sec),
+            max_frames=max_frames,
+            pre_speech_max_frames=(
+                int(self._pre_speech_timeout_sec / frame_sec)
+                if self._pre_speech_timeout_sec > 0 else max_frames
+            ),
         )
-
-        silence_count = 0
-        speech_count = 0
-        speech_started = False
-        last_processed = 0
-        total_frames = 0
-        pre_speech_frames = 0  # frames elapsed before first speech onset
+        vad = create_vad(self.VAD_BACKEND, energy_threshold=self.VAD_ENERGY_THRESHOLD,
+                         sample_rate=self.sample_rate)
+        consumed = 0    # samples already classified
         # Audio level: emit smoothed RMS every ~3 frames (~100 ms at 32 ms/frame)
         _level_accum = 0.0
         _level_frame_count = 0
         _LEVEL_EMIT_EVERY = 3
 
-        while total_frames < max_frames and not self._stop_event.is_set():
-            current_len = len(self._raw_frames)
-            if current_len == last_processed:
+        while not segmenter.done and not self._stop_event.is_set():
+            consumed, audio = self._recorded_since(consumed)
+            frames = as_frames(audio)
+            if not len(frames):
                 # Block until the stop event fires OR the poll interval expires.
                 # More CPU-efficient than time.sleep() — wakes immediately on cancel.
                 self._stop_event.wait(timeout=self.VAD_POLL_INTERVAL_SEC)
                 continue
+            consumed += frames.size
+
+            if self._on_audio_level:
+                rms = frame_features(frames)[0]
+                for value in rms:
+                    _level_accum += float(value)
+                    _level_frame_count += 1
+                    if _level_frame_count >= _LEVEL_EMIT_EVERY:
+                        # Normalise: divide by 2× threshold so speech ≈ 0.5, loud ≈ 1.0
+                        level = min(1.0, _level_accum / _level_frame_count / (self.VAD_ENERGY_THRESHOLD * 2))
+                        try:
+                            self._on_audio_level(level)
+                        except Exception:
+                            pass
+                        _level_accum = 0.0
+                        _level_frame_count = 0
+
+            state = segmenter.feed(vad.classify(frames))
+            if state == SpeechSegmenter.ENDED:
+                logger.debug("[VoiceCommand] VAD: end-of-speech detected")
+            elif state == SpeechSegmenter.TIMEOUT and segmenter.onset_frame is None:
+                logger.debug(
+                    f"[VoiceCommand] VAD: pre-speech timeout "
+                    f"({self._pre_speech_timeout_sec}s) — returning to idle"
+                )
 
-            new_frames = self._raw_frames[last_processed:current_len]
-            last_processed = current_len
+        logger.debug(
+            f"[VoiceCommand] VAD: loop ended (frames={segmenter.frames_seen}, "
+            f"speech_started={segmenter.onset_frame is not None})")
 
-            for frame in new_frames:
-                total_frames += 1
-                rms = float(np.sqrt(np.mean(np.square(frame))))
+    def _recorded_audio(self) -> np.ndarray:
+        """Everything the ring still holds of this take, as one float32 view."""
+        return self._raw_frames.samples()
 
-                # Accumulate for audio_level broadcast (~100 ms cadence)
-                _level_accum += rms
-                _level_frame_count += 1
-                if _level_frame_count >= _LEVEL_EMIT_EVERY and self._on_audio_level:
-                    # Normalise: divide by 2× threshold so speech ≈ 0.5, loud ≈ 1.0
-                    level = min(1.0, _level_accum / _level_frame_count / (self.VAD_ENERGY_THRESHOLD * 2))
-                    try:
-                        self._on_audio_level(level)
-                    except Exception:
-                        pass
-                    _level_accum = 0.0
-                    _level_frame_count = 0
-
-                if rms >= self.VAD_ENERGY_THRESHOLD:
-                    speech_count += 1
-                    silence_count = 0
-                    if speech_count >= speech_needed:
-                        speech_started = True
-                else:
-                    if speech_started:
-                        silence_count += 1
-                        if silence_count >= silence_needed:
-                            logger.debug("[VoiceCommand] VAD: end-of-speech detected")
-                            return  # silence after real speech → done
-                    else:
-                        # Background noise before speech — decay counter slowly
-                        speech_count = max(0, speech_count - 1)
-                        pre_speech_frames += 1
-                        if pre_speech_frames >= pre_speech_max_frames:
-                            logger.debug(
-                                f"[VoiceCommand] VAD: pre-speech timeout "
-                                f"({self._pre_speech_timeout_sec}s) — returning to idle"
-                            )
-                            return  # no speech onset in time → done (empty frames)
-
-        logger.debug(f"[VoiceCommand] VAD: loop ended (frames={total_frames}, speech_started={speech_started})")
+    def _recorded_since(self, start: int) -> Tuple[int, np.ndarray]:
+        """
+        (start, view) of the take from absolute sample ``start`` on.
+
+        Absolute indices stay valid after a long manual take wraps the ring;
+        if the samples at ``start`` were already overwritten, the returned
+        start moves up to the oldest sample still held.
+        """
+        ring = self._raw_frames.ring
+        start = max(start, ring.oldest)
+        return start, ring.view(start)
 
     # -------------------------------------------------------------------------
     # Internal — audio capture
@@ -523,7 +676,8 @@ class VoiceCommandHandler:
 
         # Sentinel keeps audio_buffer length accurate for iris_gateway check (> 30 frames)
         self.audio_buffer.append(None)
-        self._raw_frames.append(audio_frame.copy())
+        # One copy into the preallocated recording ring — no per-frame allocation
+        self._raw_frames.append(audio_frame)
 
     # -------------------------------------------------------------------------
     # Internal — helpers
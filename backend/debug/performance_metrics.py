@@ -3,6 +3,7 @@ import asyncio
 import time
 import json
 import psutil
+from collections import deque
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
@@ -20,11 +21,16 @@ class PerformanceMonitor:
     """
     Monitors system and application performance metrics.
     Provides real-time performance data for debugging and optimization.
+
+    Only the most recent MAX_METRICS measurements are kept; latency
+    distributions live in backend.monitoring.metrics instead.
     """
 
+    MAX_METRICS = 10_000
+
     def __init__(self, collection_interval: float = 1.0, session_manager=None, state_manager=None):
         self.collection_interval = collection_interval
-        self.metrics: List[PerformanceMetric] = []
+        self.metrics: "deque[PerformanceMetric]" = deque(maxlen=self.MAX_METRICS)
         self.is_running = False
         self.start_time: Optional[datetime] = None
         self.worker_task: Optional[asyncio.Task] = None
@@ -128,7 +134,7 @@ class PerformanceMonitor:
             metric_type: Filter by metric type
             time_range: Tuple of (start_time, end_time) as datetime objects
         """
-        filtered_metrics = self.metrics
+        filtered_metrics = list(self.metrics)
 
         if metric_type:
             filtered_metrics = [m for m in filtered_metrics if m.metric_type == metric_type]
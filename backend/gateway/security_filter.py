@@ -12,6 +12,15 @@ from .iris_gateway import GatewayMessage, MessageType
 from ..security.mcp_security import MCPSecurityManager
 from ..security.audit_logger import SecurityAuditLogger
 from ..security.security_types import SecurityLevel, SecurityContext, SecurityValidation
+from ..security.rate_limiter import RateLimiter, RateLimitPolicy
+from ..security.pattern_scanner import PatternScanner, ScanRule
+
+# Suspicious vision request patterns, scanned as one combined pass
+_SUSPICIOUS_VISION_RULES = (
+    ScanRule("vision_credentials", r"\b(password|login|credential|secret)\"", "high", "vision"),
+    ScanRule("vision_privileged", r"\b(admin|root|sudo)\"", "high", "vision"),
+    ScanRule("vision_financial", r"\b(bank|payment|credit)\"", "high", "vision"),
+)
 
 
 @dataclass
@@ -36,25 +45,34 @@ class FilterResult:
 
 @dataclass
 class RateLimitConfig:
-    """Rate limit configuration"""
+    """Rate limit configuration (sustained max_requests per window, burst defaults to max_requests)"""
     max_requests: int
     time_window_seconds: int
     key_prefix: str = ""
+    burst: Optional[int] = None
+
+    @property
+    def policy(self) -> RateLimitPolicy:
+        return RateLimitPolicy.per_window(self.max_requests, self.time_window_seconds, self.burst)
 
 
 class SecurityFilter:
     """Gateway-level security filter for message validation and rate limiting"""
     
     def __init__(self, security_manager: Optional[MCPSecurityManager] = None, 
-                 audit_logger: Optional[SecurityAuditLogger] = None):
+                 audit_logger: Optional[SecurityAuditLogger] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         """Initialize the security filter"""
         self.security_manager = security_manager or MCPSecurityManager()
         self.audit_logger = audit_logger or SecurityAuditLogger()
         self.logger = logging.getLogger(__name__)
         
         self._filter_rules: List[FilterRule] = []
-        self._rate_limits: Dict[str, List[datetime]] = {}
+        # O(1) token-bucket (GCRA) limiter; keys are namespaced by config name
+        self._rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
         self._blocked_patterns: Dict[str, re.Pattern] = {}
+        self._blocked_scanner: Optional[PatternScanner] = None
+        self._vision_scanner = PatternScanner(_SUSPICIOUS_VISION_RULES)
         
         # Rate limit configurations for different operations
         self._rate_limit_configs: Dict[str, RateLimitConfig] = {
@@ -92,7 +110,7 @@ class SecurityFilter:
             name="rate_limit_session_create",
             message_types={MessageType.SESSION_CREATE},
             conditions=[
-                lambda msg: self._check_rate_limit(f"session_create_{msg.client_id}", 5, 60)
+                lambda msg: self._is_rate_limited("session_create", f"session_create_{msg.client_id}")
             ],
             action="rate_limit",
             description="Rate limit session creation per client",
@@ -140,7 +158,7 @@ class SecurityFilter:
             name="rate_limit_state_updates",
             message_types={MessageType.STATE_UPDATE},
             conditions=[
-                lambda msg: self._check_rate_limit(f"state_update_{msg.session_id}", 10, 1)
+                lambda msg: self._is_rate_limited("state_update", f"state_update_{msg.session_id}")
             ],
             action="rate_limit",
             description="Rate limit state updates per session",
@@ -166,6 +184,12 @@ class SecurityFilter:
             r"\b(nc\s+-|netcat|telnet|ftp|ssh|rdp)\"",
             re.IGNORECASE
         )
+        
+        # All blocked patterns combined into one scanner
+        self._blocked_scanner = PatternScanner(
+            ScanRule(name, compiled.pattern, "high", "command")
+            for name, compiled in self._blocked_patterns.items()
+        )
 
     def _contains_dangerous_command(self, command: Optional[str]) -> bool:
         """Check if a command contains dangerous patterns"""
@@ -334,10 +358,10 @@ class SecurityFilter:
         command_str = str(command_payload)
         
         # Check against blocked patterns
-        for pattern_name, pattern in self._blocked_patterns.items():
-            if pattern.search(command_str):
-                self.logger.warning(f"Found dangerous pattern {pattern_name} in command")
-                return True
+        result = self._blocked_scanner.scan(command_str)
+        if result.matched:
+            self.logger.warning(f"Found dangerous pattern {result.rule} in command")
+            return True
         
         return False
     
@@ -349,64 +373,28 @@ class SecurityFilter:
         vision_str = str(vision_payload)
         
         # Check for suspicious vision patterns
-        suspicious_patterns = [
-            r"\b(password|login|credential|secret)\"",
-            r"\b(admin|root|sudo)\"",
-            r"\b(bank|payment|credit)\""
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, vision_str, re.IGNORECASE):
-                self.logger.warning(f"Found suspicious vision pattern: {pattern}")
-                return True
+        result = self._vision_scanner.scan(vision_str)
+        if result.matched:
+            self.logger.warning(f"Found suspicious vision pattern: {result.rule}")
+            return True
         
         return False
     
-    def _check_rate_limit(self, key: str, max_requests: int, time_window_seconds: int) -> bool:
-        """Check if rate limit is exceeded"""
-        now = datetime.now()
-        
-        # Initialize rate limit tracking for this key
-        if key not in self._rate_limits:
-            self._rate_limits[key] = []
-        
-        # Clean up old entries; delete key entirely when empty to prevent dict bloat
-        cutoff_time = now - timedelta(seconds=time_window_seconds)
-        self._rate_limits[key] = [
-            timestamp for timestamp in self._rate_limits[key]
-            if timestamp > cutoff_time
-        ]
-        if not self._rate_limits[key]:
-            del self._rate_limits[key]
-
-        # Check if limit exceeded
-        current = self._rate_limits.get(key, [])
-        if len(current) >= max_requests:
-            self.logger.warning(f"Rate limit exceeded for {key}: {len(current)} requests in {time_window_seconds}s")
-            return True
-
-        # Add current request
-        self._rate_limits.setdefault(key, []).append(now)
-        return False
+    def _is_rate_limited(self, config_name: str, key: str) -> bool:
+        """Check a key against one of the named rate limit configurations"""
+        policy = self._rate_limit_configs[config_name].policy
+        if self._rate_limiter.check(key, policy):
+            return False
+        self.logger.warning(f"Rate limit exceeded for {key}: burst {policy.burst}, {policy.rate:.3g}/s sustained")
+        return True
     
     def check_tool_execution_rate_limit(self, session_id: str, tool_name: str) -> bool:
         """Check rate limit for tool execution (max 10 per minute)"""
-        config = self._rate_limit_configs.get("tool_execution")
         key = f"tool_execution_{session_id}_{tool_name}"
-        return self._check_rate_limit(key, config.max_requests, config.time_window_seconds)
+        return self._is_rate_limited("tool_execution", key)
     
     def get_rate_limit_status(self, key: str) -> Dict[str, Any]:
         """Get current rate limit status for a key"""
-        if key not in self._rate_limits:
-            return {
-                "key": key,
-                "current_count": 0,
-                "limit": 0,
-                "window_seconds": 0,
-                "remaining": 0,
-                "reset_at": None
-            }
-        
         # Find matching config
         config = None
         for config_key, cfg in self._rate_limit_configs.items():
@@ -417,24 +405,13 @@ class SecurityFilter:
         if not config:
             return {"key": key, "error": "No rate limit config found"}
         
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=config.time_window_seconds)
-        
-        # Count recent requests
-        recent_requests = [ts for ts in self._rate_limits[key] if ts > cutoff_time]
-        current_count = len(recent_requests)
-        remaining = max(0, config.max_requests - current_count)
-        
-        # Calculate reset time
-        if recent_requests:
-            oldest_request = min(recent_requests)
-            reset_at = oldest_request + timedelta(seconds=config.time_window_seconds)
-        else:
-            reset_at = None
+        status = self._rate_limiter.status(key, config.policy)
+        remaining = status["remaining"]
+        reset_at = datetime.now() + timedelta(seconds=status["reset_in"]) if status["reset_in"] else None
         
         return {
             "key": key,
-            "current_count": current_count,
+            "current_count": config.policy.burst - remaining,
             "limit": config.max_requests,
             "window_seconds": config.time_window_seconds,
             "remaining": remaining,
@@ -443,20 +420,20 @@ class SecurityFilter:
     
     def reset_rate_limit(self, key: str):
         """Reset rate limit for a specific key"""
-        if key in self._rate_limits:
-            del self._rate_limits[key]
+        if self._rate_limiter.reset(key):
             self.logger.info(f"Reset rate limit for {key}")
     
     def reset_all_rate_limits(self):
         """Reset all rate limits"""
-        self._rate_limits.clear()
+        self._rate_limiter.reset_all()
         self.logger.info("Reset all rate limits")
     
     def get_filter_stats(self) -> Dict[str, Any]:
         """Get filter statistics"""
         return {
             "total_rules": len(self._filter_rules),
-            "rate_limit_keys": len(self._rate_limits),
+            "rate_limit_keys": len(self._rate_limiter),
+            "rate_limiter": self._rate_limiter.get_stats(),
             "blocked_patterns": len(self._blocked_patterns),
             "rule_priorities": [rule.priority for rule in self._filter_rules],
             "message_types_covered": list(set(
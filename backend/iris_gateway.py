@@ -9,13 +9,23 @@ from .tools.cleanup_analyzer import CleanupAnalyzer
 from .voice.wake_word_discovery import WakeWordDiscovery
 from .audio.pipeline import AudioPipeline
 from .agent.tts import get_tts_manager
+from .agent.tts_scheduler import PhrasePrefetcher, SpeechScheduler
 from .agent import get_agent_kernel
 from .core_models import Category, get_sections_for_category
 from .state_manager import StateManager, get_state_manager
 from .ws_manager import WebSocketManager, get_websocket_manager
+from .performance.stream_coalescer import StreamCoalescer
+from .performance.state_delta import StateVersionTracker
+from .performance.singleflight import SingleFlight
+from .monitoring.metrics import get_metrics_registry
+from .monitoring.tracing import bind_context, get_tracer, span as trace_span
+from .message_dispatch import (
+    Concurrency, MessageDispatcher, by_client, by_session, global_key,
+)
 import asyncio
 import json
 import logging
+import os
 import queue
 import re
 import threading
@@ -53,6 +63,18 @@ _RE_MULTI_NL = re.compile(r"\n{2,}")
 # Sentence boundary: punctuation followed by whitespace (used in split + get_spoken_version)
 _RE_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…])\s+|\n+")
 
+# Spoken tails appended by AgentKernel.prepare_spoken_text — pre-rendered
+# into the phrase audio cache when TTS warms up.
+_FIXED_PHRASES = (
+    "Full response in the chat window.",
+    "The full code is in the chat window.",
+)
+
+
+# Duplicate concurrent UI requests share one execution (see performance/singleflight.py)
+_AVAILABLE_MODELS_FLIGHT = SingleFlight("get_available_models", ttl=2.0)
+_SKILLS_LIST_FLIGHT = SingleFlight("get_skills")
+
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +100,12 @@ class IRISGateway:
         self._ws_manager = ws_manager or get_websocket_manager()
         self._state_manager = state_manager or get_state_manager()
         self._logger = logging.getLogger(__name__)
+        # Coalesces per-token chat_chunk sends into fewer WebSocket frames
+        self._stream_coalescer = StreamCoalescer(self._ws_manager.send_to_client)
+        # Per-session state revisions; state_sync carries patches after the first snapshot
+        self._state_versions = StateVersionTracker()
+        # Message type -> handler + concurrency class / ordering key / timeout
+        self._dispatcher = self._build_dispatch_table()
 
         # Initialize wake word discovery
         self._wake_word_discovery = WakeWordDiscovery()
@@ -102,6 +130,8 @@ class IRISGateway:
         self._model_cache_ttl = timedelta(minutes=5)
         self._logger.info("[IRISGateway] Model cache initialized (5 min TTL)")
         self._tts_prewarmed = False
+        # Start synthesising the reply's first sentences while the LLM streams it
+        self._tts_speculative = os.environ.get("IRIS_TTS_SPECULATIVE", "1") != "0"
         self._main_loop = None
         self._speech_interrupted = False
 
@@ -157,6 +187,7 @@ class IRISGateway:
                     self._active_voice_client.pop(sid, None)
                     self._conversation_sessions.discard(sid)
                     self._session_last_seen.pop(sid, None)
+                    self._state_versions.forget_session(sid)
                 if stale:
                     self._logger.info(f"[Gateway] Session GC swept {len(stale)} stale sessions")
             except asyncio.CancelledError:
@@ -240,158 +271,8 @@ class IRISGateway:
                        "client_id": client_id, "message_type": msg_type}
             )
 
-            # Route to appropriate handler based on message type
-            if msg_type in ["select_category", "select_section", "go_back"]:
-                await self._handle_navigation(session_id, client_id, message)
-
-            elif msg_type in ["update_field", "update_theme", "confirm_card"]:
-                await self._handle_settings(session_id, client_id, message)
-
-            elif msg_type == "set_model_selection":
-                await self._handle_set_model_selection(session_id, client_id, message)
-
-            elif msg_type in ["voice_command_start", "voice_command_end", "voice_command"]:
-                await self._handle_voice(session_id, client_id, message)
-
-            elif msg_type in ["get_wake_words", "select_wake_word"]:
-                if msg_type == "get_wake_words":
-                    await self._handle_get_wake_words(session_id, client_id)
-                else:
-                    await self._handle_select_wake_word(session_id, client_id, message)
-
-            elif msg_type in ["get_cleanup_report", "execute_cleanup"]:
-                if msg_type == "get_cleanup_report":
-                    await self._handle_get_cleanup_report(session_id, client_id, message)
-                else:
-                    await self._handle_execute_cleanup(session_id, client_id, message)
-
-            elif msg_type in ["text_message", "clear_chat"]:
-                await self._handle_chat(session_id, client_id, message)
-
-            elif msg_type in ["get_agent_status", "get_agent_tools", "agent_status", "agent_tools"]:
-                await self._handle_status(session_id, client_id, message)
-
-            elif msg_type == "get_available_models":
-                await self._handle_get_available_models(session_id, client_id, message)
-
-            elif msg_type == "request_models":
-                await self._handle_request_models(session_id, client_id, message)
-
-            # Local GGUF model management (llama-cpp-python on port 8082)
-            elif msg_type == "get_local_models":
-                await self._handle_get_local_models(session_id, client_id, message)
-
-            elif msg_type == "load_local_model":
-                await self._handle_load_local_model(session_id, client_id, message)
-
-            elif msg_type == "unload_local_model":
-                await self._handle_unload_local_model(session_id, client_id, message)
-
-            elif msg_type == "apply_inference_settings":
-                await self._handle_apply_inference_settings(session_id, client_id, message)
-
-            elif msg_type == "get_local_model_status":
-                await self._handle_get_local_model_status(session_id, client_id, message)
-
-            elif msg_type == "get_hardware_info":
-                await self._handle_get_hardware_info(session_id, client_id, message)
-
-            elif msg_type == "download_gguf_model":
-                await self._handle_download_gguf_model(session_id, client_id, message)
-
-            elif msg_type == "search_hf_models":
-                await self._handle_search_hf_models(session_id, client_id, message)
-
-            elif msg_type == "set_vision_enabled":
-                await self._handle_set_vision_enabled(session_id, client_id, message)
-
-            elif msg_type == "toggle_model_pin":
-                await self._handle_toggle_model_pin(session_id, client_id, message)
-
-            elif msg_type == "get_audio_devices":
-                await self._handle_get_audio_devices(session_id, client_id)
-
-            elif msg_type == "test_connection":
-                await self._handle_test_connection(session_id, client_id, message)
-
-            # GAP-01 FIX: Additional message types from main.py
-            elif msg_type == "collapse_to_idle":
-                await self._handle_collapse_to_idle(session_id, client_id, message)
-
-            elif msg_type == "expand_to_main":
-                await self._handle_expand_to_main(session_id, client_id, message)
-
-            elif msg_type == "reload_skills":
-                await self._handle_reload_skills(session_id, client_id, message)
-
-            elif msg_type == "get_skills":
-                await self._handle_get_skills(session_id, client_id)
-
-            elif msg_type == "toggle_skill":
-                await self._handle_toggle_skill(session_id, client_id, message)
-
-            elif msg_type == "delete_skill":
-                await self._handle_delete_skill(session_id, client_id, message)
-
-            elif msg_type == "create_skill":
-                await self._handle_create_skill(session_id, client_id, message)
-
-            elif msg_type == "execute_tool":
-                await self._handle_execute_tool(session_id, client_id, message)
-
-            elif msg_type == "tts_play":
-                # Frontend play-icon clicked — speak the supplied text via TTS
-                await self._handle_tts_play(session_id, client_id, message)
-
-            elif msg_type == "ping":
-                await self._ws_manager.send_to_client(client_id, {"type": "pong", "payload": {}})
-
-            elif msg_type == "pong":
-                await self._ws_manager.handle_pong(client_id)
-
-            elif msg_type == "request_state":
-                await self._handle_request_state(session_id, client_id)
-
-            elif msg_type == "enable_vision":
-                await self._handle_enable_vision(session_id, client_id)
-
-            elif msg_type == "disable_vision":
-                await self._handle_disable_vision(session_id, client_id)
-
-            elif msg_type == "get_vision_status":
-                await self._handle_get_vision_status(session_id, client_id)
-
-            elif msg_type == "message_exported":
-                await self._handle_message_exported(session_id, client_id, message)
-
-            elif msg_type == "crawler_query":
-                # Explicit web research request — route to CrawlerEngine
-                await self._handle_crawler_query(session_id, client_id, message)
-
-            elif msg_type == "dev_cli":
-                # Developer mode — route query to CLI tool via DevOrchestrator
-                await self._handle_dev_cli(session_id, client_id, message)
-
-            elif msg_type == "dev_abort":
-                # Developer mode — abort active CLI subprocess for this session
-                await self._handle_dev_abort(session_id, client_id)
-
-            elif msg_type == "terminal_input":
-                await self._handle_terminal_input(session_id, client_id, message)
-
-            elif msg_type in {
-                "integration_list", "integration_enable", "integration_disable",
-                "integration_state", "integration_oauth_callback",
-                "integration_credentials_auth", "integration_telegram_auth",
-                "integration_restart", "integration_forget", "app_cleanup",
-                "activity_get_recent", "logs_subscribe", "logs_get_history",
-                "logs_unsubscribe", "marketplace_preference_store",
-                "marketplace_preferences_get", "marketplace_recommendations_get",
-            }:
-                # Delegate to the integration subsystem handler
-                await get_integration_handler().handle_message(client_id, message)
-
-            else:
+            # Route to the registered handler (see _build_dispatch_table)
+            if not await self._dispatcher.dispatch(msg_type, session_id, client_id, message):
                 self._logger.warning(
                     f"Unknown message type: {msg_type}",
                     extra={"session_id": session_id,
@@ -420,6 +301,128 @@ class IRISGateway:
             )
             await self._send_error(client_id, f"Error processing message: {str(e)}")
 
+    def _build_dispatch_table(self) -> MessageDispatcher:
+        """
+        Register every WebSocket message type with its concurrency class.
+
+        INLINE handlers are quick or must stay in frame order with the read
+        loop.  ORDERED handlers mutate shared state and are serialised per
+        key.  BACKGROUND handlers are slow reads (scans, network, disk) and
+        run concurrently so they never delay pings or voice events.
+        """
+        d = MessageDispatcher(on_error=self._send_error)
+        INLINE, ORDERED, BACKGROUND = (
+            Concurrency.INLINE, Concurrency.ORDERED, Concurrency.BACKGROUND)
+
+        def _no_msg(handler):
+            # Adapt handlers that take (session_id, client_id) only
+            return lambda session_id, client_id, message: handler(session_id, client_id)
+
+        async def _ping(session_id, client_id, message):
+            await self._ws_manager.send_to_client(client_id, {"type": "pong", "payload": {}})
+
+        async def _pong(session_id, client_id, message):
+            await self._ws_manager.handle_pong(client_id)
+
+        async def _integration(session_id, client_id, message):
+            await get_integration_handler().handle_message(client_id, message)
+
+        # Heartbeat, navigation and UI control — always in frame order
+        d.register("ping", _ping)
+        d.register("pong", _pong)
+        d.register(["select_category", "select_section", "go_back"], self._handle_navigation)
+        d.register("collapse_to_idle", self._handle_collapse_to_idle)
+        d.register("expand_to_main", self._handle_expand_to_main)
+        d.register("request_state", _no_msg(self._handle_request_state))
+        d.register("resync_state", self._handle_resync_state)
+        d.register("request_status", self._handle_request_status)
+        d.register("metrics_snapshot", self._handle_metrics_snapshot)
+        d.register("get_trace", self._handle_get_trace)
+        d.register("get_vision_status", _no_msg(self._handle_get_vision_status))
+        d.register("tts_play", self._handle_tts_play)
+        d.register("message_exported", self._handle_message_exported)
+        d.register("dev_abort", _no_msg(self._handle_dev_abort))
+        d.register("terminal_input", self._handle_terminal_input)
+        d.register("get_local_model_status", self._handle_get_local_model_status)
+
+        # Session state mutations — ordered per session
+        d.register(["voice_command_start", "voice_command_end", "voice_command"],
+                   self._handle_voice, ORDERED, by_session("voice"), timeout=30)
+        d.register(["update_field", "update_theme", "confirm_card"], self._handle_settings,
+                   ORDERED, by_session("settings"), timeout=30)
+        d.register("set_model_selection", self._handle_set_model_selection,
+                   ORDERED, by_session("settings"), timeout=30)
+        d.register(["text_message", "clear_chat"], self._handle_chat,
+                   ORDERED, by_session("chat"))
+        d.register(["enable_vision", "disable_vision"],
+                   lambda s, c, m: (self._handle_enable_vision(s, c)
+                                    if m.get("type") == "enable_vision"
+                                    else self._handle_disable_vision(s, c)),
+                   ORDERED, by_session("vision"), timeout=60)
+        d.register("dev_cli", self._handle_dev_cli, ORDERED, by_session("dev_cli"))
+
+        # Process-wide resources — ordered globally
+        for msg_type, handler in (
+            ("load_local_model", self._handle_load_local_model),
+            ("unload_local_model", self._handle_unload_local_model),
+            ("apply_inference_settings", self._handle_apply_inference_settings),
+            ("set_vision_enabled", self._handle_set_vision_enabled),
+        ):
+            d.register(msg_type, handler, ORDERED, global_key("local_model"))
+        d.register("toggle_model_pin", self._handle_toggle_model_pin,
+                   ORDERED, global_key("local_model"), timeout=30)
+        d.register("select_local_model", self._handle_select_local_model,
+                   ORDERED, global_key("local_model"), timeout=30)
+        d.register("select_wake_word", self._handle_select_wake_word,
+                   ORDERED, global_key("wake_word"), timeout=30)
+        d.register("execute_cleanup", self._handle_execute_cleanup,
+                   ORDERED, global_key("cleanup"))
+        for msg_type, handler in (
+            ("reload_skills", self._handle_reload_skills),
+            ("toggle_skill", self._handle_toggle_skill),
+            ("delete_skill", self._handle_delete_skill),
+            ("create_skill", self._handle_create_skill),
+        ):
+            d.register(msg_type, handler, ORDERED, global_key("skills"), timeout=60)
+        d.register([
+            "integration_list", "integration_enable", "integration_disable",
+            "integration_state", "integration_oauth_callback",
+            "integration_credentials_auth", "integration_telegram_auth",
+            "integration_restart", "integration_forget", "app_cleanup",
+            "activity_get_recent", "logs_subscribe", "logs_get_history",
+            "logs_unsubscribe", "marketplace_preference_store",
+            "marketplace_preferences_get", "marketplace_recommendations_get",
+        ], _integration, ORDERED, by_client("integrations"))
+
+        # Slow reads — concurrent background tasks
+        d.register(["get_agent_status", "get_agent_tools", "agent_status", "agent_tools"],
+                   self._handle_status, BACKGROUND, timeout=30)
+        d.register("get_available_models", self._handle_get_available_models,
+                   BACKGROUND, timeout=60)
+        d.register("request_models", self._handle_request_models, BACKGROUND, timeout=60)
+        d.register("get_local_models", self._handle_get_local_models, BACKGROUND, timeout=60)
+        d.register("get_hardware_info", self._handle_get_hardware_info, BACKGROUND, timeout=30)
+        d.register("search_hf_models", self._handle_search_hf_models, BACKGROUND, timeout=30)
+        d.register("download_gguf_model", self._handle_download_gguf_model, BACKGROUND)
+        d.register("get_audio_devices", _no_msg(self._handle_get_audio_devices),
+                   BACKGROUND, timeout=15)
+        d.register("get_wake_words", _no_msg(self._handle_get_wake_words),
+                   BACKGROUND, timeout=15)
+        d.register("get_cleanup_report", self._handle_get_cleanup_report,
+                   BACKGROUND, timeout=120)
+        d.register("get_skills", _no_msg(self._handle_get_skills), BACKGROUND, timeout=30)
+        d.register("test_connection", self._handle_test_connection, BACKGROUND, timeout=30)
+        d.register("execute_tool", self._handle_execute_tool, BACKGROUND)
+        d.register("crawler_query", self._handle_crawler_query, BACKGROUND)
+        return d
+
+    def get_dispatch_metrics(self) -> dict:
+        """Per-message-type handler latency histograms and pending task count."""
+        return {
+            "handlers": self._dispatcher.get_latency_histograms(),
+            "pending_tasks": len(self._dispatcher.pending_tasks()),
+        }
+
     async def _handle_navigation(self, session_id: str, client_id: str, message: dict) -> None:
         """
         Handle navigation messages: select_category, select_section, go_back.
@@ -724,6 +727,7 @@ class IRISGateway:
                             kernel.configure_vps({"enabled": True, "endpoints": [vps_ep], "auth_token": values.get("vps_api_key") or None})
                             self._logger.info(f"[Session: {session_id}] inference_mode confirmed → VPS {vps_ep}")
                     # Also refresh model list for the UI
+                    _AVAILABLE_MODELS_FLIGHT.forget()     # provider/model changed
                     await self._handle_get_available_models(session_id, client_id, {})
 
                     # Apply swarm_enabled if present in inference_mode values
@@ -847,6 +851,7 @@ class IRISGateway:
                     # Refresh model dropdown so UI reflects available models for the
                     # new provider immediately.
                     if "model_provider" in values:
+                        _AVAILABLE_MODELS_FLIGHT.forget()     # provider/model changed
                         await self._handle_get_available_models(session_id, client_id, {})
                 except Exception as e:
                     self._logger.error(
@@ -960,6 +965,26 @@ class IRISGateway:
         if hasattr(voice_handler, "set_audio_level_callback"):
             voice_handler.set_audio_level_callback(_on_audio_level)
 
+        # Streaming STT: show the transcript forming while the user speaks.
+        # committed text is final; tentative text may still change.
+        def _on_partial_transcript(partial: dict) -> None:
+            session_id = partial.get("session_id")
+            loop = self._main_loop
+            if session_id and loop and loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    self._ws_manager.broadcast_to_session(session_id, {
+                        "type": "voice_partial_transcript",
+                        "payload": {
+                            "committed": partial.get("committed", ""),
+                            "tentative": partial.get("tentative", ""),
+                        },
+                    }),
+                    loop,
+                )
+
+        if hasattr(voice_handler, "set_partial_transcript_callback"):
+            voice_handler.set_partial_transcript_callback(_on_partial_transcript)
+
     async def _handle_voice(self, session_id: str, client_id: str, message: dict, auto_stop: bool = False) -> None:
         """
         Handle voice_command_start / voice_command_end from double-click or wake word.
@@ -1178,40 +1203,47 @@ class IRISGateway:
                 "payload": {"state": "processing_conversation"}
             })
 
-            def _execute_agent():
-                def chunk_callback(chunk: str):
-                    _loop = self._main_loop
-                    if _loop and _loop.is_running():
-                        asyncio.run_coroutine_threadsafe(
-                            self._ws_manager.send_to_client(client_id, {
-                                "type": "chat_chunk",
-                                "payload": {"chunk": chunk}
-                            }),
-                            _loop
-                        )
+            chunk_stream = self._stream_coalescer.open(client_id, loop)
+            prefetch = self._start_tts_prefetch(agent_kernel)
 
-                resp = agent_kernel.process_text_message(
-                    enriched,
-                    session_id=session_id,
-                    chunk_callback=chunk_callback,
-                    from_voice=True,
-                )
+            def _on_chunk(text: str) -> None:
+                chunk_stream.push(text)
+                if prefetch is not None:
+                    prefetch.feed(text)
+
+            def _execute_agent():
+                try:
+                    resp = agent_kernel.process_text_message(
+                        enriched,
+                        session_id=session_id,
+                        chunk_callback=_on_chunk,
+                        from_voice=True,
+                    )
+                finally:
+                    if prefetch is not None:
+                        prefetch.close()
                 spoken = agent_kernel.prepare_spoken_text(resp, enriched)
                 return resp, spoken
 
             # Run agent synchronously in thread pool
-            response, spoken = await loop.run_in_executor(None, _execute_agent)
+            try:
+                with trace_span("agent.run", from_voice=True):
+                    response, spoken = await loop.run_in_executor(None, bind_context(_execute_agent))
+            finally:
+                # Deliver the buffered tail before the final text_response
+                await chunk_stream.aclose()
 
             # ── Pillar 1B: assistant bubble in ChatView ─────────────────────
             thinking = getattr(agent_kernel, "_pending_thinking", "") or ""
-            await self._ws_manager.send_to_client(client_id, {
-                "type": "text_response",
-                "payload": {
-                    "text": response,
-                    "sender": "assistant",
-                    **({"thinking": thinking} if thinking else {}),
-                }
-            })
+            with trace_span("ws.deliver", message="text_response"):
+                await self._ws_manager.send_to_client(client_id, {
+                    "type": "text_response",
+                    "payload": {
+                        "text": response,
+                        "sender": "assistant",
+                        **({"thinking": thinking} if thinking else {}),
+                    }
+                })
 
             # ── TTS: speak the response ─────────────────────────────────────
             if spoken.strip():
@@ -1221,8 +1253,7 @@ class IRISGateway:
                 })
                 _tts_started = True
                 threading.Thread(
-                    target=self._speak_response,
-                    args=(spoken, session_id),
+                    target=bind_context(self._speak_response, spoken, session_id),
                     daemon=True,
                     name="voice-tts"
                 ).start()
@@ -1251,6 +1282,26 @@ class IRISGateway:
                 pass
             self._logger.debug(f"[Voice] Pipeline complete for session {session_id}")
 
+    def _start_tts_prefetch(self, agent_kernel) -> Optional[PhrasePrefetcher]:
+        """Speculatively synthesise the reply's opening sentences as the LLM streams them.
+
+        The final spoken text is only known once the reply is complete
+        (prepare_spoken_text may shorten it), but it almost always starts with
+        the same sentences — rendering those into the phrase cache now takes
+        synthesis off the time-to-first-audio path.
+        """
+        if not self._tts_speculative:
+            return None
+        tts = get_tts_manager()
+        if not tts.config.get("tts_enabled", True):
+            return None
+
+        def _prepare(sentence: str) -> str:
+            return self._clean_for_speech(agent_kernel.prepare_spoken_text(sentence))
+
+        return PhrasePrefetcher(
+            tts.synthesize_phrase, prepare=_prepare, max_phrases=SpeechScheduler.LOOKAHEAD)
+
     def _prewarm_tts(self) -> None:
         """Optionally pre-warm the TTS engine in a background thread.
 
@@ -1288,9 +1339,13 @@ class IRISGateway:
             if tts.config.get("tts_voice") == "Built-in":
                 self._tts_prewarmed = True  # built-in engine needs no warm-up
                 return
-            tts._load_f5tts()
+            with tts._lock:
+                tts._load_f5tts()
             self._tts_prewarmed = True
             self._logger.info("[IRISGateway] F5-TTS pipeline warmed up")
+            # Fixed phrases: served from the phrase cache (disk) after the first run
+            for phrase in _FIXED_PHRASES:
+                tts.synthesize_phrase(phrase)
         except Exception as e:
             self._logger.warning(
                 f"[IRISGateway] TTS pre-warm failed (non-fatal): {e}")
@@ -1326,8 +1381,9 @@ class IRISGateway:
     def _speak_response(self, input_source: Union[str, queue.Queue], session_id: str = None) -> None:
         """
         Synthesise and play text through the configured TTS engine.
-        Using a producer-consumer pattern to stream audio chunks as soon as they
-        are ready, minimizing latency for the first spoken word.
+        A SpeechScheduler renders sentence chunks up to LOOKAHEAD ahead of
+        playback (phrase-cache hits are instant), so each chunk is synthesised
+        while the previous one plays.
 
         Args:
             input_source: Either the full text to speak (str) or a queue.Queue
@@ -1344,119 +1400,75 @@ class IRISGateway:
         if not engine.pipeline:
             return
 
-        # 1. Internal state
-        audio_queue: asyncio.Queue = asyncio.Queue(
-            maxsize=4)  # Buffer a few chunks
+        # 1. Lookahead scheduler: synthesises up to LOOKAHEAD sentences ahead
+        #    of playback; repeated phrases come from the phrase audio cache.
+        scheduler = SpeechScheduler(tts.synthesize_phrase)
         interrupted = threading.Event()
-        loop = self._main_loop or asyncio.get_event_loop()
-
-        # Dynamic chunking: synthesise first sentence immediately for instant
-        # voice onset, then use larger chunks for stable continuous playback.
-        FIRST_CHUNK_THRESHOLD = 1
-        NORMAL_CHUNK_THRESHOLD = 8
+        producer_thread = None
 
-        # 2. Synthesiser thread (producer)
+        # 2. Feed text (producer)
         def _producer():
             try:
-                if isinstance(input_source, str):
-                    # Single-call path: pass the FULL text to F5-TTS in one go.
-                    # This preserves natural prosody across the entire response —
-                    # sentence-by-sentence synthesis creates prosody breaks and
-                    # robotic-sounding stitching at boundaries.
-                    text = self._clean_for_speech(input_source)
-                    if not text.strip():
-                        return
-                    self._logger.info(f"[Voice] TTS synthesizing {len(text.split())} words in single pass")
-                    for audio_chunk in tts.synthesize_stream(text):
-                        if interrupted.is_set():
-                            break
-                        if audio_chunk is not None and len(audio_chunk) > 0:
-                            asyncio.run_coroutine_threadsafe(
-                                audio_queue.put(audio_chunk), loop)
-
-                elif isinstance(input_source, queue.Queue):
-                    # Streaming path: read from sentence queue
-                    _pending = []
-                    _pending_words = 0
-                    while True:
-                        item = input_source.get()
-                        if item is None:
-                            # Final flush
-                            if _pending and not interrupted.is_set():
-                                chunk = " ".join(_pending)
-                                for audio_chunk in tts.synthesize_stream(chunk):
-                                    if audio_chunk is not None and len(audio_chunk) > 0:
-                                        asyncio.run_coroutine_threadsafe(
-                                            audio_queue.put(audio_chunk), loop)
-                            break
-
-                        _pending.append(item)
-                        _pending_words += len(item.split())
-
-                        # Trigger synthesis if we hit the word count OR if it's the
-                        # very first sentence (regardless of length) for instant response.
-                        if _pending_words >= _target or (is_first_chunk and len(_pending) >= 1):
-                            if interrupted.is_set():
-                                break
-                            chunk = " ".join(_pending)
-                            for audio_chunk in tts.synthesize_stream(chunk):
-                                if audio_chunk is not None and len(audio_chunk) > 0:
-                                    asyncio.run_coroutine_threadsafe(
-                                        audio_queue.put(audio_chunk), loop)
-                            _pending = []
-                            _pending_words = 0
-                            if is_first_chunk:
-                                is_first_chunk = False
-                                _target = NORMAL_CHUNK_THRESHOLD
+                while not interrupted.is_set():
+                    item = input_source.get()
+                    if item is None:
+                        break
+                    scheduler.feed(self._clean_for_speech(item) + " ")
             except Exception as exc:
                 self._logger.error(f"[Voice] TTS Producer error: {exc}")
             finally:
-                asyncio.run_coroutine_threadsafe(
-                    audio_queue.put(None), loop)
+                scheduler.close()
+
+        if isinstance(input_source, str):
+            # Sentence-level synthesis matches how F5-TTS and Piper chunk the
+            # text internally, so prosody is unchanged — but each sentence is
+            # now rendered while the previous one plays.
+            text = self._clean_for_speech(input_source)
+            self._logger.info(
+                f"[Voice] TTS synthesizing {len(text.split())} words, "
+                f"{scheduler.lookahead} sentences ahead"
+            )
+            scheduler.feed(text)
+            scheduler.close()
+        else:
+            # Streaming path: sentences arrive on a queue.Queue, None ends it
+            producer_thread = threading.Thread(
+                target=bind_context(_producer), daemon=True, name="tts-producer")
 
         # 3. Suppress Porcupine while IRIS is speaking
         engine.set_tts_active(True)
         engine.is_speech_interrupted()
 
+        playback = trace_span("tts.playback")
+        _playback_t0 = time.perf_counter()
         try:
-            producer_thread = threading.Thread(
-                target=_producer, daemon=True, name="tts-producer")
-            producer_thread.start()
+            if producer_thread is not None:
+                producer_thread.start()
 
-            # 4. Consumer: play each chunk as soon as it arrives.
+            # 4. Consumer: play each chunk as soon as it is ready.
             # First-chunk timeout is generous (90 s) to cover F5-TTS model
             # load time on first call after startup.  Subsequent chunks use
             # a tighter timeout (15 s) — once the model is warm each chunk
             # arrives within ~1-2 s on CPU.
-            import numpy as _np
             _first_chunk = True
             while True:
                 _timeout = 90 if _first_chunk else 15
-                _start = time.monotonic()
-                chunk = None
-                while time.monotonic() - _start < _timeout:
-                    try:
-                        chunk = audio_queue.get_nowait()
-                        break
-                    except asyncio.QueueEmpty:
-                        time.sleep(0.01)
-                if chunk is None:
+                try:
+                    chunk = scheduler.get(timeout=_timeout)
+                except queue.Empty:
                     self._logger.error(
                         f"[Voice] TTS audio queue timed out after {_timeout}s — forcing idle"
                     )
                     interrupted.set()
                     break
-                _first_chunk = False
                 if chunk is None:
                     break
+                if _first_chunk:
+                    playback.set(first_audio_ms=round((time.perf_counter() - _playback_t0) * 1000, 1))
+                _first_chunk = False
 
                 if engine.is_speech_interrupted():
                     interrupted.set()
-                    while not audio_queue.empty():
-                        try:
-                            audio_queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
                     break
 
                 # Play each chunk immediately as it arrives.
@@ -1469,10 +1481,14 @@ class IRISGateway:
                 # (24 kHz → 16 kHz in _resample → device rate in sounddevice).
                 engine.pipeline.play_audio(chunk, sample_rate=_TTS_SAMPLE_RATE)
 
-            producer_thread.join(timeout=5)
+            playback.set(**scheduler.get_stats())
+            if producer_thread is not None:
+                producer_thread.join(timeout=5)
         except Exception as e:
             self._logger.error(f"[Voice] TTS Consumer error: {e}")
         finally:
+            scheduler.cancel()   # no-op once drained; stops lookahead work if not
+            playback.end(error="interrupted" if interrupted.is_set() else None)
             engine.set_tts_active(False)
             if session_id and self._main_loop and self._main_loop.is_running():
                 import asyncio as _asyncio
@@ -1549,120 +1565,122 @@ class IRISGateway:
                 await self._send_validation_error(client_id, "text", "Message text is required")
                 return
 
-            # Get AgentKernel for this session
-            try:
-                import time as _time
-                _t_gate = _time.perf_counter()
-
-                agent_kernel = get_agent_kernel(session_id)
-                _t_kernel = _time.perf_counter()
-                self._logger.debug(
-                    f"[Timing] get_agent_kernel: {(_t_kernel - _t_gate) * 1000:.1f} ms",
-                    extra={"session_id": session_id}
-                )
+            # One trace per turn; get_trace returns its waterfall
+            with get_tracer().trace("chat.turn", session_id=session_id, client_id=client_id):
+                # Get AgentKernel for this session
+                try:
+                    import time as _time
+                    _t_gate = _time.perf_counter()
 
-                # Wire tool bridge if not already set (enables real tool execution)
-                from backend.agent.tool_bridge import get_agent_tool_bridge
-                if agent_kernel._tool_bridge is None:
-                    agent_kernel._tool_bridge = get_agent_tool_bridge()
+                    agent_kernel = get_agent_kernel(session_id)
+                    _t_kernel = _time.perf_counter()
+                    self._logger.debug(
+                        f"[Timing] get_agent_kernel: {(_t_kernel - _t_gate) * 1000:.1f} ms",
+                        extra={"session_id": session_id}
+                    )
 
-                _t_bridge = _time.perf_counter()
-                self._logger.debug(
-                    f"[Timing] tool_bridge wire: {(_t_bridge - _t_kernel) * 1000:.1f} ms",
-                    extra={"session_id": session_id}
-                )
+                    # Wire tool bridge if not already set (enables real tool execution)
+                    from backend.agent.tool_bridge import get_agent_tool_bridge
+                    if agent_kernel._tool_bridge is None:
+                        agent_kernel._tool_bridge = get_agent_tool_bridge()
 
-                # Signal ChatView: AI is processing (typing indicator only — does NOT affect orb)
-                await self._ws_manager.send_to_client(client_id, {
-                    "type": "chat_typing",
-                    "payload": {"active": True}
-                })
+                    _t_bridge = _time.perf_counter()
+                    self._logger.debug(
+                        f"[Timing] tool_bridge wire: {(_t_bridge - _t_kernel) * 1000:.1f} ms",
+                        extra={"session_id": session_id}
+                    )
 
-                # Process message in executor to avoid blocking event loop
-                loop = asyncio.get_running_loop()
-                _t_exec_start = _time.perf_counter()
-
-                def _execute_agent():
-                    def _chunk_cb(chunk: str):
-                        _loop = self._main_loop
-                        if _loop and _loop.is_running():
-                            asyncio.run_coroutine_threadsafe(
-                                self._ws_manager.send_to_client(client_id, {
-                                    "type": "chat_chunk",
-                                    "payload": {"chunk": chunk}
-                                }),
-                                _loop
-                            )
+                    # Signal ChatView: AI is processing (typing indicator only — does NOT affect orb)
+                    await self._ws_manager.send_to_client(client_id, {
+                        "type": "chat_typing",
+                        "payload": {"active": True}
+                    })
 
-                    try:
-                        response = agent_kernel.process_text_message(
-                            text,
-                            session_id=session_id,
-                            chunk_callback=_chunk_cb
-                        )
-                    except Exception as e:
-                        self._logger.error(f"[Chat] Agent processing error: {e}")
-                        raise
+                    # Process message in executor to avoid blocking event loop
+                    loop = asyncio.get_running_loop()
+                    _t_exec_start = _time.perf_counter()
 
-                    return response
+                    # Tokens arrive from the executor thread; the stream batches
+                    # them into chat_chunk frames (first token is sent immediately).
+                    chunk_stream = self._stream_coalescer.open(client_id, loop)
 
-                response = await loop.run_in_executor(None, _execute_agent)
+                    def _execute_agent():
+                        try:
+                            response = agent_kernel.process_text_message(
+                                text,
+                                session_id=session_id,
+                                chunk_callback=chunk_stream.push
+                            )
+                        except Exception as e:
+                            self._logger.error(f"[Chat] Agent processing error: {e}")
+                            raise
 
-                _t_exec_end = _time.perf_counter()
-                _elapsed_ms = round((_t_exec_end - _t_exec_start) * 1000)
-                self._logger.info(
-                    f"[Timing] process_text_message (streamed): {_elapsed_ms:.0f} ms",
-                    extra={"session_id": session_id}
-                )
+                        return response
 
-                # Emit inference_event for InferenceConsolePanel — fires for all backends
-                try:
-                    _prompt_tok = max(1, len(text) // 4)
-                    _comp_tok = max(1, len(response or "") // 4)
-                    _elapsed_s = _elapsed_ms / 1000 or 0.001
-                    _model_name = getattr(agent_kernel, "_selected_reasoning_model", None) or "local-model"
-                    await self._ws_manager.broadcast_to_session(session_id, {
-                        "type": "inference_event",
-                        "payload": {
-                            "model": _model_name,
-                            "prompt_tokens": _prompt_tok,
-                            "completion_tokens": _comp_tok,
-                            "total_tokens": _prompt_tok + _comp_tok,
-                            "time_ms": _elapsed_ms,
-                            "tps": round(_comp_tok / _elapsed_s, 1),
-                            "timestamp": _time.time(),
-                        },
-                    })
-                except Exception:
-                    pass  # never block the response
+                    try:
+                        with trace_span("agent.run"):
+                            response = await loop.run_in_executor(None, bind_context(_execute_agent))
+                    finally:
+                        # Deliver the buffered tail before the final chat_message
+                        await chunk_stream.aclose()
+
+                    _t_exec_end = _time.perf_counter()
+                    _elapsed_ms = round((_t_exec_end - _t_exec_start) * 1000)
+                    self._logger.info(
+                        f"[Timing] process_text_message (streamed): {_elapsed_ms:.0f} ms, "
+                        f"{chunk_stream.chunks_in} chunks in {chunk_stream.frames_out} frames",
+                        extra={"session_id": session_id}
+                    )
 
-                # Send final complete message (updates the UI with the full text + metadata)
-                thinking = getattr(agent_kernel, "_pending_thinking", "") or ""
-                await self._ws_manager.send_to_client(client_id, {
-                    "type": "chat_message",
-                    "payload": {
-                        "role": "assistant",
-                        "content": response,
-                        "thinking": thinking,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                })
+                    # Emit inference_event for InferenceConsolePanel — fires for all backends
+                    try:
+                        _prompt_tok = max(1, len(text) // 4)
+                        _comp_tok = max(1, len(response or "") // 4)
+                        _elapsed_s = _elapsed_ms / 1000 or 0.001
+                        _model_name = getattr(agent_kernel, "_selected_reasoning_model", None) or "local-model"
+                        await self._ws_manager.broadcast_to_session(session_id, {
+                            "type": "inference_event",
+                            "payload": {
+                                "model": _model_name,
+                                "prompt_tokens": _prompt_tok,
+                                "completion_tokens": _comp_tok,
+                                "total_tokens": _prompt_tok + _comp_tok,
+                                "time_ms": _elapsed_ms,
+                                "tps": round(_comp_tok / _elapsed_s, 1),
+                                "timestamp": _time.time(),
+                            },
+                        })
+                    except Exception:
+                        pass  # never block the response
+
+                    # Send final complete message (updates the UI with the full text + metadata)
+                    thinking = getattr(agent_kernel, "_pending_thinking", "") or ""
+                    with trace_span("ws.deliver", message="chat_message"):
+                        await self._ws_manager.send_to_client(client_id, {
+                            "type": "chat_message",
+                            "payload": {
+                                "role": "assistant",
+                                "content": response,
+                                "thinking": thinking,
+                                "timestamp": datetime.now().isoformat()
+                            }
+                        })
 
-                # Clear ChatView typing indicator
-                await self._ws_manager.send_to_client(client_id, {
-                    "type": "chat_typing",
-                    "payload": {"active": False}
-                })
+                    # Clear ChatView typing indicator
+                    await self._ws_manager.send_to_client(client_id, {
+                        "type": "chat_typing",
+                        "payload": {"active": False}
+                    })
 
-            except Exception as e:
-                self._logger.error(
-                    f"Error processing text message: {e}", exc_info=True)
-                # Clear typing indicator on error
-                await self._ws_manager.send_to_client(client_id, {
-                    "type": "chat_typing",
-                    "payload": {"active": False}
-                })
-                await self._send_error(client_id, f"Agent kernel error: {str(e)}")
+                except Exception as e:
+                    self._logger.error(
+                        f"Error processing text message: {e}", exc_info=True)
+                    # Clear typing indicator on error
+                    await self._ws_manager.send_to_client(client_id, {
+                        "type": "chat_typing",
+                        "payload": {"active": False}
+                    })
+                    await self._send_error(client_id, f"Agent kernel error: {str(e)}")
 
         elif msg_type == "clear_chat":
             # Get AgentKernel for this session and clear conversation
@@ -1795,322 +1813,340 @@ class IRISGateway:
                 f"[Session: {session_id}] Getting available models for provider: {inference_mode}"
             )
 
-            available_models = []
-
-            # Vision-only models should NOT appear in reasoning/tool dropdowns.
-            # They belong exclusively in the vision_model dropdown.
-            _VISION_ONLY_PREFIXES = (
-                "lfm2.5-vl", "llava", "bakllava", "llava-llama3", "llava-phi3",
-                "moondream", "cogvlm", "internvl",
+            # Several clients (or a double-fired UI event) ask at once: query
+            # each provider once and share the list for a moment.
+            available_models = await _AVAILABLE_MODELS_FLIGHT.do(
+                (inference_mode, ollama_endpoint, lmstudio_endpoint, api_base_url,
+                 openai_api_key, vps_url),
+                lambda: self._discover_available_models(
+                    session_id, inference_mode, ollama_endpoint=ollama_endpoint,
+                    lmstudio_endpoint=lmstudio_endpoint, api_base_url=api_base_url,
+                    openai_api_key=openai_api_key, vps_url=vps_url),
             )
 
-            def _is_vision_only(model_id: str) -> bool:
-                """Check if a model is vision-only based on its name/id.
-
-                Handles namespaced IDs like 'openbmb/minicpm-o4.5:latest' by
-                checking both the full name and the part after the last '/'.
-                """
-                name_lower = model_id.lower().split(
-                    ":")[0]  # strip tag like ":latest"
-                # Also check the base name after namespace (e.g. "openbmb/minicpm-o4.5" → "minicpm-o4.5")
-                base_name = name_lower.rsplit(
-                    "/", 1)[-1] if "/" in name_lower else name_lower
-                return (
-                    any(name_lower.startswith(p) for p in _VISION_ONLY_PREFIXES) or
-                    any(base_name.startswith(p) for p in _VISION_ONLY_PREFIXES)
-                )
+            await self._ws_manager.send_to_client(client_id, {
+                "type": "available_models",
+                "payload": {
+                    "models": available_models,
+                    "model_provider": inference_mode,   # 'lmstudio' | 'local' | 'api' | 'vps'
+                    "inference_mode": inference_mode    # kept for backward compat
+                }
+            })
 
-            if inference_mode == "local":
-                # Query Ollama for locally installed models
-                try:
-                    async with httpx.AsyncClient(timeout=3.0) as http_client:
-                        r = await http_client.get(f"{ollama_endpoint.rstrip('/')}/api/tags")
-                        if r.status_code == 200:
-                            tags = r.json().get("models", [])
-                            # Exclude vision-only models from reasoning/tool list
-                            available_models = [
-                                {"id": m["name"], "name": m["name"],
-                                    "source": "local"}
-                                for m in tags
-                                if not _is_vision_only(m["name"])
-                            ]
-                            self._logger.info(
-                                f"[Session: {session_id}] Found {len(available_models)} Ollama model(s) "
-                                f"({len(tags) - len(available_models)} vision-only filtered out)"
-                            )
-                        else:
-                            self._logger.warning(
-                                f"[Session: {session_id}] Ollama returned status {r.status_code}"
-                            )
-                except Exception as ollama_err:
-                    self._logger.warning(
-                        f"[Session: {session_id}] Ollama not reachable at {ollama_endpoint}: {ollama_err}"
-                    )
+        except Exception as e:
+            self._logger.error(
+                f"Error getting available models: {e}", exc_info=True)
+            await self._ws_manager.send_to_client(client_id, {
+                "type": "available_models",
+                "payload": {
+                    "models": [],
+                    "error": f"Failed to get available models: {str(e)}"
+                }
+            })
 
-                # Scan the local models/ directory for HuggingFace-format models
-                # (e.g. LFM2.5-1.2B-Instruct, LFM2-8B-A1B) that aren't in Ollama.
-                # NOTE: subprocess.run() blocks the asyncio event loop; use
-                # run_in_executor to perform the git worktree discovery off-thread.
-                try:
-                    from pathlib import Path
-                    import concurrent.futures as _cf
-
-                    # Resolve project root (handles git worktrees)
-                    project_dir = Path(__file__).parent.parent.resolve()
-                    models_dir = project_dir / "models"
-
-                    # If we're in a worktree, also check the main repo's models dir.
-                    # Run the blocking git commands in a thread so the event loop
-                    # stays free to handle WebSocket messages (including ping/pong).
-                    def _find_model_dirs():
-                        import subprocess
-                        dirs = [models_dir]
-                        try:
-                            result = subprocess.run(
-                                ["git", "rev-parse", "--show-toplevel"],
-                                capture_output=True, text=True, timeout=3,
-                                cwd=str(project_dir),
-                            )
-                            common = subprocess.run(
-                                ["git", "rev-parse", "--git-common-dir"],
-                                capture_output=True, text=True, timeout=3,
-                                cwd=str(project_dir),
-                            )
-                            if result.returncode == 0 and common.returncode == 0:
-                                wt_root = Path(result.stdout.strip()).resolve()
-                                main_root = Path(
-                                    common.stdout.strip()).resolve().parent
-                                if wt_root != main_root:
-                                    try:
-                                        rel = project_dir.relative_to(wt_root)
-                                        main_models = main_root / rel / "models"
-                                        if main_models != models_dir:
-                                            dirs.append(main_models)
-                                    except ValueError:
-                                        pass
-                        except Exception:
-                            pass
-                        return dirs
-
-                    loop = asyncio.get_event_loop()
-                    candidates = await loop.run_in_executor(None, _find_model_dirs)
-
-                    ollama_ids = {m["id"] for m in available_models}
-                    for mdir in candidates:
-                        if not mdir.is_dir():
-                            continue
-                        for child in sorted(mdir.iterdir()):
-                            if not child.is_dir():
-                                continue
-                            config_file = child / "config.json"
-                            if not config_file.exists():
-                                continue
-                            # It's a HuggingFace model directory
-                            model_name = child.name
-                            if model_name in ollama_ids:
-                                continue
-                            if _is_vision_only(model_name):
-                                continue
-                            # Skip non-model dirs (cache, wake_words, etc.)
-                            if model_name.lower() in ("cache", "wake_words", "audio_detokenizer"):
-                                continue
-                            available_models.append({
-                                "id": str(child),
-                                "name": model_name,
-                                "source": "local_hf",
-                            })
-                    hf_count = sum(1 for m in available_models if m.get(
-                        "source") == "local_hf")
-                    if hf_count:
+    async def _discover_available_models(
+        self, session_id: str, inference_mode: str, *, ollama_endpoint: str,
+        lmstudio_endpoint: str, api_base_url: str, openai_api_key: str, vps_url: str,
+    ) -> List[Dict[str, Any]]:
+        """Query the active inference source for its model list (fallback lists when unreachable)."""
+        available_models = []
+
+        # Vision-only models should NOT appear in reasoning/tool dropdowns.
+        # They belong exclusively in the vision_model dropdown.
+        _VISION_ONLY_PREFIXES = (
+            "lfm2.5-vl", "llava", "bakllava", "llava-llama3", "llava-phi3",
+            "moondream", "cogvlm", "internvl",
+        )
+
+        def _is_vision_only(model_id: str) -> bool:
+            """Check if a model is vision-only based on its name/id.
+
+            Handles namespaced IDs like 'openbmb/minicpm-o4.5:latest' by
+            checking both the full name and the part after the last '/'.
+            """
+            name_lower = model_id.lower().split(
+                ":")[0]  # strip tag like ":latest"
+            # Also check the base name after namespace (e.g. "openbmb/minicpm-o4.5" → "minicpm-o4.5")
+            base_name = name_lower.rsplit(
+                "/", 1)[-1] if "/" in name_lower else name_lower
+            return (
+                any(name_lower.startswith(p) for p in _VISION_ONLY_PREFIXES) or
+                any(base_name.startswith(p) for p in _VISION_ONLY_PREFIXES)
+            )
+
+        if inference_mode == "local":
+            # Query Ollama for locally installed models
+            try:
+                async with httpx.AsyncClient(timeout=3.0) as http_client:
+                    r = await http_client.get(f"{ollama_endpoint.rstrip('/')}/api/tags")
+                    if r.status_code == 200:
+                        tags = r.json().get("models", [])
+                        # Exclude vision-only models from reasoning/tool list
+                        available_models = [
+                            {"id": m["name"], "name": m["name"],
+                                "source": "local"}
+                            for m in tags
+                            if not _is_vision_only(m["name"])
+                        ]
                         self._logger.info(
-                            f"[Session: {session_id}] Found {hf_count} local HuggingFace model(s)"
+                            f"[Session: {session_id}] Found {len(available_models)} Ollama model(s) "
+                            f"({len(tags) - len(available_models)} vision-only filtered out)"
                         )
-                except Exception as scan_err:
-                    self._logger.warning(
-                        f"[Session: {session_id}] Local model scan failed: {scan_err}"
-                    )
+                    else:
+                        self._logger.warning(
+                            f"[Session: {session_id}] Ollama returned status {r.status_code}"
+                        )
+            except Exception as ollama_err:
+                self._logger.warning(
+                    f"[Session: {session_id}] Ollama not reachable at {ollama_endpoint}: {ollama_err}"
+                )
 
-                # Fallback: show popular Ollama models when the daemon is not running
-                # and no local HuggingFace models were found either
-                if not available_models:
-                    available_models = [
-                        {"id": "llama3.2",
-                            "name": "Llama 3.2 (3B)", "source": "local"},
-                        {"id": "llama3.2:1b",
-                            "name": "Llama 3.2 (1B)", "source": "local"},
-                        {"id": "llama3.1",
-                            "name": "Llama 3.1 (8B)", "source": "local"},
-                        {"id": "mistral", "name": "Mistral 7B", "source": "local"},
-                        {"id": "qwen2.5:3b",
-                            "name": "Qwen 2.5 (3B)", "source": "local"},
-                        {"id": "phi4",
-                            "name": "Phi-4 (14B)", "source": "local"},
-                        {"id": "deepseek-r1:7b",
-                            "name": "DeepSeek R1 (7B)", "source": "local"},
-                        {"id": "codellama", "name": "Code Llama", "source": "local"},
-                    ]
+            # Scan the local models/ directory for HuggingFace-format models
+            # (e.g. LFM2.5-1.2B-Instruct, LFM2-8B-A1B) that aren't in Ollama.
+            # NOTE: subprocess.run() blocks the asyncio event loop; use
+            # run_in_executor to perform the git worktree discovery off-thread.
+            try:
+                from pathlib import Path
+                import concurrent.futures as _cf
+
+                # Resolve project root (handles git worktrees)
+                project_dir = Path(__file__).parent.parent.resolve()
+                models_dir = project_dir / "models"
+
+                # If we're in a worktree, also check the main repo's models dir.
+                # Run the blocking git commands in a thread so the event loop
+                # stays free to handle WebSocket messages (including ping/pong).
+                def _find_model_dirs():
+                    import subprocess
+                    dirs = [models_dir]
+                    try:
+                        result = subprocess.run(
+                            ["git", "rev-parse", "--show-toplevel"],
+                            capture_output=True, text=True, timeout=3,
+                            cwd=str(project_dir),
+                        )
+                        common = subprocess.run(
+                            ["git", "rev-parse", "--git-common-dir"],
+                            capture_output=True, text=True, timeout=3,
+                            cwd=str(project_dir),
+                        )
+                        if result.returncode == 0 and common.returncode == 0:
+                            wt_root = Path(result.stdout.strip()).resolve()
+                            main_root = Path(
+                                common.stdout.strip()).resolve().parent
+                            if wt_root != main_root:
+                                try:
+                                    rel = project_dir.relative_to(wt_root)
+                                    main_models = main_root / rel / "models"
+                                    if main_models != models_dir:
+                                        dirs.append(main_models)
+                                except ValueError:
+                                    pass
+                    except Exception:
+                        pass
+                    return dirs
+
+                loop = asyncio.get_event_loop()
+                candidates = await loop.run_in_executor(None, _find_model_dirs)
+
+                ollama_ids = {m["id"] for m in available_models}
+                for mdir in candidates:
+                    if not mdir.is_dir():
+                        continue
+                    for child in sorted(mdir.iterdir()):
+                        if not child.is_dir():
+                            continue
+                        config_file = child / "config.json"
+                        if not config_file.exists():
+                            continue
+                        # It's a HuggingFace model directory
+                        model_name = child.name
+                        if model_name in ollama_ids:
+                            continue
+                        if _is_vision_only(model_name):
+                            continue
+                        # Skip non-model dirs (cache, wake_words, etc.)
+                        if model_name.lower() in ("cache", "wake_words", "audio_detokenizer"):
+                            continue
+                        available_models.append({
+                            "id": str(child),
+                            "name": model_name,
+                            "source": "local_hf",
+                        })
+                hf_count = sum(1 for m in available_models if m.get(
+                    "source") == "local_hf")
+                if hf_count:
                     self._logger.info(
-                        f"[Session: {session_id}] No models found — returning fallback list"
+                        f"[Session: {session_id}] Found {hf_count} local HuggingFace model(s)"
                     )
+            except Exception as scan_err:
+                self._logger.warning(
+                    f"[Session: {session_id}] Local model scan failed: {scan_err}"
+                )
 
-            elif inference_mode == "lmstudio":
-                # LM Studio exposes an OpenAI-compatible REST API at localhost:1234.
-                # Query /v1/models to get whatever model(s) the user currently has loaded.
-                try:
-                    async with httpx.AsyncClient(timeout=3.0) as http_client:
-                        r = await http_client.get(
-                            f"{lmstudio_endpoint.rstrip('/')}/v1/models",
-                            headers={"Authorization": "Bearer lm-studio"},
-                        )
-                        if r.status_code == 200:
-                            models_data = r.json().get("data", [])
-                            available_models = [
-                                {
-                                    "id": m["id"],
-                                    "name": m.get("id", m["id"]),
-                                    "source": "lmstudio",
-                                }
-                                for m in models_data
-                                if not _is_vision_only(m.get("id", ""))
-                            ]
-                            self._logger.info(
-                                f"[Session: {session_id}] LM Studio: found {len(available_models)} model(s)"
-                            )
-                        else:
-                            self._logger.warning(
-                                f"[Session: {session_id}] LM Studio returned status {r.status_code}"
-                            )
-                except Exception as lms_err:
-                    self._logger.warning(
-                        f"[Session: {session_id}] LM Studio not reachable at {lmstudio_endpoint}: {lms_err}"
-                    )
+            # Fallback: show popular Ollama models when the daemon is not running
+            # and no local HuggingFace models were found either
+            if not available_models:
+                available_models = [
+                    {"id": "llama3.2",
+                        "name": "Llama 3.2 (3B)", "source": "local"},
+                    {"id": "llama3.2:1b",
+                        "name": "Llama 3.2 (1B)", "source": "local"},
+                    {"id": "llama3.1",
+                        "name": "Llama 3.1 (8B)", "source": "local"},
+                    {"id": "mistral", "name": "Mistral 7B", "source": "local"},
+                    {"id": "qwen2.5:3b",
+                        "name": "Qwen 2.5 (3B)", "source": "local"},
+                    {"id": "phi4",
+                        "name": "Phi-4 (14B)", "source": "local"},
+                    {"id": "deepseek-r1:7b",
+                        "name": "DeepSeek R1 (7B)", "source": "local"},
+                    {"id": "codellama", "name": "Code Llama", "source": "local"},
+                ]
+                self._logger.info(
+                    f"[Session: {session_id}] No models found — returning fallback list"
+                )
 
-                # Fallback: common models users load in LM Studio
-                if not available_models:
-                    available_models = [
-                        {"id": "local-model", "name": "Currently Loaded Model",
-                            "source": "lmstudio"},
-                        {"id": "llama-3.2-3b-instruct",
-                            "name": "Llama 3.2 3B Instruct", "source": "lmstudio"},
-                        {"id": "llama-3.1-8b-instruct",
-                            "name": "Llama 3.1 8B Instruct", "source": "lmstudio"},
-                        {"id": "mistral-7b-instruct-v0.3",
-                            "name": "Mistral 7B Instruct", "source": "lmstudio"},
-                        {"id": "qwen2.5-7b-instruct",
-                            "name": "Qwen 2.5 7B Instruct", "source": "lmstudio"},
-                        {"id": "deepseek-r1-distill-qwen-7b",
-                            "name": "DeepSeek R1 7B", "source": "lmstudio"},
-                    ]
-                    self._logger.info(
-                        f"[Session: {session_id}] LM Studio unreachable — showing fallback model list"
+        elif inference_mode == "lmstudio":
+            # LM Studio exposes an OpenAI-compatible REST API at localhost:1234.
+            # Query /v1/models to get whatever model(s) the user currently has loaded.
+            try:
+                async with httpx.AsyncClient(timeout=3.0) as http_client:
+                    r = await http_client.get(
+                        f"{lmstudio_endpoint.rstrip('/')}/v1/models",
+                        headers={"Authorization": "Bearer lm-studio"},
                     )
+                    if r.status_code == 200:
+                        models_data = r.json().get("data", [])
+                        available_models = [
+                            {
+                                "id": m["id"],
+                                "name": m.get("id", m["id"]),
+                                "source": "lmstudio",
+                            }
+                            for m in models_data
+                            if not _is_vision_only(m.get("id", ""))
+                        ]
+                        self._logger.info(
+                            f"[Session: {session_id}] LM Studio: found {len(available_models)} model(s)"
+                        )
+                    else:
+                        self._logger.warning(
+                            f"[Session: {session_id}] LM Studio returned status {r.status_code}"
+                        )
+            except Exception as lms_err:
+                self._logger.warning(
+                    f"[Session: {session_id}] LM Studio not reachable at {lmstudio_endpoint}: {lms_err}"
+                )
+
+            # Fallback: common models users load in LM Studio
+            if not available_models:
+                available_models = [
+                    {"id": "local-model", "name": "Currently Loaded Model",
+                        "source": "lmstudio"},
+                    {"id": "llama-3.2-3b-instruct",
+                        "name": "Llama 3.2 3B Instruct", "source": "lmstudio"},
+                    {"id": "llama-3.1-8b-instruct",
+                        "name": "Llama 3.1 8B Instruct", "source": "lmstudio"},
+                    {"id": "mistral-7b-instruct-v0.3",
+                        "name": "Mistral 7B Instruct", "source": "lmstudio"},
+                    {"id": "qwen2.5-7b-instruct",
+                        "name": "Qwen 2.5 7B Instruct", "source": "lmstudio"},
+                    {"id": "deepseek-r1-distill-qwen-7b",
+                        "name": "DeepSeek R1 7B", "source": "lmstudio"},
+                ]
+                self._logger.info(
+                    f"[Session: {session_id}] LM Studio unreachable — showing fallback model list"
+                )
 
-            elif inference_mode == "api":
-                # Query the user-configured API base URL for available models.
-                # Works with OpenAI, Groq, Together, OpenRouter, Mistral, or any
-                # OpenAI-compatible remote API.
-                models_url = f"{api_base_url.rstrip('/')}/models"
-                headers = {}
-                if openai_api_key:
-                    headers["Authorization"] = f"Bearer {openai_api_key}"
+        elif inference_mode == "api":
+            # Query the user-configured API base URL for available models.
+            # Works with OpenAI, Groq, Together, OpenRouter, Mistral, or any
+            # OpenAI-compatible remote API.
+            models_url = f"{api_base_url.rstrip('/')}/models"
+            headers = {}
+            if openai_api_key:
+                headers["Authorization"] = f"Bearer {openai_api_key}"
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as http_client:
+                    r = await http_client.get(models_url, headers=headers)
+                    if r.status_code == 200:
+                        models_data = r.json().get("data", [])
+                        available_models = [
+                            {"id": m["id"], "name": m.get("id", m["id"]),
+                                "source": "api"}
+                            for m in models_data
+                            if not _is_vision_only(m.get("id", ""))
+                        ]
+                        self._logger.info(
+                            f"[Session: {session_id}] Found {len(available_models)} model(s) "
+                            f"from {api_base_url}"
+                        )
+            except Exception as api_err:
+                self._logger.warning(
+                    f"[Session: {session_id}] API models query failed ({api_base_url}): {api_err}"
+                )
+
+            # Fallback list if no key or query failed
+            if not available_models:
+                available_models = [
+                    {"id": "gpt-4o", "name": "GPT-4o", "source": "openai"},
+                    {"id": "gpt-4-turbo", "name": "GPT-4 Turbo",
+                        "source": "openai"},
+                    {"id": "gpt-4", "name": "GPT-4", "source": "openai"},
+                    {"id": "gpt-3.5-turbo", "name": "GPT-3.5 Turbo",
+                        "source": "openai"},
+                ]
+
+        elif inference_mode == "vps":
+            # Try to query the VPS endpoint for models
+            if vps_url:
                 try:
-                    async with httpx.AsyncClient(timeout=5.0) as http_client:
-                        r = await http_client.get(models_url, headers=headers)
+                    async with httpx.AsyncClient(timeout=3.0) as http_client:
+                        r = await http_client.get(f"{vps_url.rstrip('/')}/v1/models")
                         if r.status_code == 200:
                             models_data = r.json().get("data", [])
                             available_models = [
-                                {"id": m["id"], "name": m.get("id", m["id"]),
-                                    "source": "api"}
+                                {"id": m["id"], "name": m["id"],
+                                    "source": "vps"}
                                 for m in models_data
-                                if not _is_vision_only(m.get("id", ""))
                             ]
                             self._logger.info(
-                                f"[Session: {session_id}] Found {len(available_models)} model(s) "
-                                f"from {api_base_url}"
+                                f"[Session: {session_id}] Found {len(available_models)} VPS model(s)"
                             )
-                except Exception as api_err:
+                except Exception as vps_err:
                     self._logger.warning(
-                        f"[Session: {session_id}] API models query failed ({api_base_url}): {api_err}"
+                        f"[Session: {session_id}] VPS endpoint query failed: {vps_err}"
                     )
 
-                # Fallback list if no key or query failed
-                if not available_models:
-                    available_models = [
-                        {"id": "gpt-4o", "name": "GPT-4o", "source": "openai"},
-                        {"id": "gpt-4-turbo", "name": "GPT-4 Turbo",
-                            "source": "openai"},
-                        {"id": "gpt-4", "name": "GPT-4", "source": "openai"},
-                        {"id": "gpt-3.5-turbo", "name": "GPT-3.5 Turbo",
-                            "source": "openai"},
-                    ]
-
-            elif inference_mode == "vps":
-                # Try to query the VPS endpoint for models
-                if vps_url:
-                    try:
-                        async with httpx.AsyncClient(timeout=3.0) as http_client:
-                            r = await http_client.get(f"{vps_url.rstrip('/')}/v1/models")
-                            if r.status_code == 200:
-                                models_data = r.json().get("data", [])
-                                available_models = [
-                                    {"id": m["id"], "name": m["id"],
-                                        "source": "vps"}
-                                    for m in models_data
-                                ]
-                                self._logger.info(
-                                    f"[Session: {session_id}] Found {len(available_models)} VPS model(s)"
-                                )
-                    except Exception as vps_err:
-                        self._logger.warning(
-                            f"[Session: {session_id}] VPS endpoint query failed: {vps_err}"
-                        )
-
-                # Fallback list if no endpoint or query failed
-                if not available_models:
-                    available_models = [
-                        {"id": "lfm2-8b", "name": "LFM2 8B", "source": "vps"},
-                        {"id": "lfm2.5-1.2b-instruct",
-                            "name": "LFM2.5 1.2B Instruct", "source": "vps"},
-                    ]
-
-            elif inference_mode == "iris_local":
-                # llama-cpp-python server on port 8082.
-                # Only shows a model when one is actively loaded.
-                try:
-                    from .agent.local_model_manager import get_local_model_manager
-                    mgr = get_local_model_manager()
-                    if mgr.is_loaded():
-                        status = mgr.get_status()
-                        from pathlib import Path as _Path
-                        model_name = _Path(status["model_path"]).stem if status.get("model_path") else "gguf-model"
-                        available_models = [{"id": model_name, "name": model_name, "source": "iris_local"}]
-                    else:
-                        available_models = []
-                    self._logger.info(
-                        f"[Session: {session_id}] iris_local models: {len(available_models)} loaded"
-                    )
-                except Exception as il_err:
-                    self._logger.warning(f"[Session: {session_id}] iris_local query failed: {il_err}")
+            # Fallback list if no endpoint or query failed
+            if not available_models:
+                available_models = [
+                    {"id": "lfm2-8b", "name": "LFM2 8B", "source": "vps"},
+                    {"id": "lfm2.5-1.2b-instruct",
+                        "name": "LFM2.5 1.2B Instruct", "source": "vps"},
+                ]
+
+        elif inference_mode == "iris_local":
+            # llama-cpp-python server on port 8082.
+            # Only shows a model when one is actively loaded.
+            try:
+                from .agent.local_model_manager import get_local_model_manager
+                mgr = get_local_model_manager()
+                if mgr.is_loaded():
+                    status = mgr.get_status()
+                    from pathlib import Path as _Path
+                    model_name = _Path(status["model_path"]).stem if status.get("model_path") else "gguf-model"
+                    available_models = [{"id": model_name, "name": model_name, "source": "iris_local"}]
+                else:
+                    available_models = []
+                self._logger.info(
+                    f"[Session: {session_id}] iris_local models: {len(available_models)} loaded"
+                )
+            except Exception as il_err:
+                self._logger.warning(f"[Session: {session_id}] iris_local query failed: {il_err}")
 
-            await self._ws_manager.send_to_client(client_id, {
-                "type": "available_models",
-                "payload": {
-                    "models": available_models,
-                    "model_provider": inference_mode,   # 'lmstudio' | 'local' | 'api' | 'vps'
-                    "inference_mode": inference_mode    # kept for backward compat
-                }
-            })
-
-        except Exception as e:
-            self._logger.error(
-                f"Error getting available models: {e}", exc_info=True)
-            await self._ws_manager.send_to_client(client_id, {
-                "type": "available_models",
-                "payload": {
-                    "models": [],
-                    "error": f"Failed to get available models: {str(e)}"
-                }
-            })
+        return available_models
 
     async def _handle_request_models(self, session_id: str, client_id: str, message: dict) -> None:
         """
@@ -2369,16 +2405,125 @@ class IRISGateway:
         """
         Handle request_state message - send full state to client.
 
+        Sent on (re)connect.  The snapshot is tagged with the session's current
+        revision; later state_sync messages are patches against it.
+
         Args:
             session_id: Session ID
             client_id: Client ID
         """
+        # System status base snapshot; later system_status deltas build on it
+        await self._send_system_status(client_id)
+
         state = await self._state_manager.get_state(session_id)
+        if not state:
+            await self._ws_manager.send_to_client(client_id, {
+                "type": "initial_state",
+                "payload": {"state": {}}
+            })
+            return
+
+        doc = state.model_dump()
+        # Publish any unbroadcast changes first so the snapshot sits exactly on a revision
+        await self._publish_state(session_id, doc, exclude_client=client_id)
+        self._state_versions.record_full_sync()
 
         await self._ws_manager.send_to_client(client_id, {
             "type": "initial_state",
             "payload": {
-                "state": state.model_dump() if state else {}
+                "state": doc,
+                "rev": self._state_versions.revision(session_id)
+            }
+        })
+
+    async def _send_system_status(self, client_id: str) -> None:
+        """Send one client the full system status at the current seq."""
+        try:
+            from .api.status_snapshot import get_status_service
+            await self._ws_manager.send_to_client(
+                client_id, await get_status_service().full_message())
+        except Exception as e:
+            self._logger.warning(f"[system_status] full snapshot failed: {e}")
+
+    async def _handle_request_status(self, session_id: str, client_id: str, message: dict) -> None:
+        """
+        Handle request_status message - client missed a system_status delta
+        (seq gap) and needs the full snapshot again.
+        """
+        await self._send_system_status(client_id)
+
+    async def _handle_resync_state(self, session_id: str, client_id: str, message: dict) -> None:
+        """
+        Handle resync_state message - client detected a revision gap.
+
+        Replies with the patches since the client's last applied revision
+        when they are still in history, otherwise with a full snapshot.
+
+        Args:
+            session_id: Session ID
+            client_id: Client ID
+            message: Message dictionary (payload.rev = client's last applied revision)
+        """
+        payload = message.get("payload", {})
+        since_rev = payload.get("rev")
+        delta = None
+        if isinstance(since_rev, int):
+            delta = self._state_versions.patches_since(session_id, since_rev)
+        if delta is None:
+            state = await self._state_manager.get_state(session_id)
+            if not state:
+                return
+            self._state_versions.record_full_sync()
+            await self._ws_manager.send_to_client(client_id, {
+                "type": "state_sync",
+                "payload": {
+                    "state": state.model_dump(),
+                    "rev": self._state_versions.revision(session_id)
+                }
+            })
+            return
+
+        await self._ws_manager.send_to_client(client_id, {
+            "type": "state_sync",
+            "payload": delta.to_payload()
+        })
+
+    async def _handle_metrics_snapshot(self, session_id: str, client_id: str, message: dict) -> None:
+        """
+        Handle metrics_snapshot message - reply with current counters, gauges and latency quantiles.
+
+        Args:
+            session_id: Session ID
+            client_id: Client ID
+            message: Message dictionary (optional payload.prefix limits the metric names)
+        """
+        prefix = (message.get("payload") or {}).get("prefix") or ""
+        metrics = get_metrics_registry().snapshot()
+        if prefix:
+            metrics = {name: m for name, m in metrics.items() if name.startswith(prefix)}
+        await self._ws_manager.send_to_client(client_id, {
+            "type": "metrics_snapshot",
+            "payload": {"ts": time.time(), "metrics": metrics}
+        })
+
+    async def _handle_get_trace(self, session_id: str, client_id: str, message: dict) -> None:
+        """
+        Handle get_trace message - reply with the span waterfall of a recent turn.
+
+        Args:
+            session_id: Session ID
+            client_id: Client ID
+            message: Message dictionary (optional payload.trace_id; defaults to
+                the session's latest turn)
+        """
+        tracer = get_tracer()
+        trace_id = (message.get("payload") or {}).get("trace_id")
+        trace = tracer.get(trace_id) if trace_id else tracer.latest(session_id)
+        await self._ws_manager.send_to_client(client_id, {
+            "type": "trace_waterfall",
+            "payload": {
+                "trace": tracer.waterfall(trace) if trace else None,
+                "recent": tracer.recent(limit=20, session_id=session_id),
             }
         })
 
@@ -3101,23 +3246,58 @@ class IRISGateway:
         Broadcast state update to all clients in a session.
         GAP-05 FIX: Uses 'state_sync' instead of 'state_update' for consistency.
 
+        Only the patch against the previous revision is sent; the full state
+        goes out once, when the session has no published revision yet.
+
         Args:
             session_id: Session ID
             exclude_client: Optional client ID to exclude from broadcast
         """
         state = await self._state_manager.get_state(session_id)
         if state:
-            exclude_set = {exclude_client} if exclude_client else None
+            await self._publish_state(session_id, state.model_dump(), exclude_client=exclude_client)
+
+    async def _publish_state(
+        self, session_id: str, doc: Dict[str, Any], exclude_client: Optional[str] = None
+    ) -> None:
+        """
+        Commit a state dump as the session's next revision and broadcast it.
+
+        The excluded client (the one that made the change) gets an empty patch
+        so its revision stays in step without re-applying its own edit.
+        """
+        had_revision = self._state_versions.revision(session_id) > 0
+        delta = self._state_versions.commit(session_id, doc)
+        exclude_set = {exclude_client} if exclude_client else None
+
+        if delta is None:
+            if had_revision:
+                return  # nothing changed since the last published revision
+            self._state_versions.record_full_sync()
             await self._ws_manager.broadcast_to_session(
                 session_id,
                 {
                     "type": "state_sync",
-                    "payload": {
-                        "state": state.model_dump()
-                    }
+                    "payload": {"state": doc, "rev": self._state_versions.revision(session_id)}
                 },
                 exclude_clients=exclude_set
             )
+            return
+
+        await self._ws_manager.broadcast_to_session(
+            session_id,
+            {"type": "state_sync", "payload": delta.to_payload()},
+            exclude_clients=exclude_set
+        )
+        if exclude_client:
+            await self._ws_manager.send_to_client(exclude_client, {
+                "type": "state_sync",
+                "payload": {"rev": delta.rev, "base_rev": delta.base_rev, "patch": []}
+            })
+
+    def get_state_sync_metrics(self) -> dict:
+        """Return state_sync delta metrics (deltas sent, resyncs, bytes saved)."""
+        return self._state_versions.get_metrics()
 
     async def _send_error(self, client_id: str, error_message: str) -> None:
         """
@@ -3235,6 +3415,16 @@ class IRISGateway:
 
     async def _handle_get_skills(self, session_id: str, client_id: str) -> None:
         """List all user/agent-created skills (excludes skill-creator and built-ins)."""
+        # Panels opening together share one directory walk
+        skills = await _SKILLS_LIST_FLIGHT.do((), lambda: asyncio.to_thread(self._scan_skills))
+
+        await self._ws_manager.send_to_client(client_id, {
+            "type": "skills_list",
+            "payload": {"skills": skills}
+        })
+
+    def _scan_skills(self) -> List[Dict[str, Any]]:
+        """Read name, description and enabled state of every learned skill on disk."""
         from pathlib import Path
         # Built-in system skills never shown in the learned list
         SYSTEM_SKILLS = {"skill-creator"}
@@ -3280,10 +3470,7 @@ class IRISGateway:
                     self._logger.warning(
                         f"[IRISGateway] Could not read skill {child.name}: {e}")
 
-        await self._ws_manager.send_to_client(client_id, {
-            "type": "skills_list",
-            "payload": {"skills": skills}
-        })
+        return skills
 
     async def _handle_toggle_skill(self, session_id: str, client_id: str, message: dict) -> None:
         """Enable or disable a skill by updating config.yaml."""
@@ -3597,6 +3784,7 @@ class IRISGateway:
                 except Exception as kw_err:
                     self._logger.warning(f"[iris_local] Kernel wire failed: {kw_err}")
 
+                _AVAILABLE_MODELS_FLIGHT.forget()     # provider/model changed
                 await self._handle_get_available_models(session_id, client_id, {})
                 import time as _time
                 await self._ws_manager.broadcast_to_session(session_id, {
@@ -3912,6 +4100,30 @@ class IRISGateway:
         except Exception as e:
             self._logger.error(f"[LocalModel] toggle_pin error: {e}")
 
+    async def _handle_select_local_model(self, session_id: str, client_id: str, message: dict) -> None:
+        """Model highlighted in the ModelsScreen picker — preload it as a warm standby.
+
+        The later load_local_model for the same model and settings then swaps
+        the standby in instead of loading from disk.  Nothing is preloaded if
+        it would not fit beside the active model.
+        """
+        from .agent.local_model_manager import get_local_model_manager
+        payload = message.get("payload", message)
+        model_path = payload.get("model_path", "")
+        if not model_path:
+            return
+        try:
+            mgr = get_local_model_manager()
+            loop = asyncio.get_running_loop()
+            preloading = await loop.run_in_executor(None, lambda: mgr.select_model(
+                model_path, payload.get("profile", "balanced"), payload.get("custom_params", {})))
+            await self._ws_manager.send_to_client(client_id, {
+                "type": "local_model_status",
+                "payload": {**mgr.get_status(), "preloading": preloading},
+            })
+        except Exception as e:
+            self._logger.error(f"[LocalModel] select_local_model error: {e}")
+
 
     # ── Crawler handler ─────────────────────────────────────────────────────
 
@@ -4127,6 +4339,14 @@ class IRISGateway:
                 "payload": {"text": f"Terminal error: {exc}", "sender": "assistant"},
             })
 
+    def release_client(self, client_id: str) -> None:
+        """Drop per-client bookkeeping once a WebSocket disconnects."""
+        self._stream_coalescer.forget_client(client_id)
+
+    def get_stream_metrics(self) -> dict:
+        """Return chat_chunk coalescing metrics (chunks in, frames out, frames/sec saved)."""
+        return self._stream_coalescer.get_metrics()
+
     async def shutdown(self) -> None:
         """Shutdown the gateway and cancel background tasks."""
         if self._session_gc_task:
@@ -4136,6 +4356,8 @@ class IRISGateway:
             except asyncio.CancelledError:
                 pass
             self._logger.info("[IRISGateway] Session GC task cancelled.")
+        # Cancel in-flight background/ordered message handlers
+        await self._dispatcher.shutdown()
         # Cancel any remaining research tasks
         for task in list(self._research_tasks):
             task.cancel()
@@ -310,8 +310,11 @@ async def lifespan(app: FastAPI):
         logger.info("  - Initializing agent kernel...")
         try:
             from backend.agent import get_agent_kernel
+            from backend.agent.agent_kernel import pin_agent_kernel
             from backend.agent.tool_bridge import initialize_agent_tools
             agent_kernel = get_agent_kernel()
+            # Held as app.state.agent_kernel for the process lifetime
+            pin_agent_kernel(agent_kernel.session_id)
 
             # Initialize tool bridge (async — calls bridge.initialize() which wires
             # all MCP servers: vision, file_manager, browser, etc.).
@@ -419,39 +422,17 @@ async def lifespan(app: FastAPI):
         except Exception as _wd_err:
             logger.warning(f"  [Watchdog] Could not start watchdog (non-fatal): {_wd_err}")
 
-        # ── Status broadcast loop ──────────────────────────────────────────────
-        # Broadcast system status updates to all connected WebSocket clients
-        # at adaptive intervals (fast when active, slow when idle).
+        # ── Status broadcast ───────────────────────────────────────────────────
+        # Event-driven: git state is refreshed only when the working tree
+        # changes; clients get a full system_status on connect, then deltas.
         try:
-            async def _status_broadcast_loop():
-                from backend.api.status_snapshot import build_snapshot
-                from backend.core.idle_tracker import get_idle_tracker
-                last_payload: dict | None = None
-                while True:
-                    try:
-                        tracker = get_idle_tracker()
-                        # Fast interval (1s) when user is active, slow (30s) when idle
-                        interval = 1.0 if not tracker.is_idle(threshold_s=30.0) else 30.0
-                        await asyncio.sleep(interval)
-                        snap = await build_snapshot()
-                        # Only broadcast if changed
-                        if snap != last_payload:
-                            last_payload = snap
-                            ws_mgr = get_websocket_manager()
-                            await ws_mgr.broadcast({
-                                "type": "system_status",
-                                "payload": snap
-                            })
-                    except asyncio.CancelledError:
-                        return
-                    except Exception as e:
-                        logger.warning(f"[status_broadcast] error: {e}")
+            from backend.api.status_snapshot import get_status_service
 
             app.state.status_broadcast_task = asyncio.create_task(
-                _status_broadcast_loop(),
+                get_status_service().run(get_websocket_manager().broadcast),
                 name="iris-status-broadcast",
             )
-            logger.info("  [StatusBroadcast] System status broadcast loop started")
+            logger.info("  [StatusBroadcast] System status service started")
         except Exception as _sb_err:
             logger.warning(f"  [StatusBroadcast] Could not start status broadcast (non-fatal): {_sb_err}")
 
@@ -470,6 +451,25 @@ async def lifespan(app: FastAPI):
         # This eliminates the RSS spike at t=30s on every cold start.
         logger.info("  [LocalModel] GGUF scan deferred to first ModelsScreen open (no startup pre-warm)")
 
+        # Opt-in (IRIS_MODEL_PRELOAD=1): build the likeliest model — launcher
+        # default or last used — as a warm standby on a background thread, so
+        # the user's first load is a swap instead of a cold GGUF load.
+        if os.environ.get("IRIS_MODEL_PRELOAD", "0") == "1":
+            try:
+                from backend.agent.local_model_manager import get_local_model_manager
+                loop = asyncio.get_running_loop()
+                app.state.model_preload = loop.run_in_executor(
+                    None, get_local_model_manager().preload_predicted)
+
+                def _preload_done(fut) -> None:
+                    if not fut.cancelled() and fut.exception() is not None:
+                        logger.warning(f"  [LocalModel] Predictive preload failed: {fut.exception()}")
+
+                app.state.model_preload.add_done_callback(_preload_done)
+                logger.info("  [LocalModel] Predictive preload of the next model started")
+            except Exception as _pl_err:
+                logger.warning(f"  [LocalModel] Predictive preload failed (non-fatal): {_pl_err}")
+
     except Exception as e:
         app.state.ready = False
         logger.error(f"[ERROR] Failed to initialize backend: {e}")
@@ -539,6 +539,14 @@ logger.info(f"CORS configured with allowed origins: {ALLOWED_ORIGINS}")
 from backend.api.status_snapshot import router as status_snapshot_router
 app.include_router(status_snapshot_router)
 
+# Register Prometheus-style /metrics router
+from backend.api.metrics import router as metrics_router
+app.include_router(metrics_router)
+
+# Register turn trace router (waterfalls + Chrome trace export)
+from backend.api.traces import router as traces_router
+app.include_router(traces_router)
+
 
 # ── Idle tracker middleware ────────────────────────────────────────────────
 # Touch the idle tracker on every HTTP request so background workers
@@ -549,7 +557,7 @@ from starlette.middleware.base import BaseHTTPMiddleware as _BaseHTTPMiddleware
 from starlette.requests import Request as _Request
 
 class _IdleTrackerMiddleware(_BaseHTTPMiddleware):
-    _SKIP_PATHS = frozenset({"", "/", "/health", "/api/status"})
+    _SKIP_PATHS = frozenset({"", "/", "/health", "/api/status", "/metrics"})
 
     async def dispatch(self, request: _Request, call_next):
         if request.url.path not in self._SKIP_PATHS:
@@ -865,6 +873,10 @@ async def websocket_endpoint(
             except Exception as cleanup_error:
                 logger.error(f"Error cleaning up session {active_session_id}: {cleanup_error}")
         if owns_connection:
+            try:
+                get_iris_gateway().release_client(client_id)
+            except Exception:
+                pass
             ws_manager.disconnect(client_id)
 
 
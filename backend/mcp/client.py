@@ -8,6 +8,8 @@ from typing import Any, Dict, List, Optional, Callable
 import httpx
 import websockets
 
+from backend.performance.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 from .protocol import (
@@ -39,6 +41,9 @@ class MCPClient:
         
         # Pending requests
         self._pending_requests: Dict[str, asyncio.Future] = {}
+
+        # Health checks and UI refreshes listing tools at once share one round trip
+        self._list_tools_flight = SingleFlight("mcp_list_tools")
     
     async def connect_stdio(self, command: str, args: List[str] = None) -> bool:
         """Connect to MCP server via stdio"""
@@ -186,7 +191,9 @@ class MCPClient:
         """List available tools from server"""
         if not self._initialized:
             return []
-        
+        return await self._list_tools_flight.do((), self._fetch_tools)
+
+    async def _fetch_tools(self) -> List[MCPTool]:
         request = create_tools_list_request()
         response = await self._send_request(request)
         
@@ -23,6 +23,8 @@ from collections import OrderedDict
 from threading import Lock
 from typing import List, Optional
 
+from backend.performance.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +80,8 @@ class EmbeddingService:
     _model = None
     _lock = Lock()
     _model_lock = Lock()
+    # Retrieval and dedup often embed the same text at the same moment
+    _encode_flight = SingleFlight("embed")
     
     # Model configuration
     MODEL_NAME = "all-MiniLM-L6-v2"
@@ -98,6 +102,9 @@ class EmbeddingService:
 
     def __init__(self) -> None:
         """Initialize the embedding service with LRU cache."""
+        # __init__ runs on every EmbeddingService() call; keep the shared cache
+        if hasattr(self, "_enc_cache"):
+            return
         self._enc_cache: OrderedDict[str, List[float]] = OrderedDict()
         self._enc_cache_max = 256
 
@@ -165,7 +172,8 @@ class EmbeddingService:
         """
         Encode a single text into a 384-dimensional embedding vector.
 
-        Uses an LRU cache (max 256 entries) keyed on SHA1 hash of input text.
+        Uses an LRU cache (max 256 entries) keyed on SHA1 hash of input text;
+        concurrent misses for the same text share one model call.
         Uses the neural model when available, otherwise falls back to
         hash-projection (_hash_embed).  Never raises — returns zero vector
         on empty input.
@@ -187,8 +195,8 @@ class EmbeddingService:
             self._enc_cache.move_to_end(key)
             return cached
 
-        # Encode and cache
-        vec = self._encode_uncached(text)
+        # Encode (once for concurrent callers with the same text) and cache
+        vec = self._encode_flight.do_sync(key, lambda: self._encode_uncached(text))
         self._enc_cache[key] = vec
         if len(self._enc_cache) > self._enc_cache_max:
             self._enc_cache.popitem(last=False)
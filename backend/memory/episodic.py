@@ -11,7 +11,7 @@ import logging
 import uuid
 import math
 import struct
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 
 from backend.memory.db import open_encrypted_memory, Connection
@@ -393,7 +393,8 @@ class EpisodicStore:
         self,
         task: str,
         limit: int = 3,
-        min_score: float = 0.6
+        min_score: float = 0.6,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find top-N semantically similar successful episodes.
@@ -404,12 +405,15 @@ class EpisodicStore:
             task: The task query
             limit: Maximum number of results
             min_score: Minimum outcome score to include
+            query_embedding: Precomputed embedding of ``task`` (shared by the
+                             retrieval orchestrator); computed here if None
         
         Returns:
             List of similar episode dictionaries, sorted by similarity
         """
         # Get embedding for query
-        query_embedding = self._embed.encode(task)
+        if query_embedding is None:
+            query_embedding = self._embed.encode(task)
         
         # Get all successful episodes with embeddings
         rows = self.db.execute("""
@@ -461,7 +465,8 @@ class EpisodicStore:
     def retrieve_failures(
         self,
         task: str,
-        limit: int = 2
+        limit: int = 2,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find top-N semantically similar failure episodes for warnings.
@@ -471,12 +476,14 @@ class EpisodicStore:
         Args:
             task: The task query
             limit: Maximum number of results
+            query_embedding: Precomputed embedding of ``task``, or None
         
         Returns:
             List of failure episode dictionaries, sorted by similarity
         """
         # Get embedding for query
-        query_embedding = self._embed.encode(task)
+        if query_embedding is None:
+            query_embedding = self._embed.encode(task)
         
         # Get all failures with embeddings
         rows = self.db.execute("""
@@ -509,19 +516,36 @@ class EpisodicStore:
         logger.debug(f"[EpisodicStore] Found {len(results)} similar failures for task: {task[:50]}...")
         return results
     
-    def assemble_episodic_context(self, task: str) -> str:
+    def assemble_episodic_context(
+        self, task: str, with_score: bool = False,
+        query_embedding: Optional[List[float]] = None,
+    ) -> Union[str, Tuple[str, float]]:
         """
         Format episodic context for injection into prompts.
         
         Args:
             task: The current task
+            with_score: Also return the block's relevance — the best
+                        resonance (or cosine) score among the episodes used,
+                        clamped to [0, 1] — for context budgeting
+            query_embedding: Precomputed embedding of ``task``, or None
         
         Returns:
-            Formatted episodic context string
+            Formatted episodic context string, or (string, relevance)
         """
-        successes = self.retrieve_similar(task, limit=3, min_score=0.6)
-        failures = self.retrieve_failures(task, limit=2)
-
+        if query_embedding is None:
+            query_embedding = self._embed.encode(task)
+        successes = self.retrieve_similar(task, limit=3, min_score=0.6,
+                                          query_embedding=query_embedding)
+        failures = self.retrieve_failures(task, limit=2, query_embedding=query_embedding)
+        context = self._format_episodic_context(successes, failures)
+        if not with_score:
+            return context
+        scores = [ep.get("final_score", ep.get("similarity", 0.0)) for ep in successes + failures]
+        return context, max(0.0, min(1.0, max(scores, default=0.0)))
+
+    def _format_episodic_context(self, successes: List[Dict[str, Any]],
+                                 failures: List[Dict[str, Any]]) -> str:
         # Mycelium: use resonance-aware format_context which omits suppressed successes
         # and always includes failure warnings (Req 11.11)
         if self._mycelium is not None:
@@ -673,7 +697,9 @@ class EpisodicStore:
         min_similarity: float = 0.25,
         chunk_types: Optional[List[str]] = None,
         zones: Optional[List[str]] = None,
-    ) -> List[str]:
+        with_scores: bool = False,
+        query_embedding: Optional[List[float]] = None,
+    ) -> Union[List[str], List[Tuple[str, float]]]:
         """
         Retrieve the most semantically relevant context chunks for a query.
 
@@ -694,6 +720,8 @@ class EpisodicStore:
                             filtered out regardless of how recent they are).
             chunk_types:    Filter by chunk_type; None = all types.
             zones:          Filter by zone (e.g. ['trusted','tool']); None = all.
+            with_scores:    Return (content, combined_score) pairs instead.
+            query_embedding: Precomputed embedding of ``query``, or None.
 
         Returns:
             List of chunk content strings ranked by descending combined score.
@@ -701,7 +729,8 @@ class EpisodicStore:
         if not query:
             return []
 
-        query_embedding = self._embed.encode(query)
+        if query_embedding is None:
+            query_embedding = self._embed.encode(query)
 
         where_clauses: List[str] = []
         params_list: List[Any] = []
@@ -761,7 +790,10 @@ class EpisodicStore:
 
         scored.sort(key=lambda x: x[0], reverse=True)
         top = scored[:limit]
-        results = [content for _, content, _ in top]
+        if with_scores:
+            results = [(content, round(score, 4)) for score, content, _ in top]
+        else:
+            results = [content for _, content, _ in top]
 
         # Increment retrieval_count for returned chunks (usage tracking for decay/crystallization)
         retrieved_ids = [chunk_id for _, _, chunk_id in top]
@@ -14,15 +14,22 @@ import hashlib
 import json
 import logging
 import threading
+import time
 from typing import Optional, List, Dict, Any
 
 from backend.memory.working import ContextManager
 from backend.memory.episodic import EpisodicStore, Episode
 from backend.memory.semantic import SemanticStore
 from backend.memory.embedding import EmbeddingService
+from backend.memory.retrieval import get_retrieval_orchestrator
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import span as trace_span
 
 logger = logging.getLogger(__name__)
 
+_RETRIEVAL_SECONDS = get_metrics_registry().summary(
+    "iris_memory_retrieval_seconds", "Memory context assembly latency", ["kind"])
+
 # Default source channel level before kyudo.py is wired (Phase 9).
 # HyphaChannel.EXTERNAL — overridden when kyudo.py is wired in Phase 9.
 _DEFAULT_PRE_KYUDO_CHANNEL: int = 1
@@ -114,27 +121,38 @@ class MemoryInterface:
         Returns:
             Context string ready for model prompt
         """
-        # Mycelium coordinate path — replaces prose header when graph is mature (Req 13.3)
-        coordinate_path = ""
+        started = time.perf_counter()
+        # The three sources are independent: run them concurrently on one
+        # shared query embedding.  The prose header is fetched alongside the
+        # Mycelium path so the fallback costs nothing extra when it is needed.
+        sources = {
+            "semantic_header": lambda vec: self.semantic.get_startup_header(),
+            "episodic": lambda vec: self.episodic.assemble_episodic_context(
+                task, query_embedding=vec),
+        }
         if self._mycelium is not None:
-            try:
-                coordinate_path = self._mycelium.get_context_path(task, session_id)
-            except Exception as _cp_err:
-                logger.debug("[MemoryInterface] get_context_path failed: %s", _cp_err)
+            sources["mycelium_path"] = lambda vec: self._mycelium.get_context_path(task, session_id)
+        retrieved = get_retrieval_orchestrator().gather(sources, query=task, embed=self.embed.encode)
+        for name, result in retrieved.sources.items():
+            if result.status != "ok":
+                logger.debug("[MemoryInterface] %s %s: %s", name, result.status, result.error or "")
 
+        # Mycelium coordinate path — replaces prose header when graph is mature (Req 13.3)
+        coordinate_path = retrieved.value("mycelium_path") or ""
         if coordinate_path:
             # Inject compact coordinate path in place of prose header
             header = coordinate_path
         else:
             # Fallback: existing semantic prose header (new installs / immature graph)
-            header = self.semantic.get_startup_header()
+            header = retrieved.value("semantic_header", "")
 
-        episodic = self.episodic.assemble_episodic_context(task)
+        episodic = retrieved.value("episodic", "")
 
         context = self.context.assemble_for_task(
             session_id, task, header, episodic
         )
 
+        _RETRIEVAL_SECONDS.labels(kind="local").observe(time.perf_counter() - started)
         logger.debug(f"[MemoryInterface] Assembled context ({len(context)} chars)")
         return context
     
@@ -161,7 +179,10 @@ class MemoryInterface:
             Privacy-safe context string
         """
         # Find similar tool patterns (not full episodes)
-        similar = self.episodic.retrieve_similar(task_summary, limit=2, min_score=0.6)
+        started = time.perf_counter()
+        with trace_span("memory.episodic", remote=True):
+            similar = self.episodic.retrieve_similar(task_summary, limit=2, min_score=0.6)
+        _RETRIEVAL_SECONDS.labels(kind="remote").observe(time.perf_counter() - started)
         
         # Extract only tool hints (no personal data)
         tool_hints = []
@@ -580,9 +601,10 @@ class MemoryInterface:
                     return self.get_task_context(task, session_id), False
                 except Exception:
                     return "", False
-            pkg = self._mycelium.get_context_path(
-                task_text=task, session_id=session_id, space_subset=space_subset
-            )
+            with trace_span("memory.mycelium_path"):
+                pkg = self._mycelium.get_context_path(
+                    task_text=task, session_id=session_id, space_subset=space_subset
+                )
             if not pkg or isinstance(pkg, str):
                 try:
                     return self.get_task_context(task, session_id), False
@@ -27,6 +27,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+from backend.performance.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -527,6 +529,8 @@ class TopologyLayer:
         self._prim_classifier    = PrimitiveClassifier()
         self._deficiency         = DeficiencyDetector(conn)
         self._anchor_lifecycle   = AnchorLifecycle(conn)
+        # Concurrent context assemblies for one session share one chart query
+        self._context_flight     = SingleFlight("get_topology_context")
 
     def record_session_position(
         self, session_id: str, active_nodes: List[Any]
@@ -607,6 +611,14 @@ class TopologyLayer:
 
         Returns None when no crystallized anchors exist (fresh install / pre-maturity).
         """
+        key = (session_id, tuple(getattr(n, "node_id", id(n)) for n in active_nodes))
+        return self._context_flight.do_sync(
+            key, lambda: self._build_topology_context(session_id, active_nodes)
+        )
+
+    def _build_topology_context(
+        self, session_id: str, active_nodes: List[Any]
+    ) -> Optional[TopologyContext]:
         origins = self._chart_registry.get_nearest_origins(session_id, active_nodes)
         if not origins:
             return None
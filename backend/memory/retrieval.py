@@ -0,0 +1,177 @@
+"""
+RetrievalOrchestrator — run independent context sources concurrently.
+
+Prompt assembly used to query its context sources one after another:
+episodic similarity (twice — successes and failures), context chunks, the
+Mycelium coordinate path, the semantic header.  Each is SQLite reads plus
+an embedding of the same query, so the slowest source added straight onto
+time-to-first-token and the query was embedded up to three times.
+
+gather() embeds the query once, hands the vector to every source, runs the
+sources on a shared thread pool and waits for each until its own deadline:
+
+    result = get_retrieval_orchestrator().gather({
+        "episodic": lambda vec: store.assemble_episodic_context(q, query_embedding=vec),
+        "chunks":   lambda vec: store.retrieve_context_chunks(q, query_embedding=vec),
+    }, query=q, deadlines={"chunks": 0.5})
+    episodic = result.value("episodic", "")
+
+A source that misses its deadline or raises is reported and left out —
+the turn goes ahead without it (the late work still finishes in the
+background and its latency is still recorded).  Each source runs in a
+``memory.<source>`` span under the caller's trace, so turn waterfalls
+show the sources side by side.  Per-source latency is in
+iris_memory_source_seconds{source}; misses in
+iris_memory_source_misses_total{source, reason}.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.monitoring.metrics import get_metrics_registry
+from backend.monitoring.tracing import span as trace_span
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_SOURCE_SECONDS = _metrics.summary(
+    "iris_memory_source_seconds", "Latency of one context source during prompt assembly", ["source"])
+_SOURCE_MISSES = _metrics.counter(
+    "iris_memory_source_misses_total", "Context sources left out of a prompt", ["source", "reason"])
+
+Source = Callable[[Optional[List[float]]], Any]
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source: status is "ok", "timeout" or "error"."""
+
+    name: str
+    status: str
+    value: Any = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class RetrievalResult:
+    """All sources of one gather(), with the shared embedding's cost."""
+
+    sources: Dict[str, SourceResult] = field(default_factory=dict)
+    embedding_ms: Optional[float] = None
+    total_ms: float = 0.0
+
+    def value(self, name: str, default: Any = None) -> Any:
+        result = self.sources.get(name)
+        return result.value if result is not None and result.status == "ok" else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(self.total_ms, 1),
+            "embedding_ms": None if self.embedding_ms is None else round(self.embedding_ms, 1),
+            "sources": {
+                name: {"status": r.status,
+                       "ms": None if r.latency_ms is None else round(r.latency_ms, 1),
+                       **({"error": r.error} if r.error else {})}
+                for name, r in self.sources.items()
+            },
+        }
+
+
+class RetrievalOrchestrator:
+    """Concurrent context retrieval with a shared query embedding and per-source deadlines."""
+
+    DEFAULT_DEADLINE_S = 1.0
+
+    def __init__(self, max_workers: int = 6, default_deadline: float = DEFAULT_DEADLINE_S,
+                 embed: Optional[Callable[[str], List[float]]] = None):
+        self.default_deadline = default_deadline
+        self._embed = embed
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="iris-retrieval")
+        self.last: Optional[RetrievalResult] = None
+
+    def _embed_query(self, query: str,
+                     embed: Optional[Callable[[str], List[float]]] = None) -> Optional[List[float]]:
+        embed = embed or self._embed
+        if embed is None:
+            from backend.memory.embedding import get_embedding_service
+            embed = get_embedding_service().encode
+        return embed(query)
+
+    @staticmethod
+    def _timed(name: str, source: Source, vec: Optional[List[float]]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            with trace_span(f"memory.{name}"):
+                return source(vec)
+        finally:
+            _SOURCE_SECONDS.labels(name).observe(time.perf_counter() - t0)
+
+    def gather(self, sources: Dict[str, Source], query: Optional[str] = None,
+               deadlines: Optional[Dict[str, float]] = None,
+               embed: Optional[Callable[[str], List[float]]] = None) -> RetrievalResult:
+        """Run every source concurrently; each gets the query embedding (or None).
+
+        ``embed`` overrides the embedding function for this call (e.g. the
+        caller's own EmbeddingService); by default the shared service is used.
+        """
+        started = time.perf_counter()
+        result = RetrievalResult()
+
+        vec = None
+        if query:
+            try:
+                vec = self._embed_query(query, embed)
+            except Exception as e:
+                logger.debug(f"[Retrieval] shared query embedding failed: {e}")
+            result.embedding_ms = (time.perf_counter() - started) * 1000
+
+        launched = time.perf_counter()
+        # Each source runs in a copy of the caller's context so its span nests
+        # under the caller's trace (one copy per source: a Context is single-entry)
+        futures = {name: self._pool.submit(contextvars.copy_context().run,
+                                           self._timed, name, source, vec)
+                   for name, source in sources.items()}
+        deadlines = deadlines or {}
+        for name, future in futures.items():
+            deadline = deadlines.get(name, self.default_deadline)
+            remaining = max(0.0, launched + deadline - time.perf_counter())
+            try:
+                value = future.result(timeout=remaining)
+                result.sources[name] = SourceResult(
+                    name, "ok", value, (time.perf_counter() - launched) * 1000)
+            except FutureTimeout:
+                _SOURCE_MISSES.labels(name, "timeout").inc()
+                result.sources[name] = SourceResult(name, "timeout", latency_ms=deadline * 1000)
+                logger.info(f"[Retrieval] {name} missed its {deadline * 1000:.0f}ms deadline — skipped")
+            except Exception as e:
+                _SOURCE_MISSES.labels(name, "error").inc()
+                result.sources[name] = SourceResult(
+                    name, "error", latency_ms=(time.perf_counter() - launched) * 1000, error=str(e))
+                logger.debug(f"[Retrieval] {name} failed: {e}")
+
+        result.total_ms = (time.perf_counter() - started) * 1000
+        self.last = result
+        return result
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+_orchestrator: Optional[RetrievalOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_retrieval_orchestrator() -> RetrievalOrchestrator:
+    """The process-wide orchestrator (one pool shared by all sessions)."""
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = RetrievalOrchestrator()
+    return _orchestrator
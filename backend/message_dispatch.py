@@ -0,0 +1,271 @@
+"""
+IRIS Message Dispatch Table
+Registered WebSocket message handlers with per-handler concurrency metadata.
+
+Each message type maps to a HandlerSpec:
+
+    INLINE      awaited before the next frame is read (fast, order-sensitive:
+                navigation, ping/pong, voice start/stop, terminal input)
+    ORDERED     run off the read loop, serialised per ordering key
+                (settings updates for a session, model load/unload, chat turns)
+    BACKGROUND  run as a tracked task, fully concurrent (model scans,
+                downloads, crawler queries)
+
+so a slow handler no longer blocks that client's later pings or UI events.
+Per-type latency histograms are recorded for every dispatch.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, str, dict], Awaitable[Any]]
+OrderingKey = Callable[[str, str, dict], Hashable]
+ErrorCallback = Callable[[str, str], Awaitable[Any]]
+
+
+class Concurrency(str, Enum):
+    INLINE = "inline"
+    ORDERED = "ordered"
+    BACKGROUND = "background"
+
+
+@dataclass(frozen=True)
+class HandlerSpec:
+    """Dispatch metadata for one or more message types."""
+    handler: Handler
+    concurrency: Concurrency = Concurrency.INLINE
+    ordering_key: Optional[OrderingKey] = None
+    timeout: Optional[float] = None
+
+
+class _HandlerTimeout(Exception):
+    """A TimeoutError raised by the handler itself (the original is __cause__)."""
+
+
+async def _own_timeouts(coro: Awaitable[Any]) -> Any:
+    # Since 3.11 asyncio.TimeoutError is the builtin TimeoutError, so without
+    # this wait_for() could not tell a handler's timeout from its own deadline
+    try:
+        return await coro
+    except TimeoutError as e:
+        raise _HandlerTimeout() from e
+
+
+def by_session(scope: str) -> OrderingKey:
+    """Ordering key: serialise all messages of this scope within a session."""
+    return lambda session_id, client_id, message: (scope, session_id)
+
+
+def by_client(scope: str) -> OrderingKey:
+    """Ordering key: serialise all messages of this scope from one client."""
+    return lambda session_id, client_id, message: (scope, client_id)
+
+
+def global_key(scope: str) -> OrderingKey:
+    """Ordering key: serialise all messages of this scope process-wide."""
+    return lambda session_id, client_id, message: (scope,)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.timeouts = 0
+
+    def record(self, elapsed_ms: float) -> None:
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing quantile q (max_ms for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "buckets": dict(zip([str(b) for b in self.BUCKETS_MS] + ["+Inf"], self.counts)),
+        }
+
+
+class MessageDispatcher:
+    """
+    Routes message types to registered HandlerSpecs.
+
+    Background and ordered handlers run as tracked tasks grouped by the
+    client that sent them; they run to completion even if that client
+    disconnects (a model download should not die with a browser tab) and
+    are cancelled only on shutdown().  Handler exceptions and timeouts are
+    logged and reported through on_error.
+    """
+
+    def __init__(self, on_error: Optional[ErrorCallback] = None):
+        self._specs: Dict[str, HandlerSpec] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._client_tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._tails: Dict[Hashable, asyncio.Task] = {}
+        self._on_error = on_error
+
+    def register(
+        self,
+        msg_types: Union[str, Iterable[str]],
+        handler: Handler,
+        concurrency: Concurrency = Concurrency.INLINE,
+        ordering_key: Optional[OrderingKey] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Register a handler for one message type or a group of types."""
+        if concurrency is Concurrency.ORDERED and ordering_key is None:
+            raise ValueError("ORDERED handlers require an ordering_key")
+        spec = HandlerSpec(handler, concurrency, ordering_key, timeout)
+        for msg_type in ([msg_types] if isinstance(msg_types, str) else msg_types):
+            self._specs[msg_type] = spec
+
+    def get_spec(self, msg_type: str) -> Optional[HandlerSpec]:
+        return self._specs.get(msg_type)
+
+    def __contains__(self, msg_type: str) -> bool:
+        return msg_type in self._specs
+
+    async def dispatch(self, msg_type: str, session_id: str, client_id: str, message: dict) -> bool:
+        """
+        Dispatch a message. Returns False if no handler is registered.
+
+        INLINE handlers are awaited (exceptions propagate to the caller, as the
+        old if/elif chain did); other classes return as soon as the task is
+        scheduled.
+        """
+        spec = self._specs.get(msg_type)
+        if spec is None:
+            return False
+
+        if spec.concurrency is Concurrency.INLINE:
+            await self._run(spec, msg_type, session_id, client_id, message, report=False)
+            return True
+
+        prev = None
+        key = None
+        if spec.concurrency is Concurrency.ORDERED:
+            key = spec.ordering_key(session_id, client_id, message)
+            prev = self._tails.get(key)
+
+        task = asyncio.create_task(
+            self._run_after(prev, spec, msg_type, session_id, client_id, message),
+            name=f"ws-{msg_type}-{client_id}",
+        )
+        tasks = self._client_tasks.setdefault(client_id, set())
+        tasks.add(task)
+        if key is not None:
+            self._tails[key] = task
+
+        def _done(t: asyncio.Task, _key=key) -> None:
+            owned = self._client_tasks.get(client_id)
+            if owned is not None:
+                owned.discard(t)
+                if not owned:
+                    self._client_tasks.pop(client_id, None)
+            if _key is not None and self._tails.get(_key) is t:
+                del self._tails[_key]
+
+        task.add_done_callback(_done)
+        return True
+
+    async def _run_after(self, prev, spec, msg_type, session_id, client_id, message) -> None:
+        if prev is not None and not prev.done():
+            # Wait for the previous message with the same key; its outcome
+            # (error, timeout, cancellation) never blocks the next one.
+            await asyncio.wait([prev])
+        await self._run(spec, msg_type, session_id, client_id, message, report=True)
+
+    async def _run(self, spec, msg_type, session_id, client_id, message, report: bool) -> None:
+        hist = self._histograms.get(msg_type)
+        if hist is None:
+            hist = self._histograms[msg_type] = LatencyHistogram()
+        started = time.perf_counter()
+        try:
+            coro = spec.handler(session_id, client_id, message)
+            if spec.timeout is None:
+                await coro
+            else:
+                try:
+                    await asyncio.wait_for(_own_timeouts(coro), spec.timeout)
+                except _HandlerTimeout as e:
+                    # The handler's own TimeoutError, not the dispatch deadline
+                    raise e.__cause__
+                except asyncio.TimeoutError:
+                    hist.timeouts += 1
+                    logger.warning(
+                        f"[Dispatch] {msg_type} from {client_id} timed out after {spec.timeout}s",
+                        extra={"client_id": client_id, "message_type": msg_type},
+                    )
+                    if self._on_error:
+                        await self._on_error(client_id, f"{msg_type} timed out after {spec.timeout:.0f}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            hist.errors += 1
+            if not report:
+                raise
+            logger.error(
+                f"Error handling message type {msg_type} from client {client_id}: {e}",
+                exc_info=True,
+                extra={"client_id": client_id, "message_type": msg_type, "error": str(e)},
+            )
+            if self._on_error:
+                await self._on_error(client_id, f"Error processing message: {str(e)}")
+        finally:
+            hist.record((time.perf_counter() - started) * 1000)
+
+    def pending_tasks(self, client_id: Optional[str] = None) -> List[asyncio.Task]:
+        """Outstanding background/ordered tasks, optionally for one client."""
+        if client_id is not None:
+            return list(self._client_tasks.get(client_id, ()))
+        return [t for tasks in self._client_tasks.values() for t in tasks]
+
+    async def shutdown(self) -> None:
+        """Cancel every outstanding task and wait for them to exit."""
+        tasks = self.pending_tasks()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._client_tasks.clear()
+        self._tails.clear()
+
+    def get_latency_histograms(self) -> Dict[str, dict]:
+        """Per-message-type latency histograms."""
+        return {t: h.to_dict() for t, h in self._histograms.items()}
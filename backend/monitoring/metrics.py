@@ -0,0 +1,382 @@
+"""
+Metrics - Bounded-memory counters, gauges and latency summaries
+
+Latency summaries are backed by a DDSketch: every observation lands in a
+logarithmic bucket, so any quantile is answered with a bounded *relative*
+error (1% by default) from a few hundred integer counters, however many
+samples were recorded.  Recording is one log() and a dict increment — there
+is no sorting and no sample list — so instrumenting a hot path costs next to
+nothing; quantiles are only computed when someone scrapes.
+
+Metrics are exposed in two forms:
+
+    GET /metrics                 Prometheus text exposition format
+    {"type": "metrics_snapshot"} over the WebSocket, answered with snapshot()
+
+Usage:
+    from backend.monitoring.metrics import get_metrics_registry
+
+    _TOOL_SECONDS = get_metrics_registry().summary(
+        "iris_tool_seconds", "Tool execution latency", ["tool"])
+
+    with _TOOL_SECONDS.labels(tool="read_file").time():
+        ...
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (Masson et al., 2019).
+
+    Intended for non-negative values; those <= MIN_VALUE are counted in a
+    zero bucket.  When more than max_bins buckets are in use the lowest two
+    are merged, which only affects accuracy at the very bottom of the
+    distribution.
+    Not thread-safe on its own; Summary serialises access.
+    """
+
+    RELATIVE_ACCURACY = 0.01
+    MAX_BINS = 2048
+    MIN_VALUE = 1e-9
+
+    __slots__ = ("_gamma", "_log_gamma", "_max_bins", "_bins",
+                 "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: Optional[float] = None, max_bins: Optional[int] = None):
+        alpha = relative_accuracy or self.RELATIVE_ACCURACY
+        if not 0 < alpha < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self._max_bins = max_bins or self.MAX_BINS
+        self._bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.MIN_VALUE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        bins = self._bins
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self._max_bins:
+            low, second = sorted(bins)[:2]
+            bins[second] += bins.pop(low)
+
+    def merge(self, other: "DDSketch") -> None:
+        """Fold another sketch with the same accuracy into this one."""
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, n in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + n
+        while len(self._bins) > self._max_bins:
+            low, second = sorted(self._bins)[:2]
+            self._bins[second] += self._bins.pop(low)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (0 <= q <= 1); 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+
+# ── metric types ──────────────────────────────────────────────────────────
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Base for a named metric family with optional labels."""
+
+    TYPE = ""
+    MAX_LABEL_SETS = 256    # distinct label combinations before folding into "other"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, "_Metric"] = {}
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.documentation)
+
+    def labels(self, *values: str, **kwargs: str) -> "_Metric":
+        """Child metric for one label combination."""
+        if not self.labelnames:
+            raise ValueError(f"{self.name} has no labels")
+        if kwargs:
+            values = tuple(str(kwargs[n]) for n in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                if len(self._children) >= self.MAX_LABEL_SETS:
+                    values = ("other",) * len(self.labelnames)
+                    child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+            return child
+
+    def _series(self) -> Iterable[Tuple[LabelValues, "_Metric"]]:
+        if self.labelnames:
+            return list(self._children.items())
+        return [((), self)]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed at scrape time."""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Evaluate fn on every scrape instead of storing a value."""
+        self._function = fn
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class _Timer:
+    __slots__ = ("_summary", "_started")
+
+    def __init__(self, summary: "Summary"):
+        self._summary = summary
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._summary.observe(time.perf_counter() - self._started)
+        return False
+
+
+class Summary(_Metric):
+    """Distribution (usually latency in seconds) backed by a DDSketch."""
+
+    TYPE = "summary"
+    QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._sketch = DDSketch()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sketch.add(value)
+
+    def time(self) -> _Timer:
+        """Context manager observing the elapsed wall time in seconds."""
+        return _Timer(self)
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            return self._sketch.quantile(q)
+
+    @property
+    def count(self) -> int:
+        return self._sketch.count
+
+    @property
+    def sum(self) -> float:
+        return self._sketch.sum
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            sketch = self._sketch
+            out = {f"p{round(q * 100)}": sketch.quantile(q) for q in self.QUANTILES}
+            out.update(count=sketch.count, sum=sketch.sum, mean=sketch.mean,
+                       max=sketch.max if sketch.count else 0.0)
+        return out
+
+
+# ── registry ──────────────────────────────────────────────────────────────
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Named collection of metrics; creation is idempotent per name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} already registered as a different {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def summary(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Summary:
+        return self._get_or_create(Summary, name, documentation, labelnames)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.TYPE}")
+            for values, series in metric._series():
+                labels = _label_str(metric.labelnames, values)
+                if isinstance(series, Summary):
+                    stats = series.stats()
+                    for q in Summary.QUANTILES:
+                        ql = _label_str(metric.labelnames, values, f'quantile="{q}"')
+                        lines.append(f"{name}{ql} {_format_value(stats[f'p{round(q * 100)}'])}")
+                    lines.append(f"{name}_sum{labels} {_format_value(stats['sum'])}")
+                    lines.append(f"{name}_count{labels} {_format_value(stats['count'])}")
+                else:
+                    lines.append(f"{name}{labels} {_format_value(series.value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, dict]:
+        """JSON-friendly view of every metric (sent as metrics_snapshot)."""
+        out: Dict[str, dict] = {}
+        for name, metric in sorted(self._metrics.items()):
+            series = []
+            for values, child in metric._series():
+                entry: dict = {"labels": dict(zip(metric.labelnames, values))}
+                if isinstance(child, Summary):
+                    entry.update({k: round(v, 6) for k, v in child.stats().items()})
+                else:
+                    entry["value"] = child.value
+                series.append(entry)
+            out[name] = {"type": metric.TYPE, "help": metric.documentation, "series": series}
+        return out
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get or create the process-wide MetricsRegistry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
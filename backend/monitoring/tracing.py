@@ -0,0 +1,321 @@
+"""
+Tracing - In-process span tracing for voice and chat turns
+
+A turn opens a root span with trace(); everything it calls opens child spans
+with span().  The current span lives in a contextvar, so children find their
+parent without it being passed around:
+
+    with get_tracer().trace("chat.turn", session_id=sid):
+        with span("context.assemble"):
+            ...
+        await loop.run_in_executor(None, bind_context(run_agent))
+
+asyncio tasks and run_coroutine_threadsafe() carry contextvars across on
+their own; run_in_executor() and threading.Thread do not, so work handed to
+them is wrapped with bind_context().  span() outside any trace returns a
+no-op span, so instrumented code costs one contextvar lookup when nobody is
+tracing.
+
+Finished traces are kept in a ring buffer (MAX_TRACES) and can be rendered
+as a waterfall for the UI or exported in the Chrome trace-event format
+(load in chrome://tracing or https://ui.perfetto.dev, which also works from a
+saved file offline).
+"""
+
+import contextvars
+import functools
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "iris_current_span", default=None)
+
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation inside a trace.  Use as a context manager or call end()."""
+
+    __slots__ = ("_trace", "span_id", "parent_id", "name", "attrs", "start_ns", "end_ns",
+                 "thread_name", "error", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[int], attrs: Dict[str, Any]):
+        self._trace = trace
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.thread_name = threading.current_thread().name
+        self.error: Optional[str] = None
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        return self._trace.trace_id
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def end(self, error: Optional[str] = None) -> None:
+        """Close the span (idempotent)."""
+        if self.end_ns is not None:
+            return
+        if error:
+            self.error = error
+        self.end_ns = time.perf_counter_ns()
+        self._trace._on_span_end(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end(error=exc_type.__name__ if exc_type else None)
+        return False
+
+
+class _NoopSpan:
+    """Returned by span() when no trace is active."""
+
+    __slots__ = ()
+    trace_id = None
+    span_id = None
+    duration_ms = None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def end(self, error: Optional[str] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    All spans of one turn.
+
+    The root span is stretched to cover every span that ends after it, so a
+    turn that hands work to other threads (TTS playback, late WS frames)
+    still shows its full duration.
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self._tracer = tracer
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.root = Span(self, name, None, attrs)
+        self.spans.append(self.root)
+
+    @property
+    def name(self) -> str:
+        return self.root.name
+
+    def _add(self, span: Span) -> None:
+        with self._tracer._lock:
+            if len(self.spans) < self._tracer._max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped_spans += 1
+
+    def _on_span_end(self, span: Span) -> None:
+        root = self.root
+        if span is not root and root.end_ns is not None and span.end_ns > root.end_ns:
+            root.end_ns = span.end_ns
+
+    def duration_ms(self) -> Optional[float]:
+        return self.root.duration_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": _round(self.duration_ms()),
+            "spans": len(self.spans),
+            "attrs": dict(self.root.attrs),
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+class Tracer:
+    """Creates traces and keeps the most recent ones in a ring buffer."""
+
+    MAX_TRACES = 200
+    MAX_SPANS_PER_TRACE = 2000
+
+    def __init__(self, max_traces: Optional[int] = None, max_spans: Optional[int] = None):
+        self._max_traces = max_traces or self.MAX_TRACES
+        self._max_spans = max_spans or self.MAX_SPANS_PER_TRACE
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ── recording ───────────────────────────────────────────────────────
+
+    def trace(self, name: str, **attrs: Any) -> Span:
+        """Start a new trace and return its root span (enter it to make it current)."""
+        trace = Trace(self, name, attrs)
+        with self._lock:
+            self._traces[trace.trace_id] = trace
+            while len(self._traces) > self._max_traces:
+                self._traces.popitem(last=False)
+        return trace.root
+
+    def span(self, name: str, **attrs: Any):
+        """Child of the current span, or NOOP_SPAN when no trace is active."""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        child = Span(parent._trace, name, parent.span_id, attrs)
+        parent._trace._add(child)
+        return child
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        return self._traces.get(trace_id)
+
+    def recent(self, limit: int = 20, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Summaries of the newest traces (optionally for one session), newest first."""
+        with self._lock:
+            traces = list(reversed(self._traces.values()))
+        if session_id is not None:
+            traces = [t for t in traces if t.root.attrs.get("session_id") == session_id]
+        return [t.summary() for t in traces[:limit]]
+
+    def latest(self, session_id: Optional[str] = None) -> Optional[Trace]:
+        with self._lock:
+            traces = list(reversed(self._traces.values()))
+        for trace in traces:
+            if session_id is None or trace.root.attrs.get("session_id") == session_id:
+                return trace
+        return None
+
+    def waterfall(self, trace: Trace) -> Dict[str, Any]:
+        """Spans ordered by start time with offsets and nesting depth (for the UI)."""
+        with self._lock:
+            spans = sorted(trace.spans, key=lambda s: s.start_ns)
+        depth: Dict[int, int] = {}
+        origin = trace.root.start_ns
+        now = time.perf_counter_ns()
+        rows = []
+        for s in spans:
+            depth[s.span_id] = depth.get(s.parent_id, -1) + 1 if s.parent_id is not None else 0
+            end = s.end_ns if s.end_ns is not None else now
+            rows.append({
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "depth": depth[s.span_id],
+                "offset_ms": round((s.start_ns - origin) / 1e6, 3),
+                "duration_ms": round((end - s.start_ns) / 1e6, 3),
+                "open": s.end_ns is None,
+                "thread": s.thread_name,
+                "error": s.error,
+                "attrs": dict(s.attrs),
+            })
+        return {**trace.summary(), "dropped_spans": trace.dropped_spans, "waterfall": rows}
+
+    def export_chrome(self, trace_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Chrome trace-event JSON ("X" complete events, microseconds)."""
+        with self._lock:
+            traces = [self._traces[t] for t in trace_ids if t in self._traces] \
+                if trace_ids is not None else list(self._traces.values())
+            spans = [(t, s) for t in traces for s in list(t.spans)]
+        pid = os.getpid()
+        threads: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        for trace, s in spans:
+            tid = threads.setdefault(s.thread_name, len(threads) + 1)
+            end = s.end_ns if s.end_ns is not None else s.start_ns
+            args = {"trace_id": trace.trace_id, **{k: _jsonable(v) for k, v in s.attrs.items()}}
+            if s.error:
+                args["error"] = s.error
+            events.append({
+                "name": s.name,
+                "cat": trace.name,
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": (end - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+        for name, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def bind_context(fn: Callable, *args: Any, **kwargs: Any) -> Callable[[], Any]:
+    """
+    Wrap fn so it runs in a copy of the caller's context.
+
+    Use for run_in_executor() and threading.Thread targets so spans opened
+    there join the caller's trace.
+    """
+    return functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get or create the process-wide Tracer."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+
+def span(name: str, **attrs: Any):
+    """Shorthand for get_tracer().span(name, **attrs)."""
+    return get_tracer().span(name, **attrs)
@@ -8,6 +8,9 @@ from .agent_optimizer import AgentOptimizer, get_agent_optimizer
 from .voice_optimizer import VoiceOptimizer, get_voice_optimizer
 from .state_optimizer import StateOptimizer, get_state_optimizer
 from .tool_optimizer import ToolOptimizer, get_tool_optimizer
+from .stream_coalescer import StreamCoalescer, ChunkStream
+from .state_delta import StateVersionTracker, make_patch, apply_patch
+from .singleflight import SingleFlight
 
 __all__ = [
     "WebSocketOptimizer",
@@ -20,4 +23,10 @@ __all__ = [
     "get_state_optimizer",
     "ToolOptimizer",
     "get_tool_optimizer",
+    "StreamCoalescer",
+    "ChunkStream",
+    "StateVersionTracker",
+    "make_patch",
+    "apply_patch",
+    "SingleFlight",
 ]
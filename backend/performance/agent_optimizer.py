@@ -6,41 +6,34 @@ import asyncio
 import logging
 import time
 from typing import Dict, Optional, AsyncIterator, Callable, Awaitable
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+from backend.monitoring.metrics import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class ResponseMetrics:
     """Track response time metrics."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    sketch: DDSketch = field(default_factory=DDSketch)
     
     def record(self, response_time_s: float):
         """Record a response time sample."""
-        self.samples.append(response_time_s)
+        self.sketch.add(response_time_s)
     
     def get_p95(self) -> float:
         """Get 95th percentile response time."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[idx]
+        return self.sketch.quantile(0.95)
     
     def get_mean(self) -> float:
         """Get mean response time."""
-        if not self.samples:
-            return 0.0
-        return sum(self.samples) / len(self.samples)
+        return self.sketch.mean
     
     def get_max(self) -> float:
         """Get maximum response time."""
-        if not self.samples:
-            return 0.0
-        return max(self.samples)
+        return self.sketch.max if self.sketch.count else 0.0
 
 
 @dataclass
@@ -241,7 +234,7 @@ class AgentOptimizer:
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
             "cache_hit_rate": cache_hit_rate,
-            "total_samples": len(self.response_metrics.samples),
+            "total_samples": self.response_metrics.sketch.count,
             "target_response_time_s": self.TARGET_RESPONSE_TIME_S,
         }
     
@@ -0,0 +1,183 @@
+"""
+Singleflight — coalesce duplicate concurrent calls into one execution.
+
+Several UI clients (or one UI firing the same event twice) regularly ask
+for the same expensive thing at the same moment: the model list, the
+status snapshot, the skills listing, an MCP server's tools, the embedding
+of a text that both retrieval and dedup are about to encode.  A
+SingleFlight group runs the work once per key and hands the result (or
+the exception) to every caller that arrived while it was running:
+
+    _MODELS = SingleFlight("get_available_models", ttl=2.0)
+    models = await _MODELS.do(("local", endpoint), lambda: discover(endpoint))
+    vec = _EMBED.do_sync(text_hash, lambda: encode(text))
+
+do() is for coroutines and do_sync() for blocking calls on any thread.
+The async work runs in its own task, so a caller that is cancelled does
+not cancel the result the other callers are waiting for.  With ``ttl`` > 0
+a successful result is also memoised for that many seconds; failures are
+never memoised.  Results are shared, so callers must not mutate them.
+
+Every call is counted in iris_singleflight_calls_total{op, result} with
+result "leader" (ran the work), "coalesced" (joined a running call) or
+"memo" (served from the memoised result).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_CALLS = _metrics.counter(
+    "iris_singleflight_calls_total", "Calls into a singleflight group by outcome", ["op", "result"])
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class _Call:
+    """A blocking call in flight: followers wait on the event."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Per-key call coalescing with optional short-lived memoisation."""
+
+    def __init__(self, op: str, ttl: float = 0.0, max_entries: int = 256):
+        self.op = op
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self._calls: Dict[Hashable, _Call] = {}
+        self._memo: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.leaders = 0
+        self.coalesced = 0
+        self.memo_hits = 0
+
+    # ── memo ────────────────────────────────────────────────────────────────
+
+    def _memo_get_locked(self, key: Hashable) -> Any:
+        entry = self._memo.get(key)
+        if entry is None:
+            return _MISSING
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._memo[key]
+            return _MISSING
+        return value
+
+    def _memo_put_locked(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._memo[key] = (time.monotonic() + self.ttl, value)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+
+    def forget(self, key: Hashable = _MISSING) -> None:
+        """Drop the memoised result for ``key`` (all keys when omitted)."""
+        with self._lock:
+            if key is _MISSING:
+                self._memo.clear()
+            else:
+                self._memo.pop(key, None)
+
+    def _count(self, result: str) -> None:
+        if result == "leader":
+            self.leaders += 1
+        elif result == "coalesced":
+            self.coalesced += 1
+        else:
+            self.memo_hits += 1
+        _CALLS.labels(self.op, result).inc()
+
+    # ── async ───────────────────────────────────────────────────────────────
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` once for all concurrent callers with the same key."""
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        with self._lock:
+            value = self._memo_get_locked(key)
+            if value is not _MISSING:
+                self._count("memo")
+                return value
+            task = self._tasks.get(flight)
+            if task is None:
+                task = loop.create_task(self._run(flight, fn))
+                self._tasks[flight] = task
+                self._count("leader")
+            else:
+                self._count("coalesced")
+        return await asyncio.shield(task)
+
+    async def _run(self, flight: Tuple[asyncio.AbstractEventLoop, Hashable],
+                   fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            result = await fn()
+        except BaseException:
+            with self._lock:
+                self._tasks.pop(flight, None)
+            raise
+        with self._lock:
+            self._tasks.pop(flight, None)
+            self._memo_put_locked(flight[1], result)
+        return result
+
+    # ── blocking ────────────────────────────────────────────────────────────
+
+    def do_sync(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn()`` once for all threads calling concurrently with the same key."""
+        with self._lock:
+            value = self._memo_get_locked(key)
+            if value is not _MISSING:
+                self._count("memo")
+                return value
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._count("leader" if leader else "coalesced")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                if call.error is None:
+                    self._memo_put_locked(key, call.result)
+            call.done.set()
+        return call.result
+
+    # ── introspection ───────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "op": self.op,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "memo_hits": self.memo_hits,
+            "in_flight": len(self._tasks) + len(self._calls),
+        }
@@ -0,0 +1,202 @@
+"""
+State Delta Encoding
+Versioned, JSON-patch-style state_sync messages.
+
+Every session's state carries a monotonically increasing revision.  After a
+client's first full snapshot, state changes are sent as a list of patch
+operations against the previous revision:
+
+    {"op": "replace" | "add" | "remove", "path": "/field_values/voice/tts_voice", "value": ...}
+
+Paths are RFC 6901 JSON pointers.  Dicts are diffed recursively; lists and
+scalars are replaced whole.  A client that sees base_rev != its own rev asks
+for a resync; the tracker answers from a short patch history when it can and
+only falls back to a full snapshot when that history no longer covers the gap.
+"""
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Patch = List[Dict[str, Any]]
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Dict[str, Any], new: Dict[str, Any], prefix: str = "") -> Patch:
+    """Patch operations turning `old` into `new`."""
+    ops: Patch = []
+    for key, value in new.items():
+        path = f"{prefix}/{_escape(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": path, "value": value})
+            continue
+        prev = old[key]
+        if isinstance(value, dict) and isinstance(prev, dict):
+            ops.extend(make_patch(prev, value, path))
+        elif prev != value or type(prev) is not type(value):
+            ops.append({"op": "replace", "path": path, "value": value})
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{prefix}/{_escape(key)}"})
+    return ops
+
+
+def apply_patch(doc: Dict[str, Any], patch: Patch) -> Dict[str, Any]:
+    """
+    Apply patch operations to `doc` in place and return it.
+
+    Missing parents are created and removing an absent key is a no-op, so a
+    client that already applied a change locally can replay the same patch.
+    """
+    for op in patch:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            continue
+        target = doc
+        for token in tokens[:-1]:
+            child = target.get(token)
+            if not isinstance(child, dict):
+                child = target[token] = {}
+            target = child
+        if op["op"] == "remove":
+            target.pop(tokens[-1], None)
+        else:
+            target[tokens[-1]] = op["value"]
+    return doc
+
+
+@dataclass
+class StateDelta:
+    """One revision step for a session."""
+    rev: int
+    base_rev: int
+    patch: Patch
+
+    def to_payload(self) -> dict:
+        return {"rev": self.rev, "base_rev": self.base_rev, "patch": self.patch}
+
+
+@dataclass
+class DeltaMetrics:
+    """Bytes actually sent versus what full snapshots would have cost."""
+    deltas: int = 0
+    full_syncs: int = 0
+    resyncs_from_history: int = 0
+    resyncs_full: int = 0
+    delta_bytes: int = 0
+    # Serialising the whole document just for this metric is the cost deltas
+    # avoid, so its size is sampled and the avoided bytes extrapolated
+    full_bytes_sampled: int = 0
+    full_size_samples: int = 0
+
+    def to_dict(self) -> dict:
+        avg_full = self.full_bytes_sampled / self.full_size_samples if self.full_size_samples else 0
+        saved = int(avg_full * self.deltas) - self.delta_bytes
+        return {
+            "deltas": self.deltas,
+            "full_syncs": self.full_syncs,
+            "resyncs_from_history": self.resyncs_from_history,
+            "resyncs_full": self.resyncs_full,
+            "delta_bytes": self.delta_bytes,
+            "bytes_saved": max(0, saved),
+        }
+
+
+def _size(obj: Any) -> int:
+    return len(json.dumps(obj, default=str, separators=(",", ":")))
+
+
+class StateVersionTracker:
+    """
+    Per-session revision counter, last-published snapshot and patch history.
+
+    commit() is called with the freshly dumped state whenever the gateway
+    wants to publish; it returns the delta against the last published
+    revision (or None when nothing changed).
+    """
+
+    HISTORY_SIZE = 64   # patches kept per session for gap resyncs
+    FULL_SIZE_SAMPLE_EVERY = 32     # commits between full-document size samples
+
+    def __init__(self, history_size: Optional[int] = None):
+        self._history_size = history_size or self.HISTORY_SIZE
+        self._revs: Dict[str, int] = {}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._history: Dict[str, Deque[StateDelta]] = {}
+        self._metrics = DeltaMetrics()
+
+    def revision(self, session_id: str) -> int:
+        """Current published revision (0 before the first commit)."""
+        return self._revs.get(session_id, 0)
+
+    def commit(self, session_id: str, doc: Dict[str, Any]) -> Optional[StateDelta]:
+        """
+        Publish `doc` as the session's latest state.
+
+        The first commit only establishes revision 1 and returns None — the
+        caller must send that snapshot in full.
+        """
+        prev = self._docs.get(session_id)
+        if prev is None:
+            self._docs[session_id] = doc
+            self._revs[session_id] = 1
+            self._history[session_id] = deque(maxlen=self._history_size)
+            return None
+
+        patch = make_patch(prev, doc)
+        if not patch:
+            return None
+
+        base = self._revs[session_id]
+        delta = StateDelta(rev=base + 1, base_rev=base, patch=patch)
+        self._docs[session_id] = doc
+        self._revs[session_id] = delta.rev
+        self._history[session_id].append(delta)
+
+        self._metrics.deltas += 1
+        self._metrics.delta_bytes += _size(patch)
+        if (self._metrics.deltas - 1) % self.FULL_SIZE_SAMPLE_EVERY == 0:
+            self._metrics.full_bytes_sampled += _size(doc)
+            self._metrics.full_size_samples += 1
+        return delta
+
+    def patches_since(self, session_id: str, since_rev: int) -> Optional[StateDelta]:
+        """
+        Combined delta from since_rev to the current revision.
+
+        Returns None when the history no longer reaches back to since_rev
+        (or since_rev is unknown), in which case a full snapshot is needed.
+        """
+        current = self._revs.get(session_id)
+        if current is None or since_rev < 0 or since_rev > current:
+            self._metrics.resyncs_full += 1
+            return None
+        history = self._history.get(session_id) or ()
+        steps = [d for d in history if d.base_rev >= since_rev]
+        if since_rev < current and (not steps or steps[0].base_rev != since_rev):
+            self._metrics.resyncs_full += 1
+            return None
+        self._metrics.resyncs_from_history += 1
+        patch: Patch = [op for d in steps for op in d.patch]
+        return StateDelta(rev=current, base_rev=since_rev, patch=patch)
+
+    def record_full_sync(self) -> None:
+        self._metrics.full_syncs += 1
+
+    def forget_session(self, session_id: str) -> None:
+        self._revs.pop(session_id, None)
+        self._docs.pop(session_id, None)
+        self._history.pop(session_id, None)
+
+    def get_metrics(self) -> dict:
+        return {**self._metrics.to_dict(), "sessions": len(self._revs)}
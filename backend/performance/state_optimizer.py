@@ -7,41 +7,34 @@ import logging
 import time
 import json
 from typing import Dict, Any, Optional, Callable, Awaitable
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from backend.monitoring.metrics import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class PersistenceMetrics:
     """Track persistence performance metrics."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    sketch: DDSketch = field(default_factory=DDSketch)
     
     def record(self, persistence_time_ms: float):
         """Record a persistence time sample."""
-        self.samples.append(persistence_time_ms)
+        self.sketch.add(persistence_time_ms)
     
     def get_p95(self) -> float:
         """Get 95th percentile persistence time."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[idx]
+        return self.sketch.quantile(0.95)
     
     def get_mean(self) -> float:
         """Get mean persistence time."""
-        if not self.samples:
-            return 0.0
-        return sum(self.samples) / len(self.samples)
+        return self.sketch.mean
     
     def get_max(self) -> float:
         """Get maximum persistence time."""
-        if not self.samples:
-            return 0.0
-        return max(self.samples)
+        return self.sketch.max if self.sketch.count else 0.0
 
 
 @dataclass
@@ -197,7 +190,7 @@ class StateOptimizer:
             "mean_persistence_time_ms": self.persistence_metrics.get_mean(),
             "max_persistence_time_ms": self.persistence_metrics.get_max(),
             "pending_updates": len(self.write_batch.updates),
-            "total_samples": len(self.persistence_metrics.samples),
+            "total_samples": self.persistence_metrics.sketch.count,
             "target_persistence_time_ms": self.TARGET_PERSISTENCE_TIME_MS,
         }
     
@@ -0,0 +1,244 @@
+"""
+Token Stream Coalescer
+Merges per-token chat_chunk messages into fewer WebSocket frames.
+
+The agent streams tokens from an executor thread.  Sending one frame per
+token costs a cross-thread hop plus a JSON frame each time, which adds up
+at 50+ tok/s.  A ChunkStream buffers tokens and flushes every
+FLUSH_INTERVAL_MS or once MAX_BUFFER_BYTES are buffered, whichever comes
+first.  The first token is always flushed immediately so time-to-first-token
+is unchanged.
+"""
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.monitoring.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_metrics = get_metrics_registry()
+_TTFT_SECONDS = _metrics.summary(
+    "iris_inference_ttft_seconds", "Time from stream open to the first streamed token")
+_TOKENS_PER_SECOND = _metrics.summary(
+    "iris_inference_tokens_per_second", "Streamed chunks per second after the first token")
+
+SendCallback = Callable[[str, dict], Awaitable[Any]]
+
+
+@dataclass
+class CoalescerMetrics:
+    """Counters for chunks received versus frames actually sent."""
+    chunks_in: int = 0
+    frames_out: int = 0
+    bytes_out: int = 0
+    streams: int = 0
+    stream_seconds: float = 0.0
+
+    @property
+    def frames_saved(self) -> int:
+        return max(0, self.chunks_in - self.frames_out)
+
+    def frames_saved_per_sec(self) -> float:
+        """Frames avoided per second of active streaming."""
+        if self.stream_seconds <= 0:
+            return 0.0
+        return self.frames_saved / self.stream_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "chunks_in": self.chunks_in,
+            "frames_out": self.frames_out,
+            "frames_saved": self.frames_saved,
+            "frames_saved_per_sec": round(self.frames_saved_per_sec(), 1),
+            "bytes_out": self.bytes_out,
+            "streams": self.streams,
+        }
+
+
+class ChunkStream:
+    """
+    One coalesced token stream for a single client.
+
+    push() is thread-safe and may be called from any thread (typically the
+    executor running the agent).  Flushes always run on the event loop and
+    are serialised by an asyncio.Lock, so frames arrive in token order.
+    Call aclose() on the loop once generation finishes to deliver the tail
+    before any follow-up message (e.g. chat_message) is sent.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        send_callback: SendCallback,
+        loop: asyncio.AbstractEventLoop,
+        metrics: CoalescerMetrics,
+        message_type: str = "chat_chunk",
+        flush_interval_ms: float = 30.0,
+        max_buffer_bytes: int = 512,
+    ):
+        self.client_id = client_id
+        self._send = send_callback
+        self._loop = loop
+        self._metrics = metrics
+        self._message_type = message_type
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_bytes = max_buffer_bytes
+
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._first_sent = False
+        self._timer_armed = False
+        self._closed = False
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._started_at = time.monotonic()
+        self._first_chunk_at: Optional[float] = None
+
+        self.chunks_in = 0
+        self.frames_out = 0
+
+    def push(self, chunk: str) -> None:
+        """Buffer a chunk; schedule a flush if the first token or size cap is hit."""
+        if not chunk or self._closed:
+            return
+        if not self._loop.is_running():
+            return
+
+        with self._lock:
+            self._buffer.append(chunk)
+            self._buffered_bytes += len(chunk.encode("utf-8"))
+            self.chunks_in += 1
+            self._metrics.chunks_in += 1
+            if self._first_chunk_at is None:
+                self._first_chunk_at = time.monotonic()
+            flush_now = not self._first_sent or self._buffered_bytes >= self._max_bytes
+            if flush_now:
+                self._first_sent = True
+                arm_timer = False
+            else:
+                arm_timer = not self._timer_armed
+                self._timer_armed = True
+
+        if flush_now:
+            asyncio.run_coroutine_threadsafe(self._flush(), self._loop)
+        elif arm_timer:
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, self._flush_interval, self._schedule_flush
+            )
+
+    def _schedule_flush(self) -> None:
+        # Runs on the loop when the interval timer fires.
+        self._loop.create_task(self._flush())
+
+    def _take(self) -> str:
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            self._timer_armed = False
+            return text
+
+    async def _flush(self) -> None:
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        async with self._send_lock:
+            text = self._take()
+            if not text:
+                return
+            self.frames_out += 1
+            self._metrics.frames_out += 1
+            self._metrics.bytes_out += len(text)
+            try:
+                await self._send(self.client_id, {
+                    "type": self._message_type,
+                    "payload": {"chunk": text},
+                })
+            except Exception as e:
+                logger.debug(f"[StreamCoalescer] send to {self.client_id} failed: {e}")
+
+    async def aclose(self) -> None:
+        """Flush any buffered tail and stop accepting chunks. Call on the loop."""
+        if self._closed:
+            return
+        self._closed = True
+        await self._flush()
+        now = time.monotonic()
+        self._metrics.streams += 1
+        self._metrics.stream_seconds += now - self._started_at
+        if self._first_chunk_at is not None:
+            _TTFT_SECONDS.observe(self._first_chunk_at - self._started_at)
+            generating = now - self._first_chunk_at
+            if self.chunks_in > 1 and generating > 0:
+                _TOKENS_PER_SECOND.observe((self.chunks_in - 1) / generating)
+        logger.debug(
+            f"[StreamCoalescer] {self.client_id}: {self.chunks_in} chunks -> "
+            f"{self.frames_out} frames"
+        )
+
+
+class StreamCoalescer:
+    """
+    Factory and metrics owner for per-client ChunkStreams.
+
+    Usage (inside an async handler):
+        stream = coalescer.open(client_id)
+        # worker thread: stream.push(token)
+        await stream.aclose()
+    """
+
+    FLUSH_INTERVAL_MS = 30   # max time a token waits in the buffer
+    MAX_BUFFER_BYTES = 512   # flush early once this much text is buffered
+
+    def __init__(self, send_callback: SendCallback):
+        self._send_callback = send_callback
+        self._metrics: Dict[str, CoalescerMetrics] = {}
+        # Totals carried over from clients that have since disconnected
+        self._retired = CoalescerMetrics()
+
+    def open(
+        self,
+        client_id: str,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        message_type: str = "chat_chunk",
+    ) -> ChunkStream:
+        """Open a new stream for client_id bound to the given (or running) loop."""
+        loop = loop or asyncio.get_running_loop()
+        metrics = self._metrics.setdefault(client_id, CoalescerMetrics())
+        return ChunkStream(
+            client_id,
+            self._send_callback,
+            loop,
+            metrics,
+            message_type=message_type,
+            flush_interval_ms=self.FLUSH_INTERVAL_MS,
+            max_buffer_bytes=self.MAX_BUFFER_BYTES,
+        )
+
+    @staticmethod
+    def _accumulate(into: CoalescerMetrics, m: CoalescerMetrics) -> None:
+        into.chunks_in += m.chunks_in
+        into.frames_out += m.frames_out
+        into.bytes_out += m.bytes_out
+        into.streams += m.streams
+        into.stream_seconds += m.stream_seconds
+
+    def forget_client(self, client_id: str) -> None:
+        """Fold a disconnected client's metrics into the retired totals."""
+        m = self._metrics.pop(client_id, None)
+        if m is not None:
+            self._accumulate(self._retired, m)
+
+    def get_metrics(self) -> dict:
+        """Aggregate and per-client coalescing metrics."""
+        total = CoalescerMetrics()
+        self._accumulate(total, self._retired)
+        for m in self._metrics.values():
+            self._accumulate(total, m)
+        return {
+            **total.to_dict(),
+            "clients": {cid: m.to_dict() for cid, m in self._metrics.items()},
+        }
@@ -6,10 +6,11 @@ import asyncio
 import logging
 import time
 from typing import Dict, List, Any, Optional, Callable, Awaitable
-from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 
+from backend.monitoring.metrics import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,14 +26,14 @@ class ToolStatus(Enum):
 @dataclass
 class ToolMetrics:
     """Track tool execution metrics."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    sketch: DDSketch = field(default_factory=DDSketch)
     timeouts: int = 0
     failures: int = 0
     successes: int = 0
     
     def record_success(self, execution_time_s: float):
         """Record a successful execution."""
-        self.samples.append(execution_time_s)
+        self.sketch.add(execution_time_s)
         self.successes += 1
     
     def record_timeout(self):
@@ -45,23 +46,15 @@ class ToolMetrics:
     
     def get_p95(self) -> float:
         """Get 95th percentile execution time."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[idx]
+        return self.sketch.quantile(0.95)
     
     def get_mean(self) -> float:
         """Get mean execution time."""
-        if not self.samples:
-            return 0.0
-        return sum(self.samples) / len(self.samples)
+        return self.sketch.mean
     
     def get_max(self) -> float:
         """Get maximum execution time."""
-        if not self.samples:
-            return 0.0
-        return max(self.samples)
+        return self.sketch.max if self.sketch.count else 0.0
     
     def get_success_rate(self) -> float:
         """Get success rate."""
@@ -258,7 +251,7 @@ class ToolOptimizer:
                 "successes": metrics.successes,
                 "failures": metrics.failures,
                 "timeouts": metrics.timeouts,
-                "total_samples": len(metrics.samples),
+                "total_samples": metrics.sketch.count,
             }
         else:
             return {
@@ -6,40 +6,33 @@ import asyncio
 import logging
 import time
 from typing import Optional
-from collections import deque
 from dataclasses import dataclass, field
 
+from backend.monitoring.metrics import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class VoiceMetrics:
     """Track voice processing metrics."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    sketch: DDSketch = field(default_factory=DDSketch)
     
     def record(self, processing_time_s: float):
         """Record a processing time sample."""
-        self.samples.append(processing_time_s)
+        self.sketch.add(processing_time_s)
     
     def get_p95(self) -> float:
         """Get 95th percentile processing time."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[idx]
+        return self.sketch.quantile(0.95)
     
     def get_mean(self) -> float:
         """Get mean processing time."""
-        if not self.samples:
-            return 0.0
-        return sum(self.samples) / len(self.samples)
+        return self.sketch.mean
     
     def get_max(self) -> float:
         """Get maximum processing time."""
-        if not self.samples:
-            return 0.0
-        return max(self.samples)
+        return self.sketch.max if self.sketch.count else 0.0
 
 
 class VoiceOptimizer:
@@ -101,7 +94,7 @@ class VoiceOptimizer:
             "p95_processing_time_s": self.voice_metrics.get_p95(),
             "mean_processing_time_s": self.voice_metrics.get_mean(),
             "max_processing_time_s": self.voice_metrics.get_max(),
-            "total_samples": len(self.voice_metrics.samples),
+            "total_samples": self.voice_metrics.sketch.count,
             "target_processing_time_s": self.TARGET_PROCESSING_TIME_S,
         }
     
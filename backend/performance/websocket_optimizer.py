@@ -6,10 +6,11 @@ import asyncio
 import logging
 import time
 from typing import Dict, List, Optional, Set
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from backend.monitoring.metrics import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,31 +36,23 @@ class MessageBatch:
 @dataclass
 class LatencyMetrics:
     """Track latency metrics for performance monitoring."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    sketch: DDSketch = field(default_factory=DDSketch)
     
     def record(self, latency_ms: float):
         """Record a latency sample."""
-        self.samples.append(latency_ms)
+        self.sketch.add(latency_ms)
     
     def get_p95(self) -> float:
         """Get 95th percentile latency."""
-        if not self.samples:
-            return 0.0
-        sorted_samples = sorted(self.samples)
-        idx = int(len(sorted_samples) * 0.95)
-        return sorted_samples[idx]
+        return self.sketch.quantile(0.95)
     
     def get_mean(self) -> float:
         """Get mean latency."""
-        if not self.samples:
-            return 0.0
-        return sum(self.samples) / len(self.samples)
+        return self.sketch.mean
     
     def get_max(self) -> float:
         """Get maximum latency."""
-        if not self.samples:
-            return 0.0
-        return max(self.samples)
+        return self.sketch.max if self.sketch.count else 0.0
 
 
 class WebSocketOptimizer:
@@ -230,7 +223,7 @@ class WebSocketOptimizer:
             "mean_latency_ms": self.latency_metrics.get_mean(),
             "max_latency_ms": self.latency_metrics.get_max(),
             "pending_batches": len(self.client_batches),
-            "total_samples": len(self.latency_metrics.samples),
+            "total_samples": self.latency_metrics.sketch.count,
             "target_latency_ms": self.TARGET_LATENCY_MS,
         }
     
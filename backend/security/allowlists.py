@@ -6,6 +6,8 @@ import re
 from typing import Dict, List, Any, Set, Optional
 from dataclasses import dataclass, field
 
+from .pattern_scanner import PatternScanner, ScanResult, ScanRule
+
 
 # MCP Tool Operation Allowlists
 # Each tool defines which operations are allowed
@@ -150,6 +152,8 @@ class DangerousPatterns:
     def __init__(self):
         self._patterns: Dict[str, DangerousPattern] = {}
         self._compiled_patterns: Dict[str, re.Pattern] = {}
+        # Combined scanner over enabled patterns; rebuilt lazily after any edit
+        self._scanner: Optional[PatternScanner] = None
         self._initialize_default_patterns()
     
     def _initialize_default_patterns(self):
@@ -305,13 +309,14 @@ class DangerousPatterns:
             enabled=enabled
         )
         
-        self._patterns[name] = dangerous_pattern
-        
         # Compile pattern for performance
         try:
             self._compiled_patterns[name] = re.compile(pattern, re.IGNORECASE)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
+        
+        self._patterns[name] = dangerous_pattern
+        self._scanner = None
     
     def remove_pattern(self, name: str) -> bool:
         """Remove a dangerous pattern"""
@@ -319,6 +324,7 @@ class DangerousPatterns:
             del self._patterns[name]
             if name in self._compiled_patterns:
                 del self._compiled_patterns[name]
+            self._scanner = None
             return True
         return False
     
@@ -356,11 +362,20 @@ class DangerousPatterns:
     
     def check_all_patterns(self, text: str) -> List[str]:
         """Check text against all enabled patterns"""
-        matches = []
-        for name, pattern in self._compiled_patterns.items():
-            if self._patterns[name].enabled and pattern.search(text):
-                matches.append(name)
-        return matches
+        return self.get_scanner().match_all(text)
+
+    def get_scanner(self) -> PatternScanner:
+        """Combined scanner over the enabled patterns (built on first use)."""
+        if self._scanner is None:
+            self._scanner = PatternScanner(
+                ScanRule(p.name, p.pattern, p.severity, p.category)
+                for p in self._patterns.values() if p.enabled
+            )
+        return self._scanner
+
+    def scan(self, text: str) -> ScanResult:
+        """First enabled pattern matching text, in registration order."""
+        return self.get_scanner().scan(text)
 
     def check_path_traversal(self, text: str) -> bool:
         """Check for path traversal patterns"""
@@ -384,6 +399,7 @@ class DangerousPatterns:
         """Enable a pattern"""
         if name in self._patterns:
             self._patterns[name].enabled = True
+            self._scanner = None
             return True
         return False
     
@@ -391,6 +407,7 @@ class DangerousPatterns:
         """Disable a pattern"""
         if name in self._patterns:
             self._patterns[name].enabled = False
+            self._scanner = None
             return True
         return False
     
@@ -402,12 +419,12 @@ class DangerousPatterns:
         pattern = self._patterns[name]
         
         if "pattern" in kwargs:
-            pattern.pattern = kwargs["pattern"]
             # Recompile the pattern
             try:
-                self._compiled_patterns[name] = re.compile(pattern.pattern, re.IGNORECASE)
+                self._compiled_patterns[name] = re.compile(kwargs["pattern"], re.IGNORECASE)
             except re.error as e:
-                raise ValueError(f"Invalid regex pattern '{pattern.pattern}': {e}")
+                raise ValueError(f"Invalid regex pattern '{kwargs['pattern']}': {e}")
+            pattern.pattern = kwargs["pattern"]
         
         if "description" in kwargs:
             pattern.description = kwargs["description"]
@@ -421,6 +438,7 @@ class DangerousPatterns:
         if "enabled" in kwargs:
             pattern.enabled = kwargs["enabled"]
         
+        self._scanner = None
         return True
 
 
@@ -1,6 +1,11 @@
 """
 Security Audit Logger - Comprehensive logging for security events
 Provides structured logging for security operations and audit trails
+
+Every event is persisted to an indexed, day-segmented AuditStore by a
+background writer; audit trail queries run against that store, off the
+event loop, and cover the full retained history rather than only the
+in-memory buffer.
 """
 import json
 import logging
@@ -18,6 +23,7 @@ except ImportError:
     aiofiles = None
 
 from .security_types import SecurityContext, SecurityValidation, SecurityLevel
+from .audit_store import get_audit_store
 
 
 class AuditEventType(Enum):
@@ -99,6 +105,9 @@ class SecurityAuditLogger:
         # Initialize loggers
         self._setup_loggers()
         
+        # Indexed event store (shared by every logger using this directory)
+        self._store = get_audit_store(self.log_dir / "store")
+        
         # Event correlation
         self._event_buffer: List[AuditEvent] = []
         self._buffer_size = 1000
@@ -138,14 +147,8 @@ class SecurityAuditLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
-        # Audit log file handler
-        audit_handler = logging.FileHandler(
-            self.log_dir / "security_audit.log",
-            encoding='utf-8'
-        )
-        audit_handler.setFormatter(json_formatter)
-        audit_handler.setLevel(logging.INFO)
-        self.audit_logger.addHandler(audit_handler)
+        # The full audit trail lives in the AuditStore (see audit_store.py);
+        # only violations and emergencies are mirrored to plain log files.
         
         # Violations log file handler
         violation_handler = logging.FileHandler(
@@ -306,8 +309,8 @@ class SecurityAuditLogger:
         event_dict = event.to_dict()
         
         try:
-            # Write to main audit log
-            self.audit_logger.info(json.dumps(event_dict))
+            # Queue for the indexed store; the insert happens on its writer thread
+            self._store.append(event_dict)
             
             # Write to specific log files based on event type
             if event.event_type == AuditEventType.SECURITY_VIOLATION:
@@ -356,46 +359,39 @@ class SecurityAuditLogger:
         severity: Optional[AuditSeverity] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        tool_name: Optional[str] = None
     ) -> List[AuditEvent]:
-        """Retrieve audit trail with filtering options"""
-        
-        async with self._lock:
-            events = self._event_buffer.copy()
-        
-        # Apply filters
-        filtered_events = []
-        for event in events:
-            # Time range filter
-            if start_time and event.timestamp < start_time:
-                continue
-            if end_time and event.timestamp > end_time:
-                continue
-            
-            # Session filter
-            if session_id and event.session_id != session_id:
-                continue
-            
-            # User filter
-            if user_id and event.user_id != user_id:
-                continue
-            
-            # Event type filter
-            if event_type and event.event_type != event_type:
-                continue
-            
-            # Severity filter
-            if severity and event.severity != severity:
-                continue
-            
-            filtered_events.append(event)
-        
-        # Sort by timestamp (newest first) and limit
-        filtered_events.sort(key=lambda x: x.timestamp, reverse=True)
-        return filtered_events[:limit]
+        """Retrieve audit trail with filtering options (newest first)"""
+        
+        # Indexed lookup in the audit store, run off the event loop
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(None, lambda: self._store.query(
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            session_id=session_id,
+            user_id=user_id,
+            tool_name=tool_name,
+            event_type=event_type.value if event_type else None,
+            severity=severity.value if severity else None,
+        ))
+        return [AuditEvent.from_dict(row) for row in rows]
     
-    async def get_security_analytics(self) -> Dict[str, Any]:
-        """Get security analytics and statistics"""
+    async def get_security_analytics(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Get security analytics and statistics.
+
+        Without a time range this reports the running totals for this
+        process; with one it aggregates the stored history for that range.
+        """
+        if start_time or end_time:
+            return await self._get_stored_analytics(start_time, end_time)
+        
         async with self._lock:
             total_events = self._stats["events_total"]
             
@@ -422,6 +418,25 @@ class SecurityAuditLogger:
                 ])
             }
     
+    async def _get_stored_analytics(
+        self,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """Aggregate stored events in a time range"""
+        loop = asyncio.get_running_loop()
+        totals = await loop.run_in_executor(None, self._store.aggregate, start_time, end_time)
+        total_events = totals["events_total"]
+        violations = totals["events_by_type"].get(AuditEventType.SECURITY_VIOLATION.value, 0)
+        return {
+            "total_events": total_events,
+            "events_by_type": totals["events_by_type"],
+            "events_by_severity": totals["events_by_severity"],
+            "violations_rate": (violations / total_events * 100) if total_events else 0,
+            "average_risk_score": (totals["risk_score_sum"] / total_events) if total_events else 0,
+            "unique_sessions": totals["unique_sessions"],
+        }
+    
     async def detect_anomalies(self) -> List[Dict[str, Any]]:
         """Detect security anomalies in recent events"""
         async with self._lock:
@@ -530,6 +545,10 @@ class SecurityAuditLogger:
                     log_file.unlink()
                     cleaned_count += 1
             
+            # Drop expired store segments (whole files; no log rewrite)
+            loop = asyncio.get_running_loop()
+            cleaned_count += await loop.run_in_executor(None, self._store.compact, days_to_keep)
+            
             return cleaned_count
             
         except Exception as e:
@@ -544,6 +563,7 @@ class SecurityAuditLogger:
             return {
                 "total_files": len(log_files),
                 "total_size": sum(f.stat().st_size for f in log_files),
+                "store": self._store.get_stats(),
                 "files": [
                     {
                         "name": f.name,
@@ -559,7 +579,8 @@ class SecurityAuditLogger:
             return {"error": str(e)}
 
     def close(self):
-        """Close all file handlers"""
+        """Flush queued audit events and close all file handlers"""
+        self._store.flush()
         # Close handlers for each logger
         for logger in [self.audit_logger, self.violation_logger, self.emergency_logger]:
             for handler in logger.handlers[:]:
@@ -0,0 +1,368 @@
+"""
+Audit Store - Segment-rotated, indexed storage for security audit events
+
+Events are appended to one SQLite file per day ("segment") under
+<log_dir>/store/.  Each segment carries secondary indexes on time, session,
+tool, event type and severity, so a query only touches the segments that
+overlap its time range and, within them, only the index entries it returns.
+Retention drops whole segment files instead of rewriting a log.  At most
+MAX_OPEN_SEGMENTS connections stay open; a query over a long range closes
+the least recently used ones as it goes.
+
+Writes never block the caller: append() puts the event on a queue and a
+background writer thread inserts batches in a single transaction.  Queries
+drain the queue first, so a read always sees every event appended before it.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    session_id TEXT,
+    user_id TEXT,
+    tool_name TEXT,
+    risk_score REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS ix_events_session ON events(session_id, ts);
+CREATE INDEX IF NOT EXISTS ix_events_tool ON events(tool_name, ts);
+CREATE INDEX IF NOT EXISTS ix_events_type ON events(event_type, ts);
+CREATE INDEX IF NOT EXISTS ix_events_severity ON events(severity, ts);
+"""
+
+# Filter name -> indexed column
+_FILTER_COLUMNS = {
+    "session_id": "session_id",
+    "user_id": "user_id",
+    "tool_name": "tool_name",
+    "event_type": "event_type",
+    "severity": "severity",
+}
+
+
+def _segment_day(ts: float) -> date:
+    return datetime.fromtimestamp(ts).date()
+
+
+class AuditStore:
+    """
+    Append-only audit event store.
+
+    Events are dicts as produced by AuditEvent.to_dict(); timestamps are ISO
+    strings in local time, like the rest of the security audit log.
+    """
+
+    BATCH_SIZE = 256          # max events per insert transaction
+    FLUSH_INTERVAL_S = 0.2    # after the first queued event, wait this long to batch a burst
+    MAX_OPEN_SEGMENTS = 4     # cached segment connections (today's plus recent reads)
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conns: "OrderedDict[date, sqlite3.Connection]" = OrderedDict()
+        self._db_lock = threading.RLock()
+        self._pending: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        self._stats = {"appended": 0, "written": 0, "batches": 0, "write_errors": 0}
+
+    # ── segments ────────────────────────────────────────────────────────
+
+    def _segment_path(self, day: date) -> Path:
+        return self.root / f"audit-{day:%Y%m%d}.sqlite3"
+
+    def _segment_days(self) -> List[date]:
+        days = []
+        for path in self.root.glob("audit-*.sqlite3"):
+            try:
+                days.append(datetime.strptime(path.stem[len("audit-"):], "%Y%m%d").date())
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def _conn(self, day: date, create: bool = True) -> Optional[sqlite3.Connection]:
+        # Caller holds _db_lock and is done with any connection it got before
+        conn = self._conns.get(day)
+        if conn is not None:
+            self._conns.move_to_end(day)
+            return conn
+        path = self._segment_path(day)
+        if not create and not path.exists():
+            return None
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conns[day] = conn
+        while len(self._conns) > self.MAX_OPEN_SEGMENTS:
+            self._conns.popitem(last=False)[1].close()
+        return conn
+
+    # ── writes ──────────────────────────────────────────────────────────
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Queue an event for the background writer. Never blocks on I/O."""
+        if self._closed:
+            return
+        self._stats["appended"] += 1
+        self._pending.put(event)
+        self._wake.set()
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="audit-store-writer", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        # Events stay queued until drained under _db_lock, so a concurrent
+        # query (which drains first) can never miss or reorder one.
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            # Give a burst a moment to accumulate into one transaction
+            time.sleep(self.FLUSH_INTERVAL_S)
+            with self._db_lock:
+                self._drain_locked()
+
+    def _drain_locked(self) -> None:
+        """Write everything currently queued. Caller holds _db_lock."""
+        while True:
+            batch: List[Dict[str, Any]] = []
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        by_day: Dict[date, list] = {}
+        for event in batch:
+            try:
+                ts = datetime.fromisoformat(event["timestamp"]).timestamp()
+                data = event.get("event_data") or {}
+                by_day.setdefault(_segment_day(ts), []).append((
+                    ts,
+                    event["event_type"],
+                    event["severity"],
+                    event.get("session_id"),
+                    event.get("user_id"),
+                    data.get("tool_name") if isinstance(data, dict) else None,
+                    event.get("risk_score"),
+                    json.dumps(event, default=str),
+                ))
+            except Exception as e:
+                self._stats["write_errors"] += 1
+                logger.error(f"[AuditStore] Dropping malformed audit event: {e}")
+        for day, rows in by_day.items():
+            try:
+                conn = self._conn(day)
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO events (ts, event_type, severity, session_id, user_id,"
+                        " tool_name, risk_score, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                self._stats["written"] += len(rows)
+                self._stats["batches"] += 1
+            except Exception as e:
+                self._stats["write_errors"] += len(rows)
+                logger.error(f"[AuditStore] Failed to write {len(rows)} audit events: {e}")
+
+    def flush(self) -> None:
+        """Synchronously write every queued event."""
+        with self._db_lock:
+            self._drain_locked()
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def _days_in_range(self, start_ts: Optional[float], end_ts: Optional[float]) -> List[date]:
+        days = self._segment_days()
+        if start_ts is not None:
+            first = _segment_day(start_ts)
+            days = [d for d in days if d >= first]
+        if end_ts is not None:
+            last = _segment_day(end_ts)
+            days = [d for d in days if d <= last]
+        return days
+
+    @staticmethod
+    def _where(start_ts, end_ts, filters: Dict[str, Any]):
+        clauses, params = [], []
+        if start_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(start_ts)
+        if end_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(end_ts)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            clauses.append(f"{_FILTER_COLUMNS[name]} = ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Events matching the filters, newest first.
+
+        Supported filters: session_id, user_id, tool_name, event_type, severity
+        (string values).  Segments are visited newest-first and the scan stops
+        as soon as `limit` events have been collected.
+        """
+        unknown = set(filters) - set(_FILTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported audit filter(s): {', '.join(sorted(unknown))}")
+        start_ts = start_time.timestamp() if start_time else None
+        end_ts = end_time.timestamp() if end_time else None
+        where, params = self._where(start_ts, end_ts, filters)
+
+        results: List[Dict[str, Any]] = []
+        with self._db_lock:
+            self._drain_locked()
+            for day in reversed(self._days_in_range(start_ts, end_ts)):
+                remaining = limit - len(results)
+                if remaining <= 0:
+                    break
+                conn = self._conn(day, create=False)
+                if conn is None:
+                    continue
+                rows = conn.execute(
+                    f"SELECT data FROM events{where} ORDER BY ts DESC, id DESC LIMIT ?",
+                    (*params, remaining),
+                ).fetchall()
+                results.extend(json.loads(r[0]) for r in rows)
+        return results
+
+    def aggregate(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Counts by type and severity, risk sum and distinct sessions in a time range."""
+        start_ts = start_time.timestamp() if start_time else None
+        end_ts = end_time.timestamp() if end_time else None
+        where, params = self._where(start_ts, end_ts, {})
+        totals: Dict[str, Any] = {
+            "events_total": 0, "events_by_type": {}, "events_by_severity": {},
+            "risk_score_sum": 0.0,
+        }
+        sessions = set()
+        with self._db_lock:
+            self._drain_locked()
+            for day in self._days_in_range(start_ts, end_ts):
+                conn = self._conn(day, create=False)
+                if conn is None:
+                    continue
+                for column, key in (("event_type", "events_by_type"), ("severity", "events_by_severity")):
+                    for value, count in conn.execute(
+                            f"SELECT {column}, COUNT(*) FROM events{where} GROUP BY {column}", params):
+                        totals[key][value] = totals[key].get(value, 0) + count
+                count, risk = conn.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(risk_score), 0) FROM events{where}", params).fetchone()
+                totals["events_total"] += count
+                totals["risk_score_sum"] += risk
+                sessions.update(r[0] for r in conn.execute(
+                    f"SELECT DISTINCT session_id FROM events{where}", params))
+        totals["unique_sessions"] = len(sessions)
+        return totals
+
+    # ── retention ───────────────────────────────────────────────────────
+
+    def compact(self, days_to_keep: int) -> int:
+        """
+        Drop segments older than days_to_keep and trim the boundary segment.
+
+        Returns the number of segment files removed.
+        """
+        cutoff = datetime.now() - timedelta(days=days_to_keep)
+        removed = 0
+        with self._db_lock:
+            self._drain_locked()
+            for day in self._segment_days():
+                if day < cutoff.date():
+                    conn = self._conns.pop(day, None)
+                    if conn is not None:
+                        conn.close()
+                    for suffix in ("", "-wal", "-shm"):
+                        path = Path(str(self._segment_path(day)) + suffix)
+                        if path.exists():
+                            path.unlink()
+                    removed += 1
+                elif day == cutoff.date():
+                    conn = self._conn(day)
+                    with conn:
+                        conn.execute("DELETE FROM events WHERE ts < ?", (cutoff.timestamp(),))
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        days = self._segment_days()
+        return {
+            **self._stats,
+            "pending": self._pending.qsize(),
+            "segments": len(days),
+            "open_segments": len(self._conns),
+            "segment_bytes": sum(
+                self._segment_path(d).stat().st_size for d in days if self._segment_path(d).exists()),
+        }
+
+    def close(self) -> None:
+        """Flush queued events, stop the writer and close all segments."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        writer = self._writer
+        if writer is not None and writer.is_alive() and writer is not threading.current_thread():
+            writer.join(timeout=5.0)
+        with self._db_lock:
+            self._drain_locked()
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
+
+_stores: Dict[str, AuditStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_audit_store(root: Union[str, Path]) -> AuditStore:
+    """Shared AuditStore per directory (many SecurityAuditLoggers may point at one)."""
+    key = os.path.abspath(str(root))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store._closed:
+            store = _stores[key] = AuditStore(key)
+        return store
@@ -4,7 +4,6 @@ Implements security controls for Model Context Protocol tool execution
 """
 import asyncio
 import logging
-import re
 from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
@@ -159,24 +158,29 @@ class MCPSecurityManager:
     def _check_dangerous_patterns(self, arguments: Dict[str, Any]) -> SecurityValidation:
         """Check arguments for dangerous patterns"""
         
-        # Convert arguments to string for pattern matching
-        args_str = str(arguments).lower()
+        # Convert arguments to string for pattern matching; all patterns are
+        # scanned in one combined pass (see pattern_scanner.py)
+        result = self._dangerous_patterns.scan(str(arguments))
         
-        # Check for dangerous patterns
-        for pattern_name, pattern_info in self._dangerous_patterns.get_all_patterns().items():
-            pattern = pattern_info["pattern"]
-            severity = pattern_info["severity"]
+        if result.matched:
+            risk_score = 1.0 if result.severity == "critical" else 0.7
+            security_level = SecurityLevel.BLOCKED if result.severity == "critical" else SecurityLevel.RESTRICTED
             
-            if re.search(pattern, args_str, re.IGNORECASE):
-                risk_score = 1.0 if severity == "critical" else 0.7
-                security_level = SecurityLevel.BLOCKED if severity == "critical" else SecurityLevel.RESTRICTED
-                
-                return SecurityValidation(
-                    allowed=False,
-                    security_level=security_level,
-                    reason=f"Dangerous pattern detected: {pattern_name}",
-                    risk_score=risk_score
-                )
+            return SecurityValidation(
+                allowed=False,
+                security_level=security_level,
+                reason=f"Dangerous pattern detected: {result.rule}",
+                risk_score=risk_score
+            )
+        
+        if result.truncated:
+            # Anything past the scan cap was never inspected — refuse rather than pass it
+            return SecurityValidation(
+                allowed=False,
+                security_level=SecurityLevel.RESTRICTED,
+                reason="Arguments exceed the security scan size limit",
+                risk_score=0.7
+            )
         
         return SecurityValidation(
             allowed=True,
@@ -537,7 +541,8 @@ class MCPSecurityManager:
             "cache_hit_rate": (self._stats["cache_hits"] / 
                               (self._stats["cache_hits"] + self._stats["cache_misses"]) * 100 
                               if (self._stats["cache_hits"] + self._stats["cache_misses"]) > 0 else 0),
-            "cache_size": len(self._validation_cache)
+            "cache_size": len(self._validation_cache),
+            "pattern_scanner": self._dangerous_patterns.get_scanner().get_stats()
         }
     
     def clear_cache(self):
@@ -0,0 +1,343 @@
+"""
+Pattern Scanner - Precompiled multi-pattern scanning for tool arguments and prompts
+
+Each rule is compiled once, and the literal keywords that any match must
+contain ("rm", "powershell", "/etc/passwd", ...) are extracted from its regex.
+A payload is case-folded once and checked for those keywords with plain
+substring search; only rules whose keywords are present are confirmed with
+their regex.  A clean payload (the common case) therefore costs a handful of
+C-speed substring scans instead of one backtracking regex pass per rule.
+Rules are confirmed in registration order, so the reported rule is the same
+one the old per-pattern loop would have reported.  (A single combined
+alternation was measured too — Python's re tries every branch at every
+offset, so it is slower than separate searches.)
+
+Large payloads (file writes, crawled pages) are scanned in fixed-size chunks
+with an overlap, and anything past max_scan_chars is not scanned — the
+result is flagged `truncated` so callers can refuse it.  Verdicts for
+repeated identical payloads come from a small LRU cache.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """One named pattern; the pattern is a regex matched case-insensitively."""
+    name: str
+    pattern: str
+    severity: str = "high"
+    category: str = "general"
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    """Verdict for one payload."""
+    matched: bool
+    rule: Optional[str] = None
+    severity: Optional[str] = None
+    category: Optional[str] = None
+    truncated: bool = False
+
+
+CLEAN = ScanResult(matched=False)
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter;
+# mapped before lower() so the keyword prefilter never misses a regex match.
+_ASCII_FOLD = {0x130: "i", 0x131: "i", 0x17F: "s", 0x212A: "k"}
+
+
+def _fold(text: str) -> str:
+    if text.isascii():
+        return text.lower()
+    return text.translate(_ASCII_FOLD).lower()
+
+
+_QUANTIFIER_RE = re.compile(r"[*+?]|\{[\d,]*\}")
+_CHAR_ESCAPES = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+# Atoms of a pattern as far as keyword extraction cares:
+#   ("lit", ch)      one literal character
+#   ("group", alts)  a capturing/non-capturing group: a list of alternatives
+#   ("other", None)  anything else (classes, anchors, lookarounds, repeats)
+_Atom = Tuple[str, object]
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Index just past the character class starting at pattern[i] == "["."""
+    i += 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _read_escape(pattern: str, i: int) -> Tuple[_Atom, int]:
+    """The atom for the escape at pattern[i] == "\\", and the index past it."""
+    c = pattern[i + 1]
+    if c in _HEX_ESCAPES:
+        n = _HEX_ESCAPES[c]
+        return ("lit", chr(int(pattern[i + 2:i + 2 + n], 16))), i + 2 + n
+    if c in _CHAR_ESCAPES:
+        return ("lit", _CHAR_ESCAPES[c]), i + 2
+    if c == "N":
+        raise ValueError("named escape")
+    if c.isalnum() or c == "_":
+        # \d \s \w \b \A \Z, back-references, octal and named escapes
+        return ("other", None), i + 2
+    return ("lit", c), i + 2
+
+
+def _read_alternatives(pattern: str, i: int) -> Tuple[List[List[_Atom]], int]:
+    """
+    Alternatives of atoms from pattern[i] up to an unmatched ")" or the end.
+
+    Only the syntax needed to find literal runs is understood; anything else
+    raises, and the caller then gives up on keywords for the rule.
+    """
+    alternatives: List[List[_Atom]] = [[]]
+    while i < len(pattern) and pattern[i] != ")":
+        c = pattern[i]
+        if c == "|":
+            alternatives.append([])
+            i += 1
+            continue
+        if c == "\\":
+            atom, i = _read_escape(pattern, i)
+        elif c == "[":
+            atom, i = ("other", None), _skip_class(pattern, i)
+        elif c == "(":
+            kind = "group"
+            i += 1
+            if pattern.startswith("?", i):
+                if pattern.startswith("?#", i):
+                    i = pattern.index(")", i) + 1
+                    continue
+                lookaround = next((p for p in ("?=", "?!", "?<=", "?<!") if pattern.startswith(p, i)), None)
+                if pattern.startswith("?:", i):
+                    i += 2
+                elif pattern.startswith("?P<", i):
+                    i = pattern.index(">", i) + 1
+                elif lookaround:
+                    kind = "other"
+                    i += len(lookaround)
+                else:
+                    # Inline flags: (?i) or scoped (?i:...); verbose mode changes literals
+                    j = i + 1
+                    while pattern[j].isalpha() or pattern[j] == "-":
+                        j += 1
+                    if "x" in pattern[i + 1:j] or pattern[j] not in ":)":
+                        raise ValueError("unsupported group")
+                    if pattern[j] == ")":
+                        i = j + 1
+                        continue
+                    i = j + 1
+            inner, i = _read_alternatives(pattern, i)
+            if pattern[i] != ")":
+                raise ValueError("unbalanced group")
+            atom = (kind, inner if kind == "group" else None)
+            i += 1
+        elif c in ".^$":
+            atom, i = ("other", None), i + 1
+        else:
+            atom, i = ("lit", c), i + 1
+        quantifier = _QUANTIFIER_RE.match(pattern, i)
+        if quantifier:
+            # A repeated atom may match zero times or be split up; lazy and
+            # possessive suffixes go with it
+            i = quantifier.end()
+            if i < len(pattern) and pattern[i] in "?+":
+                i += 1
+            atom = ("other", None)
+        if atom[0] == "lit" and ord(atom[1]) >= 128:
+            atom = ("other", None)
+        alternatives[-1].append(atom)
+    return alternatives, i
+
+
+def _required_literals(alternatives: List[List[_Atom]]) -> Optional[List[str]]:
+    """
+    Keywords of which every match of the alternatives contains at least one.
+
+    Returns None when no such set can be derived; the rule is then always
+    confirmed with its regex.
+    """
+    found: List[str] = []
+    for atoms in alternatives:
+        sub = _sequence_literals(atoms)
+        if sub is None:
+            return None
+        found.extend(sub)
+    return found
+
+
+def _sequence_literals(atoms: List[_Atom]) -> Optional[List[str]]:
+    run: List[str] = []
+    for kind, value in atoms:
+        if kind == "lit":
+            run.append(value.lower())
+            continue
+        if run:
+            break
+        if kind == "group":
+            found = _required_literals(value)
+            if found:
+                return found
+        # anchors, classes, repeats: later literals are still required
+    return ["".join(run)] if run else None
+
+
+def _literals_for(pattern: str) -> Optional[List[str]]:
+    try:
+        alternatives, end = _read_alternatives(pattern, 0)
+        if end != len(pattern):
+            return None
+        literals = _required_literals(alternatives)
+    except Exception:
+        return None
+    return list(dict.fromkeys(literals)) if literals else None
+
+
+class PatternScanner:
+    """
+    Scans text against a fixed set of ScanRules.
+
+    Instances are immutable once built; DangerousPatterns rebuilds its
+    scanner whenever a rule is added, removed or edited.
+    """
+
+    CHUNK_CHARS = 64 * 1024          # scan window for large payloads
+    OVERLAP_CHARS = 512              # carried between windows so boundary matches are found
+    MAX_SCAN_CHARS = 8 * 1024 * 1024
+    CACHE_SIZE = 2048
+    INLINE_KEY_CHARS = 512           # shorter payloads are their own cache key
+
+    def __init__(
+        self,
+        rules: Iterable[ScanRule],
+        flags: int = re.IGNORECASE,
+        max_scan_chars: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
+        self._rules: List[ScanRule] = list(rules)
+        self._flags = flags
+        self._max_scan_chars = max_scan_chars or self.MAX_SCAN_CHARS
+        self._cache_size = cache_size if cache_size is not None else self.CACHE_SIZE
+
+        # (rule, compiled regex, required keywords or None)
+        self._compiled: List[Tuple[ScanRule, re.Pattern, Optional[List[str]]]] = [
+            (rule, re.compile(rule.pattern, flags), _literals_for(rule.pattern))
+            for rule in self._rules
+        ]
+
+        self._cache: "OrderedDict[object, ScanResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"scans": 0, "cache_hits": 0, "prefilter_hits": 0, "chars_scanned": 0}
+
+    @property
+    def rules(self) -> List[ScanRule]:
+        return list(self._rules)
+
+    def _cache_key(self, text: str) -> object:
+        if len(text) <= self.INLINE_KEY_CHARS:
+            return text
+        return (len(text), hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+
+    def _windows(self, text: str) -> Iterable[str]:
+        """Yield overlapping chunks of text, up to max_scan_chars."""
+        limit = min(len(text), self._max_scan_chars)
+        if limit <= self.CHUNK_CHARS:
+            yield text[:limit]
+            return
+        start = 0
+        while start < limit:
+            end = min(start + self.CHUNK_CHARS, limit)
+            yield text[max(0, start - self.OVERLAP_CHARS):end]
+            start = end
+
+    def scan(self, text: str) -> ScanResult:
+        """
+        Return the first rule (in registration order) that matches text.
+        """
+        if not self._compiled or not text:
+            return CLEAN
+
+        key = self._cache_key(text)
+        with self._lock:
+            self._stats["scans"] += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached
+
+        result = self._scan_uncached(text)
+
+        if self._cache_size:
+            with self._lock:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _first_match(self, text: str, limit: int, names: Optional[List[str]] = None) -> int:
+        """
+        Index of the earliest rule (below limit) matching text, or limit.
+
+        When names is given, every matching rule's name is appended to it.
+        """
+        best = limit
+        for window in self._windows(text):
+            self._stats["chars_scanned"] += len(window)
+            folded = _fold(window)
+            for i in range(best if names is None else len(self._compiled)):
+                rule, compiled, literals = self._compiled[i]
+                if names is not None and rule.name in names:
+                    continue
+                if literals is not None and not any(lit in folded for lit in literals):
+                    continue
+                self._stats["prefilter_hits"] += 1
+                if compiled.search(window):
+                    if names is not None:
+                        names.append(rule.name)
+                    else:
+                        best = i
+                        break
+        return best
+
+    def _scan_uncached(self, text: str) -> ScanResult:
+        truncated = len(text) > self._max_scan_chars
+        i = self._first_match(text, len(self._compiled))
+        if i == len(self._compiled):
+            return ScanResult(matched=False, truncated=truncated)
+        rule = self._compiled[i][0]
+        return ScanResult(True, rule.name, rule.severity, rule.category, truncated)
+
+    def matches(self, text: str) -> bool:
+        return self.scan(text).matched
+
+    def match_all(self, text: str) -> List[str]:
+        """Names of every rule that matches text (registration order)."""
+        if not self._compiled or not text:
+            return []
+        names: List[str] = []
+        self._first_match(text, len(self._compiled), names)
+        order = {rule.name: i for i, rule in enumerate(self._rules)}
+        return sorted(names, key=order.__getitem__)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "rules": len(self._rules), "cached_verdicts": len(self._cache)}
@@ -0,0 +1,133 @@
+"""
+Rate Limiter - Constant-time token-bucket rate limiting (GCRA)
+
+Backs the gateway SecurityFilter and, through it, the agent tool bridge.  Each
+key (client, session, tool, ...) stores a single float — its theoretical
+arrival time (TAT) — so a check is O(1) and memory is O(active keys).
+Keys idle for longer than their bucket takes to refill are evicted
+(least-recently-used first), so traffic from many distinct keys cannot grow
+the table without bound.
+
+A RateLimitPolicy combines a sustained rate with a burst allowance:
+
+    RateLimitPolicy.per_window(10, 60)          # 10 per minute, burst of 10
+    RateLimitPolicy(rate=2.0, burst=20)         # 2/s sustained, 20 at once
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Sustained rate (requests/second) plus burst capacity."""
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        # Precomputed so check() does no division
+        object.__setattr__(self, "emission_interval", 1.0 / self.rate)
+        object.__setattr__(self, "tolerance", self.burst / self.rate)
+
+    @classmethod
+    def per_window(cls, max_requests: int, window_seconds: float, burst: Optional[int] = None) -> "RateLimitPolicy":
+        """max_requests per window_seconds; burst defaults to max_requests."""
+        return cls(rate=max_requests / window_seconds, burst=burst or max_requests)
+
+    # emission_interval: seconds per token at the sustained rate
+    # tolerance: how far TAT may run ahead of now (the burst, in seconds)
+    emission_interval: float = field(init=False, repr=False, compare=False)
+    tolerance: float = field(init=False, repr=False, compare=False)
+
+
+class RateLimiter:
+    """
+    Keyed GCRA rate limiter.
+
+    check() is thread-safe; the tool bridge calls it from executor threads
+    while the gateway calls it on the event loop.
+    """
+
+    MAX_KEYS = 100_000   # hard cap; least-recently-used keys are evicted first
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_keys: Optional[int] = None):
+        self._clock = clock
+        self._max_keys = max_keys or self.MAX_KEYS
+        # key -> (tat, policy); ordered by last access for O(1) idle eviction
+        self._buckets: "OrderedDict[Hashable, Tuple[float, RateLimitPolicy]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"checks": 0, "limited": 0, "evicted": 0}
+
+    def check(self, key: Hashable, policy: RateLimitPolicy, cost: int = 1) -> bool:
+        """
+        Consume `cost` tokens for key. Returns True if allowed, False if limited.
+        """
+        now = self._clock()
+        increment = policy.emission_interval * cost
+        with self._lock:
+            self._stats["checks"] += 1
+            entry = self._buckets.get(key)
+            tat = entry[0] if entry is not None and entry[0] > now else now
+            new_tat = tat + increment
+            if new_tat - now > policy.tolerance + 1e-9:   # epsilon absorbs float drift
+                self._stats["limited"] += 1
+                if entry is not None:
+                    self._buckets.move_to_end(key)
+                return False
+            buckets = self._buckets
+            buckets[key] = (new_tat, policy)
+            buckets.move_to_end(key)
+            # Oldest-accessed keys sit at the front; drop them once their
+            # bucket has refilled (or the table is over its cap).  Each key
+            # is evicted at most once, so this is amortised O(1).
+            while buckets:
+                oldest = next(iter(buckets.values()))[0]
+                if oldest > now and len(buckets) <= self._max_keys:
+                    break
+                buckets.popitem(last=False)
+                self._stats["evicted"] += 1
+            return True
+
+    def status(self, key: Hashable, policy: Optional[RateLimitPolicy] = None) -> Dict[str, Any]:
+        """Remaining tokens and seconds until the bucket is full again."""
+        now = self._clock()
+        with self._lock:
+            entry = self._buckets.get(key)
+        if entry is None:
+            if policy is None:
+                return {"key": key, "tracked": False, "remaining": None, "reset_in": 0.0}
+            return {"key": key, "tracked": False, "limit": policy.burst,
+                    "remaining": policy.burst, "reset_in": 0.0}
+        tat, stored = entry
+        policy = policy or stored
+        backlog = max(0.0, tat - now)
+        remaining = int((policy.tolerance - backlog) / policy.emission_interval)
+        return {
+            "key": key,
+            "tracked": True,
+            "limit": policy.burst,
+            "remaining": max(0, remaining),
+            "reset_in": round(backlog, 3),
+        }
+
+    def reset(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._buckets.pop(key, None) is not None
+
+    def reset_all(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "keys": len(self._buckets)}
+
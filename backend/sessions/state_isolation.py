@@ -2,16 +2,23 @@
 IRIS Isolated State Manager
 Per-session state isolation — each session has its own IRISState.
 Handles persistence, auto-save, and state restoration.
+
+Writes to state.json are debounced: mutations mark fields dirty and a single
+flush per SAVE_DEBOUNCE_S window serialises the state and swaps it in with an
+atomic rename, so dragging a slider no longer rewrites the file per event.
 """
 import asyncio
 import json
 import logging
+import os
 import shutil
-import tempfile
+import time
 from pathlib import Path
-from typing import Dict, Optional, Any, Callable, List
+from typing import Dict, Optional, Any, Callable, List, Set
 from datetime import datetime
 
+from backend.performance.state_optimizer import PersistenceMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +28,8 @@ class IsolatedStateManager:
     to a directory under backend/sessions/<session_id>/.
     """
 
+    SAVE_DEBOUNCE_S = 0.25  # coalesce state.json writes within this window
+
     def __init__(self, session_id: str):
         self.session_id = session_id
         from backend.core_models import IRISState
@@ -33,12 +42,17 @@ class IsolatedStateManager:
         self._navigation_history: List = []
         self._state_change_callbacks: List = []
         self._shutdown = False
+        self._dirty_fields: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        self._persistence_metrics = PersistenceMetrics()
 
     async def initialize(self, persistence_dir: Optional[Path] = None) -> None:
         """Initialize state, loading from persistence dir if provided."""
         if persistence_dir:
             self._persistence_dir = Path(persistence_dir)
             self._persistence_dir.mkdir(parents=True, exist_ok=True)
+            self._backup_state_file()
             await self._load_state()
             await self._restore_model_selections()
             self._auto_save_task = asyncio.create_task(self._periodic_auto_save())
@@ -53,7 +67,8 @@ class IsolatedStateManager:
             except asyncio.CancelledError:
                 pass
         if self._persistence_dir:
-            await self._save_state()
+            self._dirty_fields.add("*")
+            await self.flush()
 
     @property
     def state(self):
@@ -63,8 +78,7 @@ class IsolatedStateManager:
         async with self._lock:
             self._state.app_state = app_state
             self._memory_tracker.track_state_change("app_state", None, app_state)
-            if self._persistence_dir:
-                await self._save_state()
+            self._mark_dirty("app_state")
             await self._notify_state_change("app_state", app_state)
 
     async def get_state_copy(self):
@@ -86,8 +100,7 @@ class IsolatedStateManager:
             self._navigation_history.append(self._state.current_category)
             self._state.current_section = section_id
             self._memory_tracker.track_state_change("section", old_section, section_id)
-            if self._persistence_dir:
-                await self._save_state()
+            self._mark_dirty("current_section")
 
     async def update_field(self, section_id: str, field_id: str, value: Any) -> None:
         async with self._lock:
@@ -116,8 +129,7 @@ class IsolatedStateManager:
                 elif field_id == "tool_execution_model":
                     self._state.selected_tool_execution_model = str(value) if value else None
 
-            if self._persistence_dir:
-                await self._save_state()
+            self._mark_dirty(field_key)
 
     async def confirm_section(self, category: str, section_id: str, values: Dict[str, Any]) -> None:
         async with self._lock:
@@ -127,8 +139,7 @@ class IsolatedStateManager:
                 self._state.field_values[section_id] = {}
             for field_id, value in values.items():
                 self._state.field_values[section_id][field_id] = value
-            if self._persistence_dir:
-                await self._save_state()
+                self._mark_dirty(f"{section_id}.{field_id}")
 
     async def update_theme(self, glow_color: str = None, font_color: str = None,
                             state_colors: Dict = None, **kwargs) -> None:
@@ -148,16 +159,14 @@ class IsolatedStateManager:
                 previous = self._navigation_history.pop()
                 self._state.current_category = previous
                 self._state.current_section = None
-            if self._persistence_dir:
-                await self._save_state()
+            self._mark_dirty("navigation")
 
     async def collapse_to_idle(self) -> None:
         async with self._lock:
             self._state.current_category = None
             self._state.current_section = None
             self._navigation_history.clear()
-            if self._persistence_dir:
-                await self._save_state()
+            self._mark_dirty("navigation")
 
     def get_field_value(self, section_id: str, field_id: str, default: Any = None) -> Any:
         fv = getattr(self._state, 'field_values', None) or {}
@@ -219,26 +228,81 @@ class IsolatedStateManager:
         }
         return category_map.get(section_id)
 
-    async def _save_state(self) -> None:
+    def _mark_dirty(self, key: str) -> None:
+        """Record a changed field and schedule one debounced flush."""
         if not self._persistence_dir:
             return
-        try:
-            state_file = self._persistence_dir / "state.json"
-            backup_file = state_file.with_suffix(".bak")
-            if state_file.exists():
-                try:
-                    shutil.copy2(state_file, backup_file)
-                except Exception:
-                    pass
-            data = {}
-            if hasattr(self._state, 'model_dump'):
-                data = self._state.model_dump()
+        self._dirty_fields.add(key)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        # Loop so fields dirtied while a write was in progress get their own window
+        while self._dirty_fields:
+            try:
+                await asyncio.sleep(self.SAVE_DEBOUNCE_S)
+            except asyncio.CancelledError:
+                return  # flush() took over
+            await self._save_state()
+
+    async def flush(self) -> None:
+        """Persist pending changes immediately (shutdown, session cleanup)."""
+        task = self._flush_task
+        if task is not None and not task.done():
+            if self._save_lock.locked():
+                # Mid-write: let it finish rather than abandon the executor job
+                await asyncio.wait([task])
             else:
-                data = {"field_values": getattr(self._state, 'field_values', {})}
-            async with _aiofiles_open(state_file, 'w') as f:
-                await f.write(json.dumps(data, indent=2, default=str))
-        except Exception as e:
-            logger.debug(f"[StateIsolation:{self.session_id}] Save failed: {e}")
+                task.cancel()
+                await asyncio.wait([task])
+        await self._save_state()
+
+    def dirty_fields(self) -> Set[str]:
+        """Fields changed since the last successful flush."""
+        return set(self._dirty_fields)
+
+    def get_persistence_metrics(self) -> Dict[str, Any]:
+        """Flush latency (p95/mean/max ms) and pending dirty-field count."""
+        return {
+            "p95_persistence_time_ms": self._persistence_metrics.get_p95(),
+            "mean_persistence_time_ms": self._persistence_metrics.get_mean(),
+            "max_persistence_time_ms": self._persistence_metrics.get_max(),
+            "flushes": self._persistence_metrics.sketch.count,
+            "pending_fields": len(self._dirty_fields),
+        }
+
+    def _backup_state_file(self) -> None:
+        """Keep a copy of the last good state.json from before this session started."""
+        state_file = self._persistence_dir / "state.json"
+        if state_file.exists():
+            try:
+                shutil.copy2(state_file, state_file.with_suffix(".bak"))
+            except Exception:
+                pass
+
+    async def _save_state(self) -> None:
+        if not self._persistence_dir:
+            return
+        async with self._save_lock:
+            if not self._dirty_fields:
+                return
+            started = time.perf_counter()
+            dirty = self._dirty_fields
+            self._dirty_fields = set()
+            try:
+                if hasattr(self._state, 'model_dump'):
+                    data = self._state.model_dump()
+                else:
+                    data = {"field_values": getattr(self._state, 'field_values', {})}
+                state_file = self._persistence_dir / "state.json"
+                # Serialise + write off the event loop; the dump above is a private copy.
+                await asyncio.get_running_loop().run_in_executor(
+                    None, _write_json_atomic, state_file, data)
+                self._persistence_metrics.record((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                # Keep the fields dirty so the next flush retries them.
+                self._dirty_fields |= dirty
+                logger.debug(f"[StateIsolation:{self.session_id}] Save failed: {e}")
 
     async def _load_state(self) -> None:
         if not self._persistence_dir:
@@ -366,6 +430,14 @@ class IsolatedStateManager:
             return 0
 
 
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temp file beside path, then rename over it atomically."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), default=str)
+    os.replace(tmp, path)
+
+
 def _aiofiles_open(path, mode='r'):
     """Lazy aiofiles import to avoid startup cost."""
     import aiofiles
@@ -0,0 +1,171 @@
+"""
+Tests for audio/ring_buffer.py and audio/speech_detection.py
+
+Key requirements:
+  - the ring hands out contiguous read-only views, also across the wrap point
+  - reader cursors are independent and detect overruns
+  - recordings are extracted as views into the ring, not copies
+  - vectorised features match the per-frame computation; ZCR rejects hiss
+  - SpeechSegmenter gives the same onset / end whatever the block size
+  - optional VAD backends fall back to the energy VAD when unavailable
+  - AudioPipeline passes one shared view to every frame listener
+
+Run: python -m pytest backend/tests/test_audio_ring_vad.py -v
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.audio.ring_buffer import AudioRingBuffer, FrameBuffer
+from backend.audio.speech_detection import (
+    EnergyVAD, SpeechSegmenter, as_frames, create_vad, frame_features,
+)
+
+
+def test_ring_views_are_contiguous_across_wrap_and_read_only():
+    ring = AudioRingBuffer(10)
+    ring.write(np.arange(8, dtype=np.float32))
+    view = ring.write(np.arange(8, 14, dtype=np.float32))   # wraps
+    assert view.tolist() == list(range(8, 14))
+    assert np.shares_memory(view, ring._buf)
+    assert ring.view(4, 14).tolist() == list(range(4, 14))
+    assert ring.view(0).tolist() == list(range(4, 14))      # clamped to what is held
+    with pytest.raises(ValueError):
+        view[0] = 1.0
+
+    big = ring.write(np.arange(100, 125, dtype=np.float32))  # larger than the ring
+    assert big.tolist() == list(range(115, 125))
+    assert ring.position == 39
+
+
+def test_readers_are_independent_and_count_overruns():
+    ring = AudioRingBuffer(16)
+    fast, slow = ring.reader(), ring.reader()
+    ring.write(np.arange(10, dtype=np.float32))
+    assert fast.read(multiple_of=4).tolist() == list(range(8))
+    assert fast.available == 2
+    ring.write(np.arange(10, 30, dtype=np.float32))
+    assert fast.read().tolist() == list(range(8, 30))[-16:]
+    assert fast.dropped == 6
+    assert slow.read(max_samples=5).tolist() == list(range(14, 19))
+    assert slow.dropped == 14
+
+
+def test_frame_buffer_returns_views_of_the_recording():
+    buf = FrameBuffer(capacity=4096)
+    frames = [np.full(512, i, dtype=np.float32) for i in range(5)]
+    for frame in frames:
+        buf.append(frame)
+    assert len(buf) == 5 and buf.num_samples == 2560
+    whole = buf.samples()
+    assert np.shares_memory(whole, buf.ring._buf)
+    np.testing.assert_array_equal(whole, np.concatenate(frames))
+    np.testing.assert_array_equal(buf.samples(3), np.concatenate(frames[3:]))
+    np.testing.assert_array_equal(buf.samples(1, 2), frames[1])
+    buf.reset()
+    assert len(buf) == 0 and not len(buf.samples())
+
+
+def test_vectorised_features_match_per_frame_loop_and_zcr_rejects_hiss():
+    rng = np.random.default_rng(0)
+    t = np.arange(512 * 20) / 16000
+    voiced = (0.05 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    hiss = rng.uniform(-0.05, 0.05, len(t)).astype(np.float32)
+
+    frames = as_frames(voiced)
+    rms, zcr = frame_features(frames)
+    expected = [np.sqrt(np.mean(np.square(f))) for f in frames]
+    np.testing.assert_allclose(rms, expected, rtol=1e-5)
+    assert zcr.max() < 0.05
+
+    vad = EnergyVAD(energy_threshold=0.008)
+    assert vad.classify(frames).all()
+    assert not vad.classify(as_frames(hiss)).any()
+    assert not vad.classify(as_frames(np.zeros(2048, dtype=np.float32))).any()
+
+
+def _flags(pattern):
+    return np.array([c == "S" for c in pattern])
+
+
+@pytest.mark.parametrize("block", [1, 3, 7, 1000])
+def test_segmenter_is_block_size_invariant(block):
+    flags = _flags("..S.." + "SS.SSSS.SSS" + "S.S..." + "SSS" + "......" + "SS")
+    seg = SpeechSegmenter(min_speech_frames=5, hangover_frames=5, max_frames=100)
+    for i in range(0, len(flags), block):
+        seg.feed(flags[i:i + block])
+    assert seg.state == SpeechSegmenter.ENDED
+    assert seg.onset_frame == 9         # 5th speech frame within a 10-frame window
+    assert seg.end_frame == 25          # first frame of the 5-frame silence run
+    assert seg.frames_seen == 30
+
+
+def test_segmenter_timeouts():
+    seg = SpeechSegmenter(min_speech_frames=3, hangover_frames=4, max_frames=100,
+                          pre_speech_max_frames=6)
+    assert seg.feed(_flags("S..S....")) == SpeechSegmenter.TIMEOUT
+    assert seg.onset_frame is None and seg.frames_seen == 6
+
+    seg = SpeechSegmenter(min_speech_frames=2, hangover_frames=50, max_frames=10)
+    assert seg.feed(_flags("SS")) == SpeechSegmenter.SPEECH
+    assert seg.feed(_flags("S" * 20)) == SpeechSegmenter.TIMEOUT
+    assert seg.onset_frame == 1 and seg.frames_seen == 10
+
+
+def test_optional_backends_fall_back_to_energy(tmp_path):
+    vad = create_vad("silero", model_path=str(tmp_path / "missing.onnx"), energy_threshold=0.02)
+    assert isinstance(vad, EnergyVAD) and vad.energy_threshold == 0.02
+    with pytest.raises(ValueError):
+        create_vad("nope")
+
+
+def test_voice_handler_detects_end_of_speech_from_ring():
+    from backend.audio.voice_command import VoiceCommandHandler
+
+    with patch.object(VoiceCommandHandler, "warm_up", return_value=None):
+        handler = VoiceCommandHandler(MagicMock())
+    handler.is_recording = True
+    handler._auto_stop_mode = True
+    levels = []
+    handler.set_audio_level_callback(levels.append)
+
+    t = np.arange(512) / 16000
+    speech = (0.05 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    silence = np.zeros(512, dtype=np.float32)
+
+    def feed():
+        for frame in [silence] * 5 + [speech] * 20 + [silence] * 40:
+            handler._capture_frame(frame)
+            time.sleep(0.001)
+
+    feeder = threading.Thread(target=feed)
+    feeder.start()
+    handler._vad_wait_for_speech_then_silence()
+    feeder.join()
+
+    assert not handler._stop_event.is_set()      # returned by end-of-speech, not stop
+    assert levels and all(0.0 <= lvl <= 1.0 for lvl in levels)
+    audio = handler._recorded_audio()
+    assert np.shares_memory(audio, handler._raw_frames.ring._buf)
+    assert len(audio) == 65 * 512
+
+
+def test_pipeline_listeners_share_one_ring_view():
+    from backend.audio.pipeline import AudioPipeline
+
+    pipeline = AudioPipeline()
+    pipeline._is_running = True
+    seen = []
+    pipeline._on_audio_frame = seen.append
+    pipeline.add_frame_listener(seen.append)
+    indata = np.random.default_rng(1).uniform(-1, 1, (512, 1)).astype(np.float32)
+    pipeline._input_callback(indata, 512, None, None)
+
+    assert seen[0] is seen[1]
+    assert np.shares_memory(seen[0], pipeline.ring._buf)
+    np.testing.assert_array_equal(seen[0], indata[:, 0])
+    assert pipeline.ring.position == 512
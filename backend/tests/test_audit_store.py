@@ -0,0 +1,133 @@
+"""
+Tests for security/audit_store.py — segmented, indexed audit event store
+
+Key requirements:
+  - append() never blocks; queries see every event appended before them
+  - events land in per-day segments; queries visit only overlapping segments
+  - filters (session, tool, type, severity) and time ranges use indexes
+  - retention drops whole expired segments
+  - only MAX_OPEN_SEGMENTS segment connections stay open, however many
+    segments a query spans
+  - SecurityAuditLogger trail queries cover history beyond the memory buffer
+
+Run: python -m pytest backend/tests/test_audit_store.py -v
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.security.audit_store import AuditStore
+
+
+def _event(ts: datetime, session="s1", tool="read_file", event_type="tool_operation",
+           severity="info", risk=0.1):
+    return {
+        "event_type": event_type,
+        "timestamp": ts.isoformat(),
+        "session_id": session,
+        "user_id": None,
+        "event_data": {"tool_name": tool},
+        "severity": severity,
+        "risk_score": risk,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = AuditStore(tmp_path / "store")
+    yield s
+    s.close()
+
+
+def test_query_sees_unflushed_appends_newest_first(store):
+    now = datetime.now()
+    for i in range(5):
+        store.append(_event(now + timedelta(seconds=i), session=f"s{i % 2}"))
+    rows = store.query(limit=10)
+    assert [r["session_id"] for r in rows] == ["s0", "s1", "s0", "s1", "s0"]
+    assert rows[0]["timestamp"] == (now + timedelta(seconds=4)).isoformat()
+
+
+def test_filters_and_time_range(store):
+    now = datetime.now()
+    store.append(_event(now - timedelta(minutes=10), tool="write_file", severity="critical",
+                        event_type="security_violation"))
+    store.append(_event(now - timedelta(minutes=5), session="s2"))
+    store.append(_event(now))
+
+    assert len(store.query(session_id="s1")) == 2
+    assert [r["event_data"]["tool_name"] for r in store.query(tool_name="write_file")] == ["write_file"]
+    assert len(store.query(severity="critical", event_type="security_violation")) == 1
+    assert len(store.query(start_time=now - timedelta(minutes=6))) == 2
+    assert len(store.query(end_time=now - timedelta(minutes=6))) == 1
+    assert len(store.query(limit=1)) == 1
+    with pytest.raises(ValueError):
+        store.query(bogus="x")
+
+
+def test_segments_per_day_and_retention(store):
+    now = datetime.now()
+    for days_ago in (40, 10, 0):
+        store.append(_event(now - timedelta(days=days_ago)))
+    store.flush()
+    assert store.get_stats()["segments"] == 3
+
+    # A time-bounded query only opens the segments it overlaps
+    assert len(store.query(start_time=now - timedelta(days=1))) == 1
+
+    assert store.compact(days_to_keep=30) == 1
+    assert store.get_stats()["segments"] == 2
+    assert len(store.query(limit=10)) == 2
+
+
+def test_open_segment_connections_are_capped(store):
+    store.MAX_OPEN_SEGMENTS = 2
+    now = datetime.now()
+    for days_ago in range(6):
+        store.append(_event(now - timedelta(days=days_ago)))
+
+    assert len(store.query(limit=10)) == 6
+    assert store.get_stats()["open_segments"] == 2
+    assert store.aggregate()["events_total"] == 6
+    store.append(_event(now, session="later"))
+    assert store.query(limit=1)[0]["session_id"] == "later"
+    assert store.get_stats()["open_segments"] == 2
+
+
+def test_aggregate(store):
+    now = datetime.now()
+    store.append(_event(now, session="a", risk=0.5))
+    store.append(_event(now, session="b", event_type="security_violation", severity="critical", risk=1.0))
+    totals = store.aggregate(start_time=now - timedelta(hours=1))
+    assert totals["events_total"] == 2
+    assert totals["events_by_type"] == {"tool_operation": 1, "security_violation": 1}
+    assert totals["unique_sessions"] == 2
+    assert totals["risk_score_sum"] == pytest.approx(1.5)
+
+
+@pytest.mark.asyncio
+async def test_security_audit_logger_trail_beyond_buffer(tmp_path):
+    from backend.security.audit_logger import AuditEventType, SecurityAuditLogger
+    from backend.security.security_types import SecurityContext
+
+    audit = SecurityAuditLogger(log_dir=tmp_path)
+    audit._buffer_size = 10
+    ctx = SecurityContext(session_id="sess", tool_name="read_file", operation_type="read")
+    for i in range(25):
+        await audit.log_tool_operation("read_file", "read", {"i": i}, ctx, None, 0.1)
+    await audit.log_session_event("other", "create")
+
+    trail = await audit.get_audit_trail(session_id="sess", limit=100)
+    assert len(trail) == 25
+    assert trail[0].event_data["arguments"] == {"i": 24}
+
+    by_tool = await audit.get_audit_trail(tool_name="read_file", limit=5)
+    assert len(by_tool) == 5
+
+    sessions = await audit.get_audit_trail(event_type=AuditEventType.SESSION_CREATE)
+    assert [e.session_id for e in sessions] == ["other"]
+
+    stats = await audit.get_security_analytics(start_time=datetime.now() - timedelta(hours=1))
+    assert stats["total_events"] == 26
+    audit.close()
@@ -0,0 +1,148 @@
+"""
+Tests for agent/context_budget.py — value-density prompt assembly
+
+Key requirements:
+  - required blocks are always kept; the rest are chosen by value per token
+    under the window minus the generation reserve, so a large low-value
+    block loses to small high-value ones regardless of position
+  - history stays a contiguous run back from the newest turn; a shared frame
+    block is charged only when a block that needs it is chosen
+  - token counts come from the model's tokenizer when one is given (cached),
+    otherwise from a byte-based estimate
+  - AgentKernel._assemble_direct_context uses the in-process model's window
+    and tokenizer, reserves a quarter of a small window for the reply (so a
+    2k "eco" window still fits memory and history), keeps role order intact
+    and records the allocation
+
+Run: python -m pytest backend/tests/test_context_budget.py -v
+"""
+
+from unittest.mock import MagicMock
+
+from backend.agent.context_budget import (
+    ContextBlock, TokenCounter, estimate_tokens, select_blocks,
+)
+
+
+def _msg(text, role="user"):
+    return [{"role": role, "content": text}]
+
+
+def test_select_blocks_by_value_density():
+    blocks = [
+        ContextBlock("system", _msg("s", "system"), 100, required=True),
+        ContextBlock("bulky", _msg("b"), 600, value=0.9),
+        ContextBlock("sharp", _msg("a"), 150, value=0.6),
+        ContextBlock("also", _msg("c"), 200, value=0.5),
+        ContextBlock("history:0", _msg("h0"), 50, value=1.0),
+        ContextBlock("history:1", _msg("h1"), 600, value=0.8, after="history:0"),
+        ContextBlock("history:2", _msg("h2"), 10, value=0.7, after="history:1"),
+    ]
+    allocation = select_blocks(blocks, window=1_600, reserved=600)
+    chosen = [b.name for b in allocation.chosen]
+    # Budget 1000: fixed order would have spent 600 on "bulky"
+    assert chosen == ["system", "sharp", "also", "history:0"]
+    # history:2 is cheap but cannot skip over the dropped history:1
+    assert {b.name for b in allocation.dropped} == {"bulky", "history:1", "history:2"}
+    report = allocation.to_dict()
+    assert report["budget"] == 1_000 and report["used"] == 500
+    # An explicit cap tighter than the window wins
+    assert select_blocks(blocks, window=1_600, reserved=600, budget=300).to_dict()["used"] == 300
+
+    # Frame overhead: charged with the first chunk, absent when no chunk fits
+    framed = [
+        ContextBlock("system", _msg("s", "system"), 100, required=True),
+        ContextBlock("frame", _msg("f"), 50),
+        ContextBlock("chunk:0", _msg("c0"), 100, value=0.9, frame="frame"),
+        ContextBlock("chunk:1", _msg("c1"), 100, value=0.8, frame="frame"),
+    ]
+    names = lambda a: [b.name for b in a.chosen]
+    assert names(select_blocks(framed, 1_000, 0, budget=400)) == ["system", "frame", "chunk:0", "chunk:1"]
+    assert names(select_blocks(framed, 1_000, 0, budget=250)) == ["system", "frame", "chunk:0"]
+    tight = select_blocks(framed, 1_000, 0, budget=220)
+    assert names(tight) == ["system"] and tight.used == 100
+
+
+def test_token_counter_exact_and_estimate():
+    calls = []
+
+    def tokenize(text):
+        calls.append(text)
+        return len(text.split())
+
+    counter = TokenCounter(tokenize)
+    assert counter.exact and counter.count("one two three") == 3
+    assert counter.count("one two three") == 3 and len(calls) == 1      # cached
+    assert counter.count_messages(_msg("a b")) == 2 + 4                  # + framing
+
+    # Bytes, not characters: CJK text is not undercounted fourfold
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("记忆" * 10) >= 15
+    assert not TokenCounter().exact
+
+
+def test_kernel_assembles_within_model_window():
+    from backend.agent.agent_kernel import AgentKernel
+
+    kernel = AgentKernel.__new__(AgentKernel)
+    kernel.session_id = "budget"
+    kernel._personality = None
+    kernel._launcher_mode = "personal"
+    kernel._mcm_orch = None
+    mgr = MagicMock()
+    mgr.is_loaded.return_value = True
+    mgr.context_window.return_value = 400
+    mgr.count_tokens.side_effect = lambda text: len(text.split())
+    kernel._inprocess_local_mgr = mgr
+
+    episodic = MagicMock()
+    episodic.assemble_episodic_context.return_value = ("PAST: " + "noise " * 150, 0.2)
+    episodic.retrieve_context_chunks.return_value = [("capital of France is Paris", 0.9),
+                                                     ("weather " * 150, 0.3)]
+    kernel._memory_interface = MagicMock(episodic=episodic)
+
+    history = []
+    for i in range(6):
+        history += _msg(f"question {i} " + "x " * 20) + _msg(f"answer {i} " + "y " * 20, "assistant")
+    messages = kernel._assemble_direct_context("what is the capital?", history)
+
+    allocation = kernel._last_context_allocation
+    assert allocation["window"] == 400 and allocation["budget"] == 300
+    assert allocation["exact_tokens"] and allocation["used"] <= 300
+    dropped = {b["name"] for b in allocation["dropped"]}
+    assert {"episodic", "chunk:1"} <= dropped and "chunk:0" not in dropped
+
+    text = " ".join(m["content"] for m in messages)
+    assert "Paris" in text and "noise" not in text and "weather" not in text
+    assert messages[0]["role"] == "system" and messages[1]["role"] == "user"
+    assert messages[-1] == {"role": "user", "content": "what is the capital?"}
+    assert messages[-2]["content"].startswith("answer 5")       # newest turn kept
+
+
+def test_small_window_keeps_memory_and_history():
+    from backend.agent.agent_kernel import AgentKernel
+
+    kernel = AgentKernel.__new__(AgentKernel)
+    kernel.session_id = "eco"
+    kernel._personality = None
+    kernel._launcher_mode = "personal"
+    kernel._mcm_orch = None
+    mgr = MagicMock()
+    mgr.is_loaded.return_value = True
+    mgr.context_window.return_value = 2048          # the "eco" profile's n_ctx
+    mgr.count_tokens.side_effect = lambda text: len(text.split())
+    kernel._inprocess_local_mgr = mgr
+
+    episodic = MagicMock()
+    episodic.assemble_episodic_context.return_value = ("PAST: user likes tea", 0.8)
+    episodic.retrieve_context_chunks.return_value = [("capital of France is Paris", 0.9)]
+    kernel._memory_interface = MagicMock(episodic=episodic)
+
+    history = _msg("earlier question") + _msg("earlier answer", "assistant")
+    messages = kernel._assemble_direct_context("what is the capital?", history)
+
+    allocation = kernel._last_context_allocation
+    assert allocation["reserved"] == 512 and allocation["budget"] == 1_536
+    assert allocation["dropped"] == []
+    text = " ".join(m["content"] for m in messages)
+    assert "tea" in text and "Paris" in text and "earlier answer" in text
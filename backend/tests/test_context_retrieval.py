@@ -0,0 +1,110 @@
+"""
+Tests for memory/retrieval.py — concurrent context-source retrieval
+
+Key requirements:
+  - independent sources run concurrently: a gather costs about the slowest
+    source, not the sum of all of them
+  - the query is embedded once and the same vector is handed to every source
+  - a source that misses its deadline or raises is reported and left out
+    while the others still return
+  - AgentKernel._assemble_direct_context fetches episodic memory and chunks
+    through the orchestrator and records the per-source outcome
+
+Run: python -m pytest backend/tests/test_context_retrieval.py -v
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from backend.memory.retrieval import RetrievalOrchestrator
+
+
+def _sleepy(seconds, value):
+    def source(vec):
+        time.sleep(seconds)
+        return value
+    return source
+
+
+def test_sources_run_concurrently_on_one_embedding():
+    embeds = []
+
+    def embed(text):
+        embeds.append(text)
+        return [0.5, 0.5]
+
+    seen = []
+
+    def record(name):
+        def source(vec):
+            seen.append((name, vec))
+            time.sleep(0.15)
+            return name
+        return source
+
+    orch = RetrievalOrchestrator(embed=embed)
+    t0 = time.perf_counter()
+    result = orch.gather({n: record(n) for n in ("episodic", "chunks", "header")}, query="q")
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.4                                   # sequential would be ≥ 0.45s
+    assert embeds == ["q"]
+    assert sorted(seen) == [(n, [0.5, 0.5]) for n in ("chunks", "episodic", "header")]
+    assert result.value("chunks") == "chunks"
+    assert all(s["status"] == "ok" for s in result.to_dict()["sources"].values())
+    orch.shutdown()
+
+
+def test_late_and_failing_sources_are_skipped():
+    def broken(vec):
+        raise RuntimeError("db locked")
+
+    orch = RetrievalOrchestrator(embed=lambda text: None, default_deadline=1.0)
+    t0 = time.perf_counter()
+    result = orch.gather({
+        "fast": _sleepy(0.01, "fast"),
+        "slow": _sleepy(0.5, "slow"),
+        "broken": broken,
+    }, query="q", deadlines={"slow": 0.1})
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.4                                   # did not wait for "slow"
+    assert result.value("fast") == "fast"
+    assert result.value("slow", "missing") == "missing"
+    assert result.value("broken") is None
+    report = result.to_dict()["sources"]
+    assert report["slow"]["status"] == "timeout"
+    assert report["broken"] == {"status": "error", "ms": report["broken"]["ms"], "error": "db locked"}
+    assert orch.last is result
+    orch.shutdown()
+
+
+def test_kernel_gathers_context_sources(monkeypatch):
+    from backend.agent.agent_kernel import AgentKernel
+    from backend.memory import retrieval
+
+    orch = RetrievalOrchestrator(embed=lambda text: [1.0])
+    monkeypatch.setattr(retrieval, "_orchestrator", orch)
+
+    kernel = AgentKernel.__new__(AgentKernel)
+    kernel.session_id = "retrieval"
+    kernel._personality = None
+    kernel._launcher_mode = "personal"
+    kernel._mcm_orch = None
+    kernel._inprocess_local_mgr = None
+
+    episodic = MagicMock()
+    slow_memory = _sleepy(0.2, ("PAST: slow memory", 0.9))
+    episodic.assemble_episodic_context.side_effect = lambda text, **kw: slow_memory(None)
+    episodic.retrieve_context_chunks.return_value = [("capital of France is Paris", 0.9)]
+    kernel._memory_interface = MagicMock(episodic=episodic)
+    kernel._RETRIEVAL_DEADLINES = {"episodic": 0.05, "chunks": 1.0}
+
+    messages = kernel._assemble_direct_context("what is the capital?", [])
+
+    text = " ".join(m["content"] for m in messages)
+    assert "Paris" in text and "slow memory" not in text
+    assert episodic.retrieve_context_chunks.call_args.kwargs["query_embedding"] == [1.0]
+    report = kernel._last_retrieval["sources"]
+    assert report["episodic"]["status"] == "timeout" and report["chunks"]["status"] == "ok"
+    orch.shutdown()
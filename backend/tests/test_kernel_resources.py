@@ -0,0 +1,92 @@
+"""
+Tests for agent/kernel_resources.py — per-session kernels over shared services
+
+Key requirements:
+  - every session's AgentKernel uses the same ModelRouter, TaskClassifier,
+    ModeDetector and, per endpoint, the same OpenAI client
+  - kernels idle past AGENT_KERNEL_IDLE_TTL_S, or least recently used beyond
+    MAX_AGENT_KERNELS, are evicted; the caller's session and pinned sessions
+    ("default", held by main.py as app.state.agent_kernel) never are
+  - a new session inherits the model configuration (endpoint, in-process
+    binding) from a configured peer, or from the last evicted kernel
+
+Run: python -m pytest backend/tests/test_kernel_resources.py -v
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.agent import agent_kernel, kernel_resources
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    # ConversationMemory writes under ./backend/sessions
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(kernel_resources, "_resources", kernel_resources.KernelResources())
+    monkeypatch.setattr(agent_kernel, "_agent_kernel_instances", {})
+    monkeypatch.setattr(agent_kernel, "_agent_kernel_last_used", {})
+    monkeypatch.setattr(agent_kernel, "_pinned_agent_kernels", {"default"})
+    return agent_kernel
+
+
+def test_kernels_share_heavy_services(registry):
+    pytest.importorskip("openai")
+    a = registry.get_agent_kernel("a")
+    b = registry.get_agent_kernel("b")
+
+    assert a is not b and a._conversation_memory is not b._conversation_memory
+    assert a._model_router is b._model_router
+    assert a._task_classifier is b._task_classifier
+    assert a._mode_detector is b._mode_detector
+
+    a.configure_lmstudio("http://localhost:1234/v1")
+    b.configure_lmstudio("http://localhost:1234")
+    assert a._get_lmstudio_client() is b._get_lmstudio_client()
+    b.configure_lmstudio("http://localhost:5678")
+    assert a._get_lmstudio_client() is not b._get_lmstudio_client()
+    assert kernel_resources.get_kernel_resources().get_stats()["openai_clients"] == 2
+
+
+def test_idle_and_excess_kernels_are_evicted(registry, monkeypatch):
+    monkeypatch.setattr(registry, "MAX_AGENT_KERNELS", 3)
+    for sid in ("old", "s1", "s2"):
+        registry.get_agent_kernel(sid)
+    registry._agent_kernel_last_used["old"] = time.monotonic() - registry.AGENT_KERNEL_IDLE_TTL_S - 1
+
+    registry.get_agent_kernel("s3")
+    assert set(registry._agent_kernel_instances) == {"s1", "s2", "s3"}
+
+    # Over the cap: the least recently used goes, the caller's session stays
+    registry.get_agent_kernel("s4")
+    assert set(registry._agent_kernel_instances) == {"s2", "s3", "s4"}
+    assert set(registry._agent_kernel_last_used) == {"s2", "s3", "s4"}
+
+    # Pinned kernels survive both idleness and the cap
+    app_kernel = registry.get_agent_kernel("default")
+    registry.pin_agent_kernel("held")
+    registry.get_agent_kernel("held")
+    monkeypatch.setattr(registry, "AGENT_KERNEL_IDLE_TTL_S", -1.0)
+    registry.get_agent_kernel("s5")
+    assert set(registry._agent_kernel_instances) == {"default", "held", "s5"}
+    assert registry.get_agent_kernel("default") is app_kernel
+
+
+def test_new_sessions_inherit_model_config(registry, monkeypatch):
+    mgr = MagicMock()
+    ui = registry.get_agent_kernel("session_iris")
+    ui.set_model_selection(reasoning_model="qwen", model_provider="iris_local")
+    ui.configure_inprocess_local(mgr)
+    ui.configure_lmstudio("http://localhost:8082")
+
+    voice = registry.get_agent_kernel("session_iris_integration")
+    assert voice._model_provider == "iris_local" and voice._selected_reasoning_model == "qwen"
+    assert voice._inprocess_local_mgr is mgr and voice._lmstudio_endpoint == "http://localhost:8082"
+
+    # Every configured kernel evicted: the last one's settings carry over
+    monkeypatch.setattr(registry, "AGENT_KERNEL_IDLE_TTL_S", -1.0)
+    late = registry.get_agent_kernel("late")
+    assert set(registry._agent_kernel_instances) == {"late"}
+    assert late._model_provider == "iris_local" and late._inprocess_local_mgr is mgr
@@ -0,0 +1,197 @@
+"""
+Tests for message_dispatch.py — table-driven WebSocket dispatch
+
+Key requirements:
+  - unknown types return False (gateway reports "Unknown message type")
+  - BACKGROUND handlers don't block dispatch of later messages
+  - ORDERED handlers keep per-key order but run concurrently across keys
+  - timeouts and handler errors are reported via on_error; a TimeoutError
+    raised by the handler itself is a handler error, not a dispatch timeout
+  - per-type latency histograms are recorded
+  - IRISGateway registers every message type the old if/elif chain handled
+
+Run: python -m pytest backend/tests/test_message_dispatch.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from backend.message_dispatch import Concurrency, MessageDispatcher, by_session
+
+
+@pytest.mark.asyncio
+async def test_unknown_type_returns_false():
+    d = MessageDispatcher()
+    assert await d.dispatch("nope", "s1", "c1", {"type": "nope"}) is False
+
+
+@pytest.mark.asyncio
+async def test_background_handler_does_not_block_inline():
+    d = MessageDispatcher()
+    release = asyncio.Event()
+    order = []
+
+    async def slow(s, c, m):
+        await release.wait()
+        order.append("slow")
+
+    async def ping(s, c, m):
+        order.append("ping")
+
+    d.register("scan", slow, Concurrency.BACKGROUND)
+    d.register("ping", ping)
+
+    await asyncio.wait_for(d.dispatch("scan", "s1", "c1", {}), 0.1)
+    await asyncio.wait_for(d.dispatch("ping", "s1", "c1", {}), 0.1)
+    assert order == ["ping"]
+    assert len(d.pending_tasks("c1")) == 1
+
+    release.set()
+    await asyncio.gather(*d.pending_tasks())
+    assert order == ["ping", "slow"]
+    assert d.pending_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_ordered_handlers_serialise_per_key():
+    d = MessageDispatcher()
+    log = []
+
+    async def update(s, c, m):
+        log.append(("start", s, m["n"]))
+        await asyncio.sleep(0.01 if m["n"] == 0 else 0)
+        log.append(("end", s, m["n"]))
+
+    d.register("update_field", update, Concurrency.ORDERED, by_session("settings"))
+    for n in range(3):
+        await d.dispatch("update_field", "s1", "c1", {"n": n})
+    await d.dispatch("update_field", "s2", "c2", {"n": 9})
+    await asyncio.gather(*d.pending_tasks())
+
+    s1 = [(ev, n) for ev, s, n in log if s == "s1"]
+    assert s1 == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    # s2 is a different key, so it did not wait behind s1's slow first update
+    assert log.index(("start", "s2", 9)) < log.index(("end", "s1", 0))
+
+
+@pytest.mark.asyncio
+async def test_ordered_chain_survives_errors():
+    errors = []
+
+    async def on_error(client_id, text):
+        errors.append(text)
+
+    d = MessageDispatcher(on_error=on_error)
+    done = []
+
+    async def handler(s, c, m):
+        if m["fail"]:
+            raise RuntimeError("boom")
+        done.append(m)
+
+    d.register("x", handler, Concurrency.ORDERED, by_session("x"))
+    await d.dispatch("x", "s1", "c1", {"fail": True})
+    await d.dispatch("x", "s1", "c1", {"fail": False})
+    await asyncio.gather(*d.pending_tasks())
+    assert done == [{"fail": False}]
+    assert errors == ["Error processing message: boom"]
+    assert d.get_latency_histograms()["x"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_reported_and_recorded():
+    errors = []
+
+    async def on_error(client_id, text):
+        errors.append((client_id, text))
+
+    d = MessageDispatcher(on_error=on_error)
+
+    async def hang(s, c, m):
+        await asyncio.sleep(10)
+
+    d.register("hang", hang, Concurrency.BACKGROUND, timeout=0.01)
+    await d.dispatch("hang", "s1", "c1", {})
+    await asyncio.gather(*d.pending_tasks())
+    assert errors and errors[0][0] == "c1" and "timed out" in errors[0][1]
+    hist = d.get_latency_histograms()["hang"]
+    assert hist["timeouts"] == 1 and hist["count"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeout", [None, 5.0])
+async def test_handler_timeout_error_is_a_handler_error(timeout):
+    errors = []
+
+    async def on_error(client_id, text):
+        errors.append(text)
+
+    d = MessageDispatcher(on_error=on_error)
+
+    async def upstream_timeout(s, c, m):
+        raise TimeoutError("upstream read timed out")
+
+    d.register("chat", upstream_timeout, Concurrency.BACKGROUND, timeout=timeout)
+    await d.dispatch("chat", "s1", "c1", {})
+    await asyncio.gather(*d.pending_tasks())
+    assert errors == ["Error processing message: upstream read timed out"]
+    hist = d.get_latency_histograms()["chat"]
+    assert hist["errors"] == 1 and hist["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_inline_errors_propagate():
+    d = MessageDispatcher()
+
+    async def bad(s, c, m):
+        raise ValueError("bad")
+
+    d.register("bad", bad)
+    with pytest.raises(ValueError):
+        await d.dispatch("bad", "s1", "c1", {})
+
+
+def test_ordered_requires_key():
+    d = MessageDispatcher()
+    with pytest.raises(ValueError):
+        d.register("x", lambda s, c, m: None, Concurrency.ORDERED)
+
+
+def test_histogram_quantiles():
+    from backend.message_dispatch import LatencyHistogram
+    h = LatencyHistogram()
+    for ms in [0.5] * 90 + [40] * 9 + [20000]:
+        h.record(ms)
+    stats = h.to_dict()
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == 1.0
+    assert stats["p95_ms"] == 50.0
+    assert stats["max_ms"] == 20000
+
+
+def test_gateway_registers_all_message_types():
+    from backend.iris_gateway import IRISGateway
+    gw = IRISGateway.__new__(IRISGateway)
+    dispatcher = gw._build_dispatch_table()
+    expected = {
+        "select_category", "select_section", "go_back", "update_field", "update_theme",
+        "confirm_card", "set_model_selection", "voice_command_start", "voice_command_end",
+        "voice_command", "get_wake_words", "select_wake_word", "get_cleanup_report",
+        "execute_cleanup", "text_message", "clear_chat", "get_agent_status",
+        "get_agent_tools", "agent_status", "agent_tools", "get_available_models",
+        "request_models", "get_local_models", "load_local_model", "unload_local_model",
+        "apply_inference_settings", "get_local_model_status", "get_hardware_info",
+        "download_gguf_model", "search_hf_models", "set_vision_enabled", "select_local_model",
+        "toggle_model_pin", "get_audio_devices", "test_connection", "collapse_to_idle",
+        "expand_to_main", "reload_skills", "get_skills", "toggle_skill", "delete_skill",
+        "create_skill", "execute_tool", "tts_play", "ping", "pong", "request_state",
+        "enable_vision", "disable_vision", "get_vision_status", "message_exported",
+        "crawler_query", "dev_cli", "dev_abort", "terminal_input", "integration_list",
+        "marketplace_recommendations_get",
+    }
+    missing = {t for t in expected if t not in dispatcher}
+    assert not missing
+    assert dispatcher.get_spec("ping").concurrency is Concurrency.INLINE
+    assert dispatcher.get_spec("get_available_models").concurrency is Concurrency.BACKGROUND
+    assert dispatcher.get_spec("update_field").concurrency is Concurrency.ORDERED
@@ -0,0 +1,151 @@
+"""
+Tests for monitoring/metrics.py — sketch-backed summaries, counters, gauges
+
+Key requirements:
+  - DDSketch quantiles stay within the relative-error bound, in bounded memory
+  - label sets are capped; overflow folds into an "other" series
+  - the registry renders the Prometheus text format and a JSON snapshot
+  - GET /metrics and the metrics_snapshot WebSocket message expose the registry
+  - hot paths (tool bridge, token streams) record into the shared registry
+
+Run: python -m pytest backend/tests/test_metrics.py -v
+"""
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.monitoring.metrics import DDSketch, MetricsRegistry, Summary, get_metrics_registry
+
+
+def test_sketch_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 2) for _ in range(50_000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+    values.sort()
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+    assert sketch.count == len(values)
+    assert sketch.max == values[-1]
+    assert len(sketch._bins) < 2048
+
+
+def test_sketch_bins_are_capped_and_merge():
+    sketch = DDSketch(max_bins=32)
+    for i in range(1, 10_000):
+        sketch.add(i * 1e-3)
+    assert len(sketch._bins) <= 32
+    # Collapsing only touches the lowest buckets; the tail is still accurate
+    assert abs(sketch.quantile(0.99) - 9.9) <= 0.1
+
+    other = DDSketch(max_bins=32)
+    other.add(0.0)
+    other.add(100.0)
+    sketch.merge(other)
+    assert sketch.count == 10_001
+    assert sketch.zero_count == 1
+    assert sketch.quantile(1.0) == 100.0
+    assert DDSketch().quantile(0.5) == 0.0
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.summary("iris_test_seconds", "Test latency", ["tool"])
+    for v in (0.1, 0.2, 0.3):
+        latency.labels(tool='say "hi"').observe(v)
+    registry.counter("iris_test_total", "Test count").inc(3)
+    gauge = registry.gauge("iris_test_clients", "Clients")
+    gauge.set_function(lambda: 4)
+
+    text = registry.render_prometheus()
+    assert "# TYPE iris_test_seconds summary" in text
+    p50_line = next(l for l in text.splitlines() if 'quantile="0.5"' in l)
+    assert p50_line.startswith('iris_test_seconds{tool="say \\"hi\\"",quantile="0.5"} ')
+    assert float(p50_line.rsplit(" ", 1)[1]) == pytest.approx(0.2, rel=0.01)
+    assert 'iris_test_seconds_count{tool="say \\"hi\\""} 3' in text
+    assert "iris_test_total 3" in text
+    assert "iris_test_clients 4" in text
+
+    snap = registry.snapshot()
+    series = snap["iris_test_seconds"]["series"][0]
+    assert series["labels"] == {"tool": 'say "hi"'}
+    assert series["count"] == 3 and series["max"] == 0.3
+
+    # Same name, same type -> same object; a different type is rejected
+    assert registry.summary("iris_test_seconds", "Test latency", ["tool"]) is latency
+    with pytest.raises(ValueError):
+        registry.counter("iris_test_seconds", "clash")
+
+
+def test_label_sets_are_capped():
+    summary = Summary("iris_cap_seconds", "cap", ["key"])
+    summary.MAX_LABEL_SETS = 4
+    for i in range(10):
+        summary.labels(key=f"k{i}").observe(1.0)
+    keys = {values for values, _ in summary._series()}
+    assert len(keys) == 5
+    assert summary.labels(key="k9") is summary.labels(key="other")
+    assert summary.labels(key="other").count == 6
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_and_ws_snapshot():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.api.metrics import router
+    from backend.iris_gateway import IRISGateway
+
+    get_metrics_registry().counter("iris_test_endpoint_total", "endpoint test").inc()
+
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "iris_test_endpoint_total 1" in response.text
+
+    gateway = IRISGateway.__new__(IRISGateway)
+    gateway._ws_manager = MagicMock()
+    gateway._ws_manager.send_to_client = AsyncMock()
+    await gateway._handle_metrics_snapshot(
+        "s1", "c1", {"type": "metrics_snapshot", "payload": {"prefix": "iris_test_endpoint"}})
+    client_id, message = gateway._ws_manager.send_to_client.await_args.args
+    assert client_id == "c1"
+    assert message["type"] == "metrics_snapshot"
+    assert list(message["payload"]["metrics"]) == ["iris_test_endpoint_total"]
+
+
+@pytest.mark.asyncio
+async def test_hot_paths_record_metrics():
+    from backend.agent.tool_bridge import AgentToolBridge
+    from backend.performance.stream_coalescer import StreamCoalescer
+
+    registry = get_metrics_registry()
+
+    bridge = AgentToolBridge()
+    tool = registry.get("iris_tool_seconds").labels(tool="no_such_tool")
+    errors = registry.get("iris_tool_errors_total").labels(tool="no_such_tool")
+    before, errors_before = tool.count, errors.value
+    result = await bridge.execute_tool("no_such_tool", {}, "s1")
+    assert "error" in result
+    assert tool.count == before + 1
+    assert errors.value == errors_before + 1
+
+    ttft = registry.get("iris_inference_ttft_seconds")
+    tps = registry.get("iris_inference_tokens_per_second")
+    ttft_before, tps_before = ttft.count, tps.count
+    send = AsyncMock()
+    stream = StreamCoalescer(send).open("c1")
+    for token in ("a", "b", "c"):
+        stream.push(token)
+        await asyncio.sleep(0.001)
+    await stream.aclose()
+    assert ttft.count == ttft_before + 1
+    assert tps.count == tps_before + 1
@@ -0,0 +1,169 @@
+"""
+Tests for agent/model_inventory.py — persistent GGUF model index
+
+Key requirements:
+  - GGUF headers yield architecture, context, quantization and attention shape,
+    with the tokenizer vocabulary skipped rather than parsed
+  - the index survives a restart: unchanged files are never re-parsed
+  - rescans are incremental: only new or changed files are parsed, deleted
+    files are dropped
+  - KV cache footprint follows layers × KV heads × head dim × n_ctx × cache type
+  - the last measured tok/s is stored per model; samples are batched into
+    one index write instead of one per generation
+  - scan_models answers from the index and still groups split shards; the
+    directory watcher marks the index dirty when a model is added
+
+Run: python -m pytest backend/tests/test_model_inventory.py -v
+"""
+
+import os
+import struct
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.agent.local_model_manager import PROFILES, LocalModelManager
+from backend.agent.model_inventory import ModelInventory, estimate_footprint
+
+
+def _kv(key, vtype, value):
+    out = struct.pack("<Q", len(key)) + key.encode() + struct.pack("<I", vtype)
+    if vtype == 8:
+        return out + struct.pack("<Q", len(value)) + value.encode()
+    if vtype == 9:
+        elem_type, items = value
+        out += struct.pack("<IQ", elem_type, len(items))
+        for item in items:
+            out += (struct.pack("<Q", len(item)) + item.encode()) if elem_type == 8 \
+                else struct.pack("<i", item)
+        return out
+    fmt = {4: "<I", 7: "<?", 10: "<Q"}[vtype]
+    return out + struct.pack(fmt, value)
+
+
+def _write_gguf(path, layers=32, padding=0):
+    kvs = [
+        _kv("general.architecture", 8, "llama"),
+        _kv("general.name", 8, "Tiny Llama"),
+        _kv("tokenizer.ggml.tokens", 9, (8, [f"tok{i}" for i in range(5000)])),
+        _kv("tokenizer.ggml.add_bos_token", 7, True),
+        _kv("llama.context_length", 4, 8192),
+        _kv("llama.block_count", 4, layers),
+        _kv("llama.embedding_length", 4, 4096),
+        _kv("llama.attention.head_count", 4, 32),
+        _kv("llama.attention.head_count_kv", 4, 8),
+        _kv("general.parameter_count", 10, 8_030_000_000),
+        _kv("general.file_type", 4, 15),
+    ]
+    header = b"GGUF" + struct.pack("<IQQ", 3, 0, len(kvs)) + b"".join(kvs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + b"\0" * padding)
+
+
+def _manager():
+    mgr = LocalModelManager.__new__(LocalModelManager)
+    mgr._inventory = None
+    mgr._current_model_path = None
+    mgr._tps_window = []
+    mgr._tps_slow_warned = False
+    mgr._lock = threading.Lock()
+    return mgr
+
+
+def test_parse_reads_attention_shape_past_the_vocab(tmp_path):
+    path = tmp_path / "tiny-Q4_K_M.gguf"
+    _write_gguf(path)
+    meta = LocalModelManager.parse_gguf_metadata(None, path)
+    assert meta == {
+        "architecture": "llama", "model_name": "Tiny Llama", "params_b": 8.0,
+        "quantization": "Q4_K_M", "context_length": 8192, "n_layers": 32,
+        "n_embd": 4096, "n_heads": 32, "n_kv_heads": 8, "head_dim": 128,
+    }
+
+
+def test_index_persists_and_rescans_incrementally(tmp_path):
+    models, index = tmp_path / "models", tmp_path / "index.json"
+    _write_gguf(models / "a.gguf")
+    _write_gguf(models / "sub" / "b.gguf", layers=40)
+    calls = []
+
+    def parse(path):
+        calls.append(path.name)
+        return LocalModelManager.parse_gguf_metadata(None, path)
+
+    inv = ModelInventory(models, index, parse, PROFILES)
+    assert [os.path.basename(e["path"]) for e in inv.entries()] == ["a.gguf", "b.gguf"]
+    assert sorted(calls) == ["a.gguf", "b.gguf"]
+
+    # Restart: nothing re-parsed, footprints still present
+    calls.clear()
+    again = ModelInventory(models, index, parse, PROFILES)
+    assert len(again.entries()) == 2 and calls == []
+    assert again.get(str(models / "sub" / "b.gguf"))["meta"]["n_layers"] == 40
+
+    # Changed, added and deleted files
+    _write_gguf(models / "a.gguf", padding=10)
+    _write_gguf(models / "c.gguf")
+    (models / "sub" / "b.gguf").unlink()
+    again.mark_dirty()
+    assert again.refresh() == {"parsed": 2, "unchanged": 0, "removed": 1}
+    assert sorted(calls) == ["a.gguf", "c.gguf"]
+
+    # Not dirty and not stale: answered without touching the disk
+    with patch.object(ModelInventory, "refresh", side_effect=AssertionError("rescanned")):
+        assert len(again.entries()) == 2
+
+
+def test_footprint_scales_with_context_and_cache_type():
+    meta = {"n_layers": 32, "n_kv_heads": 8, "head_dim": 128}
+    size = 4 * 1024 ** 3
+    f16 = estimate_footprint(meta, size, {"n_ctx": 8192, "cache_type_k": "f16", "cache_type_v": "f16"})
+    assert f16["kv_cache_gb"] == 1.0          # 32 × 8 × 128 × 2 × 2 B × 8192
+    q4 = estimate_footprint(meta, size, {**PROFILES["research"]})
+    assert q4["kv_cache_gb"] == pytest.approx(102400 / 8192 * 18 / 32 / 2, abs=0.01)
+    eco = estimate_footprint(meta, size, PROFILES["eco"])
+    assert eco["vram_gb"] == 0.0 and eco["ram_gb"] == pytest.approx(4.25, abs=0.01)
+    # No attention shape in the header → the old rough rule
+    assert estimate_footprint({}, size, {"n_ctx": 10000})["kv_cache_gb"] == 1.0
+
+
+def test_scan_models_uses_index_and_records_tps(tmp_path):
+    models, index = tmp_path / "models", tmp_path / "index.json"
+    _write_gguf(models / "big-Q4_K_M-00001-of-00002.gguf")
+    _write_gguf(models / "big-Q4_K_M-00002-of-00002.gguf")
+    _write_gguf(models / "small.gguf", layers=16)
+    mgr = _manager()
+    with patch.object(LocalModelManager, "MODELS_DIR", models), \
+            patch.object(LocalModelManager, "INDEX_FILE", index), \
+            patch.object(LocalModelManager, "SETTINGS_FILE", tmp_path / "settings.json"):
+        listed = {m["filename"]: m for m in mgr.scan_models()}
+        inventory = mgr.get_model_inventory()
+        try:
+            assert set(listed) == {"big-Q4_K_M-00001-of-00002.gguf", "small.gguf"}
+            assert listed["big-Q4_K_M-00001-of-00002.gguf"]["shard_count"] == 2
+            small = listed["small.gguf"]
+            assert small["quantization"] == "Q4_K_M" and small["n_layers"] == 16
+            assert set(small["footprint"]) == set(PROFILES)
+
+            mgr._current_model_path = small["path"]
+            saves = inventory.get_stats()["saves"]
+            for tps in (40.0, 41.0, 42.5):
+                mgr.record_tps(tps)
+            assert inventory.get_stats()["saves"] == saves      # debounced, not one write per sample
+            inventory.flush()
+            assert inventory.get_stats()["saves"] == saves + 1
+            reloaded = ModelInventory(models, index, lambda p: pytest.fail("re-parsed"), PROFILES)
+            assert reloaded.get(small["path"])["last_tps"] == 42.5
+            assert {m["filename"]: m for m in mgr.scan_models()}["small.gguf"]["last_tps"] == 42.5
+
+            # The directory watcher picks up a new download
+            if inventory.get_stats()["watching"]:
+                _write_gguf(models / "new.gguf")
+                deadline = time.monotonic() + 5
+                while not inventory.get_stats()["dirty"] and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                assert "new.gguf" in {m["filename"] for m in mgr.scan_models()}
+        finally:
+            inventory.stop()
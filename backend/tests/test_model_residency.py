@@ -0,0 +1,216 @@
+"""
+Tests for agent/model_residency.py — warm standby, predictive preload and swap
+
+Key requirements:
+  - a preload builds the model on a background thread and warms it up with a
+    one-token generation; load_model() for the same model and settings waits
+    for it instead of loading again
+  - a standby is only kept when it fits the memory budget, and only handed
+    over for an identical load; computing that identity has no side effects
+    (no RotorQuant fallback warning per preload/take)
+  - a cancelled preload keeps building until done; no new preload or
+    foreground load is constructed beside it
+  - the swap happens under the inference lock: a running generation finishes
+    on the old model, and the displaced model becomes the next standby
+  - the next model is predicted from the UI picker selection, then the
+    launcher default, then the most recently loaded model
+  - load and swap timings are reported in get_status()
+
+Run: python -m pytest backend/tests/test_model_residency.py -v
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+from unittest.mock import patch
+
+import pytest
+
+from backend.agent.local_model_manager import LocalModelManager
+from backend.agent.model_residency import ModelResidency
+
+
+class FakeLlama:
+    built = []
+
+    def __init__(self, model_path, build_s=0.05, **kwargs):
+        time.sleep(build_s)
+        self.model_path = model_path
+        self.kwargs = kwargs
+        self.completions = []
+        FakeLlama.built.append(model_path)
+
+    def create_completion(self, **kwargs):
+        self.completions.append(kwargs)
+        return {"choices": [{"text": "Hi"}]}
+
+    def create_chat_completion(self, **kwargs):
+        return {"choices": [{"message": {"role": "assistant", "content": self.model_path}}]}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    FakeLlama.built = []
+    monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setenv("IRIS_INPROCESS_LLAMA", "1")
+    monkeypatch.delenv("IRIS_MODEL_PRELOAD", raising=False)
+    monkeypatch.delenv("IRIS_DEFAULT_MODEL", raising=False)
+    monkeypatch.setattr(LocalModelManager, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(LocalModelManager, "SETTINGS_FILE", tmp_path / "settings.json")
+    monkeypatch.setattr(LocalModelManager, "_preflight_resource_check", lambda *a: None)
+    monkeypatch.setattr(LocalModelManager, "_standby_fits", lambda *a: True)
+    with patch.object(LocalModelManager, "_register_cleanup"):
+        mgr = LocalModelManager()
+    for name in ("a.gguf", "b.gguf", "c.gguf"):
+        (tmp_path / name).write_bytes(b"GGUF")
+    yield mgr
+    mgr._residency.discard()
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_preload_take_and_budget():
+    fits = {"ok": True}
+    residency = ModelResidency(lambda path, params: FakeLlama(path, build_s=0.2),
+                               lambda path, params: fits["ok"])
+    assert residency.preload("a.gguf", {"n_ctx": 4096})
+    assert not residency.preload("a.gguf", {"n_ctx": 4096})     # already in flight
+    # Taken while still loading: waits rather than building a second copy
+    model = residency.take("a.gguf", {"n_ctx": 4096})
+    assert model is not None and model.llm.completions[0]["max_tokens"] == 1
+    assert FakeLlama.built.count("a.gguf") == 1
+    assert model.load_s >= 0.2 and residency.get_stats()["last_load"]["mode"] == "standby"
+
+    # Different settings are a different Llama
+    assert residency.preload("a.gguf", {"n_ctx": 4096})
+    assert _wait(lambda: residency.get_stats()["standby"] == "a.gguf")
+    assert residency.take("a.gguf", {"n_ctx": 8192}) is None
+    assert residency.get_stats()["misses"] == 1
+
+    fits["ok"] = False
+    residency.discard()
+    assert not residency.preload("b.gguf", {})
+    assert not residency.offer("b.gguf", {}, object())
+    assert not residency.occupied
+
+
+def test_cancelled_preload_never_overlaps_another_build():
+    FakeLlama.built = []
+    gates = {"a.gguf": threading.Event()}
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def build(path, params):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        gates.get(path, threading.Event()).wait(0 if path != "a.gguf" else 5)
+        with lock:
+            active[0] -= 1
+        return FakeLlama(path, build_s=0)
+
+    residency = ModelResidency(build, lambda path, params: True)
+    assert residency.preload("a.gguf", {})
+    assert _wait(lambda: active[0] == 1)
+    # The picker moves on (new preload), then the user loads something else
+    assert residency.preload("b.gguf", {})
+    residency.discard()
+    loader = threading.Thread(target=residency.load, args=("c.gguf", {}))
+    loader.start()
+    time.sleep(0.1)
+    assert active[0] == 1 and not residency.settle(timeout=0.01)
+    assert residency.get_stats()["abandoned_preloads"] == 2
+
+    gates["a.gguf"].set()
+    loader.join(timeout=5)
+    assert residency.settle(timeout=5)
+    assert peak[0] == 1 and "b.gguf" not in FakeLlama.built
+    assert residency.get_stats()["abandoned_preloads"] == 0 and not residency.occupied
+
+
+def test_load_model_swaps_in_preloaded_standby(manager, tmp_path):
+    a, b = str(tmp_path / "a.gguf"), str(tmp_path / "b.gguf")
+
+    async def scenario():
+        assert await manager.load_model(a, "eco")
+        first = manager._llm
+        assert first.completions and first.completions[0]["max_tokens"] == 1   # warmed up
+
+        assert manager.select_model(b, "eco")
+        assert _wait(lambda: manager._residency.get_stats()["standby"] == "b.gguf")
+
+        # A generation in flight holds the inference lock; the swap waits for it
+        release = threading.Event()
+
+        def generate():
+            with manager._inference_lock:
+                release.wait()
+
+        worker = threading.Thread(target=generate)
+        worker.start()
+        load = asyncio.ensure_future(manager.load_model(b, "eco"))
+        await asyncio.sleep(0.1)
+        assert not load.done() and manager._llm is first
+        release.set()
+        assert await load
+        worker.join()
+        return first
+
+    first = asyncio.run(scenario())
+    assert manager._llm.model_path == b and manager.get_status()["model_path"] == b
+    assert FakeLlama.built.count(b) == 1
+
+    status = manager.get_status()["residency"]
+    assert status["hits"] == 1 and status["last_swap_s"] >= 0.05
+    # The displaced model stays warm, so switching back is a swap too
+    assert status["standby"] == "a.gguf"
+    assert asyncio.run(manager.load_model(a, "eco")) and manager._llm is first
+    assert FakeLlama.built.count(a) == 1
+
+    # Unloading frees the standby as well
+    asyncio.run(manager.unload_model())
+    assert manager.get_status()["residency"]["standby"] is None
+
+
+def test_residency_key_does_not_warn(manager, tmp_path, caplog):
+    manager._rotorquant_available = False
+    params = {"n_ctx": 4096, "cache_type_k": "planar3", "cache_type_v": "planar3"}
+    path = str(tmp_path / "a.gguf")
+
+    with caplog.at_level("WARNING", logger="backend.agent.local_model_manager"):
+        key = manager._residency_key(path, params)
+        assert manager._residency_key(path, params) == key
+        assert not caplog.records
+        manager._build_llama_ctor_kwargs(path, params)
+    assert "RotorQuant" in caplog.records[0].getMessage()
+
+
+def test_predict_next_model(manager, tmp_path, monkeypatch):
+    a, b, c = (str(tmp_path / n) for n in ("a.gguf", "b.gguf", "c.gguf"))
+    assert manager.predict_next_model() is None
+
+    manager._record_loaded(a, "eco", manager.get_profile_params("eco"))
+    manager._record_loaded(b, "balanced", manager.get_profile_params("balanced"))
+    assert manager.predict_next_model()["path"] == b
+    manager._current_model_path = b
+    predicted = manager.predict_next_model()
+    assert predicted["path"] == a and predicted["profile"] == "eco"
+
+    monkeypatch.setenv("IRIS_DEFAULT_MODEL", "c.gguf")
+    assert manager.predict_next_model()["path"] == c
+
+    manager._selected_model = {"path": a, "profile": "performance", "custom_params": {}}
+    assert manager.predict_next_model()["profile"] == "performance"
+
+    # Preloading the prediction is opt-in
+    assert not manager.preload_predicted()
+    monkeypatch.setenv("IRIS_MODEL_PRELOAD", "1")
+    assert manager.preload_predicted()
+    assert _wait(lambda: manager._residency.get_stats()["standby"] == "a.gguf")
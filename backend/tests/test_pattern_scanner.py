@@ -0,0 +1,101 @@
+"""
+Tests for security/pattern_scanner.py — precompiled multi-pattern scanning
+
+Key requirements:
+  - verdicts match the old per-pattern loop (same first rule reported)
+  - keyword prefilter never hides a regex match (case folding, odd patterns)
+  - large payloads are scanned in overlapping chunks; past the cap -> truncated
+  - repeated identical payloads are answered from the verdict cache
+  - DangerousPatterns rebuilds its scanner when patterns change
+
+Run: python -m pytest backend/tests/test_pattern_scanner.py -v
+"""
+
+import re
+
+import pytest
+
+from backend.security.allowlists import DangerousPatterns
+from backend.security.pattern_scanner import PatternScanner, ScanRule, _literals_for
+
+
+def _legacy_first(patterns: dict, text: str):
+    for name, info in patterns.items():
+        if re.search(info["pattern"], text.lower(), re.IGNORECASE):
+            return name
+    return None
+
+
+@pytest.mark.parametrize("payload", [
+    {"query": "weather in Berlin tomorrow"},
+    {"command": "rm -rf /tmp/cache"},
+    {"path": "../../etc/passwd"},
+    {"code": "__import__('os').system('id')"},
+    {"content": "Set PASSWORD = hunter2 in the config"},
+    {"url": "FTP://files.example.com"},
+    {"note": "the information format is fine"},
+    {"cmd": "powershell -nop -c iex"},
+])
+def test_verdicts_match_legacy_loop(payload):
+    dp = DangerousPatterns()
+    text = str(payload)
+    assert dp.scan(text).rule == _legacy_first(dp.get_all_patterns(), text)
+
+
+def test_literal_extraction():
+    assert _literals_for(r"(rm\s+-rf|format\s+[a-z]:)") == ["rm", "format"]
+    assert _literals_for(r"\b(admin|root)\"") == ["admin", "root"]
+    assert _literals_for(r"[a-z]+\d") is None
+    assert _literals_for(r"(foo|[0-9]+)") is None
+    assert _literals_for(r"\s*(?:x)?secret=") == ["secret="]
+    assert _literals_for(r"(?i)(?<!\w)(?P<tool>curl|wget)\b") == ["curl", "wget"]
+    assert _literals_for(r"ab{0,2}c") == ["a"]
+    # Syntax the reader does not model falls back to always confirming
+    assert _literals_for(r"(?x) r m") is None
+    assert _literals_for(r"\N{LATIN SMALL LETTER R}m") is None
+
+
+def test_prefilter_respects_ignorecase_folding():
+    scanner = PatternScanner([ScanRule("priv", r"sudo\s+")])
+    assert scanner.scan("SUDO reboot").matched
+    # U+017F (long s) matches 's' under re.IGNORECASE
+    assert scanner.scan("ſudo reboot").matched
+
+
+def test_rules_without_literals_always_confirmed():
+    scanner = PatternScanner([ScanRule("digits", r"[0-9]{4}-[0-9]{4}")])
+    assert scanner.scan("card 1234-5678").rule == "digits"
+    assert not scanner.scan("nothing here").matched
+
+
+def test_chunked_scan_finds_match_on_boundary():
+    scanner = PatternScanner([ScanRule("kw", r"xp_cmdshell")], cache_size=0)
+    scanner.CHUNK_CHARS = 1024
+    text = "a" * (1024 - 5) + "xp_cmdshell" + "b" * 5000
+    assert scanner.scan(text).matched
+
+
+def test_payload_over_cap_is_truncated():
+    scanner = PatternScanner([ScanRule("kw", r"xmrig")], max_scan_chars=1000)
+    result = scanner.scan("a" * 2000 + "xmrig")
+    assert not result.matched and result.truncated
+    assert scanner.scan("xmrig" + "a" * 2000).matched
+
+
+def test_verdict_cache():
+    scanner = PatternScanner([ScanRule("kw", r"netcat")])
+    big = "x" * 10_000 + " netcat"
+    assert scanner.scan(big).matched
+    assert scanner.scan(big).matched
+    assert scanner.get_stats()["cache_hits"] == 1
+
+
+def test_dangerous_patterns_rebuilds_scanner():
+    dp = DangerousPatterns()
+    assert not dp.scan("deploy widget").matched
+    dp.add_pattern("widgets", r"widget", severity="low")
+    assert dp.scan("deploy widget").rule == "widgets"
+    dp.disable_pattern("widgets")
+    assert not dp.scan("deploy widget").matched
+    assert dp.check_all_patterns("sudo rm -rf ../x") == [
+        "system_manipulation", "path_traversal", "privilege_escalation"]
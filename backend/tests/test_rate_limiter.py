@@ -0,0 +1,106 @@
+"""
+Tests for security/rate_limiter.py — GCRA token-bucket rate limiting
+
+Key requirements:
+  - burst requests pass immediately, the next one is limited
+  - tokens refill at the sustained rate (monotonic clock)
+  - idle keys are evicted once their bucket refills; table size is capped
+  - SecurityFilter rate limits run on the shared engine
+
+Run: python -m pytest backend/tests/test_rate_limiter.py -v
+"""
+
+import pytest
+
+from backend.security.rate_limiter import RateLimiter, RateLimitPolicy
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_sustained_rate():
+    clock = _Clock()
+    limiter = RateLimiter(clock=clock)
+    policy = RateLimitPolicy(rate=1.0, burst=3)
+
+    assert [limiter.check("k", policy) for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 1.0          # one token back
+    assert limiter.check("k", policy) is True
+    assert limiter.check("k", policy) is False
+
+    clock.now += 3.0          # fully refilled
+    assert [limiter.check("k", policy) for _ in range(4)] == [True, True, True, False]
+
+
+def test_per_window_policy_and_status():
+    clock = _Clock()
+    limiter = RateLimiter(clock=clock)
+    policy = RateLimitPolicy.per_window(10, 60)
+    assert policy.burst == 10
+    assert policy.emission_interval == pytest.approx(6.0)
+
+    for _ in range(4):
+        limiter.check("k", policy)
+    status = limiter.status("k")
+    assert status["remaining"] == 6
+    assert status["reset_in"] == pytest.approx(24.0)
+    assert limiter.status("other", policy)["remaining"] == 10
+
+
+def test_keys_are_independent_and_cost_counts():
+    limiter = RateLimiter(clock=_Clock())
+    policy = RateLimitPolicy(rate=1.0, burst=5)
+    assert limiter.check("a", policy, cost=5) is True
+    assert limiter.check("a", policy) is False
+    assert limiter.check("b", policy) is True
+
+
+def test_idle_keys_evicted_and_cap_enforced():
+    clock = _Clock()
+    limiter = RateLimiter(clock=clock, max_keys=100)
+    policy = RateLimitPolicy(rate=10.0, burst=5)
+
+    for i in range(50):
+        limiter.check(f"k{i}", policy)
+    assert len(limiter) == 50
+
+    clock.now += 1.0          # every bucket has refilled
+    limiter.check("fresh", policy)
+    assert len(limiter) == 1
+
+    for i in range(500):
+        limiter.check(f"burst{i}", policy)
+    assert len(limiter) == 100
+    assert limiter.get_stats()["evicted"] >= 450
+
+
+def test_invalid_policy_rejected():
+    with pytest.raises(ValueError):
+        RateLimitPolicy(rate=0)
+    with pytest.raises(ValueError):
+        RateLimitPolicy(rate=1.0, burst=0)
+
+
+def test_security_filter_uses_engine():
+    from backend.gateway.security_filter import SecurityFilter
+
+    clock = _Clock()
+    sf = SecurityFilter(rate_limiter=RateLimiter(clock=clock))
+    results = [sf.check_tool_execution_rate_limit("s1", "read_file") for _ in range(11)]
+    assert results == [False] * 10 + [True]
+    assert sf.check_tool_execution_rate_limit("s1", "write_file") is False
+
+    status = sf.get_rate_limit_status("tool_execution_s1_read_file")
+    assert status["remaining"] == 0 and status["limit"] == 10
+
+    clock.now += 6.0
+    assert sf.check_tool_execution_rate_limit("s1", "read_file") is False
+
+    sf.reset_all_rate_limits()
+    assert sf.get_filter_stats()["rate_limit_keys"] == 0
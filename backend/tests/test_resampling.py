@@ -0,0 +1,114 @@
+"""
+Tests for audio/resampling.py — polyphase resampler
+
+Key requirements:
+  - output matches scipy.signal.resample_poly with the same filter
+  - chunked streaming output matches a one-shot resample
+  - filters are designed once per rate pair
+  - in-band tones survive, out-of-band tones are suppressed before decimation
+  - AudioPipeline re-cuts resampled device audio into frame_length frames
+  - Piper sentences are resampled as one continuous stream
+
+Run: python -m pytest backend/tests/test_resampling.py -v
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.audio.resampling import (
+    StreamingResampler, output_length, polyphase_filter, resample,
+)
+
+RATE_PAIRS = [(22_050, 48_000), (24_000, 48_000), (48_000, 16_000), (22_050, 24_000)]
+
+
+@pytest.mark.parametrize("src,dst", RATE_PAIRS)
+def test_matches_resample_poly(src, dst):
+    signal = pytest.importorskip("scipy.signal")
+    x = np.random.default_rng(0).standard_normal(src // 4 + 13).astype(np.float32)
+    f = polyphase_filter(src, dst)
+    expected = signal.resample_poly(x.astype(np.float64), f.up, f.down, window=f.prototype / f.up)
+    out = resample(x, src, dst)
+    assert out.dtype == np.float32
+    assert len(out) == len(expected) == output_length(len(x), src, dst)
+    np.testing.assert_allclose(out, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("src,dst", RATE_PAIRS)
+def test_streaming_equals_one_shot(src, dst):
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(src // 2).astype(np.float32)
+    r = StreamingResampler(src, dst)
+    parts, i = [], 0
+    while i < len(x):
+        n = int(rng.integers(1, 700))
+        parts.append(r.process(x[i:i + n]))
+        i += n
+    parts.append(r.flush())
+    np.testing.assert_allclose(np.concatenate(parts), resample(x, src, dst), atol=1e-5)
+
+    # Reset after flush: a second stream gives the same result
+    again = np.concatenate((r.process(x), r.flush()))
+    np.testing.assert_allclose(again, resample(x, src, dst), atol=1e-5)
+
+
+def test_filter_cached_per_rate_pair():
+    assert polyphase_filter(22_050, 48_000) is polyphase_filter(22_050, 48_000)
+    f = polyphase_filter(22_050, 48_000)
+    assert (f.up, f.down) == (320, 147)
+    assert f.bank.shape == (320, f.taps) and f.taps <= 21
+    with pytest.raises(ValueError):
+        polyphase_filter(0, 16_000)
+
+
+def test_tones_pass_and_aliases_are_suppressed():
+    t_in = np.arange(24_000) / 24_000
+    tone = np.sin(2 * np.pi * 1_000 * t_in).astype(np.float32)
+    out = resample(tone, 24_000, 48_000)
+    t_out = np.arange(len(out)) / 48_000
+    mid = slice(1_000, -1_000)
+    np.testing.assert_allclose(out[mid], np.sin(2 * np.pi * 1_000 * t_out)[mid], atol=2e-3)
+
+    # 10 kHz is above the 8 kHz Nyquist of 16 kHz and must not fold back to 6 kHz
+    t48 = np.arange(48_000) / 48_000
+    alias = resample(np.sin(2 * np.pi * 10_000 * t48).astype(np.float32), 48_000, 16_000)
+    assert np.sqrt(np.mean(alias[500:-500] ** 2)) < 0.01
+
+
+def test_pipeline_resamples_device_rate_into_frames():
+    from backend.audio.pipeline import AudioPipeline
+
+    pipeline = AudioPipeline()
+    pipeline._is_running = True
+    pipeline._configure_input_rate(48_000)
+    frames = []
+    pipeline.add_frame_listener(frames.append)
+
+    t = np.arange(48_000) / 48_000
+    capture = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    for i in range(0, len(capture), 1536):
+        pipeline._input_callback(capture[i:i + 1536, None], 1536, None, None)
+
+    assert all(len(f) == 512 for f in frames)
+    assert len(frames) == 31          # 16 000 samples minus the filter look-ahead
+    got = np.concatenate(frames)
+    np.testing.assert_allclose(got, resample(capture, 48_000, 16_000)[:len(got)], atol=1e-5)
+
+
+def test_piper_stream_is_resampled_continuously():
+    from backend.agent.tts import OUTPUT_SAMPLE_RATE, TTSManager
+
+    rng = np.random.default_rng(2)
+    sentences = [(rng.uniform(-0.3, 0.3, n) * 32768).astype(np.int16) for n in (5_000, 3_001, 7_777)]
+    piper = SimpleNamespace(synthesize=lambda text: (
+        SimpleNamespace(audio_int16_array=s, sample_rate=22_050) for s in sentences))
+
+    chunks = list(TTSManager._stream_piper(piper, "hello. there. world."))
+    assert len(chunks) == 3
+    whole = np.concatenate(sentences).astype(np.float32) / 32768.0
+    expected = resample(whole, 22_050, OUTPUT_SAMPLE_RATE)
+    got = np.concatenate(chunks)
+    assert len(expected) - len(got) <= 12          # only the unflushed filter tail
+    np.testing.assert_allclose(got, expected[:len(got)], atol=1e-5)
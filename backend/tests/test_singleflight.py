@@ -0,0 +1,129 @@
+"""
+Tests for performance/singleflight.py — duplicate concurrent request coalescing
+
+Key requirements:
+  - concurrent async callers with the same key share one execution, its
+    result and its exception; a cancelled caller does not cancel the others
+  - with a ttl the result is memoised briefly; failures never are
+  - concurrent threads with the same key run the blocking work once
+  - two clients asking for available models at once cause one provider query,
+    and the status snapshot is built once for concurrent callers
+
+Run: python -m pytest backend/tests/test_singleflight.py -v
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.performance.singleflight import SingleFlight
+
+
+def test_async_coalescing_memo_and_errors():
+    flight = SingleFlight("test_async", ttl=60.0)
+    runs = []
+
+    async def work(value):
+        runs.append(value)
+        await asyncio.sleep(0.05)
+        if value == "boom":
+            raise RuntimeError("boom")
+        return [value]
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("k", lambda: work("a")) for _ in range(5)))
+        assert all(r is results[0] for r in results) and results[0] == ["a"]
+        assert await flight.do("k", lambda: work("again")) == ["a"]       # memoised
+
+        errors = await asyncio.gather(*(flight.do("e", lambda: work("boom")) for _ in range(3)),
+                                      return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert await asyncio.gather(flight.do("e", lambda: work("ok"))) == [["ok"]]
+
+        # A caller that gives up does not take the shared result with it
+        first = asyncio.ensure_future(flight.do("c", lambda: work("c")))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("c", lambda: work("c2")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == ["c"]
+
+    asyncio.run(scenario())
+    assert runs == ["a", "boom", "ok", "c"]
+    stats = flight.get_stats()
+    assert stats["coalesced"] == 7 and stats["memo_hits"] == 1 and stats["in_flight"] == 0
+
+    flight.forget("k")
+    asyncio.run(flight.do("k", lambda: work("fresh")))
+    assert runs[-1] == "fresh"
+
+
+def test_threads_run_blocking_work_once():
+    flight = SingleFlight("test_sync")
+    runs = []
+    barrier = threading.Barrier(6)
+
+    def work():
+        runs.append(1)
+        time.sleep(0.1)
+        return "vec"
+
+    results = []
+
+    def caller():
+        barrier.wait()
+        results.append(flight.do_sync("text", work))
+
+    threads = [threading.Thread(target=caller) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["vec"] * 6 and len(runs) == 1
+    # No ttl: the next call runs again
+    assert flight.do_sync("text", work) == "vec" and len(runs) == 2
+
+
+def test_available_models_and_snapshot_are_coalesced(monkeypatch):
+    from backend import iris_gateway
+    from backend.api import status_snapshot
+    from backend.iris_gateway import IRISGateway
+
+    gw = IRISGateway.__new__(IRISGateway)
+    gw._logger = MagicMock()
+    gw._ws_manager = AsyncMock()
+    gw._state_manager = MagicMock()
+    gw._state_manager._get_session_state_manager = AsyncMock(return_value=None)
+    queries = []
+
+    async def discover(session_id, mode, **endpoints):
+        queries.append(mode)
+        await asyncio.sleep(0.05)
+        return [{"id": "m", "name": "m", "source": mode}]
+
+    gw._discover_available_models = discover
+    iris_gateway._AVAILABLE_MODELS_FLIGHT.forget()
+
+    builds = []
+
+    async def git_status():
+        builds.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": [], "log": [], "dirty": False}
+
+    monkeypatch.setattr(status_snapshot, "get_git_status", git_status)
+
+    async def scenario():
+        await asyncio.gather(*(gw._handle_get_available_models("s", f"c{i}", {}) for i in range(3)))
+        snaps = await asyncio.gather(*(status_snapshot.build_snapshot() for _ in range(3)))
+        assert all(s is snaps[0] for s in snaps)
+
+    asyncio.run(scenario())
+    iris_gateway._AVAILABLE_MODELS_FLIGHT.forget()
+    assert queries == ["lmstudio"] and builds == [1]
+    sent = [c.args for c in gw._ws_manager.send_to_client.call_args_list]
+    assert sorted(client for client, _ in sent) == ["c0", "c1", "c2"]
+    assert all(msg["payload"]["models"][0]["source"] == "lmstudio" for _, msg in sent)
@@ -0,0 +1,146 @@
+"""
+Tests for performance/state_delta.py — versioned delta state_sync
+
+Key requirements:
+  - patches round-trip: apply_patch(old, make_patch(old, new)) == new
+  - revisions increase monotonically; unchanged state publishes nothing
+  - first commit establishes a baseline (caller sends the full state)
+  - gap resync is answered from history, full snapshot once history is exceeded
+  - the bytes-saved metric only samples the full document's size, it does
+    not serialise it on every commit
+  - gateway broadcasts patches to peers and an empty patch to the sender
+
+Run: python -m pytest backend/tests/test_state_delta.py -v
+"""
+
+import copy
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.performance.state_delta import StateVersionTracker, apply_patch, make_patch
+
+
+def _state(**fields):
+    return {
+        "current_category": None,
+        "field_values": {"voice": {"tts_voice": "Nova", "volume": 50}, **fields},
+        "active_theme": {"glow_color": "#00ff88"},
+        "confirmed_nodes": [],
+    }
+
+
+def test_patch_round_trip():
+    old = _state()
+    new = copy.deepcopy(old)
+    new["field_values"]["voice"]["volume"] = 80
+    new["field_values"]["agent/x~y"] = {"enabled": True}
+    new["confirmed_nodes"] = ["voice"]
+    del new["active_theme"]["glow_color"]
+
+    patch = make_patch(old, new)
+    assert {"op": "replace", "path": "/field_values/voice/volume", "value": 80} in patch
+    assert {"op": "add", "path": "/field_values/agent~1x~0y", "value": {"enabled": True}} in patch
+    assert {"op": "remove", "path": "/active_theme/glow_color"} in patch
+    assert apply_patch(copy.deepcopy(old), patch) == new
+
+
+def test_type_change_is_replaced():
+    assert make_patch({"a": 1}, {"a": True}) == [{"op": "replace", "path": "/a", "value": True}]
+
+
+def test_revisions_monotonic_and_noop_skipped():
+    tracker = StateVersionTracker()
+    assert tracker.commit("s1", _state()) is None
+    assert tracker.revision("s1") == 1
+
+    assert tracker.commit("s1", _state()) is None
+    assert tracker.revision("s1") == 1
+
+    delta = tracker.commit("s1", _state(agent={"model": "a"}))
+    assert (delta.base_rev, delta.rev) == (1, 2)
+    delta = tracker.commit("s1", _state(agent={"model": "b"}))
+    assert (delta.base_rev, delta.rev) == (2, 3)
+    assert delta.patch == [{"op": "replace", "path": "/field_values/agent/model", "value": "b"}]
+
+
+def test_resync_from_history_then_full():
+    tracker = StateVersionTracker(history_size=2)
+    docs = [_state(agent={"model": str(i)}) for i in range(4)]
+    for doc in docs:
+        tracker.commit("s1", doc)
+    assert tracker.revision("s1") == 4
+
+    catch_up = tracker.patches_since("s1", 2)
+    assert (catch_up.base_rev, catch_up.rev) == (2, 4)
+    assert apply_patch(copy.deepcopy(docs[1]), catch_up.patch) == docs[3]
+
+    assert tracker.patches_since("s1", 4).patch == []
+    assert tracker.patches_since("s1", 1) is None      # rolled out of history
+    assert tracker.patches_since("s1", 9) is None      # from the future
+    assert tracker.patches_since("other", 0) is None
+
+    metrics = tracker.get_metrics()
+    assert metrics["deltas"] == 3
+    assert metrics["resyncs_from_history"] == 2
+    assert metrics["resyncs_full"] == 3
+    assert metrics["bytes_saved"] > 0
+
+
+def test_full_document_size_is_sampled(monkeypatch):
+    from backend.performance import state_delta
+
+    sized = []
+    real_size = state_delta._size
+    monkeypatch.setattr(state_delta, "_size", lambda obj: sized.append(type(obj)) or real_size(obj))
+    tracker = StateVersionTracker()
+    tracker.FULL_SIZE_SAMPLE_EVERY = 10
+    for i in range(21):
+        tracker.commit("s1", _state(agent={"model": str(i)}))
+
+    assert sized.count(dict) == 2 and sized.count(list) == 20      # deltas 1 and 11
+    assert tracker.get_metrics()["bytes_saved"] > 0
+
+
+@pytest.mark.asyncio
+async def test_gateway_broadcasts_patch_and_acks_sender():
+    from backend.iris_gateway import IRISGateway
+
+    gateway = IRISGateway.__new__(IRISGateway)
+    gateway._state_versions = StateVersionTracker()
+    gateway._ws_manager = MagicMock()
+    gateway._ws_manager.broadcast_to_session = AsyncMock()
+    gateway._ws_manager.send_to_client = AsyncMock()
+
+    state = MagicMock()
+    state.model_dump.return_value = _state()
+    gateway._state_manager = MagicMock()
+    gateway._state_manager.get_state = AsyncMock(return_value=state)
+
+    # Reconnect: full snapshot at rev 1
+    await gateway._handle_request_state("s1", "c1")
+    sent = gateway._ws_manager.send_to_client.await_args.args[1]
+    assert sent["type"] == "initial_state"
+    assert sent["payload"]["rev"] == 1
+    assert sent["payload"]["state"] == _state()
+
+    # A settings change: peers get the patch, the sender an empty patch
+    state.model_dump.return_value = _state(agent={"model": "b"})
+    await gateway._broadcast_state_update("s1", exclude_client="c1")
+    broadcast = gateway._ws_manager.broadcast_to_session.await_args
+    assert broadcast.args[1] == {
+        "type": "state_sync",
+        "payload": {
+            "rev": 2, "base_rev": 1,
+            "patch": [{"op": "add", "path": "/field_values/agent", "value": {"model": "b"}}],
+        },
+    }
+    assert broadcast.kwargs["exclude_clients"] == {"c1"}
+    ack = gateway._ws_manager.send_to_client.await_args.args
+    assert ack == ("c1", {"type": "state_sync", "payload": {"rev": 2, "base_rev": 1, "patch": []}})
+
+    # Gap resync from rev 1 is served from history
+    await gateway._handle_resync_state("s1", "c2", {"type": "resync_state", "payload": {"rev": 1}})
+    reply = gateway._ws_manager.send_to_client.await_args.args[1]
+    assert reply["payload"]["base_rev"] == 1 and reply["payload"]["rev"] == 2
+    assert "state" not in reply["payload"]
@@ -0,0 +1,81 @@
+"""
+Tests for sessions/state_isolation.py — debounced state persistence
+
+Key requirements:
+  - rapid field updates coalesce into a single state.json write
+  - writes are atomic (temp file + rename), never partial
+  - cleanup() forces a flush of pending changes
+  - persistence latency is reported through PersistenceMetrics
+
+Run: python -m pytest backend/tests/test_state_persistence.py -v
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.sessions import state_isolation
+from backend.sessions.state_isolation import IsolatedStateManager
+
+
+async def _make_manager(tmp_path):
+    mgr = IsolatedStateManager("test-session")
+    with patch.object(IsolatedStateManager, "_restore_model_selections", return_value=None):
+        await mgr.initialize(tmp_path)
+    return mgr
+
+
+@pytest.mark.asyncio
+async def test_rapid_updates_coalesce_into_one_write(tmp_path):
+    mgr = await _make_manager(tmp_path)
+    mgr.SAVE_DEBOUNCE_S = 0.05
+    writes = []
+    real_write = state_isolation._write_json_atomic
+
+    def _counting_write(path, data):
+        writes.append(path)
+        real_write(path, data)
+
+    with patch.object(state_isolation, "_write_json_atomic", _counting_write):
+        for i in range(50):
+            await mgr.update_field("voice_settings", "volume", i)
+        assert mgr.dirty_fields() == {"voice_settings.volume"}
+        await asyncio.sleep(0.2)
+
+    assert len(writes) == 1
+    data = json.loads((tmp_path / "state.json").read_text())
+    assert data["field_values"]["voice_settings"]["volume"] == 49
+    assert mgr.dirty_fields() == set()
+    assert not list(tmp_path.glob(".state.json.tmp"))
+    await mgr.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_forces_flush(tmp_path):
+    mgr = await _make_manager(tmp_path)
+    mgr.SAVE_DEBOUNCE_S = 60  # would never fire on its own during the test
+    await mgr.update_field("appearance", "glow", "#fff")
+    assert not (tmp_path / "state.json").exists()
+    await mgr.cleanup()
+    data = json.loads((tmp_path / "state.json").read_text())
+    assert data["field_values"]["appearance"]["glow"] == "#fff"
+
+
+@pytest.mark.asyncio
+async def test_reload_round_trip_and_metrics(tmp_path):
+    mgr = await _make_manager(tmp_path)
+    await mgr.confirm_section("agent", "agent_settings", {"temperature": 0.3})
+    await mgr.flush()
+    metrics = mgr.get_persistence_metrics()
+    assert metrics["flushes"] == 1
+    assert metrics["pending_fields"] == 0
+    assert metrics["p95_persistence_time_ms"] >= 0
+    await mgr.cleanup()
+
+    fresh = await _make_manager(tmp_path)
+    assert fresh.get_field_value("agent_settings", "temperature") == 0.3
+    # The previous state.json was kept as a backup when the session started
+    assert (tmp_path / "state.bak").exists()
+    await fresh.cleanup()
@@ -0,0 +1,144 @@
+"""
+Tests for api/status_snapshot.py — event-driven system status
+
+Key requirements:
+  - git state is gathered via asyncio subprocesses (no blocking subprocess.run)
+  - diff_snapshot ignores ts and yields field-level deltas
+  - StatusService broadcasts a full snapshot first, then only deltas, and
+    nothing at all when a refresh changes nothing
+  - deltas carry seq/base_seq; a full snapshot at the current seq is sent
+    to each client on connect (request_state) and on request_status
+  - refreshes are driven by file-watcher events, filtered by path; runtime
+    files the backend writes (TTS cache, model index) never trigger one
+
+Run: python -m pytest backend/tests/test_status_snapshot.py -v
+"""
+
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from backend.api import status_snapshot
+from backend.api.status_snapshot import StatusService, diff_snapshot
+
+
+def test_no_blocking_subprocess_run():
+    src = inspect.getsource(status_snapshot)
+    assert "subprocess.run" not in src
+    assert "create_subprocess_exec" in src
+
+
+def test_diff_snapshot_ignores_ts_and_recurses():
+    old = {"ts": 1.0, "online": True, "git": {"status": [], "log": ["a"], "dirty": False}}
+    new = {"ts": 2.0, "online": True, "git": {"status": [" M x.py"], "log": ["a"], "dirty": True}}
+    assert diff_snapshot(old, dict(old, ts=5.0)) == {}
+    assert diff_snapshot(old, new) == {"git": {"status": [" M x.py"], "dirty": True}}
+    assert diff_snapshot(new, {"ts": 3.0, "git": new["git"]}) == {"online": None}
+
+
+@pytest.mark.parametrize("path", [
+    "/x/backend/voice/tts_cache/3f2a.npy",
+    "/x/models/gguf/.iris_model_index.json",
+    "/x/models/gguf/.iris_model_index.json.tmp",
+    "/x/data/stt_fixtures/short.wav",
+    "C:\\x\\backend\\logs\\security\\store\\000001.seg",
+])
+def test_runtime_files_do_not_trigger_refresh(path):
+    assert not StatusService()._is_relevant(path)
+    assert StatusService()._is_relevant("/x/models/gguf/README.md")
+
+
+@pytest.mark.asyncio
+async def test_get_git_status_returns_lines():
+    git = await status_snapshot.get_git_status()
+    assert set(git) >= {"status", "log", "dirty"}
+
+
+@pytest.mark.asyncio
+async def test_service_broadcasts_full_then_deltas(monkeypatch):
+    states = iter([
+        {"status": [], "log": ["c1"], "dirty": False},
+        {"status": [], "log": ["c1"], "dirty": False},            # no change
+        {"status": [" M a.py"], "log": ["c1"], "dirty": True},
+    ])
+
+    async def fake_git():
+        return next(states)
+
+    monkeypatch.setattr(status_snapshot, "get_git_status", fake_git)
+    service = StatusService()
+    service.REFRESH_DEBOUNCE_S = 0
+    monkeypatch.setattr(service, "_start_watcher", lambda: True)
+    monkeypatch.setattr(service, "_stop_watcher", lambda: None)
+
+    sent = []
+
+    async def broadcast(msg):
+        sent.append(msg)
+
+    task = asyncio.create_task(service.run(broadcast))
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if service.refresh_count >= 1:
+            break
+    assert len(sent) == 1
+    assert sent[0]["payload"]["delta"] is False and sent[0]["payload"]["seq"] == 1
+    assert sent[0]["payload"]["git"]["log"] == ["c1"]
+
+    # Irrelevant path: no refresh
+    service._on_file_event(SimpleNamespace(path="/x/node_modules/pkg/index.js"))
+    await asyncio.sleep(0.02)
+    assert service.refresh_count == 1
+
+    # Relevant change but identical snapshot: refresh, no broadcast
+    service._on_file_event(SimpleNamespace(path="/x/backend/main.py"))
+    await asyncio.sleep(0.02)
+    assert service.refresh_count == 2
+    assert len(sent) == 1
+
+    service._on_file_event(SimpleNamespace(path="/x/backend/main.py"))
+    await asyncio.sleep(0.02)
+    assert len(sent) == 2
+    payload = sent[1]["payload"]
+    assert payload["delta"] is True and (payload["base_seq"], payload["seq"]) == (1, 2)
+    assert payload["git"] == {"status": [" M a.py"], "dirty": True}
+    assert "online" not in payload
+
+    assert service.snapshot()["git"]["dirty"] is True
+
+    # A client connecting now gets the whole status, at the seq deltas build on
+    full = (await service.full_message())["payload"]
+    assert full["delta"] is False and full["seq"] == 2
+    assert full["online"] is True and full["git"]["dirty"] is True
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_gateway_sends_full_status_on_connect_and_request(monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.iris_gateway import IRISGateway
+
+    service = StatusService()
+    service._snapshot = {"ts": 1.0, "online": True, "git": {"dirty": False}}
+    service.seq = 7
+    monkeypatch.setattr(status_snapshot, "_status_service", service)
+
+    gw = IRISGateway.__new__(IRISGateway)
+    gw._logger = MagicMock()
+    gw._ws_manager = MagicMock()
+    gw._ws_manager.send_to_client = AsyncMock()
+    gw._state_manager = MagicMock()
+    gw._state_manager.get_state = AsyncMock(return_value=None)
+
+    await gw._handle_request_state("s1", "c1")
+    await gw._handle_request_status("s1", "c1", {"type": "request_status", "payload": {}})
+
+    sent = [c.args for c in gw._ws_manager.send_to_client.await_args_list]
+    status = [msg for client, msg in sent if msg["type"] == "system_status"]
+    assert len(status) == 2 and all(client == "c1" for client, _ in sent)
+    assert all(m["payload"] == {"ts": 1.0, "online": True, "git": {"dirty": False},
+                                "delta": False, "seq": 7} for m in status)
@@ -0,0 +1,106 @@
+"""
+Tests for performance/stream_coalescer.py — chat_chunk frame coalescing
+
+Key requirements:
+  - first token is flushed immediately (TTFT unchanged)
+  - later tokens are merged into fewer frames, in order
+  - size cap forces an early flush
+  - aclose() delivers the buffered tail
+  - metrics report frames saved
+
+Run: python -m pytest backend/tests/test_stream_coalescer.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from backend.performance.stream_coalescer import StreamCoalescer
+
+
+def _make_coalescer():
+    sent = []
+
+    async def _send(client_id, message):
+        sent.append((client_id, message))
+        return True
+
+    return StreamCoalescer(_send), sent
+
+
+@pytest.mark.asyncio
+async def test_first_token_flushed_immediately():
+    coalescer, sent = _make_coalescer()
+    stream = coalescer.open("c1")
+    stream.push("Hello")
+    await asyncio.sleep(0.005)   # well under FLUSH_INTERVAL_MS
+    assert sent == [("c1", {"type": "chat_chunk", "payload": {"chunk": "Hello"}})]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tokens_from_thread_coalesced_in_order():
+    coalescer, sent = _make_coalescer()
+    stream = coalescer.open("c1")
+    tokens = [f"t{i} " for i in range(200)]
+
+    def _worker():
+        for tok in tokens:
+            stream.push(tok)
+
+    await asyncio.get_running_loop().run_in_executor(None, _worker)
+    await stream.aclose()
+
+    text = "".join(m["payload"]["chunk"] for _, m in sent)
+    assert text == "".join(tokens)
+    assert len(sent) < len(tokens)
+    assert stream.chunks_in == len(tokens)
+    assert stream.frames_out == len(sent)
+
+
+@pytest.mark.asyncio
+async def test_size_cap_forces_flush():
+    coalescer, sent = _make_coalescer()
+    coalescer.FLUSH_INTERVAL_MS = 10_000  # only the byte cap can trigger
+    stream = coalescer.open("c1")
+    stream.push("a")                      # first token, immediate
+    await asyncio.sleep(0.005)
+    stream.push("x" * coalescer.MAX_BUFFER_BYTES)
+    await asyncio.sleep(0.01)
+    assert len(sent) == 2
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_delivers_tail_and_reports_metrics():
+    coalescer, sent = _make_coalescer()
+    coalescer.FLUSH_INTERVAL_MS = 10_000
+    stream = coalescer.open("c1")
+    stream.push("a")
+    await asyncio.sleep(0.005)
+    for tok in ["b", "c", "d"]:
+        stream.push(tok)
+    await stream.aclose()
+    assert "".join(m["payload"]["chunk"] for _, m in sent) == "abcd"
+    assert len(sent) == 2
+
+    metrics = coalescer.get_metrics()
+    assert metrics["chunks_in"] == 4
+    assert metrics["frames_out"] == 2
+    assert metrics["frames_saved"] == 2
+    assert metrics["clients"]["c1"]["streams"] == 1
+
+    coalescer.forget_client("c1")
+    metrics = coalescer.get_metrics()
+    assert "c1" not in metrics["clients"]
+    assert metrics["frames_saved"] == 2
+
+
+@pytest.mark.asyncio
+async def test_push_after_close_ignored():
+    coalescer, sent = _make_coalescer()
+    stream = coalescer.open("c1")
+    await stream.aclose()
+    stream.push("late")
+    await asyncio.sleep(0.005)
+    assert sent == []
@@ -0,0 +1,200 @@
+"""
+Tests for audio/streaming_stt.py — incremental STT with local agreement
+
+Key requirements:
+  - words are committed only once consecutive passes agree on them
+  - the unstable tail is reported as tentative text, never committed early
+  - committed audio is trimmed so passes and the final decode stay short;
+    without agreement the window is still capped at max_window_sec
+  - VoiceCommandHandler emits partials while recording and finalises from
+    the streamer at end-of-speech, even after a long take wraps the
+    recording ring; a worker that will not stop is abandoned for one-pass
+
+Run: python -m pytest backend/tests/test_streaming_stt.py -v
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.audio.streaming_stt import StreamingTranscriber, Word
+
+SR = 16000
+SCRIPT = [Word(0.2 + 0.5 * i, 0.6 + 0.5 * i, w) for i, w in enumerate(
+    "turn the living room lights down to twenty percent please".split())]
+
+
+def _timed_audio(start_s: float, end_s: float) -> np.ndarray:
+    # Each sample holds its own index, so the fake model can tell which part
+    # of the utterance a window covers
+    return np.arange(int(start_s * SR), int(end_s * SR), dtype=np.float32)
+
+
+def _fake_words(audio: np.ndarray, prompt: str = ""):
+    """Whisper stand-in: finished words are right, a word cut off by the window edge is garbled."""
+    if not len(audio):
+        return []
+    offset, end = audio[0] / SR, (audio[-1] + 1) / SR
+    words = []
+    for w in SCRIPT:
+        if w.start < offset - 0.05:
+            continue
+        if w.end <= end:
+            words.append(Word(w.start - offset, w.end - offset, f" {w.text.capitalize()},"))
+        elif w.start < end:
+            words.append(Word(w.start - offset, end - offset, " uh" + str(len(audio))))
+    return words
+
+
+def test_local_agreement_commits_only_stable_prefix():
+    calls = []
+
+    def transcribe(audio, prompt):
+        calls.append(prompt)
+        return _fake_words(audio)
+
+    streamer = StreamingTranscriber(transcribe, SR, trim_sec=100)
+    committed = []
+    for step in range(1, 12):
+        streamer.insert_audio(_timed_audio((step - 1) * 0.5, step * 0.5))
+        partial = streamer.process()
+        assert partial.committed.startswith(" ".join(committed))
+        committed = partial.committed.split()
+        # A garbled edge word never gets committed
+        assert "uh" not in partial.committed
+
+    assert streamer.passes == 11
+    assert committed[:3] == ["Turn,", "The,", "Living,"]
+    assert partial.tentative            # the newest words are still waiting for agreement
+    final = streamer.finish()
+    assert [w.strip(",").lower() for w in final.split()] == [w.text for w in SCRIPT]
+
+
+def test_trimming_keeps_windows_short_and_prompts_with_committed_text():
+    prompts = []
+
+    def transcribe(audio, prompt):
+        prompts.append((len(audio) / SR, prompt))
+        return _fake_words(audio)
+
+    streamer = StreamingTranscriber(transcribe, SR, trim_sec=1.5)
+    for step in range(1, 12):
+        streamer.insert_audio(_timed_audio((step - 1) * 0.5, step * 0.5))
+        streamer.process()
+    final_window = streamer.buffered_sec
+    text = streamer.finish()
+
+    assert max(window for window, _ in prompts) < 3.0
+    assert final_window < 2.0           # finish() only decodes the uncommitted tail
+    assert prompts[-1][1] and text.startswith(prompts[-1][1])
+    assert [w.strip(",").lower() for w in text.split()] == [w.text for w in SCRIPT]
+    # Without trimming every pass re-decodes the whole utterance (33 s in total)
+    assert streamer.decoded_sec < 0.6 * 33
+
+
+def test_window_is_capped_when_passes_never_agree():
+    passes = []
+
+    def transcribe(audio, prompt):
+        # Every pass hears every word differently, so nothing is ever agreed on
+        passes.append(len(audio) / SR)
+        return [Word(w.start, w.end, f"{w.text}{len(passes)}") for w in _fake_words(audio)]
+
+    streamer = StreamingTranscriber(transcribe, SR, trim_sec=1.5, max_window_sec=3.0)
+    for step in range(1, 12):
+        streamer.insert_audio(_timed_audio((step - 1) * 0.5, step * 0.5))
+        streamer.process()
+
+    assert max(passes) <= 3.5 and streamer.buffered_sec <= 3.0
+    assert streamer.committed_text          # forced through, not lost
+    words = [w.rstrip("0123456789,").lower() for w in streamer.finish().split()]
+    assert words == [w.text for w in SCRIPT]
+
+
+class _FakeWhisper:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        words = [SimpleNamespace(start=w.start, end=w.end, word=w.text) for w in _fake_words(audio)]
+        return [SimpleNamespace(text="".join(w.word for w in words), words=words)], None
+
+
+@pytest.mark.parametrize("ring_sec", [60.0, 2.0])
+def test_voice_handler_streams_partials_and_finalises_from_streamer(ring_sec):
+    from backend.audio.ring_buffer import FrameBuffer
+    from backend.audio.voice_command import VoiceCommandHandler
+
+    with patch.object(VoiceCommandHandler, "warm_up", return_value=None):
+        handler = VoiceCommandHandler(MagicMock())
+    # A 2 s ring wraps during the 5.5 s take; the streamer must still get all of it
+    handler._raw_frames = FrameBuffer(int(ring_sec * SR))
+    handler.STREAM_STEP_SEC = 0.01
+    handler._whisper = _FakeWhisper()
+    partials, results = [], []
+    handler.set_partial_transcript_callback(partials.append)
+    handler.set_command_result_callback(results.append)
+    handler.set_active_session("s1")
+
+    handler.is_recording = True
+    handler._auto_stop_mode = False
+    worker = threading.Thread(target=handler._run_transcription)
+    worker.start()
+    audio = _timed_audio(0, 5.5)
+    for i in range(0, len(audio), 512):
+        handler._capture_frame(audio[i:i + 512])
+        if i % (512 * 4) == 0:
+            time.sleep(0.01)
+    time.sleep(0.05)
+    handler.stop_recording()
+    worker.join(timeout=5)
+
+    assert handler._raw_frames.overflowed == (ring_sec < 5.5)
+
+    assert partials and all(p["session_id"] == "s1" for p in partials)
+    assert any(p["committed"] for p in partials)
+    assert results[0]["transcript"].lower().replace(",", "").split() == [w.text for w in SCRIPT]
+    # Every decode went through the streaming path (word timestamps, no one-pass VAD filter)
+    assert all(c.get("word_timestamps") for c in handler._whisper.calls)
+
+
+def test_voice_handler_falls_back_to_one_pass_when_streaming_disabled():
+    from backend.audio.voice_command import VoiceCommandHandler
+
+    with patch.object(VoiceCommandHandler, "warm_up", return_value=None):
+        handler = VoiceCommandHandler(MagicMock())
+    handler.STREAMING_STT = False
+    handler._whisper = _FakeWhisper()
+    results = []
+    handler.set_command_result_callback(results.append)
+
+    handler.is_recording = True
+    handler._raw_frames.append(_timed_audio(0, 5.5))
+    handler._stop_event.set()
+    handler._run_transcription()
+
+    assert len(handler._whisper.calls) == 1
+    assert handler._whisper.calls[0]["vad_filter"] is True
+    assert results[0]["transcript"]
+
+
+def test_voice_handler_abandons_a_stuck_streaming_worker():
+    from backend.audio.voice_command import VoiceCommandHandler
+
+    with patch.object(VoiceCommandHandler, "warm_up", return_value=None):
+        handler = VoiceCommandHandler(MagicMock())
+    handler.STREAM_JOIN_TIMEOUT_SEC = 0.05
+    release = threading.Event()
+    stuck = threading.Thread(target=release.wait, daemon=True)
+    stuck.start()
+    streamer = SimpleNamespace(passes=3)
+
+    t0 = time.perf_counter()
+    assert handler._stop_streaming((stuck, threading.Event(), {"streamer": streamer, "fed": 0})) == (None, 0)
+    assert time.perf_counter() - t0 < 1.0
+    release.set()
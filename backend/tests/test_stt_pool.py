@@ -0,0 +1,175 @@
+"""
+Tests for audio/stt_pool.py — resident faster-whisper model pool
+
+Key requirements:
+  - a model is loaded once per (size, device, compute_type) and reused
+  - concurrent first requests share a single load
+  - idle models are unloaded, leased models never are
+  - the memory budget evicts the least recently used idle model
+  - load and transcribe time are reported separately
+  - VoiceCommandHandler gets its model from the pool (no per-call construction)
+
+Run: python -m pytest backend/tests/test_stt_pool.py -v
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.audio.stt_pool import ModelSpec, STTModelPool
+
+
+class _FakeModel:
+    def __init__(self, spec):
+        self.spec = spec
+
+    def transcribe(self, audio, **kwargs):
+        def _segments():
+            time.sleep(0.01)     # lazy decoding, like faster-whisper
+            yield SimpleNamespace(text=f" {self.spec.size}")
+        return _segments(), None
+
+
+class _Loader:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.loads = []
+
+    def __call__(self, spec, options):
+        self.loads.append((spec, options))
+        time.sleep(self.delay)
+        return _FakeModel(spec)
+
+
+def test_model_loaded_once_and_timed_separately():
+    loader = _Loader(delay=0.05)
+    pool = STTModelPool(idle_unload_sec=0, loader=loader)
+    whisper = pool.model("tiny", num_workers=2)
+    assert not whisper.is_loaded and loader.loads == []
+
+    for _ in range(3):
+        segments, _ = whisper.transcribe(np.zeros(16000, dtype=np.float32))
+        assert [s.text for s in segments] == [" tiny"]
+    assert len(loader.loads) == 1
+    assert loader.loads[0][1] == {"num_workers": 2}
+
+    stats = pool.get_stats()["models"]["tiny/cpu/int8"]
+    assert stats["loads"] == 1 and stats["transcribes"] == 3
+    assert stats["last_load_ms"] >= 50
+    # Decoding happens inside the lease, so it is billed to transcribe, not load
+    assert 30 <= stats["transcribe_ms_total"] < stats["last_load_ms"] + 100
+
+
+def test_concurrent_first_use_shares_one_load():
+    loader = _Loader(delay=0.1)
+    pool = STTModelPool(idle_unload_sec=0, loader=loader)
+    results = []
+
+    def _use():
+        segments, _ = pool.model("base", num_workers=4).transcribe(np.zeros(10, dtype=np.float32))
+        results.append(segments[0].text)
+
+    threads = [threading.Thread(target=_use) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert results == [" base"] * 6
+    assert len(loader.loads) == 1
+
+
+def test_failed_load_propagates_to_waiters_and_can_retry():
+    calls = []
+
+    def loader(spec, options):
+        calls.append(spec)
+        time.sleep(0.05)
+        if len(calls) == 1:
+            raise OSError("model files missing")
+        return _FakeModel(spec)
+
+    pool = STTModelPool(idle_unload_sec=0, loader=loader)
+    errors = []
+
+    def _use():
+        try:
+            pool.model("tiny").transcribe(np.zeros(10, dtype=np.float32))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_use) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert len(errors) == 3 and len(calls) == 1
+
+    segments, _ = pool.model("tiny").transcribe(np.zeros(10, dtype=np.float32))
+    assert segments[0].text == " tiny" and len(calls) == 2
+
+
+def test_idle_unload_skips_leased_models_and_reloads_on_demand():
+    loader = _Loader()
+    pool = STTModelPool(idle_unload_sec=0.05, loader=loader)
+    tiny, base = ModelSpec("tiny"), ModelSpec("base")
+    pool.model("tiny").transcribe(np.zeros(10, dtype=np.float32))
+
+    with pool.lease(base):
+        time.sleep(0.1)
+        assert pool.unload_idle() == 1          # tiny goes, leased base stays
+        assert not pool.is_loaded(tiny) and pool.is_loaded(base)
+    time.sleep(0.1)
+    assert pool.unload_idle() == 1
+    assert not pool.is_loaded(base)
+
+    pool.model("tiny").transcribe(np.zeros(10, dtype=np.float32))
+    assert [spec.size for spec, _ in loader.loads] == ["tiny", "base", "tiny"]
+    pool.close()
+
+
+def test_memory_budget_evicts_least_recently_used_idle_model():
+    loader = _Loader()
+    # tiny/int8 ≈ 49 MB, base/int8 ≈ 93 MB, small/int8 ≈ 305 MB
+    pool = STTModelPool(idle_unload_sec=0, memory_budget_mb=400, loader=loader)
+    for size in ("tiny", "base"):
+        pool.model(size).transcribe(np.zeros(10, dtype=np.float32))
+        time.sleep(0.01)
+    pool.model("tiny").transcribe(np.zeros(10, dtype=np.float32))   # base is now LRU
+
+    pool.model("small").transcribe(np.zeros(10, dtype=np.float32))
+    assert pool.is_loaded(ModelSpec("tiny")) and pool.is_loaded(ModelSpec("small"))
+    assert not pool.is_loaded(ModelSpec("base"))
+    assert pool.get_stats()["resident_mb"] <= 400
+
+
+def test_prewarm_is_noop_when_resident():
+    loader = _Loader()
+    pool = STTModelPool(idle_unload_sec=0, loader=loader)
+    pool.prewarm("tiny", background=False)
+    assert pool.prewarm("tiny") is None
+    assert len(loader.loads) == 1
+    assert pool.get_stats()["models"]["tiny/cpu/int8"]["transcribes"] == 1
+
+
+def test_voice_handler_uses_shared_pool():
+    from backend.audio import voice_command
+    from backend.audio.voice_command import VoiceCommandHandler
+
+    loader = _Loader()
+    pool = STTModelPool(idle_unload_sec=0, loader=loader)
+    with patch.object(voice_command, "get_stt_pool", return_value=pool):
+        handler = VoiceCommandHandler(MagicMock())
+        handler._whisper.prewarm(background=False)
+        other = VoiceCommandHandler(MagicMock())
+        with patch("psutil.virtual_memory", return_value=SimpleNamespace(available=0)):
+            # Resident model → the low-RAM guard doesn't skip faster-whisper
+            assert handler._transcribe_with_fallback(np.zeros(10, dtype=np.float32)) == "tiny"
+
+    assert other._get_whisper().spec == handler._get_whisper().spec
+    assert len(loader.loads) == 1
+    assert loader.loads[0][1] == {"num_workers": 1, "cpu_threads": 4}
@@ -0,0 +1,145 @@
+"""
+Tests for monitoring/tracing.py — contextvar span tracing across a turn
+
+Key requirements:
+  - spans nest through the contextvar; span() outside a trace is a no-op
+  - run_in_executor (via bind_context), threads and run_coroutine_threadsafe
+    all keep spans in the caller's trace
+  - the root span stretches to cover spans that end after it
+  - recent traces live in a bounded ring buffer
+  - waterfall and Chrome trace export; get_trace replies over the WebSocket
+
+Run: python -m pytest backend/tests/test_tracing.py -v
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.monitoring.tracing import NOOP_SPAN, Tracer, bind_context, current_span
+
+
+def test_spans_nest_and_noop_outside_trace():
+    tracer = Tracer()
+    assert tracer.span("orphan") is NOOP_SPAN
+
+    with tracer.trace("chat.turn", session_id="s1") as root:
+        with tracer.span("context.assemble") as ctx:
+            with tracer.span("memory.episodic") as ep:
+                assert current_span() is ep
+        assert current_span() is root
+    assert current_span() is None
+
+    assert ctx.parent_id == root.span_id
+    assert ep.parent_id == ctx.span_id
+    rows = tracer.waterfall(tracer.get(root.trace_id))["waterfall"]
+    assert [(r["name"], r["depth"]) for r in rows] == [
+        ("chat.turn", 0), ("context.assemble", 1), ("memory.episodic", 2)]
+    assert all(not r["open"] for r in rows)
+
+
+def test_errors_are_recorded():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.trace("turn") as root:
+            with tracer.span("tool.call", tool="x"):
+                raise ValueError("boom")
+    rows = tracer.waterfall(tracer.get(root.trace_id))["waterfall"]
+    assert [r["error"] for r in rows] == ["ValueError", "ValueError"]
+
+
+@pytest.mark.asyncio
+async def test_context_crosses_executor_thread_and_loop():
+    tracer = Tracer()
+    loop = asyncio.get_running_loop()
+
+    async def deliver():
+        with tracer.span("ws.deliver"):
+            await asyncio.sleep(0)
+
+    def agent():
+        with tracer.span("agent.generate"):
+            # Executor thread back onto the loop — context travels with it
+            asyncio.run_coroutine_threadsafe(deliver(), loop).result(timeout=5)
+
+    def tts():
+        with tracer.span("tts.synthesize"):
+            time.sleep(0.02)
+
+    with tracer.trace("voice.turn", session_id="s1") as root:
+        await loop.run_in_executor(None, bind_context(agent))
+        worker = threading.Thread(target=bind_context(tts))
+        worker.start()
+    # The root has ended; the TTS thread is still running
+    root_end = root.end_ns
+    await loop.run_in_executor(None, worker.join)
+
+    trace = tracer.get(root.trace_id)
+    names = {s.name: s for s in trace.spans}
+    assert set(names) == {"voice.turn", "agent.generate", "ws.deliver", "tts.synthesize"}
+    assert names["ws.deliver"].parent_id == names["agent.generate"].span_id
+    assert names["tts.synthesize"].parent_id == root.span_id
+    assert names["tts.synthesize"].thread_name != names["agent.generate"].thread_name
+    # Root stretched to cover the late TTS span
+    assert root.end_ns == names["tts.synthesize"].end_ns > root_end
+
+
+def test_ring_buffer_and_chrome_export():
+    tracer = Tracer(max_traces=3)
+    ids = []
+    for i in range(5):
+        with tracer.trace("chat.turn", session_id="a" if i % 2 else "b") as root:
+            with tracer.span("agent.run", n=i):
+                pass
+        ids.append(root.trace_id)
+
+    assert len(tracer) == 3
+    assert tracer.get(ids[0]) is None
+    assert [t["trace_id"] for t in tracer.recent()] == ids[:1:-1]
+    assert tracer.latest("a").trace_id == ids[3]
+    assert [t["trace_id"] for t in tracer.recent(session_id="b")] == [ids[4], ids[2]]
+
+    exported = json.loads(json.dumps(tracer.export_chrome([ids[4]])))
+    complete = [e for e in exported["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["chat.turn", "agent.run"]
+    assert complete[1]["args"] == {"trace_id": ids[4], "n": 4}
+    assert all(e["dur"] >= 0 for e in complete)
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in exported["traceEvents"])
+
+
+@pytest.mark.asyncio
+async def test_gateway_get_trace_and_ws_send_span():
+    from backend.iris_gateway import IRISGateway
+    from backend.monitoring.tracing import get_tracer
+    from backend.ws_manager import ClientSender
+
+    tracer = get_tracer()
+    websocket = MagicMock()
+    websocket.send_json = AsyncMock()
+    sender = ClientSender("c1", websocket, max_depth=8, on_failure=lambda s: None)
+    sender.start()
+
+    with tracer.trace("chat.turn", session_id="trace-session") as root:
+        sender.enqueue({"type": "chat_message", "payload": {}})
+    sender.enqueue({"type": "untraced", "payload": {}})
+    while sender._queue:
+        await asyncio.sleep(0.005)
+    sender.close()
+
+    spans = tracer.get(root.trace_id).spans
+    assert [s.name for s in spans] == ["chat.turn", "ws.send"]
+    assert spans[1].attrs == {"type": "chat_message"} and spans[1].end_ns is not None
+
+    gateway = IRISGateway.__new__(IRISGateway)
+    gateway._ws_manager = MagicMock()
+    gateway._ws_manager.send_to_client = AsyncMock()
+    await gateway._handle_get_trace("trace-session", "c1", {"type": "get_trace", "payload": {}})
+    client_id, message = gateway._ws_manager.send_to_client.await_args.args
+    assert message["type"] == "trace_waterfall"
+    assert message["payload"]["trace"]["trace_id"] == root.trace_id
+    assert [r["name"] for r in message["payload"]["trace"]["waterfall"]] == ["chat.turn", "ws.send"]
+    assert message["payload"]["recent"][0]["trace_id"] == root.trace_id
@@ -0,0 +1,215 @@
+"""
+Tests for agent/tts_scheduler.py and agent/tts_cache.py
+
+Key requirements:
+  - streamed text is cut into sentences only once a boundary is certain
+  - the scheduler synthesises at most `lookahead` chunks ahead of playback,
+    and the next chunk is rendered while the current one plays
+  - cancel() stops synthesis work
+  - the phrase cache serves repeats from RAM, then disk across instances,
+    and synthesises concurrent requests for one phrase once
+  - audio from a fallback engine is not cached under the primary voice
+  - prefetched sentences from the LLM stream are reused when spoken
+  - _speak_response plays every chunk and reaches the end cleanly
+
+Run: python -m pytest backend/tests/test_tts_scheduler.py -v
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.agent.tts_cache import PhraseAudioCache
+from backend.agent.tts_scheduler import PhrasePrefetcher, SentenceSegmenter, SpeechScheduler
+
+
+def _audio(text: str) -> np.ndarray:
+    return np.full(len(text) * 10, len(text), dtype=np.float32)
+
+
+class _Synth:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.events = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        self.events.append(("synth", text))
+        time.sleep(self.delay)
+        return _audio(text)
+
+
+def test_segmenter_waits_for_a_certain_boundary():
+    seg = SentenceSegmenter()
+    assert seg.feed("Hel") == []
+    assert seg.feed("lo there. It costs 3.") == ["Hello there."]
+    assert seg.feed("5 dollars") == []
+    assert seg.feed("! Next\nline") == ["It costs 3.5 dollars!", "Next"]
+    assert seg.flush() == ["line"]
+    assert seg.flush() == []
+
+
+def test_scheduler_bounds_lookahead_and_preserves_order():
+    synth = _Synth()
+    sched = SpeechScheduler(synth, lookahead=2)
+    sched.feed("One. Two. Three. Four. Five. Six.")
+    sched.close()
+    time.sleep(0.2)
+    # Two chunks waiting for the player plus one rendered and blocked on the queue
+    assert len(synth.calls) == 3
+
+    chunks = list(sched)
+    assert [int(c[0]) for c in chunks] == [4, 4, 6, 5, 5, 4]
+    assert sched.get() is None
+    assert len(synth.calls) == 6
+    assert sched.time_to_first_audio is not None
+    assert sched.get_stats()["chunks_played"] == 6
+
+
+def test_next_chunk_is_synthesised_while_current_plays():
+    synth = _Synth(delay=0.03)
+    sched = SpeechScheduler(synth, lookahead=1)
+    sched.feed("Alpha one. Beta two. Gamma three.")
+    sched.close()
+    for chunk in sched:
+        synth.events.append(("play_start", int(chunk[0])))
+        time.sleep(0.05)
+        synth.events.append(("play_end", int(chunk[0])))
+    order = [e[0] for e in synth.events]
+    # Beta is rendered before Alpha has finished playing
+    assert order.index("synth", 1) < order.index("play_end")
+
+
+def test_cancel_stops_synthesis():
+    synth = _Synth(delay=0.01)
+    sched = SpeechScheduler(synth, lookahead=1)
+    sched.feed(" ".join(f"Sentence {i}." for i in range(20)))
+    sched.close()
+    assert sched.get(timeout=2) is not None
+    sched.cancel()
+    time.sleep(0.1)
+    assert len(synth.calls) < 5
+    assert not sched._worker.is_alive()
+
+
+def test_phrase_cache_ram_disk_and_budget(tmp_path):
+    cache = PhraseAudioCache(cache_dir=tmp_path, ram_budget_mb=0.01, disk_budget_mb=1)
+    key = cache.key("f5tts", "voice", "Sure.", speaking_rate=1.0)
+    assert key == cache.key("f5tts", "voice", "  Sure. ", speaking_rate=1.0)
+    assert key != cache.key("piper", "voice", "Sure.", speaking_rate=1.0)
+
+    audio, cached = cache.get_or_create(key, lambda: (_audio("Sure."), True))
+    assert not cached
+    again, cached = cache.get_or_create(key, lambda: pytest.fail("re-synthesised"))
+    assert cached and again is audio
+    assert not again.flags.writeable
+
+    # Fresh instance (restart): served from disk
+    reloaded = PhraseAudioCache(cache_dir=tmp_path, ram_budget_mb=0.01)
+    np.testing.assert_array_equal(reloaded.get(key), audio)
+    assert reloaded.hits["disk"] == 1
+
+    # RAM budget (~10 KB) keeps only the most recent large phrases
+    for i in range(5):
+        cache.put(f"k{i}", np.zeros(1000, dtype=np.float32), persist=False)
+    assert cache.get_stats()["ram_mb"] <= 0.01
+    assert "k4" in cache._ram and "k0" not in cache._ram
+
+
+def test_phrase_cache_single_flight_and_uncacheable_results(tmp_path):
+    cache = PhraseAudioCache(cache_dir=tmp_path)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return _audio("Hello."), True
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", slow)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(results) == 4
+    assert sum(not cached for _, cached in results) == 1
+
+    cache.get_or_create("fallback", lambda: (_audio("x"), False))
+    assert cache.get("fallback") is None
+
+
+def test_synthesize_phrase_caches_only_the_expected_engine(tmp_path):
+    from backend.agent.tts import get_tts_manager
+
+    tts = get_tts_manager()
+    cache = PhraseAudioCache(cache_dir=tmp_path)
+    produced = {"engine": "piper"}
+    calls = []
+
+    def fake_stream(text, used=None):
+        calls.append(text)
+        used["engine"] = produced["engine"]
+        yield _audio(text)
+
+    with patch.object(tts, "synthesize_stream", side_effect=fake_stream), \
+            patch.object(tts, "voice_identity", return_value=("piper", "ryan")):
+        a = tts.synthesize_phrase("All done.", cache=cache)
+        b = tts.synthesize_phrase("All done.", cache=cache)
+        np.testing.assert_array_equal(a, b)
+        assert calls == ["All done."]
+
+        produced["engine"] = "pyttsx3"          # Piper failed, fallback spoke
+        tts.synthesize_phrase("Sorry.", cache=cache)
+        tts.synthesize_phrase("Sorry.", cache=cache)
+        assert calls == ["All done.", "Sorry.", "Sorry."]
+
+
+def test_prefetched_sentences_are_reused_by_the_scheduler(tmp_path):
+    cache = PhraseAudioCache(cache_dir=tmp_path)
+    synth = _Synth(delay=0.02)
+
+    def synthesize_phrase(text):
+        return cache.get_or_create(text, lambda: (synth(text), True))[0]
+
+    prefetch = PhrasePrefetcher(synthesize_phrase, prepare=str.strip, max_phrases=2)
+    for token in ["Sure", ", I can", " help. ", "First", " step. ", "Then more. ", "End."]:
+        prefetch.feed(token)
+    prefetch.close()
+    assert prefetch.submitted == ["Sure, I can help.", "First step."]
+
+    # Playback starts while the second prefetch may still be in flight
+    sched = SpeechScheduler(synthesize_phrase, lookahead=2)
+    sched.feed("Sure, I can help. First step. Then more. End.")
+    sched.close()
+    assert len(list(sched)) == 4
+    prefetch.join(1)
+    assert sorted(synth.calls) == sorted(["Sure, I can help.", "First step.", "Then more.", "End."])
+
+
+def test_speak_response_plays_all_chunks():
+    from backend.iris_gateway import IRISGateway
+
+    gateway = IRISGateway.__new__(IRISGateway)
+    gateway._logger = MagicMock()
+    gateway._main_loop = None
+    engine = MagicMock()
+    engine.is_speech_interrupted.return_value = False
+    played = []
+    engine.pipeline.play_audio.side_effect = lambda audio, sample_rate: played.append(int(audio[0]))
+    tts = MagicMock()
+    tts.synthesize_phrase.side_effect = _audio
+
+    with patch("backend.audio.engine.get_audio_engine", return_value=engine), \
+            patch("backend.agent.get_tts_manager", return_value=tts):
+        gateway._speak_response("**Hello** there. How are you today?")
+
+    assert played == [12, 18]
+    assert [c.args[0] for c in tts.synthesize_phrase.call_args_list] == [
+        "Hello there.", "How are you today?"]
+    engine.set_tts_active.assert_called_with(False)
+    gateway._logger.error.assert_not_called()
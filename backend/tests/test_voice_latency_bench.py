@@ -0,0 +1,88 @@
+"""
+Tests for audio/latency_bench.py — end-to-end voice latency harness
+
+Key requirements:
+  - synthetic fixtures are deterministic; WAV fixtures keep their native rate
+  - a turn runs headless through AudioPipeline and VoiceCommandHandler and
+    yields ordered milestones from end-of-speech to first audio
+  - fake backend latencies show up in the matching stage
+  - the report is JSON-serialisable with per-stage percentiles
+  - speculative TTS prefetch takes synthesis off the first-audio path
+
+Run: python -m pytest backend/tests/test_voice_latency_bench.py -v
+"""
+
+import json
+import wave
+
+import numpy as np
+
+from backend.audio.latency_bench import (
+    MILESTONES, STAGES, FakeLLM, FakeSTT, FakeTTS, VoiceLatencyHarness,
+    load_wav_fixture, synthetic_utterance,
+)
+
+
+def _harness(**kwargs):
+    return VoiceLatencyHarness(
+        stt=FakeSTT(latency_s=0.02, per_audio_s=0.0),
+        llm=FakeLLM(first_token_s=0.1, token_s=0.01, reply="Okay. {transcript}. Done now."),
+        tts=FakeTTS(latency_s=0.2, per_char_s=0.0),
+        speed=2.0,
+        **kwargs,
+    )
+
+
+def test_fixtures(tmp_path):
+    a = synthetic_utterance("turn on the lights", seed=3)
+    b = synthetic_utterance("turn on the lights", seed=3)
+    np.testing.assert_array_equal(a.audio, b.audio)
+    assert a.transcript == "turn on the lights"
+    assert 0.3 < a.speech_end_s < a.duration_s - 1.0
+
+    path = tmp_path / "clip.wav"
+    pcm = np.zeros(48_000, dtype=np.int16)
+    pcm[4_800:24_000] = 6_000
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(48_000)
+        wf.writeframes(pcm.tobytes())
+    clip = load_wav_fixture(path, "hello")
+    assert clip.sample_rate == 48_000 and clip.name == "clip"
+    assert abs(clip.speech_end_s - 0.5) < 0.04
+    assert clip.duration_s > 1.0 + 1.0          # silence tail appended
+
+
+def test_turn_milestones_and_report():
+    harness = _harness()
+    try:
+        report = harness.bench([synthetic_utterance("what time is it")], runs=2, warmup=0)
+    finally:
+        harness.close()
+
+    json.dumps(report)
+    assert report["failures"] == 0
+    for run in report["runs"]:
+        assert run["text"] == "what time is it"
+        times = [run[m] for m in MILESTONES]
+        assert times == sorted(times) and times[0] > 0
+        assert abs(sum(run[s] for s in STAGES) - run["first_audio"]) < 0.1
+        assert run["llm_first_token"] >= 99
+    stats = report["latency_ms"]["first_audio"]
+    assert stats["n"] == 2 and stats["min"] <= stats["p50"] <= stats["p99"] <= stats["max"]
+    assert report["config"]["stt"] == {"backend": "FakeSTT", "latency_s": 0.02,
+                                       "per_audio_s": 0.0, "jitter": 0.0}
+
+
+def test_speculative_prefetch_hides_tts_latency():
+    fixture = synthetic_utterance("play some music", sample_rate=48_000)
+    results = {}
+    for speculative in (True, False):
+        harness = _harness(speculative=speculative)
+        try:
+            results[speculative] = harness.run(fixture)
+        finally:
+            harness.close()
+    assert results[False]["tts_first_audio"] >= 190
+    assert results[True]["tts_first_audio"] < results[False]["tts_first_audio"] - 50
@@ -448,6 +448,7 @@ class TestAudioLevelCallback:
         with patch("backend.audio.engine.AudioEngine.__init__", lambda self: None):
             engine = object.__new__(__import__("backend.audio.engine", fromlist=["AudioEngine"]).AudioEngine)
             engine.pipeline = None
+        from backend.audio.ring_buffer import FrameBuffer
         from backend.audio.voice_command import VoiceCommandHandler
         with patch.object(VoiceCommandHandler, "warm_up"):
             handler = VoiceCommandHandler.__new__(VoiceCommandHandler)
@@ -459,7 +460,7 @@ class TestAudioLevelCallback:
             handler.state = __import__("backend.audio.voice_command", fromlist=["VoiceState"]).VoiceState.IDLE
             handler.is_recording = False
             handler.audio_buffer = []
-            handler._raw_frames = []
+            handler._raw_frames = FrameBuffer(int(VoiceCommandHandler.RECORDING_CAPACITY_SEC * 16000))
             handler.sample_rate = 16000
             handler._active_session_id = "test-session"
             handler._auto_stop_mode = False
@@ -0,0 +1,317 @@
+"""
+Tests for agent/vps_routing.py — VPSGateway request routing
+
+Key requirements:
+  - each endpoint has a long-lived keep-alive client: repeated requests reuse
+    one connection and carry the auth header
+  - synchronous callers (infer_sync) all run on the gateway's one loop, so
+    the keep-alive clients never outlive the loop they were created on
+  - the circuit breaker opens after consecutive failures, admits a single
+    half-open probe after the cooldown and doubles the cooldown when the
+    probe fails
+  - a failing endpoint's request fails over to the next one, and once its
+    circuit is open it receives no traffic; EWMA routing prefers the faster
+    endpoint
+  - a request slower than the endpoint's p95 is hedged on another endpoint
+    and the slower copy is cancelled
+  - streaming (SSE or NDJSON) yields chat chunks shaped like
+    LocalModelManager.create_chat_completion_stream as tokens arrive, awaits
+    async token callbacks, and records TTFT per endpoint
+  - a stream that dies mid-way resumes on another endpoint without repeating
+    delivered text; errors raised by the consumer are not retried
+
+Run: python -m pytest backend/tests/test_vps_routing.py -v
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.agent.vps_gateway import LoadBalancingStrategy, VPSConfig, VPSGateway
+from backend.agent.vps_routing import CircuitBreaker, EndpointRouter
+
+
+class StubVPS:
+    """Local HTTP server speaking the /api/v1/infer + /api/v1/health protocol."""
+
+    def __init__(self, name):
+        self.name = name
+        self.delay = 0.0
+        self.status = 200
+        self.infer_calls = 0
+        self.connections = set()
+        self.auth = []
+        # Streaming: tokens, SSE or NDJSON framing, drop the connection after N tokens
+        self.tokens = ["Hel", "lo", " the", "re", "!"]
+        self.sse = True
+        self.fail_after = None
+        self.token_delay = 0.0
+        self.stream_bodies = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except OSError:
+                    pass        # client cancelled (hedge loser)
+
+            def do_GET(self):
+                self._reply(200, {"status": "ok"})
+
+            def _stream(self, body):
+                stub.stream_bodies.append(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream" if stub.sse
+                                 else "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                offset = 0          # restarts from scratch, reporting offsets
+                for i, token in enumerate(stub.tokens):
+                    if stub.fail_after is not None and i == stub.fail_after:
+                        self.close_connection = True
+                        return      # no terminating chunk: the client sees a broken stream
+                    event = json.dumps({"text": token, "offset": offset})
+                    offset += len(token)
+                    line = f"data: {event}\n\n" if stub.sse else event + "\n"
+                    self.wfile.write(f"{len(line):x}\r\n{line}\r\n".encode())
+                    self.wfile.flush()
+                    time.sleep(stub.token_delay)
+                tail = "data: [DONE]\n\n" if stub.sse else ""
+                if tail:
+                    self.wfile.write(f"{len(tail):x}\r\n{tail}\r\n".encode())
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path.endswith("/stream"):
+                    return self._stream(json.loads(body))
+                stub.infer_calls += 1
+                stub.connections.add(self.client_address)
+                stub.auth.append(self.headers.get("Authorization"))
+                time.sleep(stub.delay)
+                if stub.status != 200:
+                    return self._reply(stub.status, {"error": "boom"})
+                prompt = json.loads(body)["prompt"]
+                self._reply(200, {"text": f"{stub.name}:{prompt}", "model": "m", "latency_ms": 1.0})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    servers = [StubVPS("a"), StubVPS("b")]
+    yield servers
+    for server in servers:
+        server.close()
+
+
+def _gateway(stubs, **overrides):
+    config = VPSConfig(enabled=True, endpoints=[s.url for s in stubs], auth_token="tok",
+                       health_check_interval=0, fallback_to_local=False, **overrides)
+    return VPSGateway(config, model_router=None)
+
+
+def test_keepalive_client_per_endpoint(stubs):
+    async def scenario():
+        gateway = _gateway(stubs)
+        await gateway.initialize()
+        try:
+            for i in range(5):
+                assert await gateway.infer("m", f"p{i}", {}, {}) == f"a:p{i}"
+        finally:
+            await gateway.shutdown()
+
+    asyncio.run(scenario())
+    assert stubs[0].infer_calls == 5 and len(stubs[0].connections) == 1
+    assert set(stubs[0].auth) == {"Bearer tok"}
+
+
+def test_sync_calls_share_one_loop(stubs):
+    gateway = _gateway(stubs)
+    try:
+        for i in range(4):
+            assert gateway.infer_sync("m", f"p{i}", {}, {}) == f"a:p{i}"
+        thread = gateway._loop_thread
+        assert thread.is_alive() and len(stubs[0].connections) == 1
+        assert gateway._router.breakers[stubs[0].url].state == "closed"
+    finally:
+        asyncio.run(gateway.shutdown())
+    assert not thread.is_alive() and gateway._router is None
+
+
+def test_circuit_breaker_half_open_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10.0, clock=lambda: now[0])
+    assert breaker.acquire() and not breaker.record_failure()
+    assert breaker.record_failure() and breaker.state == "open" and not breaker.available()
+
+    now[0] = 10.0
+    assert breaker.state == "half_open" and breaker.acquire()
+    assert not breaker.acquire()                   # one probe at a time
+    assert breaker.record_failure()                # probe failed: cooldown doubles
+    now[0] = 29.0
+    assert not breaker.available()
+    now[0] = 30.0
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.acquire()
+
+
+def test_failover_circuit_and_ewma(stubs):
+    bad, good = stubs
+    bad.status = 500
+
+    async def scenario():
+        gateway = _gateway(stubs, circuit_failure_threshold=2, circuit_cooldown=60)
+        await gateway.initialize()
+        try:
+            for i in range(4):
+                assert await gateway.infer("m", f"p{i}", {}, {}) == f"b:p{i}"
+            status = gateway.get_status()["health_status"]
+            assert status[bad.url]["routing"]["circuit"] == "open"
+            assert status[bad.url]["consecutive_failures"] == 2
+            assert status[good.url]["routing"]["requests"] == 4
+        finally:
+            await gateway.shutdown()
+
+    asyncio.run(scenario())
+    assert bad.infer_calls == 2          # no traffic once the circuit opened
+
+    # EWMA routing: the faster endpoint takes the traffic
+    bad.status, bad.delay = 200, 0.05
+
+    async def ewma():
+        gateway = _gateway(stubs, load_balancing=True,
+                           load_balancing_strategy=LoadBalancingStrategy.EWMA)
+        await gateway.initialize()
+        try:
+            return [await gateway.infer("m", "x", {}, {}) for _ in range(10)]
+        finally:
+            await gateway.shutdown()
+
+    answers = asyncio.run(ewma())
+    assert answers.count("b:x") >= 8
+
+
+def test_hedged_request_cancels_slow_copy(stubs):
+    slow, fast = stubs
+
+    async def scenario():
+        router = EndpointRouter([slow.url, fast.url], timeout=5.0, hedge=True)
+        try:
+            for _ in range(EndpointRouter.HEDGE_MIN_SAMPLES):
+                await router.request("POST", "/api/v1/infer", [slow.url],
+                                     json={"prompt": "warm"})
+            slow.delay = 1.0
+            start = time.perf_counter()
+            endpoint, response = await router.request(
+                "POST", "/api/v1/infer", [slow.url, fast.url], json={"prompt": "q"})
+            elapsed = time.perf_counter() - start
+            return endpoint, response.json()["text"], elapsed, router.snapshot(slow.url)
+        finally:
+            await router.aclose()
+
+    endpoint, text, elapsed, slow_stats = asyncio.run(scenario())
+    assert endpoint == fast.url and text == "b:q"
+    assert elapsed < 0.5
+    # The cancelled copy is neither an error nor a latency sample
+    assert slow_stats["in_flight"] == 0 and slow_stats["errors"] == 0
+    assert slow_stats["circuit"] == "closed"
+
+
+def _stream(gateway, on_token=None):
+    async def collect():
+        chunks = []
+        async for chunk in gateway.infer_stream("m", "hi", {}, {}, on_token=on_token):
+            chunks.append((time.perf_counter(), chunk))
+        return chunks
+    return collect()
+
+
+def test_stream_chunks_ttft_and_async_callback(stubs):
+    sse = stubs[0]
+    sse.token_delay = 0.05
+    heard = []
+
+    async def on_token(token):
+        await asyncio.sleep(0)
+        heard.append(token)
+
+    async def scenario():
+        gateway = _gateway(stubs)
+        await gateway.initialize()
+        try:
+            start = time.perf_counter()
+            chunks = await _stream(gateway, on_token)
+            return start, chunks, gateway.get_status()["health_status"][sse.url]["routing"]
+        finally:
+            await gateway.shutdown()
+
+    start, chunks, routing = asyncio.run(scenario())
+    deltas = [c["choices"][0]["delta"].get("content") for _, c in chunks]
+    assert deltas == sse.tokens + [None] and heard == sse.tokens
+    assert chunks[-1][1]["choices"][0]["finish_reason"] == "stop"
+    # Tokens arrive as they are generated, not after the whole completion
+    assert chunks[0][0] - start < chunks[-1][0] - start - 0.15
+    assert routing["ewma_ttft_ms"] is not None and routing["in_flight"] == 0
+    assert sse.stream_bodies[0]["stream"] is True
+
+
+def test_stream_resumes_on_mid_stream_failure(stubs):
+    dying, backup = stubs
+    dying.fail_after = 3
+    backup.sse = False              # NDJSON framing on the second endpoint
+
+    async def scenario():
+        gateway = _gateway(stubs)
+        await gateway.initialize()
+        try:
+            chunks = await _stream(gateway)
+            return "".join(c["choices"][0]["delta"].get("content") or "" for _, c in chunks)
+        finally:
+            await gateway.shutdown()
+
+    assert asyncio.run(scenario()) == "Hello there!"
+    # The backup was told what the user already has, and its replay was de-duplicated
+    assert backup.stream_bodies[0]["resume_from"] == "Hello the"
+
+
+def test_stream_consumer_errors_are_not_retried(stubs):
+    def on_token(token):
+        raise ValueError("consumer gave up")
+
+    async def scenario():
+        gateway = _gateway(stubs)
+        await gateway.initialize()
+        try:
+            with pytest.raises(ValueError, match="consumer gave up"):
+                await _stream(gateway, on_token)
+            return gateway.get_status()["health_status"][stubs[0].url]["routing"]
+        finally:
+            await gateway.shutdown()
+
+    routing = asyncio.run(scenario())
+    assert stubs[1].stream_bodies == []
+    assert routing["errors"] == 0 and routing["in_flight"] == 0 and routing["circuit"] == "closed"
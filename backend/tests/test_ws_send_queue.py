@@ -0,0 +1,163 @@
+"""
+Tests for ws_manager.py — per-client bounded send queues
+
+Key requirements:
+  - broadcast does not await individual sockets (slow client can't stall others)
+  - coalescible types keep only the latest queued copy per entity (download
+    progress per model); status deltas are never coalesced or dropped
+  - full queue sheds droppable messages first, then disconnects a stalled client
+  - failed socket writes disconnect the client
+  - per-client queue metrics are exposed
+
+Run: python -m pytest backend/tests/test_ws_send_queue.py -v
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.ws_manager import ClientSender, WebSocketManager
+
+
+class _FakeSocket:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.gate = None
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(message)
+
+
+async def _drain(sender, timeout: float = 1.0):
+    """Wait (bounded) until everything queued on ``sender`` has been written."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while sender._queue and loop.time() < deadline:
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0)
+
+
+def _make_manager():
+    session = MagicMock()
+    session.connected_clients = set()
+    session_manager = MagicMock()
+    session_manager.get_session.return_value = session
+    session_manager.client_to_session = {}
+
+    def _associate(client_id, session_id):
+        session.connected_clients.add(client_id)
+        session_manager.client_to_session[client_id] = session_id
+
+    session_manager.associate_client_with_session.side_effect = _associate
+    session_manager.dissociate_client.side_effect = lambda cid: session.connected_clients.discard(cid)
+    return WebSocketManager(session_manager=session_manager, state_manager=MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_broadcast():
+    manager = _make_manager()
+    slow, fast = _FakeSocket(), _FakeSocket()
+    slow.gate = asyncio.Event()          # never released during the test
+    await manager.connect(slow, "slow", "s1")
+    await manager.connect(fast, "fast", "s1")
+
+    await asyncio.wait_for(manager.broadcast({"type": "state_sync", "payload": {}}), 0.1)
+    await asyncio.wait_for(
+        manager.broadcast_to_session("s1", {"type": "text_response", "payload": {}}), 0.1
+    )
+    await _drain(manager._senders["fast"])
+    assert [m["type"] for m in fast.sent] == ["state_sync", "text_response"]
+    assert slow.sent == []
+
+    manager.disconnect("slow")
+    manager.disconnect("fast")
+
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_latest_status():
+    sender = ClientSender("c1", _FakeSocket(), max_depth=8, on_failure=lambda s: None)
+    for i in range(5):
+        sender.enqueue({"type": "local_model_status", "payload": {"n": i}})
+    assert sender.get_metrics()["queue_depth"] == 1
+    assert sender.get_metrics()["coalesced"] == 4
+
+    # Per-model progress: one download never overwrites another's
+    for pct in (10, 20):
+        for name in ("a.gguf", "b.gguf"):
+            sender.enqueue({"type": "gguf_download_progress",
+                            "payload": {"repo_id": "r", "filename": name, "pct": pct}})
+    # Status deltas must each arrive
+    for seq in (1, 2):
+        sender.enqueue({"type": "system_status", "payload": {"seq": seq}})
+    assert sender.get_metrics()["queue_depth"] == 5
+
+    sender.start()
+    await _drain(sender)
+    assert sender.websocket.sent == [
+        {"type": "local_model_status", "payload": {"n": 4}},
+        {"type": "gguf_download_progress", "payload": {"repo_id": "r", "filename": "a.gguf", "pct": 20}},
+        {"type": "gguf_download_progress", "payload": {"repo_id": "r", "filename": "b.gguf", "pct": 20}},
+        {"type": "system_status", "payload": {"seq": 1}},
+        {"type": "system_status", "payload": {"seq": 2}},
+    ]
+    sender.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_sheds_droppable_then_fails_stalled_client():
+    failed = []
+    sender = ClientSender("c1", _FakeSocket(), max_depth=3, on_failure=failed.append)
+    sender.enqueue({"type": "inference_event"})
+    sender.enqueue({"type": "chat_message"})
+    sender.enqueue({"type": "chat_message"})
+
+    # Droppable message on a full queue is dropped outright
+    assert sender.enqueue({"type": "audio_level"}) is True
+    assert sender.dropped == 1
+
+    # Critical message evicts the queued droppable one
+    assert sender.enqueue({"type": "text_response"}) is True
+    assert sender.dropped == 2
+    assert [m["type"] for m in sender._queue] == ["chat_message", "chat_message", "text_response"]
+
+    # Nothing left to shed: client is considered stalled
+    assert sender.enqueue({"type": "text_response"}) is False
+    assert failed == [sender]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_disconnects_client():
+    manager = _make_manager()
+    ws = _FakeSocket(fail=True)
+    await manager.connect(ws, "c1", "s1")
+    assert await manager.send_to_client("c1", {"type": "ping"}) is True
+    await asyncio.sleep(0.01)
+    assert "c1" not in manager.active_connections
+    assert await manager.send_to_client("c1", {"type": "ping"}) is False
+
+
+@pytest.mark.asyncio
+async def test_client_metrics_exposed():
+    manager = _make_manager()
+    ws = _FakeSocket()
+    await manager.connect(ws, "c1", "s1")
+    await manager.send_to_client("c1", {"type": "chat_message"})
+    await _drain(manager._senders["c1"])
+    metrics = manager.get_client_metrics()["c1"]
+    assert metrics["sent"] == 1
+    assert metrics["queue_depth"] == 0
+    assert {"dropped", "coalesced", "max_queue_depth"} <= set(metrics)
+    manager.disconnect("c1")
+    assert manager.get_client_metrics() == {}
@@ -5,7 +5,8 @@ Handles client connections, session association, and message routing.
 import json
 import logging
 import asyncio
-from typing import Dict, List, Set, Optional
+from collections import deque
+from typing import Deque, Dict, List, Set, Optional
 from fastapi import WebSocket
 from datetime import datetime
 import time
@@ -14,6 +15,193 @@ logger = logging.getLogger(__name__)
 
 from .sessions import get_session_manager, SessionManager
 from .state_manager import get_state_manager, StateManager
+from .monitoring.metrics import get_metrics_registry
+from .monitoring.tracing import NOOP_SPAN, span as trace_span
+
+_metrics = get_metrics_registry()
+_WS_SEND_SECONDS = _metrics.summary(
+    "iris_ws_send_seconds", "Time to write one WebSocket frame to the socket")
+_WS_DROPPED = _metrics.counter(
+    "iris_ws_dropped_messages_total", "Droppable messages shed because a send queue was full")
+
+
+# Message types where only the newest queued copy matters: a pending message
+# with the same coalesce key is replaced in place instead of appending another
+# one.  Only full-state messages belong here — system_status carries deltas
+# against the previous message, so replacing one would lose changes.
+COALESCE_TYPES = frozenset({
+    "audio_level",
+    "voice_partial_transcript",
+    "gguf_download_progress",
+    "local_model_status",
+})
+
+# Payload fields that identify the entity a coalescible message is about;
+# messages for different entities (e.g. two downloads) never replace each other.
+COALESCE_KEY_FIELDS = {
+    "gguf_download_progress": ("repo_id", "filename"),
+}
+
+# Message types that may be discarded when a client's queue is full: purely
+# transient readouts that the next message supersedes.  Everything else
+# (chat, state, status, download results, errors) is never silently dropped.
+DROPPABLE_TYPES = frozenset({
+    "audio_level",
+    "voice_partial_transcript",
+    "inference_event",
+    "chat_typing",
+})
+
+
+def _coalesce_key(message: dict) -> tuple:
+    msg_type = message.get("type", "")
+    payload = message.get("payload") or {}
+    return (msg_type,) + tuple(payload.get(f) for f in COALESCE_KEY_FIELDS.get(msg_type, ()))
+
+
+class ClientSender:
+    """
+    Bounded outbound queue plus a dedicated sender task for one WebSocket.
+
+    enqueue() never awaits the socket, so a slow or half-dead client only
+    backs up its own queue.  When the queue is full, droppable messages are
+    shed first; if nothing can be shed the client is treated as stalled and
+    on_failure() is called so the manager can disconnect it.
+    """
+
+    def __init__(self, client_id: str, websocket: WebSocket, max_depth: int, on_failure):
+        self.client_id = client_id
+        self.websocket = websocket
+        self._max_depth = max_depth
+        self._on_failure = on_failure
+        self._queue: Deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        # id(message) -> "ws.send" span, only for messages queued inside a trace
+        self._spans: Dict[int, object] = {}
+
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth_seen = 0
+        self.last_send_ms = 0.0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"ws-send-{self.client_id}")
+
+    def enqueue(self, message: dict) -> bool:
+        """Queue a message without awaiting the socket. Returns False if closed or stalled."""
+        if self._closed:
+            return False
+        msg_type = message.get("type", "")
+
+        if msg_type in COALESCE_TYPES:
+            key = _coalesce_key(message)
+            for i, queued in enumerate(self._queue):
+                if queued.get("type") == msg_type and _coalesce_key(queued) == key:
+                    self._end_span(queued, "coalesced")
+                    self._queue[i] = message
+                    self._track(message)
+                    self.coalesced += 1
+                    return True
+
+        if len(self._queue) >= self._max_depth:
+            if msg_type in DROPPABLE_TYPES:
+                self.dropped += 1
+                _WS_DROPPED.inc()
+                return True
+            if not self._evict_droppable():
+                logger.warning(
+                    f"Send queue for {self.client_id} full ({self._max_depth}) — client stalled"
+                )
+                self.close()
+                self._on_failure(self)
+                return False
+
+        self._queue.append(message)
+        self._track(message)
+        self.enqueued += 1
+        if len(self._queue) > self.max_depth_seen:
+            self.max_depth_seen = len(self._queue)
+        self._wakeup.set()
+        return True
+
+    def _evict_droppable(self) -> bool:
+        for i, queued in enumerate(self._queue):
+            if queued.get("type") in DROPPABLE_TYPES:
+                del self._queue[i]
+                self._end_span(queued, "dropped")
+                self.dropped += 1
+                _WS_DROPPED.inc()
+                return True
+        return False
+
+    def _track(self, message: dict) -> None:
+        # Queue wait + socket write, attributed to the turn that queued it
+        span = trace_span("ws.send", type=message.get("type", ""))
+        if span is not NOOP_SPAN:
+            self._spans[id(message)] = span
+
+    def _end_span(self, message: dict, error: Optional[str] = None) -> None:
+        if self._spans:
+            span = self._spans.pop(id(message), None)
+            if span is not None:
+                span.end(error=error)
+
+    async def _run(self) -> None:
+        try:
+            while not self._closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                message = self._queue.popleft()
+                started = time.perf_counter()
+                try:
+                    await self.websocket.send_json(message)
+                except Exception as e:
+                    logger.error(f"Error sending to {self.client_id}: {e}")
+                    self._end_span(message, "send_failed")
+                    self.close()
+                    self._on_failure(self)
+                    return
+                elapsed = time.perf_counter() - started
+                self._end_span(message)
+                _WS_SEND_SECONDS.observe(elapsed)
+                self.last_send_ms = elapsed * 1000
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+
+    def close(self) -> None:
+        self._closed = True
+        self._queue.clear()
+        for span in self._spans.values():
+            span.end(error="closed")
+        self._spans.clear()
+        self._wakeup.set()
+        if self._task and not self._task.done() and self._task is not _current_task():
+            self._task.cancel()
+
+    def get_metrics(self) -> dict:
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth_seen,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_send_ms": round(self.last_send_ms, 2),
+        }
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
 
 
 class WebSocketManager:
@@ -29,6 +217,7 @@ class WebSocketManager:
     # backlogged for several seconds, preventing the pong message from being
     # processed before the 5 s window expired.  30 s gives plenty of headroom
     # while still catching genuinely dead connections (which never pong at all).
+    SEND_QUEUE_DEPTH = 256  # max pending outbound messages per client
     
     def __init__(self, session_manager: Optional[SessionManager] = None, state_manager: Optional[StateManager] = None):
         import time
@@ -40,6 +229,9 @@ class WebSocketManager:
         self._state_manager = state_manager or get_state_manager()
         self._heartbeat_tasks: Dict[str, asyncio.Task] = {}
         self._last_pong: Dict[str, datetime] = {}
+        self._senders: Dict[str, ClientSender] = {}
+        _metrics.gauge("iris_ws_clients", "Connected WebSocket clients").set_function(
+            lambda: len(self.active_connections))
         
         logger.info(f"[WebSocketManager] Initialization complete (elapsed: {time.time() - start_time:.3f}s)")
     
@@ -71,6 +263,9 @@ class WebSocketManager:
                     f"Client {client_id} reconnecting — replacing stale connection entry"
                 )
                 self.active_connections.pop(client_id)
+                stale_sender = self._senders.pop(client_id, None)
+                if stale_sender:
+                    stale_sender.close()
                 # Cancel the stale heartbeat task.
                 if client_id in self._heartbeat_tasks:
                     self._heartbeat_tasks[client_id].cancel()
@@ -104,6 +299,9 @@ class WebSocketManager:
                 return None
 
             self.active_connections[client_id] = websocket
+            sender = ClientSender(client_id, websocket, self.SEND_QUEUE_DEPTH, self._on_sender_failure)
+            self._senders[client_id] = sender
+            sender.start()
             
             # Create or get session with error handling
             try:
@@ -147,6 +345,7 @@ class WebSocketManager:
                 # Clean up connection
                 if client_id in self.active_connections:
                     del self.active_connections[client_id]
+                self._close_sender(client_id)
                 return None
 
             # Associate client with session
@@ -166,6 +365,7 @@ class WebSocketManager:
             # Clean up any partial state
             if client_id in self.active_connections:
                 del self.active_connections[client_id]
+            self._close_sender(client_id)
             return None
     
     def disconnect(self, client_id: str):
@@ -191,8 +391,23 @@ class WebSocketManager:
             if client_id in self._last_pong:
                 del self._last_pong[client_id]
 
+            self._close_sender(client_id)
+
             logger.debug(f"Client {client_id} disconnected from session {session_id}. Total clients: {len(self.active_connections)}")
     
+    def _close_sender(self, client_id: str) -> None:
+        sender = self._senders.pop(client_id, None)
+        if sender:
+            sender.close()
+
+    def _on_sender_failure(self, sender: ClientSender) -> None:
+        """Called by a ClientSender whose socket write failed or whose queue overflowed."""
+        # Identity check: only remove the stale socket that failed.
+        # A concurrent reconnect may have already replaced active_connections[client_id]
+        # with a fresh (accepted) socket — don't evict that new connection.
+        if self.active_connections.get(sender.client_id) is sender.websocket:
+            self.disconnect(sender.client_id)
+
     async def _heartbeat_loop(self, client_id: str):
         """
         Send ping messages every PING_INTERVAL seconds.
@@ -272,45 +487,25 @@ class WebSocketManager:
 
     async def send_to_client(self, client_id: str, message: dict) -> bool:
         """
-        Send a message to a specific client.
-        Returns True if sent successfully.
+        Queue a message for a specific client.
+        Returns True if the message was accepted by the client's send queue;
+        the write itself happens on the client's sender task.
         """
-        websocket = self.active_connections.get(client_id)
-        if not websocket:
-            return False
-
-        try:
-            await websocket.send_json(message)
-            return True
-        except Exception as e:
-            logger.error(f"Error sending to {client_id}: {e}")
-            # Identity check: only remove the stale socket that failed.
-            # A concurrent reconnect may have already replaced active_connections[client_id]
-            # with a fresh (accepted) socket — don't evict that new connection.
-            if self.active_connections.get(client_id) is websocket:
-                self.disconnect(client_id)
+        sender = self._senders.get(client_id)
+        if sender is None:
             return False
+        return sender.enqueue(message)
 
     async def broadcast(self, message: dict, exclude_clients: Optional[Set[str]] = None):
-        """Broadcast a message to all connected clients."""
+        """Broadcast a message to all connected clients without awaiting any socket."""
         if exclude_clients is None:
             exclude_clients = set()
 
-        # Snapshot the dict so mutations during iteration (reconnects) don't
-        # cause RuntimeError.  Store (client_id, websocket) pairs so the
-        # identity check below can avoid evicting a freshly-reconnected socket.
-        snapshot = list(self.active_connections.items())
-        disconnected: list[tuple[str, object]] = []
-        for client_id, websocket in snapshot:
+        # Snapshot so mutations during iteration (reconnects, overflow
+        # disconnects) don't cause RuntimeError.
+        for client_id, sender in list(self._senders.items()):
             if client_id not in exclude_clients:
-                try:
-                    await websocket.send_json(message)
-                except Exception:
-                    disconnected.append((client_id, websocket))
-
-        for client_id, websocket in disconnected:
-            if self.active_connections.get(client_id) is websocket:
-                self.disconnect(client_id)
+                sender.enqueue(message)
 
     async def broadcast_to_session(self, session_id: str, message: dict, exclude_clients: Optional[Set[str]] = None):
         """Broadcast a message to all clients in a specific session."""
@@ -321,10 +516,18 @@ class WebSocketManager:
         if exclude_clients is None:
             exclude_clients = set()
 
-        clients_in_session = session.connected_clients
-        for client_id in clients_in_session:
+        for client_id in list(session.connected_clients):
             if client_id not in exclude_clients:
-                await self.send_to_client(client_id, message)
+                sender = self._senders.get(client_id)
+                if sender is not None:
+                    sender.enqueue(message)
+
+    def get_client_metrics(self, client_id: Optional[str] = None) -> Dict[str, dict]:
+        """Per-client queue depth, sent, dropped and coalesced counters."""
+        if client_id is not None:
+            sender = self._senders.get(client_id)
+            return {client_id: sender.get_metrics()} if sender else {}
+        return {cid: sender.get_metrics() for cid, sender in self._senders.items()}
 
     def get_connection_count(self) -> int:
         """Get number of active connections."""
@@ -32,6 +32,50 @@ interface IRISState {
   sections: Record<string, Record<string, unknown>[]>
 }
 
+// One JSON-patch-style operation from a delta state_sync (path is an RFC 6901 pointer)
+interface StatePatchOp {
+  op: "add" | "replace" | "remove"
+  path: string
+  value?: unknown
+}
+
+// Apply state_sync patch operations in place (mirrors backend/performance/state_delta.py)
+function applyStatePatch(doc: Record<string, unknown>, patch: StatePatchOp[]): void {
+  for (const op of patch) {
+    const tokens = op.path.split("/").slice(1).map(t => t.replace(/~1/g, "/").replace(/~0/g, "~"))
+    if (tokens.length === 0) continue
+    let target = doc
+    for (const token of tokens.slice(0, -1)) {
+      const child = target[token]
+      // Copy on write so React sees new object identities along the changed path
+      const next = (child && typeof child === "object" && !Array.isArray(child))
+        ? { ...(child as Record<string, unknown>) }
+        : {}
+      target[token] = next
+      target = next
+    }
+    const last = tokens[tokens.length - 1]
+    if (op.op === "remove") delete target[last]
+    else target[last] = op.value
+  }
+}
+
+// Merge a system_status delta into the held snapshot (mirrors diff_snapshot in
+// backend/api/status_snapshot.py: nested objects recurse, null removes a key)
+function mergeStatusDelta(doc: Record<string, unknown>, delta: Record<string, unknown>): Record<string, unknown> {
+  const next: Record<string, unknown> = { ...doc }
+  for (const [key, value] of Object.entries(delta)) {
+    const prev = next[key]
+    if (value === null) delete next[key]
+    else if (value && typeof value === "object" && !Array.isArray(value)
+             && prev && typeof prev === "object" && !Array.isArray(prev)) {
+      next[key] = mergeStatusDelta(prev as Record<string, unknown>, value as Record<string, unknown>)
+    }
+    else next[key] = value
+  }
+  return next
+}
+
 // Hook return type
 type VoiceState = "idle" | "listening" | "processing_conversation" | "processing_tool" | "speaking" | "error"
 
@@ -114,6 +158,9 @@ const NON_QUEUEABLE_TYPES = new Set([
   'ping', 'pong',
   'select_category', 'select_section', 'go_back',
   'expand_to_main', 'collapse_to_idle',
+  'resync_state',  // reconnect sends request_state, which returns a full snapshot
+  'request_status',  // likewise for system_status
+  'get_trace', 'metrics_snapshot',  // diagnostics reads — stale after a reconnect
 ])
 const RECONNECT_MAX_DELAY = 30_000   // 30 s ceiling
 const STABILITY_THRESHOLD = 10_000  // reset backoff counter after 10 s of uptime
@@ -191,6 +238,15 @@ export function useIRISWebSocket(
   // Timestamp tracking for out-of-order update handling
   const fieldTimestampsRef = useRef<Map<string, number>>(new Map())
 
+  // Versioned state: last full/patched state document and its revision.
+  // state_sync carries JSON-patch-style deltas against stateRevRef.
+  const stateDocRef = useRef<Record<string, unknown> | null>(null)
+  const stateRevRef = useRef<number | null>(null)
+
+  // System status: full snapshot plus seq-numbered deltas against statusSeqRef
+  const statusDocRef = useRef<Record<string, unknown> | null>(null)
+  const statusSeqRef = useRef<number | null>(null)
+
   // Update ref when callback changes
   useEffect(() => {
     onWakeDetectedRef.current = onWakeDetected
@@ -372,9 +428,26 @@ export function useIRISWebSocket(
       }
       case "initial_state":
       case "state_sync": {
-        const state: IRISState = payload.state as IRISState
+        if (payload.state === undefined && Array.isArray(payload.patch)) {
+          // Delta against a known revision; on a gap ask the backend to catch us up
+          if (stateDocRef.current === null || payload.base_rev !== stateRevRef.current) {
+            sendMessage("resync_state", { rev: stateRevRef.current })
+            break
+          }
+          if (payload.patch.length === 0) {
+            stateRevRef.current = payload.rev as number
+            break
+          }
+          applyStatePatch(stateDocRef.current, payload.patch as StatePatchOp[])
+          stateRevRef.current = payload.rev as number
+        } else {
+          stateDocRef.current = (payload.state ?? {}) as Record<string, unknown>
+          stateRevRef.current = typeof payload.rev === "number" ? payload.rev : null
+        }
+
+        const state: IRISState = stateDocRef.current as unknown as IRISState
         if (state && state.active_theme) setTheme(state.active_theme)
-        if (state && state.field_values) setFieldValues(state.field_values)
+        if (state && state.field_values) setFieldValues({ ...state.field_values })
         if (state && state.sections) setSections(state.sections)
         if (state && state.current_category !== undefined) setCurrentCategory(state.current_category)
         if (state && state.current_section !== undefined) setCurrentSection(state.current_section)
@@ -604,6 +677,19 @@ export function useIRISWebSocket(
         break
       }
 
+      case "voice_partial_transcript": {
+        // Streaming STT — committed text is final, tentative may still change
+        if (typeof window !== 'undefined') {
+          window.dispatchEvent(new CustomEvent('iris:voice_partial', {
+            detail: {
+              committed: typeof payload.committed === 'string' ? payload.committed : '',
+              tentative: typeof payload.tentative === 'string' ? payload.tentative : '',
+            }
+          }))
+        }
+        break
+      }
+
       case "text_response": {
         // Text response from LFM2-8B-A1B model
         if (process.env.NODE_ENV !== 'production') {
@@ -887,7 +973,10 @@ export function useIRISWebSocket(
       case "local_model_loading":
       case "gguf_download_progress":
       case "model_pin_updated":
-      case "hf_models_list": {
+      case "hf_models_list":
+      // ── Diagnostics ── turn waterfalls (get_trace) and metric snapshots
+      case "trace_waterfall":
+      case "metrics_snapshot": {
         // Forward to any panel that listens on iris:ws_message
         if (typeof window !== 'undefined') {
           window.dispatchEvent(new CustomEvent('iris:ws_message', {
@@ -994,9 +1083,22 @@ export function useIRISWebSocket(
       }
 
       case 'system_status': {
-        // Broadcast system snapshot — replaces FE polling in iris-launcher
+        // Full snapshot on connect / request, then deltas merged in seq order.
+        // Listeners always receive the whole status, never a partial delta.
+        const { delta, seq, base_seq, ...fields } = payload as Record<string, unknown>
+        if (delta) {
+          if (statusDocRef.current === null || base_seq !== statusSeqRef.current) {
+            // Missed a delta (or none held yet): ask for the full snapshot
+            sendMessage("request_status", {})
+            break
+          }
+          statusDocRef.current = mergeStatusDelta(statusDocRef.current, fields)
+        } else {
+          statusDocRef.current = fields
+        }
+        statusSeqRef.current = typeof seq === "number" ? seq : null
         if (typeof window !== 'undefined') {
-          window.dispatchEvent(new CustomEvent('iris:system_status', { detail: payload }))
+          window.dispatchEvent(new CustomEvent('iris:system_status', { detail: statusDocRef.current }))
         }
         break
       }
@@ -0,0 +1,152 @@
+"""
+bench_kernel_sessions.py — new-session cost of per-session AgentKernels.
+
+Creates 1, 10 and 50 sessions through get_agent_kernel() and, for each new
+session, measures the time from the first get_agent_kernel() call to the
+first streamed token of a direct response, plus the process RSS once all
+sessions exist.  Inference goes to a local OpenAI-compatible stub that
+streams a fixed reply, so the numbers reflect kernel setup, context
+assembly and client/connection reuse rather than model speed.
+
+--unshared gives every kernel its own KernelResources (its own ModelRouter,
+classifier and HTTP client), approximating the old per-session setup.
+
+Usage:
+  python scripts/bench_kernel_sessions.py
+  python scripts/bench_kernel_sessions.py --sessions 1 10 50 100 --unshared
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class _StubLLM(BaseHTTPRequestHandler):
+    """OpenAI chat completions, streamed as SSE over HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    tokens = ["Hello", " from", " the", " stub", "."]
+    token_delay = 0.002
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in self.tokens:
+            time.sleep(self.token_delay)
+            event = {"id": "bench", "object": "chat.completion.chunk", "created": 0,
+                     "model": "bench", "choices": [{"index": 0, "delta": {"content": token},
+                                                    "finish_reason": None}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+        self.wfile.flush()
+
+
+def _rss_mb() -> float:
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def run(counts, endpoint: str, unshared: bool) -> list:
+    from backend.agent import agent_kernel, kernel_resources
+
+    if unshared:
+        agent_kernel.get_kernel_resources = kernel_resources.KernelResources
+
+    # The first session is configured the way the UI does; the rest inherit it
+    seed = agent_kernel.get_agent_kernel("bench_seed")
+    seed.set_model_selection(reasoning_model="bench", model_provider="lmstudio")
+    seed.configure_lmstudio(endpoint)
+
+    rows = []
+    created = 0
+    for target in counts:
+        first_token_ms = []
+        while created < target:
+            sid = f"bench_{created}"
+            created += 1
+            first = []
+            t0 = time.perf_counter()
+            kernel = agent_kernel.get_agent_kernel(sid)
+            kernel._respond_direct(
+                "hello there", [],
+                chunk_callback=lambda delta: first or first.append(time.perf_counter()))
+            first_token_ms.append((first[0] - t0) * 1000)
+        rows.append({
+            "sessions": target,
+            "new_sessions": len(first_token_ms),
+            "first_token_ms_p50": round(statistics.median(first_token_ms), 2),
+            "first_token_ms_p90": round(_pct(first_token_ms, 90), 2),
+            "first_token_ms_max": round(max(first_token_ms), 2),
+            "rss_mb": round(_rss_mb(), 1),
+            "kernels": len(agent_kernel._agent_kernel_instances),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50],
+                        help="session counts to measure at (cumulative)")
+    parser.add_argument("--unshared", action="store_true",
+                        help="give every kernel its own KernelResources (old behaviour)")
+    parser.add_argument("--json", type=str, default=None, help="write the report here")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubLLM)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # ConversationMemory persists under ./backend/sessions — keep it out of the repo
+    baseline_rss = _rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            import_t0 = time.perf_counter()
+            import backend.agent.agent_kernel  # noqa: F401
+            import_ms = (time.perf_counter() - import_t0) * 1000
+            rows = run(sorted(set(args.sessions)), endpoint, args.unshared)
+        finally:
+            os.chdir(cwd)
+    server.shutdown()
+
+    mode = "unshared" if args.unshared else "shared"
+    print(f"[{mode}] import {import_ms:.0f} ms, RSS before import {baseline_rss:.1f} MB")
+    print(f"{'sessions':>8} {'p50 ms':>9} {'p90 ms':>9} {'max ms':>9} {'RSS MB':>9}")
+    for row in rows:
+        print(f"{row['sessions']:>8} {row['first_token_ms_p50']:>9.2f} {row['first_token_ms_p90']:>9.2f} "
+              f"{row['first_token_ms_max']:>9.2f} {row['rss_mb']:>9.1f}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"mode": mode, "import_ms": round(import_ms, 1),
+                                               "rows": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+bench_pattern_scanner.py — microbenchmark for backend/security/pattern_scanner.py.
+
+Compares the combined PatternScanner with the old per-pattern loop from
+MCPSecurityManager._check_dangerous_patterns (str(args).lower(), then one
+re.search per pattern) on realistic tool payloads.
+
+Usage:
+  python scripts/bench_pattern_scanner.py
+  python scripts/bench_pattern_scanner.py --runs 50
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.security.allowlists import DangerousPatterns  # noqa: E402
+from backend.security.pattern_scanner import PatternScanner, ScanRule  # noqa: E402
+
+
+def _legacy_check(patterns: dict, arguments: dict):
+    args_str = str(arguments).lower()
+    for name, info in patterns.items():
+        if re.search(info["pattern"], args_str, re.IGNORECASE):
+            return name
+    return None
+
+
+def _payloads() -> dict:
+    prose = ("The quarterly report summarises revenue, churn and hiring plans for "
+             "the next two quarters across all regions. ")
+    code = Path(__file__).read_text(encoding="utf-8")
+    html = ("<div class=\"article\"><p>" + prose * 4 + "</p><a href=\"https://example.com/a\">"
+            "next page</a></div>\n")
+    return {
+        "small_args": {"query": "weather in Berlin tomorrow", "limit": 5},
+        "file_write_200k": {"path": "notes/report.md", "content": (prose * 2000)[:200_000]},
+        "code_write_100k": {"path": "src/app.ts", "content": (code * 40)[:100_000]},
+        "crawled_page_500k": {"url": "https://example.com", "html": (html * 1200)[:500_000]},
+    }
+
+
+def _time(fn, runs: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - t0) / runs * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per payload")
+    args = parser.parse_args()
+
+    dangerous = DangerousPatterns()
+    patterns = dangerous.get_all_patterns()
+    rules = [ScanRule(n, i["pattern"], i["severity"], i["category"]) for n, i in patterns.items()]
+
+    print(f"{len(rules)} patterns, {args.runs} runs per payload")
+    print(f"{'payload':<20}{'legacy ms':>12}{'scanner ms':>12}{'cached ms':>12}{'speedup':>10}")
+    for name, payload in _payloads().items():
+        text = str(payload)
+        # Verdicts must agree before timings mean anything
+        assert PatternScanner(rules, cache_size=0).scan(text).rule == _legacy_check(patterns, payload), name
+
+        legacy_ms = _time(lambda: _legacy_check(patterns, payload), args.runs)
+        uncached = PatternScanner(rules, cache_size=0)
+        scanner_ms = _time(lambda: uncached.scan(str(payload)), args.runs)
+        cached = PatternScanner(rules)
+        cached.scan(text)
+        cached_ms = _time(lambda: cached.scan(str(payload)), args.runs)
+        print(f"{name:<20}{legacy_ms:>12.3f}{scanner_ms:>12.3f}{cached_ms:>12.3f}"
+              f"{legacy_ms / scanner_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+bench_rate_limiter.py — microbenchmark for backend/security/rate_limiter.py.
+
+Measures checks/sec for the GCRA limiter against the old list-of-datetimes
+sliding window, with traffic spread over many distinct keys.
+
+Usage:
+  python scripts/bench_rate_limiter.py
+  python scripts/bench_rate_limiter.py --keys 10000 --checks 500000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.security.rate_limiter import RateLimiter, RateLimitPolicy  # noqa: E402
+
+
+def _legacy_check(store: dict, key: str, max_requests: int, window: int) -> bool:
+    # The pre-GCRA SecurityFilter._check_rate_limit, kept here for comparison
+    now = datetime.now()
+    cutoff = now - timedelta(seconds=window)
+    store[key] = [ts for ts in store.get(key, []) if ts > cutoff]
+    if len(store[key]) >= max_requests:
+        return True
+    store[key].append(now)
+    return False
+
+
+def bench_gcra(keys: list, n: int, policy: RateLimitPolicy) -> tuple[float, dict]:
+    limiter = RateLimiter()
+    t0 = time.perf_counter()
+    for i in range(n):
+        limiter.check(keys[i % len(keys)], policy)
+    elapsed = time.perf_counter() - t0
+    return n / elapsed, limiter.get_stats()
+
+
+def bench_legacy(keys: list, n: int, max_requests: int, window: int) -> float:
+    store: dict = {}
+    t0 = time.perf_counter()
+    for i in range(n):
+        _legacy_check(store, keys[i % len(keys)], max_requests, window)
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=10_000, help="distinct keys")
+    parser.add_argument("--checks", type=int, default=200_000, help="checks per run")
+    parser.add_argument("--max-requests", type=int, default=100)
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+
+    keys = [f"tool_execution_session{random.randrange(1000)}_{i}" for i in range(args.keys)]
+    random.shuffle(keys)
+    policy = RateLimitPolicy.per_window(args.max_requests, args.window)
+
+    # Spread: many keys, each well under its limit.  Hot: few keys near the
+    # limit, where the old per-key timestamp list was longest.
+    for label, key_set in (("spread", keys), ("hot", keys[:10])):
+        gcra_rate, stats = bench_gcra(key_set, args.checks, policy)
+        legacy_rate = bench_legacy(key_set, args.checks, args.max_requests, args.window)
+        print(f"[{label}] keys={len(key_set)} checks={args.checks} "
+              f"limit={args.max_requests}/{args.window}s")
+        print(f"  GCRA      {gcra_rate:>12,.0f} checks/s   keys held={stats['keys']}")
+        print(f"  legacy    {legacy_rate:>12,.0f} checks/s")
+        print(f"  speedup   {gcra_rate / legacy_rate:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
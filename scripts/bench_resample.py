@@ -0,0 +1,113 @@
+"""
+bench_resample.py — cost, first-output latency and edge accuracy of resampling.
+
+For each rate pair (22.05k→48k, 24k→48k, 48k→16k) and a synthetic
+multi-tone clip, compares:
+  fft        scipy.signal.resample over the whole clip (the old TTS path)
+  poly       scipy.signal.resample_poly (C implementation, whole clip)
+  polyphase  backend.audio.resampling.resample (cached filter bank, whole clip)
+  stream     StreamingResampler fed 20 ms chunks
+
+Reported per method: CPU ms per second of audio, time until the first output
+sample is available (whole-clip methods must finish the clip first), and the
+error against the analytically resampled test signal in the first/last 10 ms
+(edge ringing) and in the middle.
+
+Usage:
+  python scripts/bench_resample.py
+  python scripts/bench_resample.py --seconds 10 --repeat 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.audio.resampling import StreamingResampler, polyphase_filter, resample  # noqa: E402
+
+PAIRS = [(22_050, 48_000), (24_000, 48_000), (48_000, 16_000)]
+# Non-integer cycle counts, as in real audio, expose the periodic extension of FFT resampling
+TONES_HZ = (217.3, 1_013.7, 3_301.1)
+CHUNK_SEC = 0.02
+
+
+def test_signal(rate: int, seconds: float) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return sum(np.sin(2 * np.pi * f * t) for f in TONES_HZ).astype(np.float32) / len(TONES_HZ)
+
+
+def run_whole(fn, audio: np.ndarray, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.process_time()
+        out = fn(audio)
+        best = min(best, time.process_time() - t0)
+    return np.asarray(out, dtype=np.float32), best, best
+
+
+def run_stream(audio: np.ndarray, src: int, dst: int, repeat: int):
+    chunk = int(src * CHUNK_SEC)
+    best, first_best, out = float("inf"), float("inf"), None
+    for _ in range(repeat):
+        r = StreamingResampler(src, dst)
+        parts, first = [], None
+        t0 = time.process_time()
+        for i in range(0, len(audio), chunk):
+            y = r.process(audio[i:i + chunk])
+            if first is None and len(y):
+                first = time.process_time() - t0
+            parts.append(y)
+        parts.append(r.flush())
+        best = min(best, time.process_time() - t0)
+        first_best = min(first_best, first)
+        out = np.concatenate(parts)
+    return out, best, first_best
+
+
+def errors(out: np.ndarray, dst: int, seconds: float):
+    ref = test_signal(dst, seconds)
+    n = min(len(out), len(ref))
+    diff = np.abs(out[:n] - ref[:n])
+    edge = int(0.01 * dst)
+    return max(diff[:edge].max(), diff[n - edge:].max()), diff[edge:n - edge].max()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="clip length")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        from scipy import signal
+    except ImportError:
+        signal = None
+        print("scipy not installed — comparing polyphase and stream only\n")
+
+    for src, dst in PAIRS:
+        audio = test_signal(src, args.seconds)
+        f = polyphase_filter(src, dst)
+        n_out = -(-len(audio) * f.up // f.down)
+        methods = {}
+        if signal is not None:
+            methods["fft"] = lambda a: signal.resample(a, n_out)
+            methods["poly"] = lambda a: signal.resample_poly(a, f.up, f.down)
+        methods["polyphase"] = lambda a: resample(a, src, dst)
+
+        print(f"{src} Hz -> {dst} Hz  (up {f.up} / down {f.down}, {f.taps} taps per phase, "
+              f"{args.seconds:.0f} s clip)")
+        print(f"  {'method':<10} {'ms/s audio':>10} {'first out ms':>13} {'edge err':>9} {'mid err':>9}")
+        results = [(name, *run_whole(fn, audio, args.repeat)) for name, fn in methods.items()]
+        results.append(("stream", *run_stream(audio, src, dst, args.repeat)))
+        for name, out, cpu, first in results:
+            edge, mid = errors(out, dst, args.seconds)
+            print(f"  {name:<10} {cpu / args.seconds * 1000:10.2f} {first * 1000:13.2f} "
+                  f"{edge:9.4f} {mid:9.4f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+bench_streaming_stt.py — end-of-speech latency of streaming vs one-pass STT.
+
+Replays recorded WAV files as if they were being spoken: audio is released to
+the StreamingTranscriber in STREAM_STEP_SEC chunks on a simulated clock, and
+each decoding pass occupies the (real) CPU time it actually took.  For every
+file it reports how long after the end of the audio the final transcript is
+ready, for streaming and for a single transcribe() of the whole clip, plus
+when the first words were committed and the word error rate of the streaming
+transcript against the one-pass one.
+
+Requires faster-whisper.  CPU only by default.
+
+Fixtures: any 16-bit PCM WAV of speech.  The repo ships one, data/TOMV2.wav
+(the ~6 s TTS reference voice).  --generate renders FIXTURE_PHRASES — voice
+commands from a couple of seconds to about half a minute — through the app's
+TTSManager into data/stt_fixtures/ (git-ignored); real recordings can be
+dropped into the same directory.  The one-pass transcript is the WER
+reference, so fixtures need no transcripts.
+
+Usage:
+  python scripts/bench_streaming_stt.py --generate            # render fixtures, then bench
+  python scripts/bench_streaming_stt.py                       # data/stt_fixtures/*.wav + TOMV2.wav
+  python scripts/bench_streaming_stt.py clip1.wav clip2.wav --model base
+"""
+import argparse
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.audio.streaming_stt import StreamingTranscriber, whisper_word_transcriber  # noqa: E402
+
+SAMPLE_RATE = 16000
+FIXTURE_DIR = ROOT / "data" / "stt_fixtures"
+FIXTURE_PHRASES = [
+    "What time is it?",
+    "Turn the living room lights down to twenty percent, please.",
+    "Remind me tomorrow at nine to call the dentist and move my appointment to Friday afternoon.",
+    "Open my notes from yesterday's meeting, find the part about the quarterly budget, and read "
+    "me the three action items that were assigned to me, then draft a short email to the team "
+    "summarising them and asking whether anyone needs more time.",
+    "I want to plan a weekend trip. Look up the weather for the coast on Saturday and Sunday, "
+    "suggest two places to stay that are close to the beach and allow dogs, check how long the "
+    "drive is if I leave after work on Friday, and put a packing list in my notes with everything "
+    "I usually forget, like the phone charger, sunscreen, the dog's food and a spare jacket.",
+]
+
+
+def generate_fixtures() -> list:
+    """Render FIXTURE_PHRASES with the app's TTS engine into FIXTURE_DIR."""
+    from backend.agent.tts import OUTPUT_SAMPLE_RATE, get_tts_manager
+
+    tts = get_tts_manager()
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, text in enumerate(FIXTURE_PHRASES):
+        audio = tts.synthesize(text)
+        if audio is None:
+            sys.exit("TTS produced no audio — install f5-tts or piper-tts (see backend/agent/tts.py)")
+        path = FIXTURE_DIR / f"phrase_{i:02d}.wav"
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(OUTPUT_SAMPLE_RATE)
+            wf.writeframes(pcm.tobytes())
+        print(f"wrote {path.relative_to(ROOT)} ({len(audio) / OUTPUT_SAMPLE_RATE:.1f}s)")
+        paths.append(path)
+    return paths
+
+
+def load_wav(path: Path, max_sec: float) -> np.ndarray:
+    """16 kHz mono float32, truncated to max_sec."""
+    with wave.open(str(path), "rb") as wf:
+        width = wf.getsampwidth()
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        raw = wf.readframes(min(wf.getnframes(), int(max_sec * rate)))
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    audio = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+    if width == 1:
+        audio = (audio - 128) / 128
+    else:
+        audio /= float(2 ** (8 * width - 1))
+    audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        t_out = np.arange(int(len(audio) * SAMPLE_RATE / rate)) / SAMPLE_RATE
+        audio = np.interp(t_out, np.arange(len(audio)) / rate, audio).astype(np.float32)
+    return audio
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return float(bool(hyp))
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / len(ref)
+
+
+def bench_one_pass(model, audio: np.ndarray) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    segments, _ = model.transcribe(audio, language="en", beam_size=1, best_of=1,
+                                   condition_on_previous_text=False, vad_filter=True)
+    text = " ".join(s.text.strip() for s in segments).strip()
+    return time.perf_counter() - t0, text
+
+
+def bench_streaming(model, audio: np.ndarray, step: float) -> dict:
+    streamer = StreamingTranscriber(whisper_word_transcriber(model), SAMPLE_RATE)
+    chunk = int(step * SAMPLE_RATE)
+    clock = 0.0             # simulated wall time; audio position == clock while speaking
+    busy_until = 0.0        # when the decoder finishes its current pass
+    first_commit = None
+    max_lag = 0.0
+    for start in range(0, len(audio), chunk):
+        clock = (start + chunk) / SAMPLE_RATE
+        streamer.insert_audio(audio[start:start + chunk])
+        if busy_until > clock:
+            continue        # decoder still busy — this chunk rides along with the next pass
+        t0 = time.perf_counter()
+        partial = streamer.process()
+        busy_until = clock + time.perf_counter() - t0
+        max_lag = max(max_lag, busy_until - clock)
+        if first_commit is None and partial.committed:
+            first_commit = busy_until
+    end = len(audio) / SAMPLE_RATE
+    t0 = time.perf_counter()
+    text = streamer.finish()
+    finalize = max(busy_until, end) - end + time.perf_counter() - t0
+    return {
+        "finalize_s": finalize,
+        "first_commit_s": first_commit,
+        "max_pass_s": max_lag,
+        "passes": streamer.passes,
+        "decoded_x": streamer.decoded_sec / end if end else 0.0,
+        "text": text,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wavs", nargs="*", type=Path,
+                        help="WAV fixtures (default: data/stt_fixtures/*.wav and data/TOMV2.wav)")
+    parser.add_argument("--generate", action="store_true",
+                        help="render FIXTURE_PHRASES into data/stt_fixtures/ with the app's TTS first")
+    parser.add_argument("--model", default="tiny", help="faster-whisper model size (tiny, base, ...)")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--step", type=float, default=0.5, help="streaming step in seconds")
+    parser.add_argument("--max-sec", type=float, default=30.0, help="truncate clips to this length")
+    args = parser.parse_args()
+
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        sys.exit("faster-whisper is not installed: pip install faster-whisper")
+
+    if args.generate:
+        generate_fixtures()
+    reference = ROOT / "data" / "TOMV2.wav"
+    wavs = args.wavs or sorted(FIXTURE_DIR.glob("*.wav")) + ([reference] if reference.exists() else [])
+    if not wavs:
+        sys.exit("no WAV files given and none found; run with --generate")
+
+    model = WhisperModel(args.model, device=args.device, compute_type=args.compute_type)
+    # Warm up so kernel initialisation isn't billed to the first clip
+    list(model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="en")[0])
+
+    print(f"model={args.model} device={args.device} step={args.step}s\n")
+    print(f"{'file':<24} {'audio':>6} {'one-pass':>9} {'stream':>8} {'1st word':>9} "
+          f"{'max pass':>9} {'passes':>6} {'decoded':>8} {'WER':>5}")
+    for path in wavs:
+        audio = load_wav(path, args.max_sec)
+        duration = len(audio) / SAMPLE_RATE
+        one_pass_s, reference = bench_one_pass(model, audio)
+        s = bench_streaming(model, audio, args.step)
+        first = f"{s['first_commit_s']:.2f}s" if s["first_commit_s"] is not None else "-"
+        print(f"{path.name[:24]:<24} {duration:5.1f}s {one_pass_s:8.3f}s {s['finalize_s']:7.3f}s "
+              f"{first:>9} {s['max_pass_s']:8.3f}s {s['passes']:6d} {s['decoded_x']:7.1f}x "
+              f"{word_error_rate(reference, s['text']):5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+bench_vad.py — CPU cost and end-of-speech latency of the recording VAD at 16 kHz.
+
+1. Throughput: classifies the same audio with the previous per-frame Python
+   loop and with the block-vectorised EnergyVAD + SpeechSegmenter (one block
+   per VAD poll), reporting CPU microseconds per 32 ms frame and the CPU% of
+   one core needed to keep up with real time.
+2. Real time: feeds frames at microphone pace into a VoiceCommandHandler's
+   recording ring from a second thread and measures the wall time from the
+   last speech frame to the VAD returning (ideally VAD_SILENCE_SEC plus one
+   poll) and the process CPU% while waiting.
+
+Usage:
+  python scripts/bench_vad.py
+  python scripts/bench_vad.py --wav data/TOMV2.wav --backend webrtc
+"""
+import argparse
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.audio.speech_detection import (  # noqa: E402
+    FRAME_LENGTH, SpeechSegmenter, as_frames, create_vad,
+)
+from backend.audio.voice_command import VoiceCommandHandler  # noqa: E402
+
+SR = 16000
+FRAME_SEC = FRAME_LENGTH / SR
+
+
+def synthetic_utterance(speech_sec: float, rng: np.random.Generator) -> np.ndarray:
+    """Lead-in noise, syllable-like voiced bursts, then silence."""
+    t = np.arange(int(speech_sec * SR)) / SR
+    envelope = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None) ** 0.5
+    voiced = 0.06 * envelope * np.sin(2 * np.pi * (140 + 30 * np.sin(2 * np.pi * 0.7 * t)) * t)
+    noise = lambda n: rng.normal(0, 0.001, n)  # noqa: E731
+    return np.concatenate((noise(SR // 2), voiced + noise(len(t)), noise(2 * SR))).astype(np.float32)
+
+
+def load_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as wf:
+        width, channels, rate = wf.getsampwidth(), wf.getnchannels(), wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    audio = np.frombuffer(raw, dtype={2: np.int16, 4: np.int32}[width]).astype(np.float32)
+    audio = (audio / float(2 ** (8 * width - 1))).reshape(-1, channels).mean(axis=1)
+    if rate != SR:
+        out_t = np.arange(int(len(audio) * SR / rate)) / SR
+        audio = np.interp(out_t, np.arange(len(audio)) / rate, audio)
+    return np.concatenate((audio, np.zeros(2 * SR))).astype(np.float32)
+
+
+def legacy_vad(frames, threshold: float, speech_needed: int, silence_needed: int) -> int:
+    # The pre-vectorisation loop from VoiceCommandHandler, kept for comparison
+    silence_count = speech_count = 0
+    speech_started = False
+    for i, frame in enumerate(frames):
+        rms = float(np.sqrt(np.mean(np.square(frame))))
+        if rms >= threshold:
+            speech_count += 1
+            silence_count = 0
+            if speech_count >= speech_needed:
+                speech_started = True
+        elif speech_started:
+            silence_count += 1
+            if silence_count >= silence_needed:
+                return i
+        else:
+            speech_count = max(0, speech_count - 1)
+    return -1
+
+
+def bench_throughput(audio: np.ndarray, backend: str, block_frames: int, repeat: int) -> None:
+    h = VoiceCommandHandler
+    speech_needed = int(h.VAD_MIN_SPEECH_SEC / FRAME_SEC)
+    silence_needed = int(h.VAD_SILENCE_SEC / FRAME_SEC)
+    frames = as_frames(audio)
+    frame_list = [f.copy() for f in frames]
+
+    t0 = time.process_time()
+    for _ in range(repeat):
+        legacy_end = legacy_vad(frame_list, h.VAD_ENERGY_THRESHOLD, speech_needed, silence_needed)
+    legacy = (time.process_time() - t0) / (repeat * len(frames))
+
+    t0 = time.process_time()
+    for _ in range(repeat):
+        vad = create_vad(backend, energy_threshold=h.VAD_ENERGY_THRESHOLD, sample_rate=SR)
+        seg = SpeechSegmenter(speech_needed, silence_needed, max_frames=10 ** 9)
+        for i in range(0, len(frames), block_frames):
+            seg.feed(vad.classify(frames[i:i + block_frames]))
+            if seg.done:
+                break
+    vectorised = (time.process_time() - t0) / (repeat * len(frames))
+
+    print(f"throughput ({len(frames)} frames, {block_frames}-frame blocks, backend={vad.name})")
+    for name, per_frame in (("per-frame loop", legacy), ("vectorised", vectorised)):
+        print(f"  {name:<15} {per_frame * 1e6:7.2f} µs/frame   {per_frame / FRAME_SEC * 100:6.3f}% CPU")
+    print(f"  end-of-speech detected at frame: legacy={legacy_end} vectorised={seg.frames_seen - 1}\n")
+
+
+def bench_realtime(audio: np.ndarray, backend: str) -> None:
+    with patch.object(VoiceCommandHandler, "warm_up", return_value=None):
+        handler = VoiceCommandHandler(MagicMock())
+    handler.VAD_BACKEND = backend
+    handler.is_recording = True
+    handler._auto_stop_mode = True
+    frames = as_frames(audio)
+    loud = np.nonzero(np.sqrt(np.mean(frames ** 2, axis=1)) >= handler.VAD_ENERGY_THRESHOLD)[0]
+    last_speech = int(loud[-1]) if len(loud) else 0
+    marks = {}
+
+    def feed():
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            # Pace writes like the PortAudio callback would
+            delay = start + (i + 1) * FRAME_SEC - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            handler._capture_frame(frame)
+            if i == last_speech:
+                marks["speech_end"] = time.perf_counter()
+            if handler._stop_event.is_set() or "vad_done" in marks:
+                return
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    feeder.start()
+    handler._vad_wait_for_speech_then_silence()
+    marks["vad_done"] = time.perf_counter()
+    cpu = time.process_time() - cpu0
+    wall = marks["vad_done"] - wall0
+    feeder.join()
+
+    latency = marks["vad_done"] - marks.get("speech_end", marks["vad_done"])
+    print(f"real time ({len(frames) * FRAME_SEC:.1f}s of audio, backend={backend})")
+    print(f"  end-of-speech detected {latency * 1000:.0f} ms after the last speech frame "
+          f"(hangover {handler.VAD_SILENCE_SEC * 1000:.0f} ms + poll {handler.VAD_POLL_INTERVAL_SEC * 1000:.0f} ms)")
+    print(f"  process CPU while listening: {cpu / wall * 100:.2f}% of one core (incl. feeder thread)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", type=Path, help="speech WAV fixture (default: synthetic utterance)")
+    parser.add_argument("--speech-sec", type=float, default=4.0, help="synthetic speech length")
+    parser.add_argument("--backend", default="energy", help="energy | webrtc | silero")
+    parser.add_argument("--block-frames", type=int, default=16,
+                        help="frames per VAD poll in the throughput test")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    audio = load_wav(args.wav) if args.wav else synthetic_utterance(args.speech_sec, np.random.default_rng(0))
+    bench_throughput(audio, args.backend, args.block_frames, args.repeat)
+    bench_realtime(audio, args.backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+bench_voice_latency.py — end-of-speech → transcript → first token → first audio.
+
+Feeds utterances through the real AudioPipeline / VoiceCommandHandler path
+(input resampling, ring buffer, VAD, streaming STT) and the gateway's TTS
+scheduling, headless — no audio device is opened.  STT, LLM and TTS are fakes
+with configurable, seeded latencies by default, so results are reproducible
+and any regression comes from IRIS code; each can be swapped for a real
+model.  Prints per-stage latency percentiles and optionally writes the full
+report as JSON for regression tracking.
+
+Fixtures are deterministic synthetic utterances unless WAV files are given
+(played at their native rate, as a capture device would deliver them).
+
+Usage:
+  python scripts/bench_voice_latency.py                         # synthetic, all fakes
+  python scripts/bench_voice_latency.py --runs 20 --json report.json
+  python scripts/bench_voice_latency.py data/*.wav --transcript "what time is it"
+  python scripts/bench_voice_latency.py data/*.wav --whisper tiny --iris-tts
+  python scripts/bench_voice_latency.py --llm-gguf ~/models/qwen2.5-0.5b-instruct-q4_k_m.gguf
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.audio.latency_bench import (  # noqa: E402
+    MILESTONES, STAGES, FakeLLM, FakeSTT, FakeTTS, VoiceLatencyHarness,
+    load_wav_fixture, synthetic_utterance,
+)
+
+SYNTHETIC_PHRASES = [
+    "stop",
+    "what time is it",
+    "remind me to call the dentist tomorrow morning at nine",
+]
+
+
+def whisper_stt(size: str):
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        sys.exit("faster-whisper is not installed: pip install faster-whisper")
+    return WhisperModel(size, device="cpu", compute_type="int8", cpu_threads=4, num_workers=1)
+
+
+def llama_cpp_llm(path: Path, max_tokens: int):
+    """Token stream from a local GGUF model (llama-cpp-python), CPU only."""
+    try:
+        from llama_cpp import Llama
+    except ImportError:
+        sys.exit("llama-cpp-python is not installed: pip install llama-cpp-python")
+    llm = Llama(model_path=str(path), n_ctx=2048, n_gpu_layers=0, verbose=False)
+
+    def _stream(prompt: str):
+        for chunk in llm.create_chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens, temperature=0.0, stream=True,
+        ):
+            token = chunk["choices"][0]["delta"].get("content")
+            if token:
+                yield token
+
+    return _stream
+
+
+def iris_tts():
+    """The configured IRIS engine chain (F5-TTS → Piper → pyttsx3), bypassing the phrase cache."""
+    import numpy as np
+    from backend.agent import get_tts_manager
+
+    tts = get_tts_manager()
+
+    def _synthesize(text: str):
+        chunks = list(tts.synthesize_stream(text))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    return _synthesize
+
+
+def print_table(report: dict) -> None:
+    cfg = report["config"]
+    print(f"stt={cfg['stt']['backend']} llm={cfg['llm']['backend']} tts={cfg['tts']['backend']} "
+          f"speed={cfg['speed']}x speculative={cfg['speculative']} lookahead={cfg['lookahead']} "
+          f"streaming_stt={cfg['streaming_stt']} vad={cfg['vad_backend']}")
+    print(f"{len(report['runs'])} runs, {report['failures']} without audio\n")
+    print(f"{'ms after end of speech':<24} {'n':>4} {'min':>8} {'p50':>8} {'p90':>8} "
+          f"{'p99':>8} {'max':>8} {'mean':>8}")
+    for section in (MILESTONES, STAGES):
+        for name in section:
+            s = report["latency_ms"].get(name)
+            if s is None:
+                continue
+            print(f"{name:<24} {s['n']:4d} {s['min']:8.1f} {s['p50']:8.1f} {s['p90']:8.1f} "
+                  f"{s['p99']:8.1f} {s['max']:8.1f} {s['mean']:8.1f}")
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wavs", nargs="*", type=Path, help="WAV fixtures (default: synthetic utterances)")
+    parser.add_argument("--transcript", default="what time is it",
+                        help="what the fake STT hears in WAV fixtures")
+    parser.add_argument("--runs", type=int, default=5, help="timed turns per fixture")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed turns per fixture")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="feed audio this many times faster than real time")
+    parser.add_argument("--lookahead", type=int, default=None, help="TTS sentences rendered ahead")
+    parser.add_argument("--no-speculative", action="store_true",
+                        help="don't prefetch TTS while the LLM streams")
+    parser.add_argument("--json", type=Path, help="write the full report here ('-' for stdout)")
+
+    fake = parser.add_argument_group("fake backends (seconds)")
+    fake.add_argument("--stt-latency", type=float, default=0.05, help="per STT pass")
+    fake.add_argument("--stt-per-sec", type=float, default=0.02, help="per second of audio decoded")
+    fake.add_argument("--llm-first-token", type=float, default=0.3)
+    fake.add_argument("--llm-token", type=float, default=0.02)
+    fake.add_argument("--tts-latency", type=float, default=0.15, help="per synthesised phrase")
+    fake.add_argument("--tts-per-char", type=float, default=0.004)
+    fake.add_argument("--jitter", type=float, default=0.0, help="± fraction applied to every delay")
+    fake.add_argument("--seed", type=int, default=0)
+
+    real = parser.add_argument_group("real backends")
+    real.add_argument("--whisper", metavar="SIZE", help="faster-whisper model for STT (e.g. tiny)")
+    real.add_argument("--llm-gguf", type=Path, metavar="PATH", help="GGUF model run with llama-cpp-python")
+    real.add_argument("--llm-max-tokens", type=int, default=64)
+    real.add_argument("--iris-tts", action="store_true", help="use the configured IRIS TTS engines")
+    args = parser.parse_args()
+
+    if args.wavs:
+        fixtures = [load_wav_fixture(p, args.transcript) for p in args.wavs]
+    else:
+        fixtures = [synthetic_utterance(text, seed=i) for i, text in enumerate(SYNTHETIC_PHRASES)]
+
+    stt = (whisper_stt(args.whisper) if args.whisper else
+           FakeSTT(args.stt_latency, args.stt_per_sec, jitter=args.jitter, seed=args.seed))
+    llm = (llama_cpp_llm(args.llm_gguf, args.llm_max_tokens) if args.llm_gguf else
+           FakeLLM(args.llm_first_token, args.llm_token, jitter=args.jitter, seed=args.seed + 1))
+    tts = (iris_tts() if args.iris_tts else
+           FakeTTS(args.tts_latency, args.tts_per_char, jitter=args.jitter, seed=args.seed + 2))
+
+    harness = VoiceLatencyHarness(stt, llm, tts, speed=args.speed,
+                                  speculative=not args.no_speculative, lookahead=args.lookahead)
+    try:
+        report = harness.bench(fixtures, runs=args.runs, warmup=args.warmup)
+    finally:
+        harness.close()
+
+    if args.json and str(args.json) == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    print_table(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()